@@ -0,0 +1,59 @@
+"""
+Benchmark of the time of the acquisition function values
+for a batch of candidates with one call per candidate
+and one vectorized call for the whole batch.
+
+Run with: python benchmarks/acquisition.py
+"""
+
+import time
+import numpy as np
+from catlearn.optimize.acquisition import AcqUCB, AcqEI, AcqPI
+
+
+def time_single(acq, energies, uncertainties, repeats=5):
+    "Get the average time of the values with one call per candidate."
+    start = time.perf_counter()
+    for _ in range(repeats):
+        values = np.array(
+            [acq.calculate(e, u) for e, u in zip(energies, uncertainties)]
+        )
+        acq.choose(values, q=1)
+    return (time.perf_counter() - start) / repeats
+
+
+def time_batch(acq, energies, uncertainties, repeats=5):
+    "Get the average time of the values with one call for the batch."
+    start = time.perf_counter()
+    for _ in range(repeats):
+        values, _ = acq.calculate_batch(energies, uncertainties)
+        acq.choose(values, q=1)
+    return (time.perf_counter() - start) / repeats
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(1)
+    acq_list = [
+        AcqUCB(objective="max", kappa=2.0),
+        AcqEI(objective="max", ebest=0.0),
+        AcqPI(objective="max", ebest=0.0),
+    ]
+    print(
+        "{:>8} {:>8} {:>12} {:>12}".format(
+            "acq", "n", "single (ms)", "batch (ms)"
+        )
+    )
+    for n_candidates in [10, 100, 1000, 10000]:
+        energies = rng.normal(size=n_candidates)
+        uncertainties = rng.uniform(0.1, 1.0, size=n_candidates)
+        for acq in acq_list:
+            t_single = time_single(acq, energies, uncertainties)
+            t_batch = time_batch(acq, energies, uncertainties)
+            print(
+                "{:>8} {:>8d} {:>12.3f} {:>12.3f}".format(
+                    acq.__class__.__name__,
+                    n_candidates,
+                    1e3 * t_single,
+                    1e3 * t_batch,
+                )
+            )
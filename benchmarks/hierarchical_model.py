@@ -0,0 +1,98 @@
+"""
+Benchmark of the prediction time of the hierarchical ML model
+as a function of the number of levels (old models).
+The levels are either kept or collapsed into a single model.
+The collapsed model only uses the npoints training points farthest
+from each other, so the number of training points used in
+the predictions stays bounded.
+
+Run with: python benchmarks/hierarchical_model.py
+"""
+
+import time
+import numpy as np
+from ase import Atoms
+from ase.calculators.emt import EMT
+from catlearn.regression.gp.calculator import (
+    HierarchicalMLModel,
+    MLCalculator,
+    get_default_model,
+    get_default_database,
+)
+
+
+def make_data(n_data=60, seed=1):
+    "Make a data set of perturbed Cu clusters calculated with EMT."
+    rng = np.random.default_rng(seed)
+    base = Atoms(
+        "Cu6",
+        positions=[
+            [0.0, 0.0, 0.0],
+            [2.5, 0.0, 0.0],
+            [0.0, 2.5, 0.0],
+            [0.0, 0.0, 2.5],
+            [2.5, 2.5, 0.0],
+            [2.5, 0.0, 2.5],
+        ],
+    )
+    base.center(vacuum=5.0)
+    atoms_list = []
+    for _ in range(n_data):
+        atoms = base.copy()
+        atoms.positions += rng.normal(scale=0.15, size=(len(atoms), 3))
+        atoms.calc = EMT()
+        atoms.get_forces()
+        atoms_list.append(atoms)
+    return atoms_list
+
+
+def time_predictions(mlcalc, atoms_list, repeats=5):
+    "Get the average time of a prediction of the energy and forces."
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for atoms in atoms_list:
+            atoms_c = atoms.copy()
+            atoms_c.calc = mlcalc
+            atoms_c.get_forces()
+    return (time.perf_counter() - start) / (repeats * len(atoms_list))
+
+
+if __name__ == "__main__":
+    npoints = 6
+    data = make_data()
+    test_atoms = data[-5:]
+    print(
+        "{:>8} {:>8} {:>12} {:>12}".format(
+            "levels",
+            "points",
+            "time (ms)",
+            "collapsed",
+        )
+    )
+    for max_levels in [None, 1]:
+        mlmodel = HierarchicalMLModel(
+            model=get_default_model(model="tp", global_optimization=False),
+            database=get_default_database(),
+            optimize=False,
+            npoints=npoints,
+            max_levels=max_levels,
+        )
+        mlcalc = MLCalculator(mlmodel=mlmodel)
+        for i, atoms in enumerate(data[:-5]):
+            mlcalc.add_training(atoms)
+            mlcalc.train_model()
+            if (i + 1) % (npoints - 1) == 0:
+                n_levels = mlcalc.mlmodel.get_number_of_levels()
+                # The training points used in the predictions of the levels
+                n_points = sum(
+                    len(level.features) for level in mlcalc.mlmodel.levels
+                )
+                t_pred = time_predictions(mlcalc, test_atoms)
+                print(
+                    "{:>8d} {:>8d} {:>12.3f} {:>12}".format(
+                        n_levels,
+                        n_points,
+                        1e3 * t_pred,
+                        str(max_levels is not None),
+                    )
+                )
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.stats import norm
+from scipy.special import ndtr
 
 
 class Acquisition:
@@ -19,15 +19,142 @@ class Acquisition:
 
     def calculate(self, energy, uncertainty=None, **kwargs):
         "Calculate the acqusition function value."
+        return self.calculate_batch(energy, uncertainty)[0]
+
+    def calculate_gradient(
+        self,
+        energy,
+        uncertainty,
+        energy_deriv,
+        unc_deriv,
+        **kwargs,
+    ):
+        """
+        Calculate the acqusition function value and its derivatives
+        from the derivatives of the energy and uncertainty
+        with the chain rule.
+        The acqusition functions only implement calculate_partials,
+        which is used for both a single candidate and a batch.
+
+        Parameters:
+            energy : float
+                The predicted energy.
+            uncertainty : float
+                The predicted uncertainty.
+            energy_deriv : array
+                The derivatives of the predicted energy.
+            unc_deriv : array
+                The derivatives of the predicted uncertainty.
+
+        Returns:
+            float: The acqusition function value.
+            array: The derivatives of the acqusition function.
+        """
+        return self.calculate_batch(
+            energy,
+            uncertainty,
+            energy_derivs=energy_deriv,
+            unc_derivs=unc_deriv,
+        )
+
+    def calculate_batch(
+        self,
+        energies,
+        uncertainties=None,
+        energy_derivs=None,
+        unc_derivs=None,
+        **kwargs,
+    ):
+        """
+        Calculate the acqusition function values of a batch of candidates
+        in one vectorized call.
+        The derivatives of the acqusition function values are calculated
+        with the chain rule if the derivatives of the energies and
+        uncertainties are given.
+        The acqusition functions that switch between the energy and
+        the uncertainty use the maximum uncertainty of the batch.
+
+        Parameters:
+            energies : float or (N) array
+                The predicted energies.
+            uncertainties : float or (N) array
+                The predicted uncertainties.
+            energy_derivs : (N,...) array or None
+                The derivatives of the predicted energies.
+            unc_derivs : (N,...) array or None
+                The derivatives of the predicted uncertainties.
+
+        Returns:
+            float or (N) array: The acqusition function values.
+            (N,...) array or None: The derivatives of the acqusition
+                function values if the derivatives are given.
+        """
+        energies = np.asarray(energies, dtype=float)
+        if uncertainties is not None:
+            uncertainties = np.asarray(uncertainties, dtype=float)
+        values, energy_coef, unc_coef = self.calculate_partials(
+            energies,
+            uncertainties,
+        )
+        if np.ndim(values) == 0:
+            values = float(values)
+        if energy_derivs is None and unc_derivs is None:
+            return values, None
+        # Use the chain rule for the derivatives
+        derivs = 0.0
+        for coef, d in [(energy_coef, energy_derivs), (unc_coef, unc_derivs)]:
+            if d is None:
+                continue
+            d = np.asarray(d, dtype=float)
+            coef = np.reshape(
+                coef,
+                np.shape(coef) + (1,) * (np.ndim(d) - np.ndim(coef)),
+            )
+            derivs = derivs + coef * d
+        return values, derivs
+
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
+        """
+        Calculate the acqusition function values and their partial
+        derivatives with respect to the energies and uncertainties.
+
+        Parameters:
+            energies : float or (N) array
+                The predicted energies.
+            uncertainties : float or (N) array
+                The predicted uncertainties.
+
+        Returns:
+            float or (N) array: The acqusition function values.
+            float or (N) array: The derivatives with respect to the energies.
+            float or (N) array: The derivatives with respect to
+                the uncertainties.
+        """
         raise NotImplementedError()
 
-    def choose(self, candidates):
-        "Sort a list of acquisition function values."
+    def choose(self, candidates, q=None):
+        """
+        Sort a list of acquisition function values.
+
+        Parameters:
+            candidates : (N) array
+                The acquisition function values of the candidates.
+            q : int or None
+                The number of the best candidates that are returned.
+                All the candidates are sorted if q=None.
+
+        Returns:
+            (N) or (q) array: The indicies of the sorted candidates.
+        """
         if self.objective == "min":
-            return np.argsort(candidates)
+            indicies = np.argsort(candidates)
         elif self.objective == "max":
-            return np.argsort(candidates)[::-1]
-        return np.random.permutation(list(range(len(candidates))))
+            indicies = np.argsort(candidates)[::-1]
+        else:
+            indicies = np.random.permutation(len(candidates))
+        if q is not None:
+            return indicies[:q]
+        return indicies
 
     def objective_value(self, value):
         "Return the objective value."
@@ -80,9 +207,9 @@ class AcqEnergy(Acquisition):
         "The predicted energy as the acqusition function."
         super().__init__(objective)
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
-        "Calculate the acqusition function value as the predicted energy."
-        return energy
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
+        "Calculate the acqusition function values as the predicted energies."
+        return energies, 1.0, 0.0
 
 
 class AcqUncertainty(Acquisition):
@@ -90,9 +217,12 @@ class AcqUncertainty(Acquisition):
         "The predicted uncertainty as the acqusition function."
         super().__init__(objective)
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
-        "Calculate the acqusition function value as the predicted uncertainty."
-        return uncertainty
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
+        """
+        Calculate the acqusition function values as
+        the predicted uncertainties.
+        """
+        return uncertainties, 0.0, 1.0
 
 
 class AcqUCB(Acquisition):
@@ -108,10 +238,10 @@ class AcqUCB(Acquisition):
             **kwargs,
         )
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
-        "Calculate the acqusition function value as the predicted ucb."
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
+        "Calculate the acqusition function values as the predicted ucb."
         kappa = self.get_kappa()
-        return energy + kappa * uncertainty
+        return energies + kappa * uncertainties, 1.0, kappa
 
     def get_kappa(self):
         "Get the kappa value."
@@ -165,10 +295,10 @@ class AcqLCB(AcqUCB):
             **kwargs,
         )
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
-        "Calculate the acqusition function value as the predicted ucb."
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
+        "Calculate the acqusition function values as the predicted lcb."
         kappa = self.get_kappa()
-        return energy - kappa * uncertainty
+        return energies - kappa * uncertainties, 1.0, -kappa
 
 
 class AcqIter(Acquisition):
@@ -180,15 +310,15 @@ class AcqIter(Acquisition):
         self.update_arguments(objective=objective, niter=niter, **kwargs)
         self.iter = 0
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
         """
-        Calculate the acqusition function value as
-        the predicted energy or uncertainty.
+        Calculate the acqusition function values as
+        the predicted energies or uncertainties.
         """
         self.iter += 1
         if (self.iter) % self.niter == 0:
-            return energy
-        return uncertainty
+            return energies, 1.0, 0.0
+        return uncertainties, 0.0, 1.0
 
     def update_arguments(self, objective=None, niter=None, **kwargs):
         "Set the parameters of the Acquisition function class."
@@ -224,14 +354,19 @@ class AcqUME(Acquisition):
             **kwargs,
         )
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
         """
-        Calculate the acqusition function value as the predicted uncertainty
-        when it is is larger than unc_convergence else predicted energy.
+        Calculate the acqusition function values as the predicted
+        uncertainties when they are larger than unc_convergence
+        else predicted energies.
         """
-        if np.max([uncertainty]) < self.unc_convergence:
-            return energy
-        return self.objective_value(uncertainty)
+        if np.max(uncertainties) < self.unc_convergence:
+            return energies, 1.0, 0.0
+        return (
+            self.objective_value(uncertainties),
+            0.0,
+            self.objective_value(1.0),
+        )
 
     def update_arguments(self, objective=None, unc_convergence=None, **kwargs):
         "Set the parameters of the Acquisition function class."
@@ -276,15 +411,15 @@ class AcqUUCB(AcqUCB):
             **kwargs,
         )
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
         """
-        Calculate the acqusition function value as the predicted uncertainty
-        when it is is larger than unc_convergence else ucb.
+        Calculate the acqusition function values as the predicted
+        uncertainties when they are larger than unc_convergence else ucb.
         """
-        if np.max([uncertainty]) < self.unc_convergence:
+        if np.max(uncertainties) < self.unc_convergence:
             kappa = self.get_kappa()
-            return energy + kappa * uncertainty
-        return uncertainty
+            return energies + kappa * uncertainties, 1.0, kappa
+        return uncertainties, 0.0, 1.0
 
     def update_arguments(
         self,
@@ -344,15 +479,15 @@ class AcqULCB(AcqUUCB):
             **kwargs,
         )
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
         """
-        Calculate the acqusition function value as the predicted uncertainty
-        when it is is larger than unc_convergence else lcb.
+        Calculate the acqusition function values as the predicted
+        uncertainties when they are larger than unc_convergence else lcb.
         """
-        if np.max([uncertainty]) < self.unc_convergence:
+        if np.max(uncertainties) < self.unc_convergence:
             kappa = self.get_kappa()
-            return energy - kappa * uncertainty
-        return -uncertainty
+            return energies - kappa * uncertainties, 1.0, -kappa
+        return -uncertainties, 0.0, -1.0
 
 
 class AcqEI(Acquisition):
@@ -362,14 +497,24 @@ class AcqEI(Acquisition):
         """
         self.update_arguments(objective=objective, ebest=ebest, **kwargs)
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
         """
-        Calculate the acqusition function value as
-        the predicted expected improvement.
+        Calculate the acqusition function values as
+        the predicted expected improvements.
         """
-        z = (energy - self.ebest) / uncertainty
-        a = (energy - self.ebest) * norm.cdf(z) + uncertainty * norm.pdf(z)
-        return self.objective_value(a)
+        z = (energies - self.ebest) / uncertainties
+        cdf = ndtr(z)
+        pdf = self.get_pdf(z)
+        a = (energies - self.ebest) * cdf + uncertainties * pdf
+        return (
+            self.objective_value(a),
+            self.objective_value(cdf),
+            self.objective_value(pdf),
+        )
+
+    def get_pdf(self, z):
+        "Get the probability density of the standard normal distribution."
+        return np.exp(-0.5 * z**2) / np.sqrt(2.0 * np.pi)
 
     def update_arguments(self, objective=None, ebest=None, **kwargs):
         "Set the parameters of the Acquisition function class."
@@ -400,10 +545,17 @@ class AcqPI(AcqEI):
         """
         self.update_arguments(objective=objective, ebest=ebest, **kwargs)
 
-    def calculate(self, energy, uncertainty=None, **kwargs):
+    def calculate_partials(self, energies, uncertainties=None, **kwargs):
         """
-        Calculate the acqusition function value as
-        the predicted expected improvement.
+        Calculate the acqusition function values as
+        the predicted probabilities of improvement.
         """
-        z = (energy - self.ebest) / uncertainty
-        return self.objective_value(norm.cdf(z))
+        z = (energies - self.ebest) / uncertainties
+        pdf = self.get_pdf(z) / uncertainties
+        return (
+            self.objective_value(ndtr(z)),
+            self.objective_value(pdf),
+            self.objective_value(-z * pdf),
+        )
+
+
@@ -2,10 +2,13 @@ import numpy as np
 import ase
 from ase.io import read
 from scipy.optimize import dual_annealing
+from scipy.spatial import cKDTree
 import datetime
+from ase.data import covalent_radii
 from ase.parallel import world, broadcast
 from ..regression.gp.calculator.copy_atoms import copy_atoms
 from ..regression.gp.baseline.repulsive import RepulsionCalculator
+from ..regression.gp.fingerprint.geometry import mic_distance
 
 
 class MLGO:
@@ -23,9 +26,14 @@ class MLGO:
         force_consistent=None,
         scale_fmax=0.8,
         save_memory=False,
+        share_model=False,
         local_opt=None,
         local_opt_kwargs={},
         opt_kwargs={},
+        search_method="annealing",
+        prescreen=False,
+        clash_scale=0.5,
+        duplicate_tol=1e-4,
         bounds=None,
         initial_points=2,
         norelax_points=10,
@@ -88,6 +96,12 @@ class MLGO:
                 If save_memory==True then parallel optimization of
                 the hyperparameters can not be achived.
                 If save_memory==False no MPI object is used.
+            share_model : bool
+                Whether to only train the ML model on rank 0 and
+                broadcast its trained state as NumPy arrays
+                to the other ranks instead of training it on all ranks.
+                The hyperparameters must then be optimized without MPI,
+                otherwise an error is raised.
             local_opt : ASE local optimizer Object.
                 A local optimizer object from ASE.
                 If None is given then FIRE is used.
@@ -110,9 +124,33 @@ class MLGO:
             min_steps : int.
                 The minimum number of iterations before convergence is checked.
             opt_kwargs : dict.
-                Arguments used for the simulated annealing method.
+                Arguments used for the simulated annealing method or
+                the gradient-based search.
+            search_method : str
+                The method used for the global search on
+                the surrogate surface.
+                'annealing' uses the simulated annealing of scipy
+                without derivatives.
+                'gradient' uses multiple starts of L-BFGS-B with
+                the analytic derivatives of the acquisition function
+                with respect to the positions and angles of the adsorbates.
+            prescreen : bool
+                Whether to pre-screen the structures in the simulated
+                annealing before the ML model is used.
+                Structures with overlapping adsorbate atoms are rejected and
+                the predicted energies and uncertainties of near-duplicates
+                of the training structures are reused.
+            clash_scale : float
+                The scaling of the sum of the covalent radii that gives
+                the smallest allowed distance between an adsorbate atom and
+                a slab atom (or an atom of the other adsorbate).
+            duplicate_tol : float
+                The fingerprint distance below which a structure is
+                a near-duplicate of a training structure.
             trajectory : string.
                 Trajectory filename to store the evaluated training data.
+                Only the new training data is appended to the trajectory.
+                If trajectory=None, the training data is not saved.
             tabletxt : string
                 Name of the .txt file where the summary table is printed.
                 It is not saved to the file if tabletxt=None.
@@ -120,10 +158,19 @@ class MLGO:
                 Whether to print on screen the full output (True).
         """
         # Setup parallelization
-        self.parallel_setup(save_memory)
+        self.parallel_setup(save_memory, share_model)
         # Setup given parameters
         self.setup_slab_ads(slab, ads, ads2)
         self.opt_kwargs = opt_kwargs
+        if search_method.lower() not in ["annealing", "gradient"]:
+            raise Exception(
+                "The search method {} is not implemented.".format(
+                    search_method
+                )
+            )
+        self.search_method = search_method.lower()
+        # Setup the pre-screening of the structures
+        self.setup_prescreening(prescreen, clash_scale, duplicate_tol)
         self.norelax_points = norelax_points
         self.min_steps = min_steps
         self.use_database_check = use_database_check
@@ -282,9 +329,129 @@ class MLGO:
         self.number_atoms = len(self.slab_ads)
         return
 
-    def parallel_setup(self, save_memory=False, **kwargs):
+    def setup_prescreening(
+        self,
+        prescreen=False,
+        clash_scale=0.5,
+        duplicate_tol=1e-4,
+        clash_penalty=1e6,
+        **kwargs,
+    ):
+        """
+        Setup the pre-screening of the structures in the simulated annealing.
+        The pairs of adsorbate and slab atoms (and the pairs of atoms
+        in the two adsorbates) and their smallest allowed distances
+        are made once.
+
+        Parameters:
+            prescreen : bool
+                Whether to pre-screen the structures.
+            clash_scale : float
+                The scaling of the sum of the covalent radii that gives
+                the smallest allowed distance between the atoms.
+            duplicate_tol : float
+                The fingerprint distance below which a structure is
+                a near-duplicate of a training structure.
+            clash_penalty : float
+                The value of the object function for overlapping structures
+                added to the total overlap of the atoms.
+
+        Returns:
+            self: The object itself.
+        """
+        self.prescreen = prescreen
+        self.clash_scale = clash_scale
+        self.duplicate_tol = duplicate_tol
+        self.clash_penalty = clash_penalty
+        # Make the pairs of atoms that are checked for overlaps
+        n_slab = len(self.slab)
+        n_ads = len(self.ads)
+        ads_indicies = np.arange(n_slab, n_slab + n_ads)
+        clash_i, clash_j = np.meshgrid(
+            ads_indicies,
+            np.arange(n_slab),
+            indexing="ij",
+        )
+        clash_i, clash_j = [clash_i.reshape(-1)], [clash_j.reshape(-1)]
+        if self.ads2:
+            ads2_indicies = np.arange(n_slab + n_ads, self.number_atoms)
+            for indicies in [np.arange(n_slab), ads_indicies]:
+                pair_i, pair_j = np.meshgrid(
+                    ads2_indicies,
+                    indicies,
+                    indexing="ij",
+                )
+                clash_i.append(pair_i.reshape(-1))
+                clash_j.append(pair_j.reshape(-1))
+        self.clash_i = np.concatenate(clash_i)
+        self.clash_j = np.concatenate(clash_j)
+        # Get the smallest allowed distances from the covalent radii
+        radii = covalent_radii[self.slab_ads.get_atomic_numbers()]
+        self.clash_distances = clash_scale * (
+            radii[self.clash_i] + radii[self.clash_j]
+        )
+        self.reset_prescreening()
+        return self
+
+    def reset_prescreening(self, **kwargs):
+        """
+        Reset the nearest-neighbour index of the training fingerprints and
+        the stored predictions of the near-duplicates.
+        """
+        self.database_tree = None
+        self.duplicate_predictions = {}
+        return self
+
+    def get_clash_overlap(self, slab_ads, **kwargs):
+        """
+        Get the total overlap of the adsorbate atoms with the slab atoms
+        (and the other adsorbate) from the smallest allowed distances.
+        The overlap is zero if no atoms are overlapping.
+        """
+        pos = slab_ads.get_positions()
+        dist_vec = pos[self.clash_j] - pos[self.clash_i]
+        pbc = slab_ads.pbc
+        if sum(pbc):
+            dist, _ = mic_distance(dist_vec, np.array(slab_ads.cell), pbc)
+        else:
+            dist = np.linalg.norm(dist_vec, axis=-1)
+        return np.sum(np.maximum(self.clash_distances - dist, 0.0))
+
+    def get_database_tree(self, **kwargs):
+        """
+        Get the nearest-neighbour index of the fingerprints of
+        the training structures.
+        The index is made once after each update of the ML model.
+        """
+        if self.database_tree is None:
+            database = self.mlcalc.mlmodel.database
+            features = database.get_features()
+            if len(features) == 0:
+                return None
+            if database.use_fingerprint:
+                features = [fp.get_vector() for fp in features]
+            self.database_tree = cKDTree(np.array(features))
+        return self.database_tree
+
+    def get_duplicate_index(self, fp, **kwargs):
+        """
+        Get the index of the training structure that the fingerprint is
+        a near-duplicate of. None is returned if it is not a near-duplicate.
+        """
+        tree = self.get_database_tree()
+        if tree is None:
+            return None
+        if self.mlcalc.mlmodel.database.use_fingerprint:
+            fp = fp.get_vector()
+        dist, index = tree.query(fp)
+        if dist < self.duplicate_tol:
+            return int(index)
+        return None
+
+    def parallel_setup(self, save_memory=False, share_model=False, **kwargs):
         "Setup the parallelization."
         self.save_memory = save_memory
+        self.share_model = share_model
         self.rank = world.rank
         self.size = world.size
         return self
@@ -326,32 +493,65 @@ class MLGO:
 
     def rotation_matrix(self, ads, angles):
         "Rotate the adsorbate"
+        R = self.get_rotation_matrix(angles)
+        ads.set_positions(np.matmul(ads.get_positions(), R))
+        return ads
+
+    def get_rotation_matrix(self, angles, get_derivatives=False):
+        """
+        Get the rotation matrix of the adsorbate from the three angles.
+        The derivatives of the rotation matrix with respect to
+        the angles are also returned if get_derivatives=True.
+        """
         theta1, theta2, theta3 = angles
-        Rz = np.array(
-            [
-                [np.cos(theta1), -np.sin(theta1), 0.0],
-                [np.sin(theta1), np.cos(theta1), 0.0],
-                [0.0, 0.0, 1.0],
-            ]
-        )
-        Ry = np.array(
-            [
-                [np.cos(theta2), 0.0, np.sin(theta2)],
-                [0.0, 1.0, 0.0],
-                [-np.sin(theta2), 0.0, np.cos(theta2)],
-            ]
-        )
-        R = np.matmul(Ry, Rz)
-        Rz = np.array(
+        c1, s1 = np.cos(theta1), np.sin(theta1)
+        c2, s2 = np.cos(theta2), np.sin(theta2)
+        c3, s3 = np.cos(theta3), np.sin(theta3)
+        Rz1 = np.array([[c1, -s1, 0.0], [s1, c1, 0.0], [0.0, 0.0, 1.0]])
+        Ry = np.array([[c2, 0.0, s2], [0.0, 1.0, 0.0], [-s2, 0.0, c2]])
+        Rz3 = np.array([[c3, -s3, 0.0], [s3, c3, 0.0], [0.0, 0.0, 1.0]])
+        R = np.matmul(Rz3, np.matmul(Ry, Rz1)).T
+        if not get_derivatives:
+            return R
+        # The derivatives of the rotations with respect to the angles
+        dRz1 = np.array([[-s1, -c1, 0.0], [c1, -s1, 0.0], [0.0, 0.0, 0.0]])
+        dRy = np.array([[-s2, 0.0, c2], [0.0, 0.0, 0.0], [-c2, 0.0, -s2]])
+        dRz3 = np.array([[-s3, -c3, 0.0], [c3, -s3, 0.0], [0.0, 0.0, 0.0]])
+        dR = np.array(
             [
-                [np.cos(theta3), -np.sin(theta3), 0.0],
-                [np.sin(theta3), np.cos(theta3), 0.0],
-                [0.0, 0.0, 1.0],
+                np.matmul(Rz3, np.matmul(Ry, dRz1)).T,
+                np.matmul(Rz3, np.matmul(dRy, Rz1)).T,
+                np.matmul(dRz3, np.matmul(Ry, Rz1)).T,
             ]
         )
-        R = np.matmul(Rz, R).T
-        ads.set_positions(np.matmul(ads.get_positions(), R))
-        return ads
+        return R, dR
+
+    def get_pos_angles_gradient(self, pos_angles, gradient):
+        """
+        Get the derivatives with respect to the positions and angles of
+        the adsorbates from the derivatives with respect to
+        the atomic positions with the chain rule through place_ads.
+        """
+        cell = np.array(self.slab.get_cell())
+        n_start = len(self.slab)
+        ads_list = [self.ads] if self.ads2 is None else [self.ads, self.ads2]
+        pos_angles_gradient = []
+        for i, ads in enumerate(ads_list):
+            gradient_ads = gradient[n_start : n_start + len(ads)]
+            n_start += len(ads)
+            # The derivatives with respect to the scaled center position
+            pos_angles_gradient.append(
+                np.matmul(cell, np.sum(gradient_ads, axis=0))
+            )
+            # The derivatives with respect to the angles
+            _, dR = self.get_rotation_matrix(
+                pos_angles[6 * i + 3 : 6 * i + 6],
+                get_derivatives=True,
+            )
+            pos_angles_gradient.append(
+                np.einsum("kj,ajl,kl->a", ads.get_positions(), dR, gradient_ads)
+            )
+        return np.concatenate(pos_angles_gradient)
 
     def evaluate(self, candidate):
         "Caculate energy and forces and add training system to ML-model"
@@ -376,7 +576,8 @@ class MLGO:
         # Store the data
         self.max_abs_forces = np.nanmax(np.linalg.norm(forces, axis=1))
         self.add_training([self.candidate])
-        self.mlcalc.save_data(trajectory=self.trajectory)
+        if isinstance(self.trajectory, str) and len(self.trajectory):
+            self.mlcalc.save_data(trajectory=self.trajectory)
         # Best new point
         self.best_new_point(self.candidate, self.energy_true)
         return
@@ -384,6 +585,7 @@ class MLGO:
     def add_training(self, atoms_list):
         "Add atoms_list data to ML model on rank=0."
         self.mlcalc.add_training(atoms_list)
+        self.reset_prescreening()
         return self.mlcalc
 
     def best_new_point(self, candidate, energy):
@@ -447,10 +649,15 @@ class MLGO:
         if self.save_memory:
             if self.rank != 0:
                 return self.mlcalc
-        # Update database with the points of interest
-        self.update_database_arguments(point_interest=self.best_candidate)
-        # Train the ML model
-        self.mlcalc.train_model()
+        if not self.share_model or self.rank == 0:
+            # Update database with the points of interest
+            self.update_database_arguments(point_interest=self.best_candidate)
+            # Train the ML model
+            self.mlcalc.train_model()
+        # Share the trained ML model from rank 0 with the other ranks
+        if self.share_model and not self.save_memory:
+            self.mlcalc.broadcast_trained_state(root=0)
+        self.reset_prescreening()
         return self.mlcalc
 
     def is_in_database(self, atoms, **kwargs):
@@ -526,7 +733,7 @@ class MLGO:
                 self.message_system(
                     "Starting global search!", end="\r", rank=r
                 )
-                candidate, energy, unc, x = self.dual_annealing(
+                candidate, energy, unc, x = self.global_search(
                     maxiter=ml_steps,
                     **self.opt_kwargs,
                 )
@@ -581,7 +788,7 @@ class MLGO:
             np.array(candidates["uncertainties"]),
         )
         # Chose the minimum value given by the Acq. class
-        i_min = self.acq.choose(acq_values)[0]
+        i_min = self.acq.choose(acq_values, q=1)[0]
         # The next training point
         candidate = candidates["candidates"][i_min].copy()
         self.energy = candidates["energies"][i_min]
@@ -611,6 +818,15 @@ class MLGO:
         converged = broadcast(converged, root=0)
         return converged
 
+    def global_search(self, maxiter=5000, **opt_kwargs):
+        """
+        Find the candidates structures, energy and forces with
+        the chosen global search method.
+        """
+        if self.search_method == "gradient":
+            return self.gradient_search(maxiter=maxiter, **opt_kwargs)
+        return self.dual_annealing(maxiter=maxiter, **opt_kwargs)
+
     def dual_annealing(self, maxiter=5000, **opt_kwargs):
         """
         Find the candidates structures, energy and forces using dual annealing.
@@ -635,6 +851,9 @@ class MLGO:
         "Dual annealing object function"
         # Construct the structure
         slab_ads = self.place_ads(pos_angles)
+        # Pre-screen the structure before the ML model is used
+        if self.prescreen:
+            return self.prescreen_func(slab_ads)
         # Predict the energy and uncertainty
         slab_ads.calc = self.mlcalc
         energy = slab_ads.get_potential_energy()
@@ -642,6 +861,96 @@ class MLGO:
         # Calculate the acquisition function
         return self.acq.calculate(energy, uncertainty=unc)
 
+    def prescreen_func(self, slab_ads):
+        """
+        Dual annealing object function with a pre-screening of
+        the structure.
+        Structures with overlapping atoms get a penalty without
+        using the ML model.
+        The energy and uncertainty of a near-duplicate of
+        a training structure are only predicted once and then reused.
+        The acquisition function is always calculated, since it can be
+        stochastic or change with the number of calls.
+        """
+        # Reject overlapping structures
+        overlap = self.get_clash_overlap(slab_ads)
+        if overlap > 0.0:
+            return self.clash_penalty + overlap
+        # Check if the structure is a near-duplicate of a training structure
+        fp = self.mlcalc.mlmodel.database.make_atoms_feature(slab_ads)
+        index = self.get_duplicate_index(fp)
+        if index is not None and index in self.duplicate_predictions:
+            energy, unc = self.duplicate_predictions[index]
+        else:
+            # Predict the energy and uncertainty from the fingerprint
+            results = self.mlcalc.calculate_batch(
+                [slab_ads],
+                properties=["energy", "uncertainty"],
+                features=[fp],
+            )[0]
+            energy, unc = results["energy"], results["uncertainty"]
+            if index is not None:
+                self.duplicate_predictions[index] = (energy, unc)
+        # Calculate the acquisition function
+        return self.acq.calculate(energy, uncertainty=unc)
+
+    def gradient_search(self, maxiter=5000, n_starts=10, **opt_kwargs):
+        """
+        Find the candidates structures, energy and forces using
+        L-BFGS-B from multiple random starts within the bounds
+        with the analytic derivatives of the acquisition function.
+        """
+        from scipy.optimize import minimize
+
+        # The maximum number of evaluations for each start
+        maxfun = max(int(maxiter // n_starts), 1)
+        sol = None
+        for start in range(n_starts):
+            x0 = np.random.uniform(self.bounds[:, 0], self.bounds[:, 1])
+            sol_start = minimize(
+                self.dual_func_gradient,
+                x0,
+                method="L-BFGS-B",
+                jac=True,
+                bounds=self.bounds,
+                options=dict(maxfun=maxfun, **opt_kwargs),
+            )
+            if sol is None or sol_start["fun"] < sol["fun"]:
+                sol = sol_start
+        # Reconstruct the final structure
+        slab_ads = self.place_ads(sol["x"])
+        # Get the energy and uncertainty predictions
+        slab_ads.calc = self.mlcalc
+        energy, unc = self.get_predictions(slab_ads)
+        return slab_ads.copy(), energy, unc, sol["x"].copy()
+
+    def dual_func_gradient(self, pos_angles):
+        """
+        The acquisition function and its derivatives with respect to
+        the positions and angles of the adsorbates.
+        """
+        # Construct the structure
+        slab_ads = self.place_ads(pos_angles)
+        # Predict the energy, uncertainty, and their derivatives
+        results = self.mlcalc.calculate_batch(
+            [slab_ads],
+            properties=[
+                "energy",
+                "forces",
+                "uncertainty",
+                "uncertainty derivatives",
+            ],
+        )[0]
+        # Calculate the acquisition function and its derivatives
+        value, gradient = self.acq.calculate_gradient(
+            results["energy"],
+            results["uncertainty"],
+            -results["forces"],
+            results["uncertainty derivatives"],
+        )
+        # Use the chain rule through the placement of the adsorbates
+        return value, self.get_pos_angles_gradient(pos_angles, gradient)
+
     def local_relax(
         self,
         candidate,
@@ -874,12 +1183,39 @@ class MLGO:
                 fp=fp,
                 baseline=baseline,
                 use_derivatives=True,
-                parallel=(not save_memory),
+                parallel=(not (save_memory or self.share_model)),
                 database_reduction=False,
             )
             self.mlcalc = MLCalculator(mlmodel=mlmodel)
         else:
             self.mlcalc = mlcalc
+        # Only rank 0 trains the ML model if it is shared,
+        # so the other ranks can not join the MPI optimization
+        if self.share_model and self.mlcalc.mlmodel.is_parallel():
+            raise Exception(
+                "The hyperparameters can not be optimized in parallel "
+                "when share_model=True! Use an optimizer with "
+                "parallel=False."
+            )
+        # Only update the fingerprint contributions of the adsorbates
+        self.set_fingerprint_reference()
+        return self
+
+    def set_fingerprint_reference(self, **kwargs):
+        """
+        Set the slab as the fixed reference of the fingerprint,
+        so only the contributions of the adsorbate atoms are
+        calculated for each placement of the adsorbates.
+
+        Returns:
+            self: The object itself.
+        """
+        slab_ads = self.slab_ads.copy()
+        slab_ads.wrap()
+        self.mlcalc.mlmodel.database.fingerprint.set_reference(
+            slab_ads,
+            fixed_indicies=np.arange(len(self.slab)),
+        )
         return self
 
     def set_acq(self, acq=None, **kwargs):
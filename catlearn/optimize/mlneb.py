@@ -1,9 +1,10 @@
 import numpy as np
+import re
 import ase
 from ase.io import read
-from ase.io.trajectory import TrajectoryWriter
 from ase.parallel import world, broadcast
 import datetime
+from .trajectorywriter import BufferedTrajectoryWriter
 from .neb.improvedneb import ImprovedTangentNEB
 from .neb.nebimage import NEBImage
 from .neb.interpolate_band import make_interpolation
@@ -31,17 +32,22 @@ class MLNEB:
         check_path_fmax=True,
         use_low_unc_ci=True,
         reuse_ci_path=False,
+        active_subspace=False,
+        min_displacement=0.1,
         save_memory=False,
+        share_model=False,
         apply_constraint=True,
         force_consistent=None,
         scale_fmax=0.8,
         local_opt=None,
         local_opt_kwargs=dict(),
+        warm_start=True,
         trainingset="evaluated_structures.traj",
         trajectory="MLNEB.traj",
         last_path=None,
         final_path="final_path.traj",
         tabletxt="mlneb_summary.txt",
+        async_write=True,
         restart=False,
         full_output=False,
         **kwargs,
@@ -115,12 +121,30 @@ class MLNEB:
             reuse_ci_path : bool
                 Whether to reuse the path from the climbing image NEB.
                 It is only recommended to be used if use_low_unc_ci=True.
+            active_subspace : bool
+                Whether to only use the atoms that are displaced along
+                the path (from the end-points, the evaluated structures,
+                and the current path) in the features and the derivative
+                targets of the ML model.
+                The active subspace is updated before each training.
+                It requires that the database uses reduce_dimensions=True.
+            min_displacement : float
+                The minimum displacement of an atom from the initial state
+                for it to be in the active subspace.
+                The atoms with forces above fmax in the evaluated
+                structures are also in the active subspace.
             save_memory : bool
                 Whether to only train the ML calculator and store
                 all objects on one CPU.
                 If save_memory==True then parallel optimization of
                 the hyperparameters can not be achived.
                 If save_memory==False no MPI object is used.
+            share_model : bool
+                Whether to only train the ML model on rank 0 and
+                broadcast its trained state as NumPy arrays
+                to the other ranks instead of training it on all ranks.
+                The hyperparameters must then be optimized without MPI,
+                otherwise an error is raised.
             apply_constraint : boolean
                 Whether to apply the constrains of the ASE Atoms instance
                 to the calculated forces.
@@ -139,10 +163,21 @@ class MLNEB:
                 If None is given then FIRE is used.
             local_opt_kwargs : dict
                 Arguments used for the ASE local optimizer.
+            warm_start : bool
+                Whether to keep the NEB and the local optimizer with its
+                state (e.g. the FIRE velocities) between the iterations
+                when the path of the last iteration is reused.
+                Only the optimizers with velocities (FIRE and MDMin)
+                are warm-started, since the quasi-Newton optimizers
+                need the forces of their last step on
+                the same surrogate surface.
             trainingset : string.
                 Trajectory filename to store the evaluated training data.
+                Only the new training data is appended to the trajectory.
+                If trainingset=None, the training data is not saved.
             trajectory : string
                 Trajectory filename to store the predicted NEB path.
+                If trajectory=None, the predicted paths are not saved.
             last_path : string
                 Trajectory filename to store the last MLNEB path.
                 If last_path=None, the last path is not saved.
@@ -152,6 +187,9 @@ class MLNEB:
             tabletxt : string
                 Name of the .txt file where the summary table is printed.
                 It is not saved to the file if tabletxt=None.
+            async_write : bool
+                Whether to write the trajectories of the paths on
+                a background thread.
             restart : bool
                 Whether to restart the MLNEB from a previous run.
                 It is only possible to restart the MLNEB
@@ -164,7 +202,7 @@ class MLNEB:
                 Whether to print on screen the full output (True).
         """
         # Setup parallelization
-        self.parallel_setup(save_memory)
+        self.parallel_setup(save_memory, share_model)
         # NEB parameters
         self.interpolation = interpolation
         self.interpolation_kwargs = dict(
@@ -184,9 +222,14 @@ class MLNEB:
         self.check_path_fmax = check_path_fmax
         self.reuse_ci_path = reuse_ci_path
         self.use_low_unc_ci = use_low_unc_ci
+        self.active_subspace = active_subspace
+        self.min_displacement = min_displacement
         # Set initial parameters
         self.step = 0
         self.converging = False
+        # The version of the trained ML model and its cached predictions
+        self.model_version = 0
+        self.path_predictions = {}
         # Setup the ML calculator
         self.set_mlcalc(mlcalc, start=start, save_memory=save_memory)
         # Whether to have the full output
@@ -208,6 +251,10 @@ class MLNEB:
             local_opt=local_opt,
             local_opt_kwargs=local_opt_kwargs,
         )
+        # The NEBs and local optimizers kept between the iterations
+        # for the NEB with and without climbing image
+        self.warm_start = warm_start
+        self.neb_sessions = {}
         # Trajectories
         self.trainingset = trainingset
         self.trajectory = trajectory
@@ -215,6 +262,9 @@ class MLNEB:
         self.final_path = final_path
         # Summary table file name
         self.tabletxt = tabletxt
+        # The writers of the path trajectories
+        self.async_write = async_write
+        self.path_writers = {}
         # Restart the MLNEB
         if restart:
             if prev_calculations is not None:
@@ -235,6 +285,8 @@ class MLNEB:
                 )
         # Load previous calculations to the ML model
         self.use_prev_calculations(prev_calculations)
+        # The cached positions of the optimized interpolations
+        self.interpolation_cache = {}
         # Define the last images that can be used to restart the interpolation
         self.last_images = self.make_interpolation(
             interpolation=self.interpolation
@@ -280,40 +332,52 @@ class MLNEB:
         self.last_images_tmp = None
         # Calculate a extra data point if only start and end is given
         self.extra_initial_data()
-        # Save MLNEB path trajectory
-        with TrajectoryWriter(
-            self.trajectory,
-            mode="w",
-            properties=["energy", "forces", "uncertainty"],
-        ) as self.trajectory_neb:
-            # Save the initial interpolation
-            self.save_last_path(self.last_path, self.images, properties=None)
-            # Run the active learning
-            for step in range(1, steps + 1):
-                # Train and optimize ML model
-                self.train_mlmodel()
-                # Perform NEB on ML surrogate surface
-                candidate, neb_converged = self.run_mlneb(
-                    fmax=fmax * self.scale_fmax,
-                    ml_steps=ml_steps,
-                    max_unc=max_unc,
-                    unc_convergence=unc_convergence,
-                )
-                # Evaluate candidate
-                self.evaluate(candidate)
-                # Share the images between all CPUs
-                self.share_images()
-                # Print the results for this iteration
-                self.print_statement(step)
-                # Check convergence
-                self.converging = self.check_convergence(
-                    fmax, unc_convergence, neb_converged
+        try:
+            # Save MLNEB path trajectory
+            with BufferedTrajectoryWriter(
+                self.trajectory,
+                mode="w",
+                properties=["energy", "forces", "uncertainty"],
+                use_thread=self.async_write,
+                master=(self.rank == 0),
+            ) as self.trajectory_neb:
+                # Save the initial interpolation
+                self.save_last_path(
+                    self.last_path,
+                    self.images,
+                    properties=None,
                 )
-                if self.converging:
-                    self.save_last_path(self.final_path, self.images)
-                    self.message_system("MLNEB is converged.")
-                    self.print_cite()
-                    break
+                # Run the active learning
+                for step in range(1, steps + 1):
+                    # Train and optimize ML model
+                    self.train_mlmodel(fmax=fmax)
+                    # Perform NEB on ML surrogate surface
+                    candidate, neb_converged = self.run_mlneb(
+                        fmax=fmax * self.scale_fmax,
+                        ml_steps=ml_steps,
+                        max_unc=max_unc,
+                        unc_convergence=unc_convergence,
+                    )
+                    # Evaluate candidate
+                    self.evaluate(candidate)
+                    # Share the images between all CPUs
+                    self.share_images()
+                    # Print the results for this iteration
+                    self.print_statement(step)
+                    # Check convergence
+                    self.converging = self.check_convergence(
+                        fmax, unc_convergence, neb_converged
+                    )
+                    if self.converging:
+                        self.save_last_path(self.final_path, self.images)
+                        self.message_system("MLNEB is converged.")
+                        self.print_cite()
+                        break
+        finally:
+            # Write the remaining paths to the trajectories
+            self.close_path_writers()
+            # Close the local optimizers kept between the iterations
+            self.close_neb_sessions()
         if not self.converging:
             self.message_system("MLNEB did not converge!")
         return self
@@ -358,6 +422,7 @@ class MLNEB:
             self.end.copy(),
             n_images=self.n_images,
             method=interpolation,
+            cache=self.interpolation_cache,
             **self.interpolation_kwargs,
         )
         # Check interpolation has the right number of images
@@ -367,6 +432,44 @@ class MLNEB:
             )
         # Attach the ML calculator to all images
         images = self.attach_mlcalc(images)
+        # Reuse the cached predictions of the current ML model
+        images = self.set_path_predictions(images, predict=False)
+        return images
+
+    def set_path_predictions(self, images, predict=True, **kwargs):
+        """
+        Set the cached predictions of the current ML model on
+        the moving images.
+        The missing predictions are made with one prediction of
+        the ML model for all the images and cached if predict=True.
+
+        Parameters:
+            images : list of ASE Atoms and NEBImage instances
+                The images of the path with the ML calculator attached.
+            predict : bool
+                Whether to predict the images without cached predictions.
+
+        Returns:
+            list: The images with the predictions stored.
+        """
+        missing_images = []
+        for image in images[1:-1]:
+            key = (self.model_version, image.get_positions().tobytes())
+            if key in self.path_predictions:
+                image.store_results(self.path_predictions[key])
+            else:
+                missing_images.append(image)
+        if not predict or not len(missing_images):
+            return images
+        # Predict all the missing images at once
+        results_list = self.mlcalc.calculate_batch(
+            [image.atoms for image in missing_images],
+            properties=["energy", "forces", "uncertainty"],
+        )
+        for image, results in zip(missing_images, results_list):
+            image.store_results(results)
+            key = (self.model_version, image.get_positions().tobytes())
+            self.path_predictions[key] = results
         return images
 
     def make_reused_interpolation(
@@ -437,9 +540,10 @@ class MLNEB:
         images.append(copy_atoms(self.end))
         return images
 
-    def parallel_setup(self, save_memory=False, **kwargs):
+    def parallel_setup(self, save_memory=False, share_model=False, **kwargs):
         "Setup the parallelization."
         self.save_memory = save_memory
+        self.share_model = share_model
         self.rank = world.rank
         self.size = world.size
         return self
@@ -475,14 +579,34 @@ class MLNEB:
         self.mlcalc.add_training(atoms_list)
         return self.mlcalc
 
-    def train_mlmodel(self, **kwargs):
-        "Train the ML model"
+    def train_mlmodel(self, fmax=None, **kwargs):
+        """
+        Train the ML model.
+        The atoms with forces above fmax in the evaluated structures
+        are included in the active subspace if it is used.
+        """
         if self.save_memory and self.rank != 0:
             return self.mlcalc
-        # Update database with the points of interest
-        self.update_database_arguments(point_interest=self.last_images[1:-1])
-        # Train the ML model
-        self.mlcalc.train_model()
+        # Update the atoms used in the features on all the ranks
+        if self.active_subspace:
+            self.mlcalc.update_active_atoms(
+                atoms_list=self.last_images,
+                min_displacement=self.min_displacement,
+                min_force=fmax,
+            )
+        if not self.share_model or self.rank == 0:
+            # Update database with the points of interest
+            self.update_database_arguments(
+                point_interest=self.last_images[1:-1]
+            )
+            # Train the ML model
+            self.mlcalc.train_model()
+        # Share the trained ML model from rank 0 with the other ranks
+        if self.share_model and not self.save_memory:
+            self.mlcalc.broadcast_trained_state(root=0)
+        # The cached predictions are invalid for the retrained ML model
+        self.model_version += 1
+        self.path_predictions = {}
         return self.mlcalc
 
     def set_verbose(self, verbose, **kwargs):
@@ -596,6 +720,18 @@ class MLNEB:
             energies.append(image.get_potential_energy())
         return np.array(energies), np.array(uncertainties)
 
+    def get_band_predictions(self, neb, **kwargs):
+        """
+        Get the energies and uncertainties of the moving images that
+        are calculated in the force call of the NEB.
+        The uncertainties are only calculated if they are not stored.
+        """
+        energies = neb.get_energies()[1:-1].copy()
+        uncertainties = np.array(
+            [image.get_property("uncertainty") for image in neb.images[1:-1]]
+        )
+        return energies, uncertainties
+
     def get_path_unc_fmax(self, interpolation, climb=False, **kwargs):
         """
         Get the maximum uncertainty and fmax prediction from
@@ -604,6 +740,8 @@ class MLNEB:
         uncmax = None
         fmax = None
         images = self.make_interpolation(interpolation=interpolation)
+        # Predict all the images at once or use the cached predictions
+        images = self.set_path_predictions(images, predict=True)
         if self.check_path_unc:
             uncmax = np.nanmax(self.get_predictions(images)[1])
         if self.check_path_fmax:
@@ -627,7 +765,7 @@ class MLNEB:
         # Calculate the acquisition function for each image
         acq_values = self.acq.calculate(energy_path, unc_path)
         # Chose the maximum value given by the Acq. class
-        i_min = int(self.acq.choose(acq_values)[0])
+        i_min = int(self.acq.choose(acq_values, q=1)[0])
         # The next training point
         image = images[1 + i_min].copy()
         self.energy_pred = energy_path[i_min]
@@ -702,14 +840,12 @@ class MLNEB:
         **kwargs,
     ):
         "Run the MLNEB fully without consider the uncertainty."
-        # Construct the NEB
-        neb = self.neb_method(images, climb=climb, **self.neb_kwargs)
-        with self.local_opt(neb, **self.local_opt_kwargs) as neb_opt:
-            neb_opt.run(fmax=fmax, steps=ml_steps)
-            if self.reuse_ci_path or not climb:
-                self.last_images_tmp = [image.copy() for image in images]
-            # Check if the MLNEB is converged
-            converged = neb_opt.converged()
+        # Construct the NEB or reuse the NEB of the last iteration
+        neb, neb_opt = self.get_neb_session(images, climb=climb)
+        for converged in self.irun_neb_opt(neb_opt, fmax, ml_steps):
+            pass
+        if self.reuse_ci_path or not climb:
+            self.last_images_tmp = [image.copy() for image in images]
         return images, converged
 
     def mlneb_opt_max_unc(
@@ -723,64 +859,130 @@ class MLNEB:
         **kwargs,
     ):
         "Run the MLNEB, but stop it if the uncertainty becomes too large."
-        # Construct the NEB
-        neb = self.neb_method(images, climb=climb, **self.neb_kwargs)
-        with self.local_opt(neb, **self.local_opt_kwargs) as neb_opt:
-            for i in range(1, ml_steps + 1):
-                # Run the NEB on the surrogate surface
-                if ase.__version__ >= "3.23":
-                    neb_opt.run(fmax=fmax, steps=1)
-                else:
-                    neb_opt.run(fmax=fmax, steps=i)
-                # Calculate energy and uncertainty
-                energy_path, unc_path = self.get_predictions(images)
-                # Get the maximum uncertainty of the path
-                max_unc_path = np.max(unc_path)
-                # Check if the uncertainty is too large
-                if max_unc_path >= max_unc:
-                    self.message_system(
-                        "NEB on surrogate surface stopped due "
-                        "to high uncertainty."
-                    )
-                    break
-                # Check if there is a problem with prediction
-                if np.isnan(energy_path).any():
-                    images = self.make_interpolation(
-                        interpolation=self.last_images_tmp
-                    )
-                    for image in images:
-                        image.get_forces()
-                    self.message_system(
-                        "Warning: Stopped due to NaN value in prediction!"
-                    )
-                    break
-                # Make backup of images before the next NEB step,
-                # which can be used as a restart interpolation
-                if self.reuse_ci_path or not climb:
-                    if not self.check_path_unc or (
-                        max_unc_path <= unc_convergence
-                    ):
-                        self.last_images_tmp = [
-                            image.copy() for image in images
-                        ]
-
-                # Check if the NEB is converged on the predicted surface
-                if neb_opt.converged():
-                    break
-                # Check the number of steps
-                if neb_opt.get_number_of_steps() >= ml_steps:
-                    break
-            # Check if the MLNEB is converged
-            converged = neb_opt.converged()
+        # Construct the NEB or reuse the NEB of the last iteration
+        neb, neb_opt = self.get_neb_session(images, climb=climb)
+        converged = False
+        # Run the NEB on the surrogate surface one step at a time,
+        # where the first yield is before the first step
+        for step, converged in enumerate(
+            self.irun_neb_opt(neb_opt, fmax, ml_steps)
+        ):
+            # Get the energies and uncertainties calculated in the NEB
+            energy_path, unc_path = self.get_band_predictions(neb)
+            # Get the maximum uncertainty of the path
+            max_unc_path = np.max(unc_path)
+            # Check if the uncertainty is too large after at least one step
+            if step > 0 and max_unc_path >= max_unc:
+                self.message_system(
+                    "NEB on surrogate surface stopped due "
+                    "to high uncertainty."
+                )
+                break
+            # Check if there is a problem with prediction
+            if np.isnan(energy_path).any():
+                images = self.make_interpolation(
+                    interpolation=self.last_images_tmp
+                )
+                for image in images:
+                    image.get_forces()
+                # The optimizer state is not valid for the new path
+                self.close_neb_sessions(climb=climb)
+                self.message_system(
+                    "Warning: Stopped due to NaN value in prediction!"
+                )
+                break
+            # Make backup of images before the next NEB step,
+            # which can be used as a restart interpolation
+            if self.reuse_ci_path or not climb:
+                if not self.check_path_unc or (
+                    max_unc_path <= unc_convergence
+                ):
+                    self.last_images_tmp = [image.copy() for image in images]
         return images, converged
 
+    def get_neb_session(self, images, climb=False, **kwargs):
+        """
+        Get the NEB and its local optimizer for the images.
+        The NEB and the local optimizer of the last iteration with
+        the same climb are reused with the state of the optimizer
+        if warm_start=True and the images are at the positions where
+        the last NEB stopped.
+        Otherwise, a new NEB and local optimizer are made.
+
+        Parameters:
+            images : list of ASE Atoms and NEBImage instances
+                The images of the path with the ML calculator attached.
+            climb : bool
+                Whether to use climbing image in the NEB.
+
+        Returns:
+            NEB instance: The NEB of the images.
+            ASE optimizer instance: The local optimizer of the NEB.
+        """
+        if self.is_neb_session_reusable(images, climb=climb):
+            neb, neb_opt = self.neb_sessions[climb]
+            # Use the new images with the retrained ML calculator
+            neb.images = images
+            neb.make_band_state()
+            return neb, neb_opt
+        # Make a new NEB and local optimizer
+        self.close_neb_sessions(climb=climb)
+        neb = self.neb_method(images, climb=climb, **self.neb_kwargs)
+        neb_opt = self.local_opt(neb, **self.local_opt_kwargs)
+        self.neb_sessions[climb] = (neb, neb_opt)
+        return neb, neb_opt
+
+    def is_neb_session_reusable(self, images, climb=False, **kwargs):
+        """
+        Check if the NEB and the local optimizer of the last iteration
+        with the same climb can be used for the images.
+        """
+        from ase.optimize import FIRE, MDMin
+
+        if not self.warm_start or climb not in self.neb_sessions:
+            return False
+        neb, neb_opt = self.neb_sessions[climb]
+        # Only the state of the optimizers with velocities is kept
+        if not isinstance(neb_opt, (FIRE, MDMin)):
+            return False
+        if neb.nimages != len(images):
+            return False
+        # The images must be where the last NEB stopped
+        positions = np.array([image.get_positions() for image in images])
+        return np.allclose(positions, neb.positions, rtol=0.0)
+
+    def irun_neb_opt(self, neb_opt, fmax=0.05, steps=750, **kwargs):
+        """
+        Run the local optimizer of the NEB as a generator.
+        It yields whether the NEB is converged after each step,
+        where the energies, forces, and uncertainties of the images
+        are already calculated.
+        """
+        if self.get_ase_version() >= (3, 23):
+            return neb_opt.irun(fmax=fmax, steps=steps)
+        # The number of steps is the total number of steps in older ASE
+        return neb_opt.irun(fmax=fmax, steps=neb_opt.nsteps + steps)
+
+    def get_ase_version(self, **kwargs):
+        "Get the major and minor version of ASE as a tuple of integers."
+        version = re.match(r"(\d+)\.(\d+)", ase.__version__)
+        return tuple(int(v) for v in version.groups())
+
+    def close_neb_sessions(self, climb=None, **kwargs):
+        """
+        Close the local optimizers of the NEBs kept between
+        the iterations.
+        Only the NEB with the given climb is closed if it is not None.
+        """
+        for key in list(self.neb_sessions.keys()):
+            if climb is None or key == climb:
+                self.neb_sessions.pop(key)[1].close()
+        return self
+
     def save_mlneb(self, images, **kwargs):
         "Save the MLNEB result in the trajectory."
-        self.images = []
-        for image in images:
-            image = copy_atoms(image)
-            self.images.append(image)
-            self.trajectory_neb.write(image)
+        self.images = [copy_atoms(image) for image in images]
+        self.trajectory_neb.write(self.images)
         return self.images
 
     def share_images(self, **kwargs):
@@ -789,8 +991,9 @@ class MLNEB:
         return
 
     def save_data(self, **kwargs):
-        "Save the training data to trajectory file."
-        self.mlcalc.save_data(trajectory=self.trainingset)
+        "Save the new training data to trajectory file."
+        if isinstance(self.trainingset, str) and len(self.trainingset):
+            self.mlcalc.save_data(trajectory=self.trainingset)
         return
 
     def save_last_path(
@@ -800,13 +1003,36 @@ class MLNEB:
         properties=["energy", "forces", "uncertainty"],
         **kwargs,
     ):
-        "Save the final MLNEB path in the trajectory file."
+        """
+        Save the final MLNEB path in the trajectory file.
+        The trajectory is overwritten by the path and the writer of
+        the trajectory is reused, so the path can be written on
+        a background thread.
+        A new writer is made if the saved properties are changed.
+        """
         if self.rank == 0 and isinstance(trajname, str) and len(trajname):
-            with TrajectoryWriter(
-                trajname, mode="w", properties=properties
-            ) as trajectory_last:
-                for image in images:
-                    trajectory_last.write(copy_atoms(image))
+            path_writer = self.path_writers.get(trajname, None)
+            if path_writer is not None:
+                if path_writer.properties != properties:
+                    path_writer.close()
+                    path_writer = None
+            if path_writer is None:
+                path_writer = BufferedTrajectoryWriter(
+                    trajname,
+                    mode="w",
+                    properties=properties,
+                    use_thread=self.async_write,
+                    master=True,
+                )
+                self.path_writers[trajname] = path_writer
+            path_writer.write(images, overwrite=True)
+        return
+
+    def close_path_writers(self, **kwargs):
+        "Write the remaining paths and close the path trajectories."
+        for path_writer in self.path_writers.values():
+            path_writer.close()
+        self.path_writers = {}
         return
 
     def get_barrier(self, forward=True, **kwargs):
@@ -947,12 +1173,20 @@ class MLNEB:
                 fp=fp,
                 baseline=None,
                 use_derivatives=True,
-                parallel=(not save_memory),
+                parallel=(not (save_memory or self.share_model)),
                 database_reduction=False,
             )
             self.mlcalc = MLCalculator(mlmodel=mlmodel)
         else:
             self.mlcalc = mlcalc
+        # Only rank 0 trains the ML model if it is shared,
+        # so the other ranks can not join the MPI optimization
+        if self.share_model and self.mlcalc.mlmodel.is_parallel():
+            raise Exception(
+                "The hyperparameters can not be optimized in parallel "
+                "when share_model=True! Use an optimizer with "
+                "parallel=False."
+            )
         return self
 
     def set_acq(self, acq=None, **kwargs):
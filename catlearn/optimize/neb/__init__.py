@@ -4,6 +4,7 @@ from .ewneb import EWNEB
 from .avgewneb import AvgEWNEB
 from .maxewneb import MaxEWNEB
 from .nebimage import NEBImage
+from .interpolationneb import InterpolationNEB
 from .interpolate_band import interpolate, make_interpolation
 
 __all__ = [
@@ -13,6 +14,7 @@ __all__ = [
     "AvgEWNEB",
     "MaxEWNEB",
     "NEBImage",
+    "InterpolationNEB",
     "interpolate",
     "make_interpolation",
 ]
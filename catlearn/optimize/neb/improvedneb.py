@@ -29,35 +29,33 @@ class ImprovedTangentNEB(OriginalNEB):
         return forces_parallel
 
     def get_tangent(self, pos_p, pos_m, **kwargs):
-        tangent = np.empty((int(self.nimages - 2), self.natoms, 3))
         energies = self.get_energies()
-        for i in range(1, self.nimages - 1):
-            if energies[i + 1] > energies[i] and energies[i] > energies[i - 1]:
-                tangent[i - 1] = pos_p[i - 1]
-            elif (
-                energies[i + 1] < energies[i] and energies[i] < energies[i - 1]
-            ):
-                tangent[i - 1] = pos_m[i - 1]
-            elif energies[i + 1] > energies[i - 1]:
-                energy_dif = [
-                    abs(energies[i + 1] - energies[i]),
-                    abs(energies[i - 1] - energies[i]),
-                ]
-                tangent[i - 1] = (pos_p[i - 1] * max(energy_dif)) + (
-                    pos_m[i - 1] * min(energy_dif)
-                )
-            elif energies[i + 1] < energies[i - 1]:
-                energy_dif = [
-                    abs(energies[i + 1] - energies[i]),
-                    abs(energies[i - 1] - energies[i]),
-                ]
-                tangent[i - 1] = (pos_p[i - 1] * min(energy_dif)) + (
-                    pos_m[i - 1] * max(energy_dif)
-                )
-            else:
-                tangent[i - 1] = (
-                    pos_p[i - 1] / np.linalg.norm(pos_p[i - 1])
-                ) + (pos_m[i - 1] / np.linalg.norm(pos_m[i - 1]))
+        e_m = energies[:-2].reshape(-1, 1, 1)
+        e_i = energies[1:-1].reshape(-1, 1, 1)
+        e_p = energies[2:].reshape(-1, 1, 1)
+        # The energy differences to the later and previous images
+        de_max = np.maximum(np.abs(e_p - e_i), np.abs(e_m - e_i))
+        de_min = np.minimum(np.abs(e_p - e_i), np.abs(e_m - e_i))
+        # The tangent when the energies do not change
+        tangent_norm = (
+            pos_p / np.linalg.norm(pos_p, axis=(1, 2)).reshape(-1, 1, 1)
+        ) + (pos_m / np.linalg.norm(pos_m, axis=(1, 2)).reshape(-1, 1, 1))
+        # Choose the tangent of each image from the energies
+        tangent = np.select(
+            [
+                (e_p > e_i) & (e_i > e_m),
+                (e_p < e_i) & (e_i < e_m),
+                e_p > e_m,
+                e_p < e_m,
+            ],
+            [
+                pos_p,
+                pos_m,
+                (pos_p * de_max) + (pos_m * de_min),
+                (pos_p * de_min) + (pos_m * de_max),
+            ],
+            default=tangent_norm,
+        )
         tangent = tangent / np.linalg.norm(
             tangent,
             axis=(1, 2),
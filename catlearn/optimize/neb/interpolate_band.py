@@ -1,6 +1,20 @@
 import numpy as np
 from ase.optimize import FIRE
 
+# The maximum number of cached interpolations
+max_interpolation_cache = 20
+# The arguments of the optimizer of the in-memory band
+band_run_kwargs = (
+    "dt",
+    "maxstep",
+    "dtmax",
+    "Nmin",
+    "finc",
+    "fdec",
+    "astart",
+    "fa",
+)
+
 
 def interpolate(
     start,
@@ -94,9 +108,14 @@ def make_interpolation(
     n_images=15,
     method="linear",
     mic=True,
+    cache=None,
     **interpolation_kwargs,
 ):
-    "Make the NEB interpolation path."
+    """
+    Make the NEB interpolation path.
+    The optimized IDPP and repulsive interpolations are stored
+    in the cache dictionary if it is given.
+    """
     # Use a premade interpolation path
     if isinstance(method, (list, np.ndarray)):
         images = method.copy()
@@ -125,21 +144,69 @@ def make_interpolation(
                 mic=mic,
                 **interpolation_kwargs,
             )
-            if method.lower() == "idpp":
-                images = make_idpp_interpolation(
-                    images,
-                    mic=mic,
-                    **interpolation_kwargs,
-                )
-            elif method.lower() == "rep":
-                images = make_rep_interpolation(
+            if method.lower() in ["idpp", "rep"]:
+                # Use the cached interpolation if it is made before
+                key = get_interpolation_key(
                     images,
+                    method=method.lower(),
                     mic=mic,
                     **interpolation_kwargs,
                 )
+                if cache is not None and key in cache:
+                    for image, pos in zip(images, cache[key]):
+                        image.set_positions(pos)
+                    return images
+                if method.lower() == "idpp":
+                    images = make_idpp_interpolation(
+                        images,
+                        mic=mic,
+                        **interpolation_kwargs,
+                    )
+                else:
+                    images = make_rep_interpolation(
+                        images,
+                        mic=mic,
+                        **interpolation_kwargs,
+                    )
+                # Store the interpolation and remove the oldest one
+                if cache is not None:
+                    if len(cache) >= max_interpolation_cache:
+                        cache.pop(next(iter(cache)))
+                    cache[key] = np.array(
+                        [image.get_positions() for image in images]
+                    )
     return images
 
 
+def get_interpolation_key(images, method="idpp", mic=True, **kwargs):
+    """
+    Get the key of an interpolation in the cache from the end images,
+    the number of images, the method, and its arguments.
+    """
+    start, end = images[0], images[-1]
+    return (
+        method,
+        len(images),
+        bool(mic),
+        start.get_atomic_numbers().tobytes(),
+        start.get_positions().tobytes(),
+        end.get_positions().tobytes(),
+        np.array(start.get_cell()).tobytes(),
+        start.get_pbc().tobytes(),
+        repr(start.constraints),
+        repr(sorted(kwargs.items())),
+    )
+
+
+def check_band_kwargs(local_kwargs):
+    """
+    Check if the arguments can be used by the optimizer of
+    the in-memory band, which does not write a trajectory or log file.
+    The ASE FIRE optimizer is used instead if they can not be used.
+    """
+    return all(key in band_run_kwargs for key in local_kwargs)
+
+
 def make_linear_interpolation(images, mic=False, **kwargs):
     "Make the linear interpolation from initial to final state."
     from ase.geometry import find_mic
@@ -164,14 +231,32 @@ def make_idpp_interpolation(
     mic=False,
     fmax=1.0,
     steps=100,
-    local_opt=FIRE,
+    local_opt=None,
     local_kwargs={},
     **kwargs,
 ):
     """
     Make the IDPP interpolation from initial to final state
     from NEB optimization.
+    The band is optimized in memory with all the images evaluated at once
+    if local_opt=None. Otherwise, the ASE optimizer local_opt is used.
+    The ASE FIRE optimizer is used if local_opt=None and local_kwargs
+    has arguments that the in-memory band does not use
+    (e.g. trajectory and logfile).
     """
+    # Optimize the band in memory
+    if local_opt is None and not check_band_kwargs(local_kwargs):
+        local_opt = FIRE
+    if local_opt is None:
+        from .interpolationneb import InterpolationNEB
+
+        neb = InterpolationNEB(
+            [image.copy() for image in images],
+            method="idpp",
+            mic=mic,
+        )
+        neb.run(fmax=fmax, steps=steps, **local_kwargs)
+        return neb.get_images()
     from .improvedneb import ImprovedTangentNEB
     from ...regression.gp.baseline import IDPP
 
@@ -208,13 +293,32 @@ def make_rep_interpolation(
     mic=False,
     fmax=1.0,
     steps=100,
-    local_opt=FIRE,
+    local_opt=None,
     local_kwargs={},
     **kwargs,
 ):
     """
     Make a repulsive potential to get the interpolation from NEB optimization.
+    The band is optimized in memory with all the images evaluated at once
+    if local_opt=None. Otherwise, the ASE optimizer local_opt is used.
+    The ASE FIRE optimizer is used if local_opt=None and local_kwargs
+    has arguments that the in-memory band does not use
+    (e.g. trajectory and logfile).
     """
+    # Optimize the band in memory
+    if local_opt is None and not check_band_kwargs(local_kwargs):
+        local_opt = FIRE
+    if local_opt is None:
+        from .interpolationneb import InterpolationNEB
+
+        neb = InterpolationNEB(
+            [image.copy() for image in images],
+            method="rep",
+            mic=mic,
+            power=10,
+        )
+        neb.run(fmax=fmax, steps=steps, **local_kwargs)
+        return neb.get_images()
     from .improvedneb import ImprovedTangentNEB
     from ...regression.gp.baseline import RepulsionCalculator
 
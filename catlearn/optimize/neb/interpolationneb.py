@@ -0,0 +1,396 @@
+import numpy as np
+from ase.constraints import FixAtoms
+from ase.data import covalent_radii
+from ase.geometry import wrap_positions
+from .improvedneb import ImprovedTangentNEB
+from ...regression.gp.baseline.idpp import IDPP
+from ...regression.gp.fingerprint.geometry import (
+    get_periodicities,
+    mic_distance,
+)
+
+
+class InterpolationNEB(ImprovedTangentNEB):
+    def __init__(
+        self,
+        images,
+        method="idpp",
+        k=0.1,
+        mic=True,
+        power=10,
+        r_scale=0.7,
+        periodic_softmax=True,
+        eps=1e-16,
+        **kwargs
+    ):
+        """
+        An in-memory NEB band used for making the IDPP or the repulsive
+        interpolation between the start and end structure.
+        The energies and forces of all the images are evaluated at once
+        with vectorized pair distances, so no calculators are attached
+        to the images.
+        The band is optimized by its own FIRE minimizer without writing
+        any trajectory or log files.
+
+        Parameters:
+            images : List of ASE Atoms instances
+                The ASE Atoms instances used as the images of the initial path
+                that is optimized.
+            method : str
+                The pair potential used for the interpolation.
+                The optional methods is {idpp, rep}.
+            k : List of floats or float
+                The (Nimg-1) spring forces acting between each image.
+            mic : bool
+                Minimum Image Convention (Shortest distances when
+                periodic boundary conditions are used).
+            power : int
+                The power of the repulsion if method='rep'.
+            r_scale : float
+                The scaling of the covalent radii if method='rep'.
+            periodic_softmax : bool
+                Use a softmax weighting of the squared distances
+                when periodic boundary conditions are used
+                and method='rep'.
+            eps : float
+                Small number to avoid division by zero.
+
+        See:
+            Improved initial guess for minimum energy path calculations.
+            Søren Smidstrup, Andreas Pedersen, Kurt Stokbro and Hannes Jónsson
+            Chem. Phys. 140, 214106 (2014)
+        """
+        super().__init__(
+            images,
+            k=k,
+            climb=False,
+            remove_rotation_and_translation=False,
+            mic=True,
+            **kwargs
+        )
+        self.method = method.lower()
+        if self.method not in ["idpp", "rep"]:
+            raise Exception(
+                "The interpolation method {} is not implemented.".format(
+                    method
+                )
+            )
+        self.use_mic = mic
+        self.power = int(power)
+        self.r_scale = r_scale
+        self.periodic_softmax = periodic_softmax
+        self.eps = abs(float(eps))
+        self.cell = np.array(self.images[0].get_cell())
+        self.pbc = np.array(self.images[0].get_pbc())
+        # Make the pair indicies and the properties of the pair potential
+        self.make_pairs()
+        if self.method == "idpp":
+            self.make_idpp_targets()
+            # The IDPP of all the images is evaluated by the IDPP baseline
+            self.idpp = IDPP(mic=self.use_mic)
+
+    def make_pairs(self, **kwargs):
+        """
+        Make the unique pair indicies used in the pair potential and
+        find the atoms fixed by FixAtoms constraints.
+
+        Returns:
+            self: The instance itself.
+        """
+        atoms = self.images[0]
+        self.fixed = np.zeros(self.natoms, dtype=bool)
+        for constraint in atoms.constraints:
+            if isinstance(constraint, FixAtoms):
+                self.fixed[constraint.get_indices()] = True
+        pair_i, pair_j = np.triu_indices(self.natoms, k=1)
+        # The pairs between fixed atoms do not contribute to the repulsion
+        if self.method == "rep":
+            use_pairs = ~(self.fixed[pair_i] & self.fixed[pair_j])
+            pair_i = pair_i[use_pairs]
+            pair_j = pair_j[use_pairs]
+            covrad = covalent_radii[atoms.get_atomic_numbers()]
+            self.covrad = covrad[pair_i] + covrad[pair_j]
+            self.c0 = self.r_scale**self.power
+        self.pair_i = pair_i
+        self.pair_j = pair_j
+        return self
+
+    def make_idpp_targets(self, **kwargs):
+        """
+        Make the target distances of the IDPP for all the images as
+        the linear interpolation of the distances of the end images.
+
+        Returns:
+            self: The instance itself.
+        """
+        dist_ends, _ = self.get_pair_vectors(self.positions[[0, -1]])
+        fractions = np.linspace(0.0, 1.0, self.nimages).reshape(-1, 1)
+        self.target = dist_ends[0] + fractions * (dist_ends[1] - dist_ends[0])
+        return self
+
+    def update_band_state(self, **kwargs):
+        """
+        The positions of the band are only stored in the arrays,
+        since the images are only updated by get_images.
+
+        Returns:
+            self: The instance itself.
+        """
+        return self
+
+    def set_positions(self, positions, **kwargs):
+        """
+        Set the positions of all the moving images in one array.
+        The fixed atoms are kept at their positions.
+
+        Parameters:
+            positions : ((Nimg-2)*Natoms,3) array
+                Coordinates of all atoms in all the moving images.
+        """
+        self.reset()
+        positions = np.reshape(positions, (self.nimages - 2, self.natoms, 3))
+        moving = ~self.fixed
+        self.positions[1:-1, moving] = positions[:, moving]
+
+    def calculate_properties(self, **kwargs):
+        "Calculate the energy and forces for all the images at once."
+        # The end images are fixed
+        if self.end_energies is None:
+            self.end_energies = self.get_energies_forces(
+                self.positions[[0, -1]],
+                images=[0, self.nimages - 1],
+            )[0]
+        self.energies[0], self.energies[-1] = self.end_energies
+        energies, forces = self.get_energies_forces(
+            self.positions[1:-1],
+            images=np.arange(1, self.nimages - 1),
+        )
+        self.energies[1:-1] = energies
+        self.real_forces[1:-1] = forces
+        self.calculated = True
+        return self.energies, self.real_forces
+
+    def get_energies_forces(self, positions, images, **kwargs):
+        """
+        Get the energies and forces of the pair potential for the images.
+
+        Parameters:
+            positions : (N,Natoms,3) array
+                The positions of the N images.
+            images : (N) array
+                The indicies of the images in the band.
+
+        Returns:
+            (N) array: The energies of the images.
+            (N,Natoms,3) array: The forces of the images.
+        """
+        if self.method == "idpp":
+            energies, forces = self.idpp.get_energies_forces_band(
+                positions,
+                self.target[images],
+                cell=self.cell,
+                pbc=self.pbc,
+            )
+        else:
+            energies, pair_forces = self.get_rep_pair_forces(positions)
+            forces = self.sum_pair_forces(pair_forces)
+        # The forces on the fixed atoms are removed
+        forces[:, self.fixed] = 0.0
+        return energies, forces
+
+    def get_pair_vectors(self, positions, wrap=False, mic=None, **kwargs):
+        """
+        Get the distances and distance vectors of the unique pairs
+        for all the given images.
+
+        Parameters:
+            positions : (N,Natoms,3) array
+                The positions of the N images.
+            wrap : bool
+                Whether to wrap the atoms to the unit cell.
+            mic : bool or None
+                Whether to use the minimum image convention.
+                The mic of the instance is used if None.
+
+        Returns:
+            (N,Npairs) array: The pair distances.
+            (N,Npairs,3) array: The pair distance vectors.
+        """
+        if wrap and self.pbc.any():
+            positions = wrap_positions(
+                positions.reshape(-1, 3),
+                self.cell,
+                pbc=self.pbc,
+            ).reshape(positions.shape)
+        if mic is None:
+            mic = self.use_mic
+        dist_vec = positions[:, self.pair_j] - positions[:, self.pair_i]
+        if mic and self.pbc.any():
+            return mic_distance(dist_vec, self.cell, self.pbc, vector=True)
+        return np.linalg.norm(dist_vec, axis=-1), dist_vec
+
+    def get_rep_pair_forces(self, positions, **kwargs):
+        """
+        Get the repulsive energies and the forces on the second atom
+        of each pair.
+        """
+        if self.periodic_softmax and self.pbc.any():
+            # Get the distance vectors without the minimum image convention
+            _, dist_vec = self.get_pair_vectors(
+                positions,
+                wrap=True,
+                mic=False,
+            )
+            # Calculate the distances to the atoms in all unit cell
+            cells_p = get_periodicities(self.cell, self.pbc, remove0=False)
+            d = dist_vec[None, ...] + cells_p[:, None, None, :]
+            dnorm = np.linalg.norm(d, axis=-1) + self.eps
+            # Calculate the softmax weights of the inverse distances
+            dcov = dnorm / self.covrad
+            w = np.exp(-(dcov**2))
+            w = w / np.sum(w, axis=0)
+            finner = w / dcov
+            f = np.sum(finner, axis=0)
+            # Calculate the derivatives of the inverse distances
+            inner = (2.0 * (1.0 - (dcov * f))) / (self.covrad**2)
+            inner = inner + (1.0 / (dnorm**2))
+            g = np.sum(d * (finner * inner)[..., None], axis=0)
+        else:
+            dist, dist_vec = self.get_pair_vectors(positions, wrap=True)
+            dist = dist + self.eps
+            f = self.covrad / dist
+            g = dist_vec * (self.covrad / (dist**3))[..., None]
+        energies = self.c0 * np.sum(f**self.power, axis=-1)
+        # The derivatives are with respect to the first atom of each pair
+        c0p = self.c0 * self.power
+        return energies, (c0p * f ** (self.power - 1))[..., None] * g
+
+    def sum_pair_forces(self, pair_forces, **kwargs):
+        """
+        Sum the forces of the pairs on the atoms.
+        The forces on the first atom of each pair are opposite to
+        the forces on the second atom.
+
+        Parameters:
+            pair_forces : (N,Npairs,3) array
+                The forces on the second atom of each pair.
+
+        Returns:
+            (N,Natoms,3) array: The forces on the atoms.
+        """
+        n_images = len(pair_forces)
+        # Make the flattened indicies of the atoms in each image
+        shift = (self.natoms * np.arange(n_images)).reshape(-1, 1)
+        index_i = (self.pair_i + shift).reshape(-1)
+        index_j = (self.pair_j + shift).reshape(-1)
+        n_total = n_images * self.natoms
+        pair_forces = pair_forces.reshape(-1, 3)
+        forces = np.empty((n_total, 3))
+        for d in range(3):
+            forces[:, d] = np.bincount(
+                index_j,
+                weights=pair_forces[:, d],
+                minlength=n_total,
+            ) - np.bincount(
+                index_i,
+                weights=pair_forces[:, d],
+                minlength=n_total,
+            )
+        return forces.reshape(n_images, self.natoms, 3)
+
+    def run(
+        self,
+        fmax=1.0,
+        steps=100,
+        dt=0.1,
+        maxstep=0.2,
+        dtmax=1.0,
+        Nmin=5,
+        finc=1.1,
+        fdec=0.5,
+        astart=0.1,
+        fa=0.99,
+        **kwargs
+    ):
+        """
+        Optimize the band with the FIRE algorithm.
+        The default parameters are the same as in the ASE FIRE optimizer.
+
+        Parameters:
+            fmax : float
+                The convergence criterion of the maximum atomic NEB force.
+            steps : int
+                The maximum number of steps.
+            dt : float
+                The initial time step.
+            maxstep : float
+                The maximum distance a band can move in a step.
+            dtmax : float
+                The maximum time step.
+            Nmin : int
+                The number of steps before the time step is increased.
+            finc : float
+                The factor the time step is increased with.
+            fdec : float
+                The factor the time step is decreased with.
+            astart : float
+                The initial mixing parameter.
+            fa : float
+                The factor the mixing parameter is decreased with.
+
+        See:
+            Structural Relaxation Made Simple.
+            Erik Bitzek, Pekka Koskinen, Franz Gähler, Michael Moseler,
+            and Peter Gumbsch
+            Phys. Rev. Lett. 97, 170201 (2006)
+
+        Returns:
+            bool: Whether the band is converged.
+        """
+        a = astart
+        n_steps = 0
+        v = None
+        positions = self.get_positions()
+        for step in range(steps + 1):
+            forces = self.get_forces()
+            if self.converged(forces, fmax):
+                return True
+            if step == steps:
+                break
+            # Make the FIRE step
+            if v is None:
+                v = np.zeros_like(forces)
+            else:
+                vf = np.vdot(forces, v)
+                if vf > 0.0:
+                    v = (1.0 - a) * v + a * forces / np.sqrt(
+                        np.vdot(forces, forces)
+                    ) * np.sqrt(np.vdot(v, v))
+                    if n_steps > Nmin:
+                        dt = min(dt * finc, dtmax)
+                        a *= fa
+                    n_steps += 1
+                else:
+                    v[:] *= 0.0
+                    a = astart
+                    dt *= fdec
+                    n_steps = 0
+            v += dt * forces
+            dr = dt * v
+            normdr = np.sqrt(np.vdot(dr, dr))
+            if normdr > maxstep:
+                dr = maxstep * dr / normdr
+            positions = positions + dr
+            self.set_positions(positions)
+        return False
+
+    def get_images(self, **kwargs):
+        """
+        Get the images with the positions of the band.
+
+        Returns:
+            list: The ASE Atoms instances of the images.
+        """
+        for image, pos in zip(self.images[1:-1], self.positions[1:-1]):
+            image.set_positions(pos)
+        return self.images
@@ -1,4 +1,5 @@
-from ...regression.gp.calculator.copy_atoms import copy_atoms
+import numpy as np
+from ...regression.gp.calculator.copy_atoms import StoredDataCalculator
 
 
 class NEBImage:
@@ -7,6 +8,10 @@ class NEBImage:
         An image for NEB as a wrapper for the Atoms instance.
         The calculated results are stored within so multiple
         calculations can be avoided.
+        The results are stored in preallocated arrays without copying
+        the Atoms instance. A calculator with the stored results is
+        only made when the calculator of the image is requested
+        (e.g. when the image is written to a trajectory).
 
         Parameters:
             atoms : Atoms instance.
@@ -15,6 +20,21 @@ class NEBImage:
         self.atoms = atoms
         self.cell = self.atoms.cell
         self.pbc = self.atoms.pbc
+        # The stored results and the positions they are calculated for
+        self.results = {}
+        self.arrays = {}
+        self.positions_saved = np.empty((len(self.atoms), 3))
+
+    @property
+    def calc(self):
+        "A calculator with the stored results or None if none are stored."
+        if not len(self.results):
+            return None
+        return StoredDataCalculator(self.atoms, **self.results)
+
+    @calc.setter
+    def calc(self, calc):
+        self.atoms.calc = calc
         self.reset()
 
     def get_positions(self, *args, **kwargs):
@@ -38,12 +58,8 @@ class NEBImage:
         Returns:
             float or list: The requested property.
         """
-        if (self.atoms_saved.calc is not None) and (
-            name in self.atoms_saved.calc.results
-        ):
-            return self.atoms_saved.calc.get_property(
-                name, allow_calculation=True, **kwargs
-            )
+        if self.is_stored(name):
+            return self.get_stored(name)
         output = self.atoms.calc.get_property(
             name,
             atoms=self.atoms,
@@ -53,23 +69,43 @@ class NEBImage:
         self.store_results()
         return output
 
-    def get_potential_energy(self, *args, **kwargs):
-        if (self.atoms_saved.calc is not None) and (
-            "energy" in self.atoms_saved.calc.results
-        ):
-            return self.atoms_saved.get_potential_energy(*args, **kwargs)
-        energy = self.atoms.get_potential_energy(*args, **kwargs)
-        self.store_results()
+    def get_potential_energy(
+        self,
+        force_consistent=False,
+        apply_constraint=True,
+        **kwargs
+    ):
+        name = "free_energy" if force_consistent else "energy"
+        if not self.is_stored(name):
+            energy = self.atoms.get_potential_energy(
+                force_consistent=force_consistent,
+                apply_constraint=apply_constraint,
+                **kwargs
+            )
+            self.store_results()
+            return energy
+        energy = self.get_stored(name)
+        # Adjust the energy with the constraints as in the Atoms instance
+        if apply_constraint:
+            for constraint in self.atoms.constraints:
+                if hasattr(constraint, "adjust_potential_energy"):
+                    energy += constraint.adjust_potential_energy(self.atoms)
         return energy
 
-    def get_forces(self, *args, **kwargs):
-        if (self.atoms_saved.calc is not None) and (
-            "force" in self.atoms_saved.calc.results
-        ):
-            return self.atoms_saved.get_forces(*args, **kwargs)
-        force = self.atoms.get_forces(*args, **kwargs)
-        self.store_results()
-        return force
+    def get_forces(self, apply_constraint=True, **kwargs):
+        if not self.is_stored("forces"):
+            forces = self.atoms.get_forces(
+                apply_constraint=apply_constraint,
+                **kwargs
+            )
+            self.store_results()
+            return forces
+        forces = self.get_stored("forces")
+        # Adjust the forces with the constraints as in the Atoms instance
+        if apply_constraint:
+            for constraint in self.atoms.constraints:
+                constraint.adjust_forces(self.atoms, forces)
+        return forces
 
     def get_atomic_numbers(self):
         return self.atoms.get_atomic_numbers()
@@ -80,20 +116,58 @@ class NEBImage:
     def get_tags(self):
         return self.atoms.get_tags()
 
-    def store_results(self, **kwargs):
+    def is_stored(self, name, **kwargs):
         """
-        Store the calculated results.
+        Check if the property is stored for the current positions.
+        """
+        if name not in self.results:
+            return False
+        # Check that the positions have not been changed in the Atoms
+        if not np.array_equal(self.positions_saved, self.atoms.positions):
+            self.reset()
+            return False
+        return True
+
+    def get_stored(self, name, **kwargs):
+        "Get a copy of the stored property."
+        result = self.results[name]
+        if isinstance(result, np.ndarray):
+            return result.copy()
+        return result
+
+    def store_results(self, results=None, **kwargs):
+        """
+        Store the calculated results in the preallocated arrays.
+
+        Parameters:
+            results : dict or None
+                The results calculated for the current positions.
+                The results of the calculator are used if None.
         """
-        self.atoms_saved = copy_atoms(self.atoms)
-        self.calc = self.atoms_saved.calc
-        return self.atoms_saved
+        if results is None:
+            results = self.atoms.calc.results
+        np.copyto(self.positions_saved, self.atoms.positions)
+        for name, value in results.items():
+            if value is None:
+                continue
+            if isinstance(value, (float, int)):
+                self.results[name] = value
+                continue
+            value = np.asarray(value, dtype=float)
+            # Reuse the preallocated array if possible
+            array = self.arrays.get(name, None)
+            if array is None or array.shape != value.shape:
+                array = np.empty(value.shape)
+                self.arrays[name] = array
+            np.copyto(array, value)
+            self.results[name] = array
+        return self.results
 
     def reset(self, **kwargs):
         """
         Reset the stored properties.
         """
-        self.atoms_saved = self.atoms.copy()
-        self.calc = None
+        self.results = {}
         return self
 
     def __len__(self):
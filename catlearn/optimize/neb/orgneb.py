@@ -44,7 +44,8 @@ class OriginalNEB:
         self.climb = climb
         self.rm_rot_trans = remove_rotation_and_translation
         self.mic = mic
-        self.reset()
+        # Make the band state arrays of all the images
+        self.make_band_state()
 
     def interpolate(self, method="linear", mic=True, **kwargs):
         """
@@ -71,6 +72,50 @@ class OriginalNEB:
             remove_rotation_and_translation=self.rm_rot_trans,
             **kwargs
         )
+        self.make_band_state()
+        return self
+
+    def make_band_state(self, **kwargs):
+        """
+        Make the arrays that hold the positions, energies, and forces
+        of all the images in the band.
+
+        Returns:
+            self: The instance itself.
+        """
+        self.positions = np.array(
+            [image.get_positions() for image in self.images]
+        )
+        self.energies = np.zeros((self.nimages))
+        self.real_forces = np.zeros((self.nimages, self.natoms, 3))
+        # The energies of the fixed end images are only calculated once
+        self.end_energies = None
+        self.reset()
+        return self
+
+    def update_band_state(self, **kwargs):
+        """
+        Update the positions of the band from the images if they are
+        changed outside the band (e.g. in the ASE Atoms of an image).
+        The band state is only changed by set_positions, set_calculator,
+        and interpolate, so this method must be called after
+        the ASE Atoms of the images are changed directly.
+        The stored properties are reset if the positions are changed.
+
+        Returns:
+            self: The instance itself.
+        """
+        changed = False
+        for i, image in enumerate(self.images):
+            positions = image.get_positions()
+            if not np.array_equal(self.positions[i], positions):
+                self.positions[i] = positions
+                changed = True
+                # The energies of the end images must be calculated again
+                if i == 0 or i == self.nimages - 1:
+                    self.end_energies = None
+        if changed:
+            self.reset()
         return self
 
     def get_positions(self):
@@ -81,9 +126,7 @@ class OriginalNEB:
             ((Nimg-2)*Natoms,3) array: Coordinates of all atoms in
                 all the moving images.
         """
-        return np.array(
-            [image.get_positions() for image in self.images[1:-1]]
-        ).reshape(-1, 3)
+        return self.positions[1:-1].reshape(-1, 3).copy()
 
     def set_positions(self, positions, **kwargs):
         """
@@ -94,11 +137,14 @@ class OriginalNEB:
                 Coordinates of all atoms in all the moving images.
         """
         self.reset()
-        for i, image in enumerate(self.images[1:-1]):
-            image.set_positions(
-                positions[i * self.natoms : (i + 1) * self.natoms]
-            )
-        pass
+        self.positions[1:-1] = np.reshape(
+            positions,
+            (self.nimages - 2, self.natoms, 3),
+        )
+        for image, pos in zip(self.images[1:-1], self.positions[1:-1]):
+            image.set_positions(pos)
+            # The constraints can change the positions
+            pos[:] = image.get_positions()
 
     def get_potential_energy(self, **kwargs):
         """
@@ -124,6 +170,9 @@ class OriginalNEB:
                     self.images[i - 1],
                     self.images[i],
                 )
+            self.positions[1:] = [
+                image.get_positions() for image in self.images[1:]
+            ]
         # Get the forces for each image
         forces = self.calculate_forces()
         # Get change in the coordinates to the previous and later image
@@ -148,6 +197,16 @@ class OriginalNEB:
             )
         return forces_new.reshape(-1, 3)
 
+    def get_parallel_projection(self, vectors, tangent, **kwargs):
+        """
+        Get the projection of the vectors of the moving images
+        on their tangents.
+
+        Returns:
+            (Nimg-2) array: The projection for each moving image.
+        """
+        return np.einsum("ijk,ijk->i", vectors, tangent)
+
     def get_image_positions(self):
         """
         Get the positions of the images.
@@ -156,28 +215,33 @@ class OriginalNEB:
             ((Nimg),Natoms,3) array: The positions for all atoms in
                 all the images.
         """
-        return np.array([image.get_positions() for image in self.images])
+        return self.positions.copy()
 
     def calculate_forces(self, **kwargs):
         "Calculate the forces for all the images separately."
-        if self.real_forces is None:
+        if not self.calculated:
             self.calculate_properties()
         return self.real_forces[1:-1].copy()
 
     def get_energies(self, **kwargs):
         "Get the individual energy for each image."
-        if self.energies is None:
+        if not self.calculated:
             self.calculate_properties()
         return self.energies
 
     def calculate_properties(self, **kwargs):
         "Calculate the energy and forces for each image."
-        self.real_forces = np.zeros((self.nimages, self.natoms, 3))
-        self.energies = np.zeros((self.nimages))
-        for i, image in enumerate(self.images):
-            if (not i == 0) or (not i == self.nimages - 1):
-                self.real_forces[i] = image.get_forces().copy()
+        # The end images are fixed
+        if self.end_energies is None:
+            self.end_energies = (
+                self.images[0].get_potential_energy(),
+                self.images[-1].get_potential_energy(),
+            )
+        self.energies[0], self.energies[-1] = self.end_energies
+        for i, image in enumerate(self.images[1:-1], start=1):
+            self.real_forces[i] = image.get_forces()
             self.energies[i] = image.get_potential_energy()
+        self.calculated = True
         return self.energies, self.real_forces
 
     def emax(self, **kwargs):
@@ -186,14 +250,10 @@ class OriginalNEB:
 
     def get_parallel_forces(self, tangent, pos_p, pos_m, **kwargs):
         "Get the parallel forces between the images."
-        forces_parallel = np.array(
-            [
-                np.vdot(
-                    (self.k[i + 1] * pos_p[i]) - (self.k[i] * pos_m[i]),
-                    tangent[i],
-                )
-                for i in range(len(tangent))
-            ]
+        forces_parallel = self.get_parallel_projection(
+            (self.k[1:, None, None] * pos_p)
+            - (self.k[:-1, None, None] * pos_m),
+            tangent,
         )
         forces_parallel = forces_parallel.reshape(-1, 1, 1) * tangent
         return forces_parallel
@@ -201,7 +261,8 @@ class OriginalNEB:
     def get_perpendicular_forces(self, tangent, forces, **kwargs):
         "Get the perpendicular forces to the images."
         return forces - (
-            np.sum(forces * tangent, axis=(1, 2)).reshape(-1, 1, 1) * tangent
+            self.get_parallel_projection(forces, tangent).reshape(-1, 1, 1)
+            * tangent
         )
 
     def get_position_diff(self):
@@ -209,7 +270,7 @@ class OriginalNEB:
         Get the change in the coordinates relative to
         the previous and later image.
         """
-        positions = self.get_image_positions()
+        positions = self.positions
         position_diff = positions[1:] - positions[:-1]
         pbc = np.array(self.images[0].get_pbc())
         if self.mic and pbc.any():
@@ -241,8 +302,7 @@ class OriginalNEB:
 
     def reset(self):
         "Reset the stored properties."
-        self.energies = None
-        self.real_forces = None
+        self.calculated = False
         return self
 
     def get_residual(self, **kwargs):
@@ -270,6 +330,9 @@ class OriginalNEB:
         else:
             for image in self.images[1:-1]:
                 image.calc = calculators
+        # The stored properties are from the old calculators
+        self.end_energies = None
+        self.reset()
         return self
 
     def converged(self, forces, fmax):
@@ -0,0 +1,174 @@
+import queue
+import threading
+from ase.io.trajectory import TrajectoryWriter
+from ase.parallel import world
+from ..regression.gp.calculator.copy_atoms import copy_atoms
+
+
+class BufferedTrajectoryWriter:
+    def __init__(
+        self,
+        filename,
+        mode="w",
+        properties=None,
+        use_thread=True,
+        master=None,
+        **kwargs,
+    ):
+        """
+        Buffered writer of ASE trajectories, where the ASE Atoms are
+        copied and written in groups (e.g. all the images of a path).
+        The groups are appended to the same open trajectory, so the
+        trajectory is not read or written again for each group.
+        The groups can be written on a background thread,
+        so the optimization does not wait for the file system.
+
+        Parameters:
+            filename : str or None
+                The name of the trajectory file.
+                Nothing is written if filename=None.
+            mode : str
+                Whether the trajectory is written ('w') or
+                appended to ('a') by the first group.
+            properties : list of str or None
+                The calculator properties that are saved in
+                the trajectory. All the properties are saved if None.
+            use_thread : bool
+                Whether to write the groups on a background thread.
+            master : bool or None
+                Whether this process writes the trajectory.
+                The process with rank 0 writes if None.
+        """
+        if mode not in ["w", "a"]:
+            raise Exception("The mode must be 'w' or 'a'!")
+        self.filename = filename
+        self.mode = mode
+        self.properties = properties
+        self.use_thread = use_thread
+        if master is None:
+            master = world.rank == 0
+        # Only the master process writes the trajectory if it is given
+        self.master = master and filename is not None
+        # The trajectory is opened when the first group is written
+        self.trajectory = None
+        self.error = None
+        # Start the background thread that writes the groups
+        self.queue = None
+        self.thread = None
+        if self.use_thread and self.master:
+            self.queue = queue.Queue()
+            self.thread = threading.Thread(
+                target=self.run_thread,
+                daemon=True,
+            )
+            self.thread.start()
+
+    def write(self, atoms_list, overwrite=False, **kwargs):
+        """
+        Write a group of ASE Atoms to the trajectory.
+        The ASE Atoms are copied with their calculated properties
+        before they are written.
+
+        Parameters:
+            atoms_list : list of ASE Atoms or ASE Atoms
+                The ASE Atoms objects that are written.
+            overwrite : bool
+                Whether the trajectory is overwritten by the group
+                (e.g. the last path) instead of appended to.
+
+        Returns:
+            self: The object itself.
+        """
+        if not self.master:
+            return self
+        self.check_error()
+        if not isinstance(atoms_list, (list, tuple)):
+            atoms_list = [atoms_list]
+        atoms_list = [copy_atoms(atoms) for atoms in atoms_list]
+        if self.thread is None:
+            self.write_group(atoms_list, overwrite=overwrite)
+        else:
+            self.queue.put((atoms_list, overwrite))
+        return self
+
+    def write_group(self, atoms_list, overwrite=False, **kwargs):
+        "Write the group of copied ASE Atoms to the trajectory."
+        # Open the trajectory again if it is overwritten
+        if overwrite and self.trajectory is not None:
+            self.trajectory.close()
+            self.trajectory = None
+        if self.trajectory is None:
+            mode = "w" if overwrite else self.mode
+            self.trajectory = TrajectoryWriter(
+                self.filename,
+                mode=mode,
+                properties=self.properties,
+                master=True,
+            )
+            # The following groups are appended to the trajectory
+            self.mode = "a"
+        for atoms in atoms_list:
+            self.trajectory.write(atoms)
+        return self
+
+    def run_thread(self, **kwargs):
+        "Write the groups in the queue on the background thread."
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                if self.error is None:
+                    self.write_group(item[0], overwrite=item[1])
+            except Exception as error:
+                self.error = error
+            finally:
+                self.queue.task_done()
+
+    def flush(self, **kwargs):
+        """
+        Wait until all the groups are written to the trajectory.
+
+        Returns:
+            self: The object itself.
+        """
+        if self.thread is not None:
+            self.queue.join()
+        self.check_error()
+        return self
+
+    def close(self, **kwargs):
+        """
+        Write the remaining groups, stop the background thread,
+        and close the trajectory.
+
+        Returns:
+            self: The object itself.
+        """
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        if self.trajectory is not None:
+            self.trajectory.close()
+            self.trajectory = None
+        self.check_error()
+        return self
+
+    def check_error(self, **kwargs):
+        "Raise the error if the writing of a group failed."
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise Exception(
+                "The trajectory {} could not be written!".format(
+                    self.filename
+                )
+            ) from error
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
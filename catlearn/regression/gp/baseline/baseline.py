@@ -72,6 +72,107 @@ class BaselineCalculator(Calculator):
             return 0.0, np.zeros((len(atoms), 3))
         return 0.0
 
+    def get_energy_forces_batch(
+        self,
+        atoms_list,
+        get_derivatives=True,
+        **kwargs,
+    ):
+        """
+        Get the energies and forces of many ASE Atoms.
+        The ASE Atoms with the same atoms, constraints, and cell are
+        evaluated together as one group.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects that are evaluated.
+            get_derivatives : bool
+                Whether to calculate the forces.
+
+        Returns:
+            (N) array: The energies of the ASE Atoms.
+            list of (Natoms,3) arrays: The forces of the ASE Atoms
+                if get_derivatives=True.
+        """
+        energies = np.empty(len(atoms_list))
+        forces = [None] * len(atoms_list)
+        for indicies in self.get_groups(atoms_list).values():
+            output = self.get_energies_forces_group(
+                [atoms_list[i] for i in indicies],
+                get_derivatives=get_derivatives,
+                **kwargs,
+            )
+            if get_derivatives:
+                energies[indicies] = output[0]
+                for i, forces_i in zip(indicies, output[1]):
+                    forces[i] = forces_i
+            else:
+                energies[indicies] = output
+        if get_derivatives:
+            return energies, forces
+        return energies
+
+    def get_energies_forces_group(
+        self,
+        atoms_list,
+        get_derivatives=True,
+        **kwargs,
+    ):
+        """
+        Get the energies and forces of a group of ASE Atoms with
+        the same atoms, constraints, and cell.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects in the group.
+            get_derivatives : bool
+                Whether to calculate the forces.
+
+        Returns:
+            (N) array: The energies of the ASE Atoms.
+            (N,Natoms,3) array: The forces of the ASE Atoms
+                if get_derivatives=True.
+        """
+        # Evaluate each ASE Atoms if the group is not vectorized
+        output = [
+            self.get_energy_forces(atoms, get_derivatives=get_derivatives)
+            for atoms in atoms_list
+        ]
+        if get_derivatives:
+            energies, forces = zip(*output)
+            return np.array(energies), np.array(forces)
+        return np.array(output)
+
+    def get_groups(self, atoms_list, **kwargs):
+        """
+        Group the ASE Atoms with the same atoms, constraints, and cell.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects that are grouped.
+
+        Returns:
+            dict: The indicies of the ASE Atoms in each group.
+        """
+        groups = {}
+        for i, atoms in enumerate(atoms_list):
+            key = self.get_group_key(atoms)
+            if key in groups:
+                groups[key].append(i)
+            else:
+                groups[key] = [i]
+        return groups
+
+    def get_group_key(self, atoms, **kwargs):
+        "Get the key of the group that the ASE Atoms belongs to."
+        not_masked, _ = self.get_constraints(atoms)
+        return (
+            atoms.get_atomic_numbers().tobytes(),
+            tuple(not_masked),
+            np.array(atoms.cell, dtype=float).tobytes(),
+            np.array(atoms.pbc, dtype=bool).tobytes(),
+        )
+
     def get_constraints(self, atoms, **kwargs):
         """
         Get the indicies of the atoms that does not have fixed constraints.
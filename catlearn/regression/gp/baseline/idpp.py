@@ -1,6 +1,6 @@
 import numpy as np
 from .baseline import BaselineCalculator
-from ..fingerprint.geometry import get_full_distance_matrix
+from ..fingerprint.geometry import mic_distance
 
 
 class IDPP(BaselineCalculator):
@@ -14,10 +14,15 @@ class IDPP(BaselineCalculator):
         """
         A baseline calculator for ASE atoms object.
         It uses image dependent pair potential.
+        Only the unique atom pairs are used and the work arrays of
+        the pairs are preallocated and reused between the calculations.
 
         Parameters:
             target: array
                 The target distances for the IDPP.
+                It can be the full (Natoms,Natoms) distance matrix or
+                the distances of the unique pairs in the same order as
+                the upper triangle of the distance matrix.
             mic : bool
                 Minimum Image Convention (Shortest distances
                 when periodic boundary conditions are used).
@@ -28,6 +33,9 @@ class IDPP(BaselineCalculator):
             Chem. Phys. 140, 214106 (2014)
         """
         super().__init__()
+        # The pair indicies and work arrays are made for the number of atoms
+        self.n_atoms = None
+        self.n_images = None
         self.update_arguments(
             target=target,
             mic=mic,
@@ -47,6 +55,9 @@ class IDPP(BaselineCalculator):
         Parameters:
             target: array
                 The target distances for the IDPP.
+                It can be the full (Natoms,Natoms) distance matrix or
+                the distances of the unique pairs in the same order as
+                the upper triangle of the distance matrix.
             mic : bool
                 Minimum Image Convention (Shortest distances
                 when periodic boundary conditions are used).
@@ -55,39 +66,206 @@ class IDPP(BaselineCalculator):
             self: The updated object itself.
         """
         if target is not None:
-            self.target = target.copy()
+            self.target = np.array(target, dtype=float)
+            self.target_pairs = None
         if mic is not None:
             self.mic = mic
         return self
 
     def get_energy_forces(self, atoms, get_derivatives=True, **kwargs):
         "Get the energy and forces."
-        # Get all distances
-        dis, dis_vec = get_full_distance_matrix(
-            atoms,
-            not_masked=None,
-            mic=self.mic,
-            vector=get_derivatives,
-            wrap=False,
+        output = self.get_energies_forces_group(
+            [atoms],
+            get_derivatives=get_derivatives,
         )
-        # Get the number of atoms
-        n_atoms = len(atoms)
-        # Get weights without division by zero
-        dis_non = dis.copy()
-        dis_non[range(n_atoms), range(n_atoms)] = 1.0
-        weights = 1.0 / (dis_non**4)
-        # Calculate the energy
-        dis_t = dis - self.target
-        dis_t2 = dis_t**2
-        e = 0.5 * np.sum(weights * dis_t2)
         if get_derivatives:
-            # Calculate the forces
-            finner = 2.0 * (weights / dis_non) * dis_t2
-            finner -= weights * dis_t
-            finner = finner / dis_non
-            f = np.sum(dis_vec * finner[:, :, None], axis=0)
-            return e, f
-        return e
+            return output[0][0], output[1][0]
+        return output[0]
+
+    def get_energies_forces_group(
+        self,
+        atoms_list,
+        get_derivatives=True,
+        **kwargs,
+    ):
+        """
+        Get the energies and forces of a group of ASE Atoms with
+        the same number of atoms and cell.
+        All the ASE Atoms are evaluated at once as a band.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects in the group.
+            get_derivatives : bool
+                Whether to calculate the forces.
+
+        Returns:
+            (N) array: The energies of the ASE Atoms.
+            (N,Natoms,3) array: The forces of the ASE Atoms
+                if get_derivatives=True.
+        """
+        atoms = atoms_list[0]
+        # Make the unique pairs if the number of atoms is changed
+        if self.n_atoms != len(atoms) or self.target_pairs is None:
+            self.make_pairs(len(atoms))
+            self.target_pairs = self.get_target_pairs(self.target)
+        positions = np.array([atoms.get_positions() for atoms in atoms_list])
+        targets = np.tile(self.target_pairs, (len(atoms_list), 1))
+        return self.get_energies_forces_band(
+            positions,
+            targets,
+            cell=np.array(atoms.cell),
+            pbc=atoms.pbc,
+            get_derivatives=get_derivatives,
+        )
+
+    def get_group_key(self, atoms, **kwargs):
+        "Get the key of the group that the ASE Atoms belongs to."
+        # The IDPP only depends on the number of atoms and the cell
+        return (
+            len(atoms),
+            np.array(atoms.cell, dtype=float).tobytes(),
+            np.array(atoms.pbc, dtype=bool).tobytes(),
+        )
+
+    def get_energies_forces_band(
+        self,
+        positions,
+        targets,
+        cell=None,
+        pbc=None,
+        get_derivatives=True,
+        **kwargs,
+    ):
+        """
+        Get the energies and forces of the IDPP for all the images of
+        a band at once.
+
+        Parameters:
+            positions : (N,Natoms,3) array
+                The positions of the N images.
+            targets : (N,Npairs) array
+                The target distances of the unique pairs of each image
+                in the same order as the upper triangle of
+                the distance matrix.
+            cell : (3,3) array
+                The cell vectors used with the minimum image convention.
+            pbc : (3) array
+                The periodic boundary conditions used with
+                the minimum image convention.
+            get_derivatives : bool
+                Whether to calculate the forces.
+
+        Returns:
+            (N) array: The energies of the images.
+            (N,Natoms,3) array: The forces of the images
+                if get_derivatives=True.
+        """
+        n_images, n_atoms, _ = np.shape(positions)
+        if self.n_atoms != n_atoms:
+            self.make_pairs(n_atoms)
+        if self.n_images != n_images:
+            self.make_work_arrays(n_images)
+        # Get the distance vectors of the unique pairs
+        dist_vec = self.dist_vec
+        np.take(positions, self.pair_j, axis=1, out=dist_vec)
+        dist_vec -= np.take(positions, self.pair_i, axis=1, out=self.pos_i)
+        # Get the distances with the minimum image convention if requested
+        dist = self.dist
+        if self.mic and pbc is not None and np.any(pbc):
+            dist[:], dist_vec = mic_distance(dist_vec, cell, pbc, vector=True)
+        else:
+            np.einsum("npk,npk->np", dist_vec, dist_vec, out=dist)
+            np.sqrt(dist, out=dist)
+        # Get the weights and the deviation from the target distances
+        weights = self.weights
+        np.square(dist, out=weights)
+        np.square(weights, out=weights)
+        np.reciprocal(weights, out=weights)
+        dist_t = self.dist_t
+        np.subtract(dist, targets, out=dist_t)
+        # Calculate the energies
+        energies = np.einsum("np,np,np->n", weights, dist_t, dist_t)
+        if not get_derivatives:
+            return energies
+        # Calculate the forces on the second atom of each pair
+        finner = self.finner
+        np.divide(dist_t, dist, out=dist_t)
+        np.multiply(dist_t, 2.0, out=finner)
+        finner -= 1.0
+        finner *= dist_t
+        finner *= weights
+        dist_vec *= finner[..., None]
+        return energies, self.sum_pair_forces(dist_vec)
+
+    def make_pairs(self, n_atoms, **kwargs):
+        """
+        Make the unique pair indicies in the same order as
+        the upper triangle of the distance matrix.
+
+        Returns:
+            self: The updated object itself.
+        """
+        self.n_atoms = n_atoms
+        self.pair_i, self.pair_j = np.triu_indices(n_atoms, k=1)
+        # The work arrays must be made for the new pairs
+        self.n_images = None
+        return self
+
+    def make_work_arrays(self, n_images, **kwargs):
+        """
+        Preallocate the work arrays of the pairs for a number of images.
+
+        Returns:
+            self: The updated object itself.
+        """
+        self.n_images = n_images
+        n_pairs = len(self.pair_i)
+        self.dist_vec = np.empty((n_images, n_pairs, 3))
+        self.pos_i = np.empty((n_images, n_pairs, 3))
+        self.dist = np.empty((n_images, n_pairs))
+        self.weights = np.empty((n_images, n_pairs))
+        self.dist_t = np.empty((n_images, n_pairs))
+        self.finner = np.empty((n_images, n_pairs))
+        # Make the flattened indicies of the atoms in each image
+        shift = (self.n_atoms * np.arange(n_images)).reshape(-1, 1)
+        self.index_i = (self.pair_i + shift).reshape(-1)
+        self.index_j = (self.pair_j + shift).reshape(-1)
+        return self
+
+    def get_target_pairs(self, target, **kwargs):
+        "Get the target distances of the unique pairs."
+        if target.ndim == 2 and target.shape == (self.n_atoms, self.n_atoms):
+            return target[self.pair_i, self.pair_j]
+        return target.reshape(-1)
+
+    def sum_pair_forces(self, pair_forces, **kwargs):
+        """
+        Sum the forces of the pairs on the atoms.
+        The forces on the first atom of each pair are opposite to
+        the forces on the second atom.
+
+        Parameters:
+            pair_forces : (N,Npairs,3) array
+                The forces on the second atom of each pair.
+
+        Returns:
+            (N,Natoms,3) array: The forces on the atoms.
+        """
+        n_total = self.n_images * self.n_atoms
+        pair_forces = pair_forces.reshape(-1, 3)
+        forces = np.empty((n_total, 3))
+        for d in range(3):
+            forces[:, d] = np.bincount(
+                self.index_j,
+                weights=pair_forces[:, d],
+                minlength=n_total,
+            ) - np.bincount(
+                self.index_i,
+                weights=pair_forces[:, d],
+                minlength=n_total,
+            )
+        return forces.reshape(self.n_images, self.n_atoms, 3)
 
     def get_arguments(self):
         "Get the arguments of the class itself."
@@ -140,35 +140,34 @@ class MieCalculator(RepulsionCalculator):
         self.r_scale_a = c0 * (self.r_scale**self.power_a)
         return self
 
-    def get_energy_forces(self, atoms, get_derivatives=True, **kwargs):
-        "Get the energy and forces."
-        # Get the not fixed (not masked) atom indicies
-        not_masked, masked = self.get_constraints(atoms)
-        not_masked = np.array(not_masked, dtype=int)
-        masked = np.array(masked, dtype=int)
-        # Get the inverse distances
-        f, g = self.get_inv_distances(
-            atoms,
-            not_masked,
-            masked,
-            get_derivatives,
-            **kwargs,
-        )
-        # Calculate energy
-        energy = (self.r_scale_r * np.sum(f**self.power_r)) - (
-            self.r_scale_a * np.sum(f**self.power_a)
+    def get_pair_energies(self, f, get_derivatives=True, **kwargs):
+        """
+        Get the energies from the inverse distances and
+        the negative derivatives of the energies wrt.
+        the inverse distances.
+
+        Parameters:
+            f : (N,Npairs) array
+                The inverse distances scaled with the covalent radii.
+            get_derivatives : bool
+                Whether to calculate the derivatives.
+
+        Returns:
+            (N) array: The energies.
+            (N,Npairs) array: The negative derivatives
+                if get_derivatives=True.
+        """
+        energies = (self.r_scale_r * np.sum(f**self.power_r, axis=-1)) - (
+            self.r_scale_a * np.sum(f**self.power_a, axis=-1)
         )
         if get_derivatives:
-            forces = np.zeros((len(atoms), 3))
             power_ar = self.power_a * self.r_scale_a
             power_rr = self.power_r * self.r_scale_r
-            inner = (power_ar * (f ** (self.power_a - 1))) - (
+            derivs = (power_ar * (f ** (self.power_a - 1))) - (
                 power_rr * (f ** (self.power_r - 1))
             )
-            derivs = np.sum(inner.reshape(-1, 1) * g, axis=0)
-            forces[not_masked] = derivs.reshape(-1, 3)
-            return energy, forces
-        return energy
+            return energies, derivs
+        return energies, None
 
     def get_arguments(self):
         "Get the arguments of the class itself."
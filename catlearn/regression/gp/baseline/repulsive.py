@@ -1,6 +1,8 @@
 import numpy as np
+from ase.data import covalent_radii
+from ase.geometry import wrap_positions
 from .baseline import BaselineCalculator
-from ..fingerprint.geometry import get_inverse_distances
+from ..fingerprint.geometry import get_pair_inverse_distances, mic_distance
 
 
 class RepulsionCalculator(BaselineCalculator):
@@ -119,59 +121,170 @@ class RepulsionCalculator(BaselineCalculator):
 
     def get_energy_forces(self, atoms, get_derivatives=True, **kwargs):
         "Get the energy and forces."
+        output = self.get_energies_forces_group(
+            [atoms],
+            get_derivatives=get_derivatives,
+            **kwargs,
+        )
+        if get_derivatives:
+            return output[0][0], output[1][0]
+        return output[0]
+
+    def get_energies_forces_group(
+        self,
+        atoms_list,
+        get_derivatives=True,
+        **kwargs,
+    ):
+        """
+        Get the energies and forces of a group of ASE Atoms with
+        the same atoms, constraints, and cell.
+        The inverse distances of all the ASE Atoms are
+        calculated at once.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects in the group.
+            get_derivatives : bool
+                Whether to calculate the forces.
+
+        Returns:
+            (N) array: The energies of the ASE Atoms.
+            (N,Natoms,3) array: The forces of the ASE Atoms
+                if get_derivatives=True.
+        """
+        atoms = atoms_list[0]
+        n_images = len(atoms_list)
+        n_atoms = len(atoms)
         # Get the not fixed (not masked) atom indicies
         not_masked, masked = self.get_constraints(atoms)
         not_masked = np.array(not_masked, dtype=int)
         masked = np.array(masked, dtype=int)
-        # Get the inverse distances
+        # Get the inverse distances of the pairs
+        pair_i, pair_j = self.get_pairs(not_masked, masked)
+        positions = np.array([atoms.get_positions() for atoms in atoms_list])
         f, g = self.get_inv_distances(
             atoms,
-            not_masked,
-            masked,
+            positions,
+            pair_i,
+            pair_j,
             get_derivatives,
-            **kwargs,
         )
-        # Calculate energy
-        energy = self.c0 * np.sum(f**self.power)
+        f = f.reshape(n_images, -1)
+        # Calculate the energies and the derivatives wrt. inverse distances
+        energies, derivs = self.get_pair_energies(f, get_derivatives)
+        if not get_derivatives:
+            return energies
+        # Sum the forces of the pairs on the not fixed atoms
+        pair_forces = derivs.reshape(-1, 1) * g
+        shift = (n_atoms * np.arange(n_images)).reshape(-1, 1)
+        index_i = (pair_i + shift).reshape(-1)
+        index_j = (pair_j + shift).reshape(-1)
+        n_total = n_images * n_atoms
+        forces = np.empty((n_total, 3))
+        for d in range(3):
+            forces[:, d] = np.bincount(
+                index_i,
+                weights=pair_forces[:, d],
+                minlength=n_total,
+            ) - np.bincount(
+                index_j,
+                weights=pair_forces[:, d],
+                minlength=n_total,
+            )
+        forces = forces.reshape(n_images, n_atoms, 3)
+        forces[:, masked] = 0.0
+        return energies, forces
+
+    def get_pair_energies(self, f, get_derivatives=True, **kwargs):
+        """
+        Get the energies from the inverse distances and
+        the negative derivatives of the energies wrt.
+        the inverse distances.
+
+        Parameters:
+            f : (N,Npairs) array
+                The inverse distances scaled with the covalent radii.
+            get_derivatives : bool
+                Whether to calculate the derivatives.
+
+        Returns:
+            (N) array: The energies.
+            (N,Npairs) array: The negative derivatives
+                if get_derivatives=True.
+        """
+        energies = self.c0 * np.sum(f**self.power, axis=-1)
         if get_derivatives:
-            forces = np.zeros((len(atoms), 3), dtype=float)
             c0p = -self.c0 * self.power
-            derivs = np.sum(
-                c0p * (f ** (self.power - 1)).reshape(-1, 1) * g,
-                axis=0,
-            )
-            forces[not_masked] = derivs.reshape(-1, 3)
-            return energy, forces
-        return energy
+            return energies, c0p * (f ** (self.power - 1))
+        return energies, None
+
+    def get_pairs(self, not_masked, masked, **kwargs):
+        """
+        Get the atom indicies of the pairs in the same order as
+        the inverse distances in the fingerprints.
+        The pairs between the not fixed and fixed atoms come first.
+        """
+        nmi, nmj = np.triu_indices(len(not_masked), k=1, m=None)
+        pair_i = np.concatenate(
+            [np.repeat(not_masked, len(masked)), not_masked[nmi]]
+        )
+        pair_j = np.concatenate(
+            [np.tile(masked, len(not_masked)), not_masked[nmj]]
+        )
+        return pair_i, pair_j
 
     def get_inv_distances(
-        self, atoms, not_masked, masked, get_derivatives, **kwargs
+        self,
+        atoms,
+        positions,
+        pair_i,
+        pair_j,
+        get_derivatives,
+        **kwargs,
     ):
         """
         Get the unique inverse distances scaled with the covalent radii
-        and its derivatives.
+        and its derivatives wrt. the first atom of each pair
+        for all the positions.
         """
-        # Get the indicies for not fixed and not fixed atoms interactions
-        nmi, nmj = np.triu_indices(len(not_masked), k=1, m=None)
-        nmi_ind = not_masked[nmi]
-        nmj_ind = not_masked[nmj]
-        f, g = get_inverse_distances(
-            atoms,
-            not_masked=not_masked,
-            masked=masked,
-            nmi=nmi,
-            nmj=nmj,
-            nmi_ind=nmi_ind,
-            nmj_ind=nmj_ind,
+        pbc = atoms.pbc
+        cell = np.array(atoms.get_cell())
+        n_images = len(positions)
+        # Wrap the atoms to the unit cell
+        if self.wrap and pbc.any():
+            positions = wrap_positions(
+                positions.reshape(-1, 3),
+                cell,
+                pbc=pbc,
+            ).reshape(positions.shape)
+        # Get the distance vectors of the pairs
+        vec_distances = positions[:, pair_j] - positions[:, pair_i]
+        vec_distances = vec_distances.reshape(-1, 3)
+        # Get the covalent radii of the pairs
+        covrad = covalent_radii[atoms.get_atomic_numbers()]
+        covrad = np.tile(covrad[pair_i] + covrad[pair_j], n_images)
+        # Get the distances
+        use_softmax = self.periodic_softmax and pbc.any()
+        if self.mic and not use_softmax and pbc.any():
+            distances, vec_distances = mic_distance(
+                vec_distances,
+                cell,
+                pbc,
+                vector=True,
+            )
+        else:
+            distances = np.linalg.norm(vec_distances, axis=-1)
+        return get_pair_inverse_distances(
+            distances,
+            vec_distances,
+            covrad,
+            cell,
+            pbc,
             use_derivatives=get_derivatives,
-            use_covrad=True,
             periodic_softmax=self.periodic_softmax,
-            mic=self.mic,
-            wrap=self.wrap,
             eps=self.eps,
-            **kwargs,
         )
-        return f, g
 
     def get_arguments(self):
         "Get the arguments of the class itself."
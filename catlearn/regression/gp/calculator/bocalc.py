@@ -1,5 +1,4 @@
 from .mlcalc import MLCalculator
-from ase.calculators.calculator import Calculator, all_changes
 
 
 class BOCalculator(MLCalculator):
@@ -93,65 +92,37 @@ class BOCalculator(MLCalculator):
         """
         return self.get_property("predicted forces", atoms=atoms)
 
-    def calculate(
-        self,
-        atoms=None,
-        properties=["energy", "forces"],
-        system_changes=all_changes,
-    ):
+    def make_results(self, results, get_forces=True, **kwargs):
         """
-        Calculate the prediction energy, forces, and uncertainties of
-        the energies and forces for a given ASE Atoms structure.
-        Predicted potential energy can be obtained
-        by *atoms.get_potential_energy()*,
-        predicted forces using *atoms.get_forces()*,
-        uncertainty of the energy using *atoms.calc.get_uncertainty(atoms)*,
-        uncertainties of the forces
-        using *atoms.calc.get_force_uncertainty(atoms)*,
-        derivatives of uncertainty
-        using *atoms.calc.get_uncertainty_derivatives(atoms)*,
-        predicted energy using *atoms.calc.get_predicted_energy(atoms)*,
-        and predicted forces using *atoms.calc.get_predicted_forces(atoms)*.
+        Make the results of the calculator from the predicted properties.
+        The predicted energy and forces are stored as
+        *predicted energy* and *predicted forces*, while the energy and
+        forces are the acquisition function and its derivatives.
+
+        Parameters:
+            results : dict
+                The predicted properties of the ML model.
+            get_forces : bool
+                Whether the forces are predicted.
 
         Returns:
-            self.results : dict
-                A dictionary with all the calculated properties.
+            dict: The properties that are implemented.
         """
-        # Atoms object.
-        Calculator.calculate(self, atoms, properties, system_changes)
-        # Get the arguments for calculating the requested properties
-        (
-            get_forces,
-            get_uncertainty,
-            get_force_uncertainties,
-            get_unc_derivatives,
-        ) = self.get_property_arguments(properties)
-        # Get predict energy, forces and uncertainties for the given geometry
-        results = self.model_prediction(
-            atoms,
-            get_forces=get_forces,
-            get_uncertainty=get_uncertainty,
-            get_force_uncertainties=get_force_uncertainties,
-            get_unc_derivatives=get_unc_derivatives,
-        )
-        # Store the properties that are implemented
-        for key, value in results.items():
-            if key in self.implemented_properties:
-                self.results[key] = value
+        new_results = super().make_results(results, get_forces=get_forces)
         # Save the predicted properties
-        self.results["predicted energy"] = results["energy"]
+        new_results["predicted energy"] = results["energy"]
         if get_forces:
-            self.results["predicted forces"] = results["forces"].copy()
+            new_results["predicted forces"] = results["forces"].copy()
         # Calculate the acquisition function and its derivative
         if self.kappa != 0.0:
-            self.results["energy"] = (
+            new_results["energy"] = (
                 results["energy"] + self.kappa * results["uncertainty"]
             )
             if get_forces:
-                self.results["forces"] = results["forces"] - (
+                new_results["forces"] = results["forces"] - (
                     self.kappa * results["uncertainty derivatives"]
                 )
-        return self.results
+        return new_results
 
     def update_arguments(
         self,
@@ -1,7 +1,10 @@
 import numpy as np
 from scipy.spatial.distance import cdist
 from ase.constraints import FixAtoms
+from ase.geometry import find_mic
 from ase.io import write
+from ase.io.formats import filetype
+from ase.io.trajectory import TrajectoryWriter
 from .copy_atoms import copy_atoms
 
 
@@ -100,9 +103,135 @@ class Database:
                 c.get_indices() for c in constraints if isinstance(c, FixAtoms)
             ]
             index_mask = set(np.concatenate(index_mask))
-            return list(set(not_masked).difference(index_mask))
+            not_masked = list(set(not_masked).difference(index_mask))
+        # Only the atoms in the active subspace are used
+        active_atoms = self.get_active_atoms()
+        if active_atoms is not None:
+            active_atoms = set(active_atoms)
+            not_masked = [i for i in not_masked if i in active_atoms]
         return not_masked
 
+    def get_active_atoms(self, **kwargs):
+        """
+        Get the indicies of the atoms in the active subspace
+        of the fingerprint.
+
+        Returns:
+            (Na) array or None: The indicies of the atoms in
+                the active subspace or None if all the atoms are used.
+        """
+        return self.fingerprint.get_active_atoms()
+
+    def set_active_atoms(self, active_atoms, **kwargs):
+        """
+        Set the atoms in the active subspace.
+        Only the atoms in the active subspace are used in the features
+        and the derivative targets if reduce_dimensions=True.
+        The features and targets of the stored ASE Atoms are made again.
+
+        Parameters:
+            active_atoms : list or None
+                The indicies of the atoms in the active subspace.
+                All the atoms are used if None.
+
+        Returns:
+            self: The updated object itself.
+        """
+        self.fingerprint.set_active_atoms(active_atoms)
+        self.remake_data()
+        return self
+
+    def update_active_atoms(
+        self,
+        atoms_list=[],
+        min_displacement=0.1,
+        min_force=None,
+        **kwargs,
+    ):
+        """
+        Update the active subspace with the atoms that are displaced
+        from the first ASE Atoms in the database (e.g. the initial state
+        of a NEB) in the database or in the given ASE Atoms (e.g. the
+        current path).
+        The atoms with large forces in the database can also be included.
+        The atoms are not removed from the active subspace again,
+        so the features are only made again when new atoms are moved.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects that are used together with
+                the ASE Atoms in the database.
+            min_displacement : float
+                The minimum displacement of an atom in any of
+                the ASE Atoms for it to be in the active subspace.
+            min_force : float or None
+                The minimum force on an atom in any of the ASE Atoms
+                in the database for it to be in the active subspace.
+                The forces are not used if min_force=None.
+
+        Returns:
+            bool: Whether the active subspace is changed.
+        """
+        atoms_data = self.atoms_list
+        atoms_list = atoms_data + list(atoms_list)
+        if not self.reduce_dimensions or len(atoms_list) < 2:
+            return False
+        # Get the largest displacement of each atom
+        atoms0 = atoms_list[0]
+        pos0 = atoms0.get_positions()
+        displacements = np.array(
+            [atoms.get_positions() - pos0 for atoms in atoms_list[1:]]
+        ).reshape(-1, 3)
+        if np.any(atoms0.pbc):
+            displacements = find_mic(
+                displacements,
+                cell=atoms0.cell,
+                pbc=atoms0.pbc,
+            )[0]
+        displacements = np.linalg.norm(
+            displacements.reshape(len(atoms_list) - 1, len(atoms0), 3),
+            axis=2,
+        ).max(axis=0)
+        is_active = displacements >= min_displacement
+        # Include the atoms with large forces in the database
+        if min_force is not None:
+            forces = np.array([atoms.get_forces() for atoms in atoms_data])
+            forces = np.linalg.norm(forces, axis=2).max(axis=0)
+            is_active = is_active | (forces >= min_force)
+        active_atoms = np.where(is_active)[0]
+        # Keep the atoms already in the active subspace
+        active_atoms_old = self.get_active_atoms()
+        if active_atoms_old is None:
+            if len(active_atoms) in [0, len(atoms0)]:
+                return False
+        else:
+            active_atoms = np.union1d(active_atoms, active_atoms_old)
+            if len(active_atoms) == len(active_atoms_old):
+                return False
+        self.set_active_atoms(active_atoms)
+        return True
+
+    def remake_data(self, **kwargs):
+        """
+        Make the features and targets of the stored ASE Atoms again
+        (e.g. when the active subspace is changed).
+
+        Returns:
+            self: The updated object itself.
+        """
+        self.features = [
+            self.make_atoms_feature(atoms) for atoms in self.atoms_list
+        ]
+        self.targets = [
+            self.make_target(
+                atoms,
+                use_derivatives=self.use_derivatives,
+                use_negative_forces=self.use_negative_forces,
+            )
+            for atoms in self.atoms_list
+        ]
+        return self
+
     def get_atoms(self, **kwargs):
         """
         Get the list of atoms in the database.
@@ -130,20 +259,104 @@ class Database:
         """
         return np.array(self.targets)
 
-    def save_data(self, trajectory="data.traj", **kwargs):
+    def save_data(self, trajectory="data.traj", append=True, **kwargs):
         """
         Save the ASE Atoms data to a trajectory.
+        Only the ASE Atoms added since the last save are appended
+        if the same trajectory is used again.
+
+        Parameters:
+            trajectory : str
+                The name of the trajectory file where the data is saved.
+            append : bool
+                Whether to only append the new ASE Atoms to the trajectory
+                if it was saved by the database before.
+                Otherwise, all the ASE Atoms are written.
+
+        Returns:
+            self: The updated object itself.
+        """
+        atoms_list = self.atoms_list
+        if (
+            append
+            and trajectory == self.saved_trajectory
+            and self.n_saved <= len(atoms_list)
+        ):
+            # Append the new ASE Atoms
+            if self.n_saved < len(atoms_list):
+                self.append_data(trajectory, atoms_list[self.n_saved :])
+        else:
+            write(trajectory, atoms_list)
+        # Store the number of saved ASE Atoms
+        self.saved_trajectory = trajectory
+        self.n_saved = len(atoms_list)
+        return self
+
+    def append_data(self, trajectory, atoms_list, **kwargs):
+        """
+        Append ASE Atoms to an existing trajectory.
 
         Parameters:
             trajectory : str
                 The name of the trajectory file where the data is saved.
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects that are appended.
 
         Returns:
             self: The updated object itself.
         """
-        write(trajectory, self.get_atoms())
+        # The ASE trajectory format is appended with its own writer
+        if filetype(trajectory, read=False) == "traj":
+            with TrajectoryWriter(trajectory, mode="a") as traj:
+                for atoms in atoms_list:
+                    traj.write(atoms)
+        else:
+            write(trajectory, atoms_list, append=True)
+        return self
+
+    def save_database(
+        self,
+        filename="database.npz",
+        include_atoms=True,
+        **kwargs,
+    ):
+        """
+        Save the database object to a binary file with
+        the features and targets as arrays.
+
+        Parameters:
+            filename : str
+                The name of the file where the object is saved.
+            include_atoms : bool
+                Whether to store the ASE Atoms objects.
+                The loaded database can not be saved as a trajectory
+                if include_atoms=False.
+
+        Returns:
+            self: The object itself.
+        """
+        from ..serialization import save_object
+
+        save_object(self, filename, include_atoms=include_atoms)
         return self
 
+    def load_database(self, filename="database.npz", mmap_mode=None, **kwargs):
+        """
+        Load the database object from a binary file.
+
+        Parameters:
+            filename : str
+                The name of the file where the object is saved.
+            mmap_mode : str or None
+                The memory mapping mode (e.g. 'r') used for the arrays.
+
+        Returns:
+            database: The loaded database object.
+        """
+        from ..serialization import load_object
+
+        return load_object(filename, mmap_mode=mmap_mode)
+
     def copy_atoms(self, atoms, **kwargs):
         """
         Copy the atoms object together with the calculated properties.
@@ -216,6 +429,9 @@ class Database:
         self.atoms_list = []
         self.features = []
         self.targets = []
+        # The ASE Atoms are not saved to a trajectory
+        self.saved_trajectory = None
+        self.n_saved = 0
         return self
 
     def is_in_database(self, atoms, dtol=1e-8, **kwargs):
@@ -1,7 +1,6 @@
 import numpy as np
 from scipy.spatial.distance import cdist
 from .database import Database
-from ase.io import write
 
 
 class DatabaseReduction(Database):
@@ -238,26 +237,25 @@ class DatabaseReduction(Database):
         """
         return list(set(all_indicies).difference(indicies))
 
-    def save_data(self, trajectory="data.traj", **kwargs):
-        """
-        Save the ASE Atoms data to a trajectory.
+    def append(self, atoms, **kwargs):
+        "Append the atoms object, the fingerprint, and target(s) to lists."
+        # Store that the data base has changed
+        self.update_indicies = True
+        # Append to the data base
+        super().append(atoms, **kwargs)
+        return self
 
-        Parameters:
-            trajectory : str
-                The name of the trajectory file where the data is saved.
+    def remake_data(self, **kwargs):
+        """
+        Make the features and targets of the stored ASE Atoms again
+        (e.g. when the active subspace is changed).
 
         Returns:
             self: The updated object itself.
         """
-        write(trajectory, self.get_all_atoms())
-        return self
-
-    def append(self, atoms, **kwargs):
-        "Append the atoms object, the fingerprint, and target(s) to lists."
         # Store that the data base has changed
         self.update_indicies = True
-        # Append to the data base
-        super().append(atoms, **kwargs)
+        super().remake_data(**kwargs)
         return self
 
     def get_reduction_indicies(self, **kwargs):
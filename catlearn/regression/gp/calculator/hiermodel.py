@@ -1,6 +1,5 @@
 import numpy as np
 from .mlmodel import MLModel
-from .mlcalc import MLCalculator
 
 
 class HierarchicalMLModel(MLModel):
@@ -13,8 +12,13 @@ class HierarchicalMLModel(MLModel):
         hp=None,
         pdis=None,
         verbose=False,
+        deriv_selection=None,
+        deriv_budget=None,
+        deriv_cutoff=None,
         npoints=25,
         initial_indicies=[0],
+        max_levels=None,
+        collapse_npoints=None,
         **kwargs,
     ):
         """
@@ -22,7 +26,9 @@ class HierarchicalMLModel(MLModel):
         ASE Atoms and calculator.
         A new model is made when the number of data points
         exceed the number of points.
-        The old models are used as a baseline.
+        The old models are stored as levels that are used as a baseline.
+        All the levels use the same fingerprint of the ASE Atoms,
+        so the fingerprint is only calculated once per prediction.
 
         Parameters:
             model : Model
@@ -43,12 +49,38 @@ class HierarchicalMLModel(MLModel):
                 A dict of prior distributions for each hyperparameter type.
             verbose : bool
                 Whether to print statements in the optimization.
+            deriv_selection : str or None
+                The selection of the derivative targets (forces) of
+                the atoms used in the training of each structure
+                ('magnitude' or 'distance').
+                All the derivative targets are used if None and
+                deriv_budget=None.
+            deriv_budget : int or None
+                The maximum number of atoms with derivative targets
+                used for each structure.
+            deriv_cutoff : float or None
+                The minimum force or the maximum distance to
+                the moving region of the atoms used for
+                the derivative targets.
             npoints : int
                 Number of points that are used from the database in the models.
             initial_indicies : list
                 The indicies of the data points that must be included in
                 the used data base for every model.
+            max_levels : int or None
+                The maximum number of old models (levels) that are stored.
+                The oldest levels are collapsed into a single model
+                when the number of levels exceed max_levels.
+                The levels are never collapsed if max_levels=None.
+            collapse_npoints : int or None
+                The maximum number of training points in the collapsed
+                level, which are the points farthest from each other.
+                The number of points of a model (npoints) is used if None.
         """
+        # Set the default levels of old models
+        self.levels = []
+        self.max_levels = None
+        self.collapse_npoints = None
         super().__init__(
             model=model,
             database=database,
@@ -57,8 +89,13 @@ class HierarchicalMLModel(MLModel):
             hp=hp,
             pdis=pdis,
             verbose=verbose,
+            deriv_selection=deriv_selection,
+            deriv_budget=deriv_budget,
+            deriv_cutoff=deriv_cutoff,
             npoints=npoints,
             initial_indicies=initial_indicies,
+            max_levels=max_levels,
+            collapse_npoints=collapse_npoints,
             **kwargs,
         )
 
@@ -82,12 +119,8 @@ class HierarchicalMLModel(MLModel):
             # Include data in the same model
             super().add_training(atoms_list)
         elif data_len == self.npoints and len(atoms_list) == 1:
-            # Make the current ml model into the new baseline
-            self.baseline = MLCalculator(
-                mlmodel=self.copy(),
-                calculate_forces=True,
-                calculate_uncertainty=False,
-            )
+            # Make the current ml model into a new level
+            self.add_level()
             # Make a new ml model with the mandatory points
             data_atoms = self.get_data_atoms()
             data_atoms = [data_atoms[i] for i in self.initial_indicies]
@@ -101,6 +134,232 @@ class HierarchicalMLModel(MLModel):
             )
         return self
 
+    def update_active_atoms(
+        self,
+        atoms_list=[],
+        min_displacement=0.1,
+        min_force=None,
+        **kwargs,
+    ):
+        """
+        Update the active subspace of the database with the atoms that
+        are displaced in the database or in the given ASE Atoms.
+        The active subspace can not be changed when the levels are made,
+        since the levels are trained on the features of the old subspace.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects (e.g. the current path) that are
+                used together with the ASE Atoms in the database.
+            min_displacement : float
+                The minimum displacement of an atom in any of
+                the ASE Atoms for it to be in the active subspace.
+            min_force : float or None
+                The minimum force on an atom in any of the ASE Atoms
+                in the database for it to be in the active subspace.
+                The forces are not used if min_force=None.
+
+        Returns:
+            bool: Whether the active subspace is changed.
+        """
+        if len(self.levels):
+            raise Exception(
+                "The active subspace can not be changed "
+                "when the hierarchical levels are made!"
+            )
+        return super().update_active_atoms(
+            atoms_list=atoms_list,
+            min_displacement=min_displacement,
+            min_force=min_force,
+            **kwargs,
+        )
+
+    def add_level(self, **kwargs):
+        """
+        Store the current trained ML model as a new level and
+        collapse the oldest levels if there are too many levels.
+
+        Returns:
+            self: The updated object itself.
+        """
+        # The current ml model must be trained on the current database
+        if not self.model.trained_model:
+            self.train_model()
+        self.levels.append(self.model.copy())
+        self.use_baseline = True
+        # Collapse the oldest levels into one level
+        if self.max_levels is not None and len(self.levels) > self.max_levels:
+            self.collapse_levels(len(self.levels) - self.max_levels + 1)
+        return self
+
+    def collapse_levels(self, n_levels=None, **kwargs):
+        """
+        Collapse the oldest levels into a single model.
+        The single model is trained on the unique training features of
+        the collapsed levels with their summed predictions as targets.
+        Only the collapse_npoints features farthest from each other
+        are used, so the collapsed level has the size of a level.
+        The hyperparameters of the newest collapsed level are used.
+
+        Parameters:
+            n_levels : int or None
+                The number of the oldest levels that are collapsed.
+                All levels are collapsed if n_levels=None.
+
+        Returns:
+            self: The updated object itself.
+        """
+        if n_levels is None:
+            n_levels = len(self.levels)
+        if n_levels < 2:
+            return self
+        levels = self.levels[:n_levels]
+        # Get the unique training features of the collapsed levels
+        features = np.concatenate([level.features for level in levels])
+        if self.database.use_fingerprint:
+            vectors = np.array([fp.get_vector() for fp in features])
+        else:
+            vectors = features
+        _, indicies = np.unique(
+            np.round(vectors, decimals=12),
+            axis=0,
+            return_index=True,
+        )
+        indicies = np.sort(indicies)
+        # Select the features farthest from each other
+        indicies = indicies[
+            self.get_collapse_indicies(vectors[indicies])
+        ]
+        features = features[indicies]
+        # Get the summed predictions of the collapsed levels
+        targets = self.predict_levels(
+            features,
+            use_derivatives=self.database.use_derivatives,
+            levels=levels,
+        )
+        # Train a single model on the summed predictions
+        model = levels[-1].copy()
+        model.train(features, targets)
+        self.levels = [model] + self.levels[n_levels:]
+        return self
+
+    def get_collapse_indicies(self, vectors, **kwargs):
+        """
+        Get the indicies of the feature vectors used in the collapsed
+        level, which are the vectors farthest from each other.
+        The first vector is always used.
+
+        Parameters:
+            vectors : (N,D) array
+                The unique feature vectors of the collapsed levels.
+
+        Returns:
+            (M) array: The indicies of the used feature vectors.
+        """
+        npoints = self.collapse_npoints
+        if npoints is None:
+            npoints = self.npoints
+        if len(vectors) <= npoints:
+            return np.arange(len(vectors))
+        indicies = [0]
+        # The distances to the closest used vector
+        dist = np.linalg.norm(vectors - vectors[0], axis=1)
+        for _ in range(1, npoints):
+            i_max = int(np.argmax(dist))
+            indicies.append(i_max)
+            dist = np.minimum(
+                dist,
+                np.linalg.norm(vectors - vectors[i_max], axis=1),
+            )
+        return np.sort(indicies)
+
+    def predict_levels(
+        self,
+        features,
+        use_derivatives=True,
+        levels=None,
+        **kwargs,
+    ):
+        """
+        Predict the summed targets of the levels for all the features
+        with one prediction per level.
+
+        Parameters:
+            features : (M,D) array or (M) list of fingerprint objects
+                Features with M data points.
+            use_derivatives : bool
+                Whether to predict the derivatives of the targets.
+            levels : list or None
+                The list of levels used. All the levels are used if None.
+
+        Returns:
+            (M,1) or (M,1+D) array: The summed predictions of the levels.
+        """
+        if levels is None:
+            levels = self.levels
+        y_levels = 0.0
+        for level in levels:
+            y_levels = (
+                y_levels
+                + level.predict(
+                    features,
+                    get_derivatives=use_derivatives,
+                    get_variance=False,
+                )[0]
+            )
+        return y_levels
+
+    def calculate_baseline(
+        self,
+        atoms_list,
+        use_derivatives=True,
+        features=None,
+        **kwargs,
+    ):
+        "Calculate the baseline and the levels for each ASE atoms object."
+        if self.baseline is not None:
+            y_base = np.array(
+                super().calculate_baseline(
+                    atoms_list,
+                    use_derivatives=use_derivatives,
+                    **kwargs,
+                )
+            )
+        else:
+            y_base = 0.0
+        if len(self.levels):
+            # Calculate the fingerprints if they are not given
+            if features is None:
+                features = np.array(
+                    [
+                        self.database.make_atoms_feature(atoms)
+                        for atoms in atoms_list
+                    ]
+                )
+            y_base = y_base + self.predict_levels(
+                features,
+                use_derivatives=use_derivatives,
+            )
+        return list(y_base)
+
+    def store_baseline_targets(self, atoms_list, **kwargs):
+        "Store the baseline correction on the targets."
+        if self.use_baseline:
+            # Reuse the fingerprints of the atoms stored in the database
+            features = np.array(self.database.features[-len(atoms_list) :])
+            y_base = self.calculate_baseline(
+                atoms_list,
+                use_derivatives=self.database.use_derivatives,
+                features=features,
+                **kwargs,
+            )
+            self.baseline_targets.extend(y_base)
+        return self.baseline_targets
+
+    def get_number_of_levels(self, **kwargs):
+        "Get the number of old models (levels) that are stored."
+        return len(self.levels)
+
     def update_arguments(
         self,
         model=None,
@@ -110,8 +369,13 @@ class HierarchicalMLModel(MLModel):
         hp=None,
         pdis=None,
         verbose=None,
+        deriv_selection=None,
+        deriv_budget=None,
+        deriv_cutoff=None,
         npoints=None,
         initial_indicies=None,
+        max_levels=None,
+        collapse_npoints=None,
         **kwargs,
     ):
         """
@@ -137,11 +401,33 @@ class HierarchicalMLModel(MLModel):
                 A dict of prior distributions for each hyperparameter type.
             verbose : bool
                 Whether to print statements in the optimization.
+            deriv_selection : str or None
+                The selection of the derivative targets (forces) of
+                the atoms used in the training of each structure
+                ('magnitude' or 'distance').
+                All the derivative targets are used if None and
+                deriv_budget=None.
+            deriv_budget : int or None
+                The maximum number of atoms with derivative targets
+                used for each structure.
+            deriv_cutoff : float or None
+                The minimum force or the maximum distance to
+                the moving region of the atoms used for
+                the derivative targets.
             npoints : int
                 Number of points that are used from the database in the models.
             initial_indicies : list
                 The indicies of the data points that must be included in
                 the used data base for every model.
+            max_levels : int or None
+                The maximum number of old models (levels) that are stored.
+                The oldest levels are collapsed into a single model
+                when the number of levels exceed max_levels.
+                The levels are never collapsed if max_levels=None.
+            collapse_npoints : int or None
+                The maximum number of training points in the collapsed
+                level, which are the points farthest from each other.
+                The number of points of a model (npoints) is used if None.
 
         Returns:
             self: The updated object itself.
@@ -160,12 +446,21 @@ class HierarchicalMLModel(MLModel):
             self.pdis = pdis.copy()
         if verbose is not None:
             self.verbose = verbose
+        self.update_derivative_selection(
+            deriv_selection=deriv_selection,
+            deriv_budget=deriv_budget,
+            deriv_cutoff=deriv_cutoff,
+        )
         if npoints is not None:
             self.npoints = int(npoints)
         if initial_indicies is not None:
             self.initial_indicies = initial_indicies.copy()
-        # Check if the baseline is used
-        if self.baseline is None:
+        if max_levels is not None:
+            self.max_levels = int(max_levels)
+        if collapse_npoints is not None:
+            self.collapse_npoints = int(collapse_npoints)
+        # Check if the baseline or the levels are used
+        if self.baseline is None and len(self.levels) == 0:
             self.use_baseline = False
         else:
             self.use_baseline = True
@@ -187,11 +482,19 @@ class HierarchicalMLModel(MLModel):
             hp=self.hp,
             pdis=self.pdis,
             verbose=self.verbose,
+            deriv_selection=self.deriv_selection,
+            deriv_budget=self.deriv_budget,
+            deriv_cutoff=self.deriv_cutoff,
             npoints=self.npoints,
             initial_indicies=self.initial_indicies,
+            max_levels=self.max_levels,
+            collapse_npoints=self.collapse_npoints,
         )
         # Get the constants made within the class
-        constant_kwargs = dict()
+        constant_kwargs = dict(use_baseline=self.use_baseline)
         # Get the objects made within the class
-        object_kwargs = dict(baseline_targets=self.baseline_targets.copy())
+        object_kwargs = dict(
+            baseline_targets=self.baseline_targets.copy(),
+            levels=self.levels.copy(),
+        )
         return arg_kwargs, constant_kwargs, object_kwargs
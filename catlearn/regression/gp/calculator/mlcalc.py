@@ -153,18 +153,40 @@ class MLCalculator(Calculator):
         self.mlmodel.train_model(**kwarg)
         return self
 
-    def save_data(self, trajectory="data.traj", **kwarg):
+    def broadcast_trained_state(self, root=0, **kwargs):
+        """
+        Broadcast the trained state of the ML model from the root rank
+        to all the other MPI ranks.
+
+        Parameters:
+            root : int
+                The rank of the CPU with the trained ML model.
+
+        Returns:
+            self: The updated object itself.
+        """
+        self.mlmodel.broadcast_trained_state(root=root, **kwargs)
+        return self
+
+    def save_data(self, trajectory="data.traj", append=True, **kwarg):
         """
         Save the ASE Atoms data to a trajectory.
 
         Parameters:
             trajectory : str
                 The name of the trajectory file where the data is saved.
+            append : bool
+                Whether to only append the new ASE Atoms to the trajectory
+                if it was saved by the database before.
 
         Returns:
             self: The updated object itself.
         """
-        self.mlmodel.save_data(trajectory=trajectory, **kwarg)
+        self.mlmodel.save_data(
+            trajectory=trajectory,
+            append=append,
+            **kwarg,
+        )
         return self
 
     def get_training_set_size(self):
@@ -219,6 +241,41 @@ class MLCalculator(Calculator):
         )
         return self
 
+    def update_active_atoms(
+        self,
+        atoms_list=[],
+        min_displacement=0.1,
+        min_force=None,
+        **kwargs,
+    ):
+        """
+        Update the active subspace of the database with the atoms that
+        are displaced in the database or in the given ASE Atoms.
+        Only the atoms in the active subspace are used in the features
+        and the derivative targets of the ML model.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects (e.g. the current path) that are
+                used together with the ASE Atoms in the database.
+            min_displacement : float
+                The minimum displacement of an atom in any of
+                the ASE Atoms for it to be in the active subspace.
+            min_force : float or None
+                The minimum force on an atom in any of the ASE Atoms
+                in the database for it to be in the active subspace.
+                The forces are not used if min_force=None.
+
+        Returns:
+            bool: Whether the active subspace is changed.
+        """
+        return self.mlmodel.update_active_atoms(
+            atoms_list=atoms_list,
+            min_displacement=min_displacement,
+            min_force=min_force,
+            **kwargs,
+        )
+
     def calculate(
         self,
         atoms=None,
@@ -259,39 +316,141 @@ class MLCalculator(Calculator):
             get_unc_derivatives=get_unc_derivatives,
         )
         # Store the properties that are implemented
-        for key, value in results.items():
-            if key in self.implemented_properties:
-                self.results[key] = value
+        self.results.update(self.make_results(results, get_forces=get_forces))
         return self.results
 
-    def save_mlcalc(self, filename="mlcalc.pkl", **kwargs):
+    def make_results(self, results, get_forces=True, **kwargs):
+        """
+        Make the results of the calculator from the predicted properties.
+
+        Parameters:
+            results : dict
+                The predicted properties of the ML model.
+            get_forces : bool
+                Whether the forces are predicted.
+
+        Returns:
+            dict: The properties that are implemented.
+        """
+        return {
+            key: value
+            for key, value in results.items()
+            if key in self.implemented_properties
+        }
+
+    def calculate_batch(
+        self,
+        atoms_list,
+        properties=["energy", "forces"],
+        features=None,
+        **kwargs,
+    ):
+        """
+        Calculate the prediction energies, forces, and uncertainties of
+        the energies and forces for a list of ASE Atoms structures
+        with one prediction of the ML model.
+        The results are not stored in the calculator.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms structures that are predicted.
+            properties : list of str
+                The properties that are predicted.
+            features : list or None
+                The fingerprints of the ASE Atoms structures if they are
+                already calculated.
+
+        Returns:
+            list: A dictionary with all the calculated properties
+                for each ASE Atoms structure.
+        """
+        # Get the arguments for calculating the requested properties
+        (
+            get_forces,
+            get_uncertainty,
+            get_force_uncertainties,
+            get_unc_derivatives,
+        ) = self.get_property_arguments(properties)
+        # Predict the properties of all the structures at once
+        results_list = self.mlmodel.calculate_batch(
+            atoms_list,
+            get_forces=get_forces,
+            get_uncertainty=get_uncertainty,
+            get_force_uncertainties=get_force_uncertainties,
+            get_unc_derivatives=get_unc_derivatives,
+            features=features,
+        )
+        # Only use the properties that are implemented
+        return [
+            self.make_results(results, get_forces=get_forces)
+            for results in results_list
+        ]
+
+    def save_mlcalc(
+        self,
+        filename="mlcalc.pkl",
+        file_format=None,
+        include_atoms=True,
+        **kwargs,
+    ):
         """
         Save the ML calculator object to a file.
 
         Parameters:
             filename : str
                 The name of the file where the object is saved.
+            file_format : str or None
+                The file format used ('pickle' or 'npz').
+                The npz format stores the arrays in a binary file with
+                a JSON manifest of the classes and arguments.
+                The format is chosen from the filename extension if None.
+            include_atoms : bool
+                Whether to store the ASE Atoms objects of the database
+                in the npz format.
+                The training data can not be saved as a trajectory
+                from the loaded ML calculator if include_atoms=False.
 
         Returns:
             self: The object itself.
         """
+        from ..serialization import get_file_format, save_object
+
+        if get_file_format(filename, file_format) == "npz":
+            save_object(self, filename, include_atoms=include_atoms)
+            return self
         import pickle
 
         with open(filename, "wb") as file:
             pickle.dump(self, file)
         return self
 
-    def load_mlcalc(self, filename="mlcalc.pkl", **kwargs):
+    def load_mlcalc(
+        self,
+        filename="mlcalc.pkl",
+        file_format=None,
+        mmap_mode=None,
+        **kwargs,
+    ):
         """
         Load the ML calculator object from a file.
 
         Parameters:
             filename : str
                 The name of the file where the object is saved.
+            file_format : str or None
+                The file format used ('pickle' or 'npz').
+                The format is chosen from the filename extension if None.
+            mmap_mode : str or None
+                The memory mapping mode (e.g. 'r') used for the arrays
+                in the npz format.
 
         Returns:
             mlcalc: The loaded ML calculator object.
         """
+        from ..serialization import get_file_format, load_object
+
+        if get_file_format(filename, file_format) == "npz":
+            return load_object(filename, mmap_mode=mmap_mode)
         import pickle
 
         with open(filename, "rb") as file:
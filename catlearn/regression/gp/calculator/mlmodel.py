@@ -11,6 +11,9 @@ class MLModel:
         hp=None,
         pdis=None,
         verbose=False,
+        deriv_selection=None,
+        deriv_budget=None,
+        deriv_cutoff=None,
         **kwargs,
     ):
         """
@@ -35,6 +38,24 @@ class MLModel:
                 A dict of prior distributions for each hyperparameter type.
             verbose : bool
                 Whether to print statements in the optimization.
+            deriv_selection : str or None
+                The selection of the derivative targets (forces) of
+                the atoms used in the training of each structure.
+                All the derivative targets are used if None and
+                deriv_budget=None.
+                'magnitude' uses the atoms with the largest forces.
+                'distance' uses the atoms closest to the moving region,
+                which is the atoms that moved the most in
+                the training structures.
+            deriv_budget : int or None
+                The maximum number of atoms with derivative targets
+                used for each structure.
+                The atoms are chosen from the deriv_selection
+                ('magnitude' if deriv_selection=None).
+            deriv_cutoff : float or None
+                The minimum force of the atoms used
+                if deriv_selection='magnitude' or the maximum distance to
+                the moving region if deriv_selection='distance'.
         """
         # Make default model if it is not given
         if model is None:
@@ -50,6 +71,10 @@ class MLModel:
             self.pdis = None
         # Make default hyperparameters if it is not given
         self.hp = None
+        # All the derivative targets are used as default
+        self.deriv_selection = None
+        self.deriv_budget = None
+        self.deriv_cutoff = None
         # Set the arguments
         self.update_arguments(
             model=model,
@@ -59,6 +84,9 @@ class MLModel:
             hp=hp,
             pdis=pdis,
             verbose=verbose,
+            deriv_selection=deriv_selection,
+            deriv_budget=deriv_budget,
+            deriv_cutoff=deriv_cutoff,
             **kwargs,
         )
 
@@ -91,6 +119,8 @@ class MLModel:
         features, targets = self.get_data()
         # Correct targets with the baseline
         targets = self.get_baseline_corrected_targets(targets)
+        # Remove the derivative targets that are not selected
+        targets = self.select_derivatives(targets)
         # Train model
         if self.optimize:
             # Optimize the hyperparameters and train the ML model
@@ -100,6 +130,40 @@ class MLModel:
             self.model_training(features, targets, **kwargs)
         return self
 
+    def broadcast_trained_state(self, root=0, **kwargs):
+        """
+        Broadcast the trained state of the ML model from the root rank
+        to all the other MPI ranks as contiguous NumPy buffers,
+        so the ML model is only trained on the root rank.
+
+        Parameters:
+            root : int
+                The rank of the CPU with the trained ML model.
+
+        Returns:
+            self: The updated object itself.
+        """
+        self.model.broadcast_trained_state(root=root, **kwargs)
+        return self
+
+    def is_parallel(self, **kwargs):
+        """
+        Check if the hyperparameters are optimized in parallel with MPI
+        by the hyperparameter fitter or any of its optimizers.
+
+        Returns:
+            bool: Whether the hyperparameter optimization uses MPI.
+        """
+        objects = [self.model.hpfitter]
+        while len(objects):
+            obj = objects.pop()
+            if getattr(obj, "parallel", False):
+                return True
+            for name in ["optimizer", "local_optimizer", "line_optimizer"]:
+                if getattr(obj, name, None) is not None:
+                    objects.append(getattr(obj, name))
+        return False
+
     def calculate(
         self,
         atoms,
@@ -159,19 +223,85 @@ class MLModel:
         )
         return results
 
-    def save_data(self, trajectory="data.traj", **kwarg):
+    def calculate_batch(
+        self,
+        atoms_list,
+        get_uncertainty=True,
+        get_forces=True,
+        get_force_uncertainties=False,
+        get_unc_derivatives=False,
+        features=None,
+        **kwargs,
+    ):
+        """
+        Calculate the energies and also the uncertainties and forces
+        if selected for a list of ASE Atoms with one prediction of the model.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects that the properties (incl. energy)
+                are calculated for.
+            get_uncertainty : bool
+                Whether to calculate the uncertainty.
+            get_forces : bool
+                Whether to calculate the forces.
+            get_force_uncertainties : bool
+                Whether to calculate the uncertainties of the predicted forces.
+            get_unc_derivatives : bool
+                Whether to calculate the derivatives of
+                the uncertainty of the predicted energy.
+            features : list or None
+                The fingerprints of the ASE Atoms if they are
+                already calculated.
+
+        Returns:
+            list: A dictionary of the predicted properties for each ASE Atoms.
+        """
+        # Calculate energies, forces, and uncertainties
+        predictions = self.model_prediction_batch(
+            atoms_list,
+            get_uncertainty=get_uncertainty,
+            get_forces=get_forces,
+            get_force_uncertainties=get_force_uncertainties,
+            get_unc_derivatives=get_unc_derivatives,
+            features=features,
+        )
+        # Store the predictions
+        results_list = []
+        for atoms, prediction in zip(atoms_list, predictions):
+            energy, forces, unc, unc_forces, unc_deriv = prediction
+            results_list.append(
+                self.store_results(
+                    atoms,
+                    energy=energy,
+                    forces=forces,
+                    unc=unc,
+                    unc_forces=unc_forces,
+                    unc_deriv=unc_deriv,
+                )
+            )
+        return results_list
+
+    def save_data(self, trajectory="data.traj", append=True, **kwarg):
         """
         Save the ASE Atoms data to a trajectory.
 
         Parameters:
             trajectory : str
                 The name of the trajectory file where the data is saved.
+            append : bool
+                Whether to only append the new ASE Atoms to the trajectory
+                if it was saved by the database before.
 
         Returns:
             self: The updated object itself.
         """
         " Save the ASE atoms data to a trajectory. "
-        self.database.save_data(trajectory=trajectory, **kwarg)
+        self.database.save_data(
+            trajectory=trajectory,
+            append=append,
+            **kwarg,
+        )
         return self
 
     def get_training_set_size(self, **kwargs):
@@ -224,6 +354,48 @@ class MLModel:
         self.database.update_arguments(point_interest=point_interest, **kwargs)
         return self
 
+    def update_active_atoms(
+        self,
+        atoms_list=[],
+        min_displacement=0.1,
+        min_force=None,
+        **kwargs,
+    ):
+        """
+        Update the active subspace of the database with the atoms that
+        are displaced in the database or in the given ASE Atoms.
+        Only the atoms in the active subspace are used in the features
+        and the derivative targets.
+        The ML model has to be trained again if the active subspace
+        is changed.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The ASE Atoms objects (e.g. the current path) that are
+                used together with the ASE Atoms in the database.
+            min_displacement : float
+                The minimum displacement of an atom in any of
+                the ASE Atoms for it to be in the active subspace.
+            min_force : float or None
+                The minimum force on an atom in any of the ASE Atoms
+                in the database for it to be in the active subspace.
+                The forces are not used if min_force=None.
+
+        Returns:
+            bool: Whether the active subspace is changed.
+        """
+        is_changed = self.database.update_active_atoms(
+            atoms_list=atoms_list,
+            min_displacement=min_displacement,
+            min_force=min_force,
+            **kwargs,
+        )
+        # The baseline correction of the targets is made again
+        if is_changed and self.use_baseline:
+            self.baseline_targets = []
+            self.store_baseline_targets(self.database.atoms_list)
+        return is_changed
+
     def update_arguments(
         self,
         model=None,
@@ -233,6 +405,9 @@ class MLModel:
         hp=None,
         pdis=None,
         verbose=None,
+        deriv_selection=None,
+        deriv_budget=None,
+        deriv_cutoff=None,
         **kwargs,
     ):
         """
@@ -258,6 +433,24 @@ class MLModel:
                 A dict of prior distributions for each hyperparameter type.
             verbose : bool
                 Whether to print statements in the optimization.
+            deriv_selection : str or None
+                The selection of the derivative targets (forces) of
+                the atoms used in the training of each structure.
+                All the derivative targets are used if None and
+                deriv_budget=None.
+                'magnitude' uses the atoms with the largest forces.
+                'distance' uses the atoms closest to the moving region,
+                which is the atoms that moved the most in
+                the training structures.
+            deriv_budget : int or None
+                The maximum number of atoms with derivative targets
+                used for each structure.
+                The atoms are chosen from the deriv_selection
+                ('magnitude' if deriv_selection=None).
+            deriv_cutoff : float or None
+                The minimum force of the atoms used
+                if deriv_selection='magnitude' or the maximum distance to
+                the moving region if deriv_selection='distance'.
 
         Returns:
             self: The updated object itself.
@@ -276,6 +469,11 @@ class MLModel:
             self.pdis = pdis.copy()
         if verbose is not None:
             self.verbose = verbose
+        self.update_derivative_selection(
+            deriv_selection=deriv_selection,
+            deriv_budget=deriv_budget,
+            deriv_cutoff=deriv_cutoff,
+        )
         # Check if the baseline is used
         if self.baseline is None:
             self.use_baseline = False
@@ -320,11 +518,43 @@ class MLModel:
         **kwargs,
     ):
         "Predict the targets and uncertainties."
-        # Calculate fingerprint
-        fp = self.database.make_atoms_feature(atoms)
+        return self.model_prediction_batch(
+            [atoms],
+            get_uncertainty=get_uncertainty,
+            get_forces=get_forces,
+            get_force_uncertainties=get_force_uncertainties,
+            get_unc_derivatives=get_unc_derivatives,
+            **kwargs,
+        )[0]
+
+    def model_prediction_batch(
+        self,
+        atoms_list,
+        get_uncertainty=True,
+        get_forces=True,
+        get_force_uncertainties=False,
+        get_unc_derivatives=False,
+        features=None,
+        **kwargs,
+    ):
+        """
+        Predict the targets and uncertainties of all the ASE Atoms
+        with one prediction of the model.
+        The fingerprints are only calculated if they are not given.
+        """
+        # Calculate fingerprints
+        if features is None:
+            fps = np.array(
+                [
+                    self.database.make_atoms_feature(atoms)
+                    for atoms in atoms_list
+                ]
+            )
+        else:
+            fps = np.array(features)
         # Calculate energy, forces, and uncertainty
         y, var, var_deriv = self.model.predict(
-            np.array([fp]),
+            fps,
             get_derivatives=get_forces,
             get_variance=get_uncertainty,
             include_noise=False,
@@ -333,33 +563,39 @@ class MLModel:
         )
         # Correct the predicted targets with the baseline if it is used
         y = self.add_baseline_correction(
-            y, atoms=atoms, use_derivatives=get_forces
+            y,
+            atoms=list(atoms_list),
+            use_derivatives=get_forces,
+            features=fps,
         )
-        # Extract the energy
-        energy = y[0][0]
-        # Extract the forces if they are requested
-        if get_forces:
-            forces = -y[0][1:]
-        else:
-            forces = None
-        # Get the uncertainties if they are requested
-        if get_uncertainty:
-            unc = np.sqrt(var[0][0])
-            # Get the uncertainty of the forces if they are requested
-            if get_force_uncertainties and get_forces:
-                unc_forces = np.sqrt(unc[0][1:])
+        predictions = []
+        for i in range(len(atoms_list)):
+            # Extract the energy
+            energy = y[i][0]
+            # Extract the forces if they are requested
+            if get_forces:
+                forces = -y[i][1:]
             else:
-                unc_forces = None
-            # Get the derivatives of the predicted uncertainty
-            if get_unc_derivatives:
-                unc_deriv = (0.5 / unc) * var_deriv
+                forces = None
+            # Get the uncertainties if they are requested
+            if get_uncertainty:
+                unc = np.sqrt(var[i][0])
+                # Get the uncertainty of the forces if they are requested
+                if get_force_uncertainties and get_forces:
+                    unc_forces = np.sqrt(var[i][1:])
+                else:
+                    unc_forces = None
+                # Get the derivatives of the predicted uncertainty
+                if get_unc_derivatives:
+                    unc_deriv = (0.5 / unc) * var_deriv[i]
+                else:
+                    unc_deriv = None
             else:
+                unc = None
+                unc_forces = None
                 unc_deriv = None
-        else:
-            unc = None
-            unc_forces = None
-            unc_deriv = None
-        return energy, forces, unc, unc_forces, unc_deriv
+            predictions.append((energy, forces, unc, unc_forces, unc_deriv))
+        return predictions
 
     def store_results(
         self,
@@ -406,14 +642,19 @@ class MLModel:
     def add_baseline_correction(
         self, targets, atoms, use_derivatives=True, **kwargs
     ):
-        "Add the baseline correction to the targets if a baseline is used."
+        """
+        Add the baseline correction to the targets if a baseline is used.
+        The atoms can be a single ASE Atoms or a list of ASE Atoms.
+        """
         if self.use_baseline:
-            # Calculate the baseline for the ASE atoms object
+            if not isinstance(atoms, (list, np.ndarray)):
+                atoms = [atoms]
+            # Calculate the baseline for the ASE atoms objects
             y_base = self.calculate_baseline(
-                [atoms], use_derivatives=use_derivatives, **kwargs
+                atoms, use_derivatives=use_derivatives, **kwargs
             )
             # Add baseline correction to the targets
-            return targets + np.array(y_base)[0]
+            return targets + np.array(y_base)
         return targets
 
     def get_baseline_corrected_targets(self, targets, **kwargs):
@@ -438,13 +679,37 @@ class MLModel:
         return self.baseline_targets
 
     def calculate_baseline(self, atoms_list, use_derivatives=True, **kwargs):
-        "Calculate the baseline for each ASE atoms object."
+        """
+        Calculate the baseline for each ASE atoms object.
+        The ASE Atoms with the same atoms, constraints, and cell are
+        evaluated together by the baseline.
+        """
+        output = self.baseline.get_energy_forces_batch(
+            atoms_list,
+            get_derivatives=use_derivatives,
+        )
+        if use_derivatives:
+            energies, forces = output
+        else:
+            energies, forces = output, None
         y_base = []
-        for atoms in atoms_list:
-            atoms_base = atoms.copy()
-            atoms_base.calc = self.baseline
+        for i, atoms in enumerate(atoms_list):
+            # Adjust the energy with the constraints as in the Atoms
+            energy = energies[i]
+            for constraint in atoms.constraints:
+                if hasattr(constraint, "adjust_potential_energy"):
+                    energy += constraint.adjust_potential_energy(atoms)
+            if not use_derivatives:
+                y_base.append(np.array([energy]))
+                continue
+            # Adjust the forces with the constraints as in the Atoms
+            forces_i = np.array(forces[i], dtype=float)
+            for constraint in atoms.constraints:
+                constraint.adjust_forces(atoms, forces_i)
+            # Use the derivatives of the not fixed atoms as in the targets
+            not_masked = self.database.get_constraints(atoms)
             y_base.append(
-                self.make_targets(atoms_base, use_derivatives=use_derivatives)
+                np.concatenate([[energy], -forces_i[not_masked].reshape(-1)])
             )
         return y_base
 
@@ -457,6 +722,117 @@ class MLModel:
         full_array[not_masked] = array.reshape(-1, 3)
         return full_array
 
+    def update_derivative_selection(
+        self,
+        deriv_selection=None,
+        deriv_budget=None,
+        deriv_cutoff=None,
+        **kwargs,
+    ):
+        """
+        Update the selection of the derivative targets used in the training.
+        The existing arguments are used if they are not given.
+
+        Returns:
+            self: The updated object itself.
+        """
+        if deriv_selection is not None:
+            self.deriv_selection = deriv_selection.lower()
+            if self.deriv_selection not in ["magnitude", "distance"]:
+                raise Exception(
+                    "The derivative selection {} is not implemented.".format(
+                        deriv_selection
+                    )
+                )
+        if deriv_budget is not None:
+            self.deriv_budget = int(deriv_budget)
+        if deriv_cutoff is not None:
+            self.deriv_cutoff = float(deriv_cutoff)
+        return self
+
+    def select_derivatives(self, targets, **kwargs):
+        """
+        Select the derivative targets (forces) of the atoms used in
+        the training of each structure.
+        The derivative targets that are not used are set to NaN,
+        so the number of used derivatives can differ between structures.
+
+        Parameters:
+            targets : (N,1+3*Nat) array
+                The training targets of the structures in the database.
+
+        Returns:
+            (N,1+3*Nat) array: The training targets with the derivative
+                targets that are not used as NaN.
+        """
+        if (
+            not self.database.get_use_derivatives()
+            or (self.deriv_selection is None and self.deriv_budget is None)
+            or len(targets) == 0
+        ):
+            return targets
+        atoms_list = self.get_data_atoms()
+        targets = np.array(targets, dtype=float)
+        # Get the distances to the moving region if they are used
+        if self.deriv_selection == "distance":
+            distances = self.get_moving_distances(atoms_list)
+        for i, atoms in enumerate(atoms_list):
+            # Get the scores of the atoms without constraints
+            not_masked = self.database.get_constraints(atoms)
+            if self.deriv_selection == "distance":
+                scores = -distances[i][not_masked]
+                cutoff = None
+                if self.deriv_cutoff is not None:
+                    cutoff = -self.deriv_cutoff
+            else:
+                scores = np.linalg.norm(targets[i, 1:].reshape(-1, 3), axis=1)
+                cutoff = self.deriv_cutoff
+            # Select the atoms within the cutoff and the budget
+            i_sort = np.argsort(-scores, kind="stable")
+            if cutoff is not None:
+                i_sort = i_sort[scores[i_sort] >= cutoff]
+            if self.deriv_budget is not None:
+                i_sort = i_sort[: self.deriv_budget]
+            is_used = np.zeros(len(not_masked), dtype=bool)
+            is_used[i_sort] = True
+            targets[i, 1:].reshape(-1, 3)[~is_used] = np.nan
+        return targets
+
+    def get_moving_distances(self, atoms_list, moving_fraction=0.5, **kwargs):
+        """
+        Get the distances of the atoms to the moving region.
+        The moving region is the atoms that moved at least a fraction of
+        the largest displacement from the first structure.
+
+        Parameters:
+            atoms_list : list of ASE Atoms
+                The structures in the database.
+            moving_fraction : float
+                The fraction of the largest displacement that the atoms in
+                the moving region have moved.
+
+        Returns:
+            list of (Nat) arrays: The distances of the atoms to
+                the moving region for each structure.
+        """
+        from ase.geometry import get_distances
+
+        positions = np.array([atoms.get_positions() for atoms in atoms_list])
+        displacements = np.linalg.norm(positions - positions[0], axis=2)
+        displacements = np.max(displacements, axis=0)
+        moving = displacements >= moving_fraction * np.max(displacements)
+        distances = []
+        for atoms in atoms_list:
+            pos = atoms.get_positions()
+            dist = get_distances(
+                pos,
+                pos[moving],
+                cell=atoms.cell,
+                pbc=atoms.pbc,
+            )[1]
+            distances.append(np.min(dist, axis=1))
+        return distances
+
     def get_data(self, **kwargs):
         "Get data from the data base."
         features = self.database.get_features()
@@ -524,6 +900,9 @@ class MLModel:
             hp=self.hp,
             pdis=self.pdis,
             verbose=self.verbose,
+            deriv_selection=self.deriv_selection,
+            deriv_budget=self.deriv_budget,
+            deriv_cutoff=self.deriv_cutoff,
         )
         # Get the constants made within the class
         constant_kwargs = dict()
@@ -830,6 +1209,9 @@ def get_default_mlmodel(
     database_reduction=False,
     database_reduction_kwargs={},
     verbose=False,
+    deriv_selection=None,
+    deriv_budget=None,
+    deriv_cutoff=None,
     **kwargs,
 ):
     """
@@ -871,6 +1253,18 @@ def get_default_mlmodel(
             if it is used.
         verbose : bool
             Whether to print statements in the optimization.
+        deriv_selection : str or None
+            The selection of the derivative targets (forces) of the atoms
+            used in the training of each structure
+            ('magnitude' or 'distance').
+            All the derivative targets are used if None and
+            deriv_budget=None.
+        deriv_budget : int or None
+            The maximum number of atoms with derivative targets used for
+            each structure.
+        deriv_cutoff : float or None
+            The minimum force or the maximum distance to the moving region
+            of the atoms used for the derivative targets.
 
     Returns:
         mlmodel : MLModel class object
@@ -917,4 +1311,7 @@ def get_default_mlmodel(
         optimize=optimize_hp,
         pdis=pdis,
         verbose=verbose,
+        deriv_selection=deriv_selection,
+        deriv_budget=deriv_budget,
+        deriv_cutoff=deriv_cutoff,
     )
@@ -580,6 +580,31 @@ class EnsembleModel:
                 )
         return weights, weights_deriv
 
+    def broadcast_trained_state(self, root=0, **kwargs):
+        """
+        Broadcast the trained states of the models from the root rank
+        to all the other MPI ranks as contiguous NumPy buffers.
+
+        Parameters:
+            root : int
+                The rank of the CPU with the trained models.
+
+        Returns:
+            self: The object itself with the trained models.
+        """
+        from ase.parallel import world, broadcast
+
+        if world.size == 1:
+            return self
+        # Make the models on the other ranks
+        self.n_models = broadcast(self.n_models, root=root)
+        if world.rank != root:
+            self.models = [self.model.copy() for _ in range(self.n_models)]
+        # Broadcast the trained state of each model
+        for model in self.models:
+            model.broadcast_trained_state(root=root, **kwargs)
+        return self
+
     def get_models(self, **kwargs):
         "Get the models."
         return [model.copy() for model in self.models]
@@ -175,6 +175,15 @@ class EnsembleClustering(EnsembleModel):
             self.use_same_prior_mean = use_same_prior_mean
         return self
 
+    def broadcast_trained_state(self, root=0, **kwargs):
+        from ase.parallel import world, broadcast
+
+        if world.size == 1:
+            return self
+        # Share the fitted clustering
+        self.clustering = broadcast(self.clustering, root=root)
+        return super().broadcast_trained_state(root=root, **kwargs)
+
     def cluster(self, features, targets, **kwargs):
         "Cluster the data."
         if isinstance(features[0], (np.ndarray, list)):
@@ -7,6 +7,7 @@ class Cartesian(Fingerprint):
         self,
         reduce_dimensions=True,
         use_derivatives=True,
+        dtype=float,
         **kwargs,
     ):
         """
@@ -20,11 +21,15 @@ class Cartesian(Fingerprint):
             use_derivatives : bool
                 Calculate and store derivatives of the fingerprint wrt.
                 the cartesian coordinates.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
         """
         # Set the arguments
         super().__init__(
             reduce_dimensions=reduce_dimensions,
             use_derivatives=use_derivatives,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -8,6 +8,7 @@ class Fingerprint:
         self,
         reduce_dimensions=True,
         use_derivatives=True,
+        dtype=float,
         **kwargs,
     ):
         """
@@ -20,11 +21,17 @@ class Fingerprint:
             use_derivatives : bool
                 Calculate and store derivatives of the fingerprint wrt.
                 the cartesian coordinates.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
         """
+        # All the atoms without constraints are used as default
+        self.active_atoms = None
         # Set the arguments
         self.update_arguments(
             reduce_dimensions=reduce_dimensions,
             use_derivatives=use_derivatives,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -49,8 +56,11 @@ class Fingerprint:
             masked=masked,
             **kwargs,
         )
+        # Store the arrays with the data type of the fingerprint
+        vector = np.asarray(vector, dtype=self.dtype)
         # Make the fingerprint object and store the arrays within
         if self.use_derivatives:
+            derivative = np.asarray(derivative, dtype=self.dtype)
             return FingerprintObject(vector=vector, derivative=derivative)
         return FingerprintObject(vector=vector, derivative=None)
 
@@ -69,6 +79,7 @@ class Fingerprint:
         self,
         reduce_dimensions=None,
         use_derivatives=None,
+        dtype=None,
         **kwargs,
     ):
         """
@@ -81,6 +92,9 @@ class Fingerprint:
             use_derivatives : bool
                 Calculate and store derivatives of the fingerprint wrt.
                 the cartesian coordinates.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
 
         Returns:
             self: The updated instance itself.
@@ -89,12 +103,90 @@ class Fingerprint:
             self.reduce_dimensions = reduce_dimensions
         if use_derivatives is not None:
             self.use_derivatives = use_derivatives
+        if dtype is not None:
+            self.dtype = dtype
         return self
 
     def make_fingerprint(self, atoms, not_masked, masked, **kwargs):
         "The calculation of the fingerprint"
         raise NotImplementedError()
 
+    def set_reference(self, atoms, fixed_indicies, **kwargs):
+        """
+        Set a reference structure where some atoms are at the same positions
+        in all the following structures (e.g. the slab when only
+        the adsorbate is moved).
+        The fingerprint can then only update the contributions of
+        the moved atoms.
+        The reference is not used by this fingerprint.
+
+        Parameters:
+            atoms : ASE Atoms
+                The reference ASE Atoms object.
+            fixed_indicies : list
+                The indicies of the atoms that are not moved.
+
+        Returns:
+            self: The updated instance itself.
+        """
+        return self
+
+    def reset_reference(self, **kwargs):
+        """
+        Remove the reference structure.
+
+        Returns:
+            self: The updated instance itself.
+        """
+        return self
+
+    def set_active_atoms(self, active_atoms, **kwargs):
+        """
+        Set the atoms in the active subspace (e.g. the atoms that move
+        along a reaction path).
+        The atoms that are not in the active subspace are treated as
+        fixed atoms if reduce_dimensions=True.
+
+        Parameters:
+            active_atoms : list or None
+                The indicies of the atoms in the active subspace.
+                All the atoms are used if None.
+
+        Returns:
+            self: The updated instance itself.
+        """
+        if active_atoms is None:
+            self.active_atoms = None
+        else:
+            self.active_atoms = np.unique(np.array(active_atoms, dtype=int))
+        return self
+
+    def get_active_atoms(self, **kwargs):
+        """
+        Get the indicies of the atoms in the active subspace.
+
+        Returns:
+            (Na) array or None: The indicies of the atoms in
+                the active subspace or None if all the atoms are used.
+        """
+        return self.active_atoms
+
+    def get_length_groups(self, atoms, **kwargs):
+        """
+        Get the length-scale group of each fingerprint dimension,
+        which can be used by kernels with grouped length-scales.
+        All the fingerprint dimensions are in the same group as default.
+
+        Parameters:
+            atoms : ASE Atoms
+                The ASE Atoms object used to make the fingerprint.
+
+        Returns:
+            (D) array: The index of the length-scale group of
+                each fingerprint dimension.
+        """
+        return np.zeros(len(self(atoms).get_vector()), dtype=int)
+
     def get_constraints(self, atoms, **kwargs):
         """
         Get the indicies of the atoms that does not have fixed constraints.
@@ -115,6 +207,7 @@ class Fingerprint:
         if not self.reduce_dimensions:
             return not_masked, []
         constraints = atoms.constraints
+        masked = []
         if len(constraints) > 0:
             masked = np.concatenate(
                 [
@@ -124,8 +217,14 @@ class Fingerprint:
                 ]
             )
             masked = set(masked)
-            return list(set(not_masked).difference(masked)), list(masked)
-        return not_masked, []
+            not_masked = list(set(not_masked).difference(masked))
+            masked = list(masked)
+        # The atoms outside the active subspace are treated as fixed
+        if self.active_atoms is not None:
+            active_atoms = set(self.active_atoms)
+            masked = masked + [i for i in not_masked if i not in active_atoms]
+            not_masked = [i for i in not_masked if i in active_atoms]
+        return not_masked, masked
 
     def get_arguments(self):
         "Get the arguments of the class itself."
@@ -133,9 +232,10 @@ class Fingerprint:
         arg_kwargs = dict(
             reduce_dimensions=self.reduce_dimensions,
             use_derivatives=self.use_derivatives,
+            dtype=self.dtype,
         )
         # Get the constants made within the class
-        constant_kwargs = dict()
+        constant_kwargs = dict(active_atoms=self.active_atoms)
         # Get the objects made within the class
         object_kwargs = dict()
         return arg_kwargs, constant_kwargs, object_kwargs
@@ -8,6 +8,7 @@ class FingerprintWrapperGPAtom(Fingerprint):
         fingerprint,
         reduce_dimensions=True,
         use_derivatives=True,
+        dtype=float,
         **kwargs,
     ):
         """
@@ -24,11 +25,15 @@ class FingerprintWrapperGPAtom(Fingerprint):
             use_derivatives: bool
                 Calculate and store derivatives of the fingerprint wrt.
                 the cartesian coordinates.
+            dtype: type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
         """
         super().__init__(
             fingerprint=fingerprint,
             reduce_dimensions=reduce_dimensions,
             use_derivatives=use_derivatives,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -37,6 +42,7 @@ class FingerprintWrapperGPAtom(Fingerprint):
         fingerprint=None,
         reduce_dimensions=None,
         use_derivatives=None,
+        dtype=None,
         **kwargs,
     ):
         """
@@ -51,6 +57,9 @@ class FingerprintWrapperGPAtom(Fingerprint):
             use_derivatives: bool
                 Calculate and store derivatives of the fingerprint wrt.
                 the cartesian coordinates.
+            dtype: type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
 
         Returns:
             self: The updated instance itself.
@@ -61,6 +70,8 @@ class FingerprintWrapperGPAtom(Fingerprint):
             self.reduce_dimensions = reduce_dimensions
         if use_derivatives is not None:
             self.use_derivatives = use_derivatives
+        if dtype is not None:
+            self.dtype = dtype
         return self
 
     def make_fingerprint(self, atoms, not_masked, masked, **kwargs):
@@ -84,9 +95,10 @@ class FingerprintWrapperGPAtom(Fingerprint):
             fingerprint=self.fingerprint,
             reduce_dimensions=self.reduce_dimensions,
             use_derivatives=self.use_derivatives,
+            dtype=self.dtype,
         )
         # Get the constants made within the class
-        constant_kwargs = dict()
+        constant_kwargs = dict(active_atoms=self.active_atoms)
         # Get the objects made within the class
         object_kwargs = dict()
         return arg_kwargs, constant_kwargs, object_kwargs
@@ -99,6 +111,7 @@ class FingerprintWrapperDScribe(Fingerprint):
         reduce_dimensions=True,
         use_derivatives=True,
         fingerprint_kwargs={},
+        dtype=float,
         **kwargs,
     ):
         """
@@ -117,12 +130,16 @@ class FingerprintWrapperDScribe(Fingerprint):
                 the cartesian coordinates.
             fingerprint_kwargs: dict
                 Kwargs for the fingerprint function call.
+            dtype: type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
         """
         super().__init__(
             fingerprint=fingerprint,
             reduce_dimensions=reduce_dimensions,
             use_derivatives=use_derivatives,
             fingerprint_kwargs=fingerprint_kwargs,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -132,6 +149,7 @@ class FingerprintWrapperDScribe(Fingerprint):
         reduce_dimensions=None,
         use_derivatives=None,
         fingerprint_kwargs=None,
+        dtype=None,
         **kwargs,
     ):
         """
@@ -148,6 +166,9 @@ class FingerprintWrapperDScribe(Fingerprint):
                 the cartesian coordinates.
             fingerprint_kwargs: dict
                 Kwargs for the fingerprint function call.
+            dtype: type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
 
         Returns:
             self: The updated instance itself.
@@ -160,6 +181,8 @@ class FingerprintWrapperDScribe(Fingerprint):
             self.use_derivatives = use_derivatives
         if fingerprint_kwargs is not None:
             self.fingerprint_kwargs = fingerprint_kwargs.copy()
+        if dtype is not None:
+            self.dtype = dtype
         return self
 
     def make_fingerprint(self, atoms, not_masked, masked, **kwargs):
@@ -189,9 +212,10 @@ class FingerprintWrapperDScribe(Fingerprint):
             reduce_dimensions=self.reduce_dimensions,
             use_derivatives=self.use_derivatives,
             fingerprint_kwargs=self.fingerprint_kwargs,
+            dtype=self.dtype,
         )
         # Get the constants made within the class
-        constant_kwargs = dict()
+        constant_kwargs = dict(active_atoms=self.active_atoms)
         # Get the objects made within the class
         object_kwargs = dict()
         return arg_kwargs, constant_kwargs, object_kwargs
@@ -286,58 +286,30 @@ def get_inverse_distances(
             covrad = covrad[nmj_ind] + covrad[nmi_ind]
     else:
         covrad = 1.0
+    # Get the distances and the distance vectors
+    use_softmax = periodic_softmax and atoms.pbc.any()
+    distances, vec_distances = get_all_distances(
+        atoms,
+        not_masked=not_masked,
+        masked=masked,
+        nmi=nmi,
+        nmj_ind=nmj_ind,
+        mic=(mic and not use_softmax),
+        vector=(use_derivatives or use_softmax),
+        wrap=wrap,
+        **kwargs,
+    )
     # Get inverse distances
-    if periodic_softmax and atoms.pbc.any():
-        # Use a softmax function to weight the inverse distances
-        distances, vec_distances = get_all_distances(
-            atoms,
-            not_masked=not_masked,
-            masked=masked,
-            nmi=nmi,
-            nmj_ind=nmj_ind,
-            mic=False,
-            vector=True,
-            wrap=wrap,
-            **kwargs,
-        )
-        # Calculate all displacement vectors from the cell vectors
-        cells_p = get_periodicities(atoms.get_cell(), atoms.pbc, remove0=False)
-        c_dim = len(cells_p)
-        # Calculate the distances to the atoms in all unit cell
-        d = vec_distances + cells_p.reshape(c_dim, 1, 3)
-        # Add small number to avoid division by zero to the distances
-        dnorm = np.linalg.norm(d, axis=-1) + eps
-        # Calculate weights
-        dcov = dnorm / covrad
-        w = np.exp(-(dcov**2))
-        w = w / np.sum(w, axis=0)
-        # Calculate inverse distances
-        finner = w / dcov
-        f = np.sum(finner, axis=0)
-        # Calculate derivatives of inverse distances
-        if use_derivatives:
-            inner = (2.0 * (1.0 - (dcov * f))) / (covrad**2)
-            inner = inner + (1.0 / (dnorm**2))
-            gij = np.sum(d * (finner * inner).reshape(c_dim, -1, 1), axis=0)
-    else:
-        distances, vec_distances = get_all_distances(
-            atoms,
-            not_masked=not_masked,
-            masked=masked,
-            nmi=nmi,
-            nmj_ind=nmj_ind,
-            mic=mic,
-            vector=use_derivatives,
-            wrap=wrap,
-            **kwargs,
-        )
-        # Add small number to avoid division by zero to the distances
-        distances = distances + eps
-        # Calculate inverse distances
-        f = covrad / distances
-        # Calculate derivatives of inverse distances
-        if use_derivatives:
-            gij = vec_distances * (covrad / (distances**3)).reshape(-1, 1)
+    f, gij = get_pair_inverse_distances(
+        distances,
+        vec_distances,
+        covrad,
+        atoms.get_cell(),
+        atoms.pbc,
+        use_derivatives=use_derivatives,
+        periodic_softmax=periodic_softmax,
+        eps=eps,
+    )
     if use_derivatives:
         # Convert derivatives to the right matrix form
         n_total = len(f)
@@ -359,3 +331,56 @@ def get_inverse_distances(
             g[i_g, j_gj] = -g[i_g, j_gi]
         return f, g
     return f, None
+
+
+def get_pair_inverse_distances(
+    distances,
+    vec_distances,
+    covrad,
+    cell,
+    pbc,
+    use_derivatives=True,
+    periodic_softmax=True,
+    eps=1e-16,
+    **kwargs,
+):
+    """
+    Get the inverse distances of the atom pairs from their distances
+    and distance vectors.
+    The derivatives with respect to the distance vectors
+    can also be obtained.
+    The distance vectors must be given if the derivatives are used or
+    the softmax weighting is used for periodic boundary conditions.
+    """
+    if periodic_softmax and pbc.any():
+        # Use a softmax function to weight the inverse distances
+        # Calculate all displacement vectors from the cell vectors
+        cells_p = get_periodicities(cell, pbc, remove0=False)
+        c_dim = len(cells_p)
+        # Calculate the distances to the atoms in all unit cell
+        d = vec_distances + cells_p.reshape(c_dim, 1, 3)
+        # Add small number to avoid division by zero to the distances
+        dnorm = np.linalg.norm(d, axis=-1) + eps
+        # Calculate weights
+        dcov = dnorm / covrad
+        w = np.exp(-(dcov**2))
+        w = w / np.sum(w, axis=0)
+        # Calculate inverse distances
+        finner = w / dcov
+        f = np.sum(finner, axis=0)
+        # Calculate derivatives of inverse distances
+        if use_derivatives:
+            inner = (2.0 * (1.0 - (dcov * f))) / (covrad**2)
+            inner = inner + (1.0 / (dnorm**2))
+            gij = np.sum(d * (finner * inner).reshape(c_dim, -1, 1), axis=0)
+            return f, gij
+        return f, None
+    # Add small number to avoid division by zero to the distances
+    distances = distances + eps
+    # Calculate inverse distances
+    f = covrad / distances
+    # Calculate derivatives of inverse distances
+    if use_derivatives:
+        gij = vec_distances * (covrad / (distances**3)).reshape(-1, 1)
+        return f, gij
+    return f, None
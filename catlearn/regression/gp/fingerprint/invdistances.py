@@ -1,7 +1,13 @@
 import numpy as np
 import itertools
+from scipy.sparse import csr_matrix
 from .fingerprint import Fingerprint
-from .geometry import get_inverse_distances
+from ase.data import covalent_radii
+from .geometry import (
+    get_inverse_distances,
+    get_pair_inverse_distances,
+    mic_distance,
+)
 
 
 class InvDistances(Fingerprint):
@@ -13,6 +19,7 @@ class InvDistances(Fingerprint):
         mic=False,
         wrap=True,
         eps=1e-16,
+        dtype=float,
         **kwargs,
     ):
         """
@@ -40,7 +47,15 @@ class InvDistances(Fingerprint):
                 Whether to wrap the atoms to the unit cell or not.
             eps : float
                 Small number to avoid division by zero.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
         """
+        # The reference structure with the fixed atoms is not set
+        self.reference = None
+        # The index tables are not made
+        self.index_key = None
+        self.index_tables = None
         # Set the arguments
         super().__init__(
             reduce_dimensions=reduce_dimensions,
@@ -49,6 +64,7 @@ class InvDistances(Fingerprint):
             mic=mic,
             wrap=wrap,
             eps=eps,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -60,6 +76,7 @@ class InvDistances(Fingerprint):
         mic=None,
         wrap=None,
         eps=None,
+        dtype=None,
         **kwargs,
     ):
         """
@@ -85,6 +102,9 @@ class InvDistances(Fingerprint):
                 Whether to wrap the atoms to the unit cell or not.
             eps : float
                 Small number to avoid division by zero.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
 
         Returns:
             self: The updated instance itself.
@@ -101,6 +121,8 @@ class InvDistances(Fingerprint):
             self.wrap = wrap
         if eps is not None:
             self.eps = abs(float(eps))
+        if dtype is not None:
+            self.dtype = dtype
         return self
 
     def make_fingerprint(self, atoms, not_masked, masked, **kwargs):
@@ -173,9 +195,22 @@ class InvDistances(Fingerprint):
         **kwargs,
     ):
         # Get the indicies for not fixed and not fixed atoms interactions
-        nmi, nmj = np.triu_indices(n_nmasked, k=1, m=None)
-        nmi_ind = not_masked[nmi]
-        nmj_ind = not_masked[nmj]
+        tables = self.get_index_tables(atoms, not_masked, masked)
+        nmi, nmj = tables["nmi"], tables["nmj"]
+        nmi_ind, nmj_ind = tables["nmi_ind"], tables["nmj_ind"]
+        # Only calculate the pairs with moved atoms if the reference is used
+        if self.use_reference(atoms):
+            f, g = self.get_reference_contributions(
+                atoms,
+                not_masked,
+                masked,
+                nmi,
+                nmj,
+                nmi_ind,
+                nmj_ind,
+                **kwargs,
+            )
+            return f, g, nmi, nmj
         f, g = get_inverse_distances(
             atoms,
             not_masked=not_masked,
@@ -194,6 +229,335 @@ class InvDistances(Fingerprint):
         )
         return f, g, nmi, nmj
 
+    def get_index_tables(self, atoms, not_masked, masked, **kwargs):
+        """
+        Get the tables of the indicies of the atom pairs and
+        the indicies of the pairs for each combination of the atom types.
+        The tables are stored and only made again when the atomic numbers,
+        the tags, or the constraints of the atoms are changed.
+
+        Parameters:
+            atoms : ASE Atoms
+                The ASE Atoms object.
+            not_masked : (Nnm) array
+                The indicies of the atoms that are not fixed.
+            masked : (Nm) array
+                The indicies of the atoms that are fixed.
+
+        Returns:
+            dict: The index tables of the pairs.
+        """
+        not_masked = np.asarray(not_masked, dtype=int)
+        masked = np.asarray(masked, dtype=int)
+        key = (
+            atoms.get_atomic_numbers().tobytes(),
+            atoms.get_tags().tobytes(),
+            not_masked.tobytes(),
+            masked.tobytes(),
+        )
+        if key == self.index_key:
+            return self.index_tables
+        # Set parameters of array sizes
+        n_atoms = len(atoms)
+        n_nmasked = len(not_masked)
+        n_masked = n_atoms - n_nmasked
+        n_nm_m = n_nmasked * n_masked
+        n_total = n_nm_m + int(0.5 * n_nmasked * (n_nmasked - 1))
+        i_nm = np.arange(n_nmasked)
+        i_m = np.arange(n_masked)
+        # Get the indicies for not fixed and not fixed atoms interactions
+        nmi, nmj = np.triu_indices(n_nmasked, k=1, m=None)
+        # Get all the indicies of the interactions
+        indicies_nm_m, indicies_nm_nm = self.get_indicies(
+            n_nmasked,
+            n_masked,
+            n_total,
+            n_nm_m,
+            nmi,
+            nmj,
+        )
+        # Get all informations of the atoms and split them into types
+        nmasked_indicies, masked_indicies, n_unique = self.element_setup(
+            atoms,
+            np.arange(n_atoms),
+            not_masked,
+            masked,
+            i_nm,
+            i_m,
+            nm_bool=True,
+        )
+        # Get the pair indicies for all combinations of the atom types
+        comb_indicies = []
+        comb_lengths = []
+        for ci, cj in zip(*np.triu_indices(n_unique, k=0, m=None)):
+            indicies_comb, len_i_comb = self.get_indicies_combination(
+                ci,
+                cj,
+                nmasked_indicies,
+                masked_indicies,
+                indicies_nm_m,
+                indicies_nm_nm,
+            )
+            if len_i_comb:
+                comb_indicies.extend(indicies_comb)
+                comb_lengths.append(len_i_comb)
+        comb_indicies = np.array(comb_indicies, dtype=int)
+        comb_lengths = np.array(comb_lengths, dtype=int)
+        n_comb = len(comb_lengths)
+        # Get the combination of each pair
+        comb_segments = np.zeros(n_total, dtype=int)
+        comb_segments[comb_indicies] = np.repeat(
+            np.arange(n_comb),
+            comb_lengths,
+        )
+        # Make the sparse matrix that sums the pairs of each combination
+        comb_matrix = csr_matrix(
+            (np.ones(n_total), (comb_segments, np.arange(n_total))),
+            shape=(n_comb, n_total),
+        )
+        self.index_key = key
+        self.index_tables = dict(
+            nmi=nmi,
+            nmj=nmj,
+            nmi_ind=not_masked[nmi],
+            nmj_ind=not_masked[nmj],
+            comb_indicies=comb_indicies,
+            comb_lengths=comb_lengths,
+            comb_segments=comb_segments,
+            comb_matrix=comb_matrix,
+        )
+        return self.index_tables
+
+    def get_length_groups(self, atoms, **kwargs):
+        """
+        Get the length-scale group of each fingerprint dimension.
+        The pairs of each combination of the atom types are in
+        the same group.
+
+        Parameters:
+            atoms : ASE Atoms
+                The ASE Atoms object used to make the fingerprint.
+
+        Returns:
+            (D) array: The index of the length-scale group of
+                each fingerprint dimension.
+        """
+        not_masked, masked = self.get_constraints(atoms)
+        tables = self.get_index_tables(atoms, not_masked, masked)
+        return tables["comb_segments"].copy()
+
+    def set_reference(self, atoms, fixed_indicies, **kwargs):
+        """
+        Set a reference structure where some atoms are at the same positions
+        in all the following structures (e.g. the slab when only
+        the adsorbate is moved).
+        The contributions of the pairs of the fixed atoms are calculated
+        once and only the pairs with moved atoms are recalculated for
+        structures where the fixed atoms are at the reference positions.
+
+        Parameters:
+            atoms : ASE Atoms
+                The reference ASE Atoms object.
+            fixed_indicies : list
+                The indicies of the atoms that are not moved.
+
+        Returns:
+            self: The updated instance itself.
+        """
+        fixed = np.zeros(len(atoms), dtype=bool)
+        fixed[np.array(fixed_indicies, dtype=int)] = True
+        self.reference = dict(
+            numbers=atoms.get_atomic_numbers().copy(),
+            cell=np.array(atoms.get_cell()),
+            pbc=atoms.pbc.copy(),
+            fixed=fixed,
+            positions=atoms.get_positions(wrap=self.wrap)[fixed],
+            settings=None,
+        )
+        return self
+
+    def reset_reference(self, **kwargs):
+        """
+        Remove the reference structure.
+
+        Returns:
+            self: The updated instance itself.
+        """
+        self.reference = None
+        return self
+
+    def use_reference(self, atoms, **kwargs):
+        """
+        Check if the fixed atoms of the reference structure are
+        at the same positions in the structure.
+        """
+        ref = self.reference
+        if ref is None or len(atoms) != len(ref["numbers"]):
+            return False
+        if not (
+            np.array_equal(atoms.get_atomic_numbers(), ref["numbers"])
+            and np.array_equal(atoms.pbc, ref["pbc"])
+            and np.array_equal(atoms.get_cell(), ref["cell"])
+        ):
+            return False
+        pos = atoms.get_positions(wrap=self.wrap)
+        return np.array_equal(pos[ref["fixed"]], ref["positions"])
+
+    def get_reference_contributions(
+        self,
+        atoms,
+        not_masked,
+        masked,
+        nmi,
+        nmj,
+        nmi_ind,
+        nmj_ind,
+        **kwargs,
+    ):
+        """
+        Get the inverse distances and their derivatives, where only
+        the pairs with moved atoms are calculated and the contributions
+        of the pairs of the fixed atoms are reused from the reference.
+        The stored arrays are updated in place, so the returned arrays
+        must be copied before they are modified.
+        """
+        ref = self.reference
+        settings = (
+            self.use_derivatives,
+            self.periodic_softmax,
+            self.mic,
+            self.wrap,
+            self.eps,
+        )
+        # Calculate all the pairs if they are not stored
+        if (
+            ref["settings"] != settings
+            or not np.array_equal(ref["not_masked"], not_masked)
+            or not np.array_equal(ref["masked"], masked)
+        ):
+            f, g = get_inverse_distances(
+                atoms,
+                not_masked=not_masked,
+                masked=masked,
+                nmi=nmi,
+                nmj=nmj,
+                nmi_ind=nmi_ind,
+                nmj_ind=nmj_ind,
+                use_derivatives=self.use_derivatives,
+                use_covrad=True,
+                periodic_softmax=self.periodic_softmax,
+                mic=self.mic,
+                wrap=self.wrap,
+                eps=self.eps,
+                **kwargs,
+            )
+            self.store_reference_contributions(
+                atoms,
+                f,
+                g,
+                not_masked,
+                masked,
+                nmi,
+                nmj,
+                nmi_ind,
+                nmj_ind,
+                settings,
+            )
+            return f, g
+        # Get the distance vectors of the pairs with moved atoms
+        pos = atoms.get_positions(wrap=self.wrap)
+        vec_distances = pos[ref["pair_j"]] - pos[ref["pair_i"]]
+        cell = atoms.get_cell()
+        if self.periodic_softmax and atoms.pbc.any():
+            distances = None
+        elif self.mic and atoms.pbc.any():
+            distances, vec_distances = mic_distance(
+                vec_distances,
+                np.array(cell),
+                atoms.pbc,
+                vector=True,
+            )
+        else:
+            distances = np.linalg.norm(vec_distances, axis=-1)
+        # Calculate the inverse distances of the pairs with moved atoms
+        f_pairs, g_pairs = get_pair_inverse_distances(
+            distances,
+            vec_distances,
+            ref["covrad"],
+            cell,
+            atoms.pbc,
+            use_derivatives=self.use_derivatives,
+            periodic_softmax=self.periodic_softmax,
+            eps=self.eps,
+        )
+        # Update the contributions of the pairs with moved atoms
+        f = ref["f"]
+        f[ref["pairs"]] = f_pairs
+        if not self.use_derivatives:
+            return f, None
+        g = ref["g"]
+        g[ref["g_rows"], ref["g_cols_i"]] = g_pairs.reshape(-1)
+        g[ref["g_rows_j"], ref["g_cols_j"]] = -g_pairs[
+            ref["pairs_nm"]
+        ].reshape(-1)
+        return f, g
+
+    def store_reference_contributions(
+        self,
+        atoms,
+        f,
+        g,
+        not_masked,
+        masked,
+        nmi,
+        nmj,
+        nmi_ind,
+        nmj_ind,
+        settings,
+        **kwargs,
+    ):
+        """
+        Store the contributions of all the pairs and the indicies of
+        the pairs with moved atoms in the reference.
+        """
+        ref = self.reference
+        n_nmasked = len(not_masked)
+        n_masked = len(masked)
+        # Get the atoms and derivative columns of all the pairs
+        pair_i = np.concatenate([np.repeat(not_masked, n_masked), nmi_ind])
+        pair_j = np.concatenate([np.tile(masked, n_nmasked), nmj_ind])
+        col_i = np.concatenate(
+            [np.repeat(np.arange(n_nmasked), n_masked), nmi]
+        )
+        col_j = np.concatenate(
+            [np.full(n_nmasked * n_masked, -1, dtype=int), nmj]
+        )
+        # Find the pairs with moved atoms
+        moved = ~ref["fixed"]
+        pairs = np.where(moved[pair_i] | moved[pair_j])[0]
+        pairs_nm = np.where(col_j[pairs] >= 0)[0]
+        covrad = covalent_radii[atoms.get_atomic_numbers()]
+        xyz = np.array([0, 1, 2])
+        ref.update(
+            settings=settings,
+            not_masked=not_masked.copy(),
+            masked=masked.copy(),
+            f=f.copy(),
+            g=None if g is None else g.copy(),
+            pairs=pairs,
+            pairs_nm=pairs_nm,
+            pair_i=pair_i[pairs],
+            pair_j=pair_j[pairs],
+            covrad=covrad[pair_i[pairs]] + covrad[pair_j[pairs]],
+            g_rows=np.repeat(pairs, 3),
+            g_cols_i=(3 * col_i[pairs].reshape(-1, 1) + xyz).reshape(-1),
+            g_rows_j=np.repeat(pairs[pairs_nm], 3),
+            g_cols_j=(
+                3 * col_j[pairs[pairs_nm]].reshape(-1, 1) + xyz
+            ).reshape(-1),
+        )
+        return ref
+
     def get_indicies(
         self,
         n_nmasked,
@@ -267,9 +631,10 @@ class InvDistances(Fingerprint):
             mic=self.mic,
             wrap=self.wrap,
             eps=self.eps,
+            dtype=self.dtype,
         )
         # Get the constants made within the class
-        constant_kwargs = dict()
+        constant_kwargs = dict(active_atoms=self.active_atoms)
         # Get the objects made within the class
         object_kwargs = dict()
         return arg_kwargs, constant_kwargs, object_kwargs
@@ -10,6 +10,7 @@ class InvDistances2(InvDistances):
         mic=False,
         wrap=True,
         eps=1e-16,
+        dtype=float,
         **kwargs,
     ):
         """
@@ -37,6 +38,9 @@ class InvDistances2(InvDistances):
                 Whether to wrap the atoms to the unit cell or not.
             eps : float
                 Small number to avoid division by zero.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
         """
         # Set the arguments
         super().__init__(
@@ -46,6 +50,7 @@ class InvDistances2(InvDistances):
             mic=mic,
             wrap=wrap,
             eps=eps,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -11,6 +11,7 @@ class MeanDistances(InvDistances):
         mic=False,
         wrap=True,
         eps=1e-16,
+        dtype=float,
         **kwargs,
     ):
         """
@@ -38,6 +39,9 @@ class MeanDistances(InvDistances):
                 Whether to wrap the atoms to the unit cell or not.
             eps : float
                 Small number to avoid division by zero.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
         """
         # Set the arguments
         super().__init__(
@@ -47,6 +51,7 @@ class MeanDistances(InvDistances):
             mic=mic,
             wrap=wrap,
             eps=eps,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -62,9 +67,7 @@ class MeanDistances(InvDistances):
         # Make indicies arrays
         not_masked = np.array(not_masked, dtype=int)
         masked = np.array(masked, dtype=int)
-        indicies = np.arange(n_atoms)
         i_nm = np.arange(n_nmasked)
-        i_m = np.arange(n_masked)
         # Calculate all the fingerprints and their derivatives
         fij, gij, nmi, nmj = self.get_contributions(
             atoms,
@@ -76,49 +79,42 @@ class MeanDistances(InvDistances):
             n_masked,
             n_nm_m,
         )
-        # Get all the indicies of the interactions
-        indicies_nm_m, indicies_nm_nm = self.get_indicies(
-            n_nmasked,
-            n_masked,
-            n_total,
-            n_nm_m,
-            nmi,
-            nmj,
-        )
-        # Make the arrays of fingerprints and their derivatives
-        f = []
-        g = []
-        # Get all informations of the atoms and split them into types
-        nmasked_indicies, masked_indicies, n_unique = self.element_setup(
-            atoms,
-            indicies,
-            not_masked,
-            masked,
-            i_nm,
-            i_m,
-            nm_bool=True,
+        # Get the pair indicies for each combination of the atom types
+        tables = self.get_index_tables(atoms, not_masked, masked)
+        # Mean the fingerprints for the combinations
+        return self.mean_fp(
+            fij,
+            gij,
+            tables["comb_segments"],
+            tables["comb_matrix"],
+            tables["comb_lengths"],
         )
-        # Get all combinations of the atom types
-        combinations = zip(*np.triu_indices(n_unique, k=0, m=None))
-        # Run over all combinations
-        for ci, cj in combinations:
-            # Find the indicies in the fingerprints for the combinations
-            indicies_comb, len_i_comb = self.get_indicies_combination(
-                ci,
-                cj,
-                nmasked_indicies,
-                masked_indicies,
-                indicies_nm_m,
-                indicies_nm_nm,
-            )
-            if len_i_comb:
-                # Mean the fingerprints for the combinations
-                f, g = self.mean_fp(f, g, fij, gij, indicies_comb)
-        return np.array(f), np.array(g)
 
-    def mean_fp(self, f, g, fij, gij, indicies_comb, **kwargs):
-        "Mean of the fingerprints."
-        f.append(np.mean(fij[indicies_comb]))
+    def get_length_groups(self, atoms, **kwargs):
+        # Each combination of the atom types is a fingerprint dimension
+        not_masked, masked = self.get_constraints(atoms)
+        tables = self.get_index_tables(atoms, not_masked, masked)
+        return np.arange(len(tables["comb_lengths"]))
+
+    def mean_fp(
+        self,
+        fij,
+        gij,
+        comb_segments,
+        comb_matrix,
+        comb_lengths,
+        **kwargs,
+    ):
+        """
+        Mean of the fingerprints for each combination of the atom types
+        with segment reductions.
+        """
+        f = np.bincount(
+            comb_segments,
+            weights=fij,
+            minlength=comb_matrix.shape[0],
+        )
+        f = f / comb_lengths
         if self.use_derivatives:
-            g.append(np.mean(gij[indicies_comb], axis=0))
-        return f, g
+            return f, (comb_matrix @ gij) / comb_lengths.reshape(-1, 1)
+        return f, None
@@ -11,6 +11,7 @@ class SortedDistances(InvDistances):
         mic=False,
         wrap=True,
         eps=1e-16,
+        dtype=float,
         **kwargs,
     ):
         """
@@ -38,6 +39,9 @@ class SortedDistances(InvDistances):
                 Whether to wrap the atoms to the unit cell or not.
             eps : float
                 Small number to avoid division by zero.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
         """
         # Set the arguments
         super().__init__(
@@ -47,6 +51,7 @@ class SortedDistances(InvDistances):
             mic=mic,
             wrap=wrap,
             eps=eps,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -62,9 +67,7 @@ class SortedDistances(InvDistances):
         # Make indicies arrays
         not_masked = np.array(not_masked, dtype=int)
         masked = np.array(masked, dtype=int)
-        indicies = np.arange(n_atoms)
         i_nm = np.arange(n_nmasked)
-        i_m = np.arange(n_masked)
         # Calculate all the fingerprints and their derivatives
         fij, gij, nmi, nmj = self.get_contributions(
             atoms,
@@ -76,72 +79,32 @@ class SortedDistances(InvDistances):
             n_masked,
             n_nm_m,
         )
-        # Get all the indicies of the interactions
-        indicies_nm_m, indicies_nm_nm = self.get_indicies(
-            n_nmasked,
-            n_masked,
-            n_total,
-            n_nm_m,
-            nmi,
-            nmj,
+        # Get the pair indicies for each combination of the atom types
+        tables = self.get_index_tables(atoms, not_masked, masked)
+        # Sort the fingerprints for the combinations
+        return self.sort_fp(
+            fij,
+            gij,
+            tables["comb_indicies"],
+            tables["comb_lengths"],
         )
-        # Make the arrays of fingerprints and their derivatives
-        f = np.zeros(n_total)
-        g = np.zeros((n_total, int(n_nmasked * 3)))
-        # Get all informations of the atoms and split them into types
-        nmasked_indicies, masked_indicies, n_unique = self.element_setup(
-            atoms,
-            indicies,
-            not_masked,
-            masked,
-            i_nm,
-            i_m,
-            nm_bool=True,
-        )
-        # Get all combinations of the atom types
-        combinations = zip(*np.triu_indices(n_unique, k=0, m=None))
-        temp_len = 0
-        # Run over all combinations
-        for ci, cj in combinations:
-            # Find the indicies in the fingerprints for the combinations
-            indicies_comb, len_i_comb = self.get_indicies_combination(
-                ci,
-                cj,
-                nmasked_indicies,
-                masked_indicies,
-                indicies_nm_m,
-                indicies_nm_nm,
-            )
-            if len_i_comb:
-                # Sort the fingerprints for the combinations
-                len_new = temp_len + len_i_comb
-                f, g = self.sort_fp(
-                    f,
-                    g,
-                    fij,
-                    gij,
-                    indicies_comb,
-                    temp_len,
-                    len_new,
-                )
-                temp_len = len_new
-        return f, g
 
-    def sort_fp(
-        self,
-        f,
-        g,
-        fij,
-        gij,
-        indicies_comb,
-        temp_len,
-        len_new,
-        **kwargs,
-    ):
-        "Sort the fingerprints after inverse distance magnitude."
-        i_sort = np.argsort(fij[indicies_comb])[::-1]
-        i_sort = np.array(indicies_comb)[i_sort]
-        f[temp_len:len_new] = fij[i_sort]
+    def get_length_groups(self, atoms, **kwargs):
+        # The sorted pairs are kept within their combination
+        not_masked, masked = self.get_constraints(atoms)
+        tables = self.get_index_tables(atoms, not_masked, masked)
+        comb_lengths = tables["comb_lengths"]
+        return np.repeat(np.arange(len(comb_lengths)), comb_lengths)
+
+    def sort_fp(self, fij, gij, comb_indicies, comb_lengths, **kwargs):
+        """
+        Sort the fingerprints after inverse distance magnitude
+        within each combination of the atom types.
+        """
+        # Sort all the combinations at once with the combinations as keys
+        segments = np.repeat(np.arange(len(comb_lengths)), comb_lengths)
+        i_sort = np.lexsort((-fij[comb_indicies], segments))
+        i_sort = comb_indicies[i_sort]
         if self.use_derivatives:
-            g[temp_len:len_new] = gij[i_sort]
-        return f, g
+            return fij[i_sort], gij[i_sort]
+        return fij[i_sort], None
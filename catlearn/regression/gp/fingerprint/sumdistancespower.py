@@ -13,6 +13,7 @@ class SumDistancesPower(SumDistances):
         eps=1e-16,
         power=2,
         use_roots=True,
+        dtype=float,
         **kwargs,
     ):
         """
@@ -45,6 +46,9 @@ class SumDistancesPower(SumDistances):
                 The power of the inverse distances.
             use_roots: bool
                 Whether to use roots of the power elements.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
         """
         # Set the arguments
         super().__init__(
@@ -56,6 +60,7 @@ class SumDistancesPower(SumDistances):
             eps=eps,
             power=power,
             use_roots=use_roots,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -69,6 +74,7 @@ class SumDistancesPower(SumDistances):
         eps=None,
         power=None,
         use_roots=None,
+        dtype=None,
         **kwargs,
     ):
         """
@@ -98,6 +104,9 @@ class SumDistancesPower(SumDistances):
                 The power of the inverse distances.
             use_roots: bool
                 Whether to use roots of the power elements.
+            dtype : type
+                The data type of the stored fingerprint vector and
+                its derivatives (e.g. np.float32).
 
         Returns:
             self: The updated instance itself.
@@ -118,6 +127,8 @@ class SumDistancesPower(SumDistances):
             self.power = int(power)
         if use_roots is not None:
             self.use_roots = use_roots
+        if dtype is not None:
+            self.dtype = dtype
         return self
 
     def make_fingerprint(self, atoms, not_masked, masked, **kwargs):
@@ -132,9 +143,7 @@ class SumDistancesPower(SumDistances):
         # Make indicies arrays
         not_masked = np.array(not_masked, dtype=int)
         masked = np.array(masked, dtype=int)
-        indicies = np.arange(n_atoms)
         i_nm = np.arange(n_nmasked)
-        i_m = np.arange(n_masked)
         # Calculate all the fingerprints and their derivatives
         fij, gij, nmi, nmj = self.get_contributions(
             atoms,
@@ -146,84 +155,44 @@ class SumDistancesPower(SumDistances):
             n_masked,
             n_nm_m,
         )
-        # Get all the indicies of the interactions
-        indicies_nm_m, indicies_nm_nm = self.get_indicies(
-            n_nmasked,
-            n_masked,
-            n_total,
-            n_nm_m,
-            nmi,
-            nmj,
-        )
-        # Make the arrays of fingerprints and their derivatives
-        f = []
-        g = []
-        # Get all informations of the atoms and split them into types
-        nmasked_indicies, masked_indicies, n_unique = self.element_setup(
-            atoms,
-            indicies,
-            not_masked,
-            masked,
-            i_nm,
-            i_m,
-            nm_bool=True,
-        )
-        # Get all combinations of the atom types
-        combinations = zip(*np.triu_indices(n_unique, k=0, m=None))
-        # Run over all combinations
-        for ci, cj in combinations:
-            # Find the indicies in the fingerprints for the combinations
-            indicies_comb, len_i_comb = self.get_indicies_combination(
-                ci,
-                cj,
-                nmasked_indicies,
-                masked_indicies,
-                indicies_nm_m,
-                indicies_nm_nm,
-            )
-            if len_i_comb:
-                # Sum the fingerprints for the combinations
-                f, g = self.sum_fp_power(
-                    f,
-                    g,
-                    fij,
-                    gij,
-                    indicies_comb,
-                    len_i_comb,
-                )
-        return np.array(f), np.array(g)
+        # Get the pair indicies for each combination of the atom types
+        tables = self.get_index_tables(atoms, not_masked, masked)
+        # Sum the fingerprints for the combinations
+        return self.sum_fp_power(fij, gij, tables["comb_matrix"])
 
-    def sum_fp_power(
-        self,
-        f,
-        g,
-        fij,
-        gij,
-        indicies_comb,
-        len_i_comb,
-        **kwargs,
-    ):
-        "Sum of the fingerprints."
+    def get_length_groups(self, atoms, **kwargs):
+        # The powers of each combination of the atom types are grouped
+        not_masked, masked = self.get_constraints(atoms)
+        tables = self.get_index_tables(atoms, not_masked, masked)
+        return np.repeat(np.arange(len(tables["comb_lengths"])), self.power)
+
+    def sum_fp_power(self, fij, gij, comb_matrix, **kwargs):
+        """
+        Sum of the powers of the fingerprints for each combination of
+        the atom types with segment reductions.
+        """
         powers = np.arange(1, self.power + 1)
-        fij_powers = fij[indicies_comb].reshape(-1, 1) ** powers
-        fij_sums = np.sum(fij_powers, axis=0)
+        fij_powers = fij.reshape(-1, 1) ** powers
+        fij_sums = comb_matrix @ fij_powers
+        if self.use_roots:
+            f = (fij_sums ** (1.0 / powers)).reshape(-1)
+        else:
+            f = fij_sums.reshape(-1)
+        if not self.use_derivatives:
+            return f, None
+        g = [comb_matrix @ gij]
+        # Sum the derivatives weighted with the powers of the fingerprints
+        comb_weights = comb_matrix.copy()
+        for p in range(self.power - 1):
+            comb_weights.data = fij_powers[comb_matrix.indices, p]
+            g.append(comb_weights @ gij)
+        g = np.array(g).transpose(1, 0, 2)
         if self.use_roots:
-            f.extend(fij_sums ** (1.0 / powers))
+            fpowers = (1.0 - powers[1:]) / powers[1:]
+            g[:, 1:] = g[:, 1:] * (fij_sums[:, 1:] ** fpowers)[:, :, None]
         else:
-            f.extend(fij_sums)
-        if self.use_derivatives:
-            g.append(np.sum(gij[indicies_comb], axis=0))
-            fg_prod = np.sum(
-                fij_powers[:, :-1].T.reshape(self.power - 1, len_i_comb, 1)
-                * gij[indicies_comb],
-                axis=1,
-            )
-            if self.use_roots:
-                fpowers = (1.0 - powers[1:]) / powers[1:]
-                g.extend(fg_prod * (fij_sums[1:] ** fpowers).reshape(-1, 1))
-            else:
-                g.extend(powers[1:].reshape(-1, 1) * fg_prod)
-        return f, g
+            g[:, 1:] = powers[1:].reshape(1, -1, 1) * g[:, 1:]
+        return f, g.reshape(len(f), gij.shape[1])
 
     def get_arguments(self):
         "Get the arguments of the class itself."
@@ -237,9 +206,10 @@ class SumDistancesPower(SumDistances):
             eps=self.eps,
             power=self.power,
             use_roots=self.use_roots,
+            dtype=self.dtype,
         )
         # Get the constants made within the class
-        constant_kwargs = dict()
+        constant_kwargs = dict(active_atoms=self.active_atoms)
         # Get the objects made within the class
         object_kwargs = dict()
         return arg_kwargs, constant_kwargs, object_kwargs
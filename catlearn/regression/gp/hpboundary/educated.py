@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.spatial.distance import pdist
 from .restricted import RestrictedBoundaries
 
 
@@ -43,6 +42,8 @@ class EducatedBoundaries(RestrictedBoundaries):
                 If use_prior_mean=False, the minimum and maximum target
                 differences are used as the boundary conditions.
         """
+        # The distance statistics of the features are updated with new data
+        self.reset_distance_stats()
         self.update_arguments(
             bounds_dict=bounds_dict,
             scale=scale,
@@ -113,7 +114,11 @@ class EducatedBoundaries(RestrictedBoundaries):
         bounds = {}
         for para in parameters_set:
             if para == "length":
-                bounds[para] = self.length_bound(X, parameters.count(para))
+                bounds[para] = self.length_bound(
+                    X,
+                    parameters.count(para),
+                    groups=self.get_length_groups(model),
+                )
             elif para == "noise":
                 if "noise_deriv" in parameters_set:
                     bounds[para] = self.noise_bound(
@@ -151,15 +156,17 @@ class EducatedBoundaries(RestrictedBoundaries):
             a_max = a_mean * scaling
             a_min = a_mean / scaling
         else:
-            # Calculate the differences in the target values
-            dif = pdist(Y[:, 0:1])
-            # Remove zero differences
-            dif = dif[dif != 0.0]
+            # The smallest nonzero difference in the target values is
+            # between the neighboring unique sorted target values
+            y_unique = np.unique(Y[:, 0])
             # Check that all the targets are not the same
-            if len(dif) == 0:
-                dif = [1.0]
-            a_max = np.max(dif) * self.scale
-            a_min = np.min(dif) / self.scale
+            if len(y_unique) == 1:
+                a_max, a_min = 1.0, 1.0
+            else:
+                a_max = y_unique[-1] - y_unique[0]
+                a_min = np.min(np.diff(y_unique))
+            a_max = a_max * self.scale
+            a_min = a_min / self.scale
         if self.log:
             return np.array([[np.log(a_min), np.log(a_max)]])
         return np.array([[a_min, a_max]])
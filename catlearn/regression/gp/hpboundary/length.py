@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.spatial.distance import pdist, squareform
+from scipy.spatial.distance import cdist, squareform
 from .boundary import HPBoundaries
 
 
@@ -37,6 +37,8 @@ class LengthBoundaries(HPBoundaries):
                 The use_derivatives will be updated when
                 update_bounds is called.
         """
+        # The distance statistics of the features are updated with new data
+        self.reset_distance_stats()
         self.update_arguments(
             bounds_dict=bounds_dict,
             scale=scale,
@@ -98,7 +100,11 @@ class LengthBoundaries(HPBoundaries):
         bounds = {}
         for para in parameters_set:
             if para == "length":
-                bounds[para] = self.length_bound(X, parameters.count(para))
+                bounds[para] = self.length_bound(
+                    X,
+                    parameters.count(para),
+                    groups=self.get_length_groups(model),
+                )
             elif para in self.bounds_dict:
                 bounds[para] = self.bounds_dict[para].copy()
             else:
@@ -107,10 +113,12 @@ class LengthBoundaries(HPBoundaries):
                 )
         return bounds
 
-    def length_bound(self, X, l_dim, **kwargs):
+    def length_bound(self, X, l_dim, groups=None, **kwargs):
         """
         Get the minimum and maximum ranges of the length-scale
         in the educated guess regime within a scale.
+        The distances within each group of feature dimensions are
+        used if the length-scales are grouped.
         """
         # Get the minimum and maximum machine precision for exponential terms
         exp_lower = np.sqrt(-1 / np.log(np.finfo(float).eps)) / self.scale
@@ -132,27 +140,157 @@ class LengthBoundaries(HPBoundaries):
         # Ensure that the features are a matrix
         if not isinstance(X[0], (list, np.ndarray)):
             X = np.array([fp.get_vector() for fp in X])
+        # Get the distance statistics updated with the new features
+        dis_max, nn_dis = self.update_distance_stats(X, l_dim, groups=groups)
+        nn_median = np.median(nn_dis, axis=0)
         for d in range(l_dim):
-            # Calculate distances
-            if l_dim == 1:
-                dis = pdist(X)
-            else:
-                dis = pdist(X[:, d : d + 1])
             # Calculate the maximum length-scale
-            dis_max = exp_max * np.max(dis)
-            if dis_max == 0.0:
-                dis_min, dis_max = exp_lower, exp_max
+            dis_max_d = exp_max * dis_max[d]
+            if dis_max_d == 0.0:
+                dis_min, dis_max_d = exp_lower, exp_max
             else:
                 # The minimum length-scale from the nearest neighbor distance
-                dis_min = exp_lower * np.median(self.nearest_neighbors(dis))
+                dis_min = exp_lower * nn_median[d]
                 if dis_min == 0.0:
                     dis_min = exp_lower
             # Transform into log-scale if specified
-            lengths[d, 0], lengths[d, 1] = dis_min, dis_max
+            lengths[d, 0], lengths[d, 1] = dis_min, dis_max_d
         if self.log:
             return np.log(lengths)
         return lengths
 
+    def update_distance_stats(self, X, l_dim, groups=None, **kwargs):
+        """
+        Update the maximum distances and the nearest neighbor distances
+        of the features in each length-scale dimension.
+        Only the distances to the new features are calculated if
+        the previous features are the first features in X.
+        Otherwise, the statistics are calculated from scratch.
+
+        Parameters:
+            X : (N,D) array
+                Training features with N data points and D dimensions.
+            l_dim : int
+                The number of length-scale dimensions.
+            groups : (D) array or None
+                The length-scale group of each feature dimension.
+                The feature dimensions are used if None.
+
+        Returns:
+            (l_dim) array: The maximum distances in each dimension.
+            (N,l_dim) array: The nearest neighbor distance of each
+                data point in each dimension.
+        """
+        X = np.asarray(X)
+        n_data = len(X)
+        if l_dim == 1:
+            groups = None
+        n_stored = self.get_n_stored(X, l_dim, groups=groups)
+        # Use the stored statistics if there are no new features
+        if n_stored == n_data:
+            return self.dis_max, self.nn_dis
+        # Extend the statistics with the new features
+        nn_dis = np.empty((n_data, l_dim))
+        if n_stored:
+            nn_dis[:n_stored] = self.nn_dis
+            dis_max = self.dis_max.copy()
+        else:
+            dis_max = np.zeros(l_dim)
+        if l_dim == 1:
+            # Calculate the distances of all the new features at once
+            dis = cdist(X[n_stored:], X)
+            np.maximum(dis_max, np.max(dis), out=dis_max)
+            # Exclude the distances of the new features to themselves
+            i_new = np.arange(n_data - n_stored)
+            dis[i_new, i_new + n_stored] = np.inf
+            nn_dis[n_stored:, 0] = np.min(dis, axis=1)
+            if n_stored:
+                np.minimum(
+                    nn_dis[:n_stored, 0],
+                    np.min(dis[:, :n_stored], axis=0),
+                    out=nn_dis[:n_stored, 0],
+                )
+        else:
+            if n_stored == 0:
+                nn_dis[0] = np.inf
+                n_stored = 1
+            group_matrix = self.get_group_matrix(groups, l_dim)
+            # Calculate the distances of each new feature to the previous
+            for i in range(n_stored, n_data):
+                dis = self.get_point_distances(
+                    X[:i],
+                    X[i],
+                    l_dim,
+                    group_matrix=group_matrix,
+                )
+                np.maximum(dis_max, np.max(dis, axis=0), out=dis_max)
+                nn_dis[i] = np.min(dis, axis=0)
+                np.minimum(nn_dis[:i], dis, out=nn_dis[:i])
+        # Store the statistics and the features they are calculated for
+        self.X_stored = X.copy()
+        self.groups_stored = groups
+        self.dis_max = dis_max
+        self.nn_dis = nn_dis
+        return dis_max, nn_dis
+
+    def get_n_stored(self, X, l_dim, groups=None, **kwargs):
+        """
+        Get the number of stored features that are the first features
+        in X. Zero is returned if the stored statistics can not be used.
+        """
+        if self.X_stored is None:
+            return 0
+        n_stored = len(self.X_stored)
+        if (
+            n_stored > len(X)
+            or self.X_stored.shape[1:] != X.shape[1:]
+            or self.nn_dis.shape[1] != l_dim
+            or not np.array_equal(self.groups_stored, groups)
+        ):
+            return 0
+        if not np.array_equal(self.X_stored, X[:n_stored]):
+            return 0
+        return n_stored
+
+    def get_point_distances(self, X, x, l_dim, group_matrix=None, **kwargs):
+        """
+        Get the distances between the features and a new feature in
+        each length-scale dimension.
+        The euclidean distances within each group of feature dimensions
+        are used if the group matrix is given.
+        """
+        if group_matrix is None:
+            return np.abs(X[:, :l_dim] - x[:l_dim])
+        return np.sqrt(np.square(X - x) @ group_matrix)
+
+    def get_group_matrix(self, groups, l_dim, **kwargs):
+        """
+        Get the (D,l_dim) matrix that sums the feature dimensions
+        of each length-scale group or None if the groups are not used.
+        """
+        if groups is None:
+            return None
+        group_matrix = np.zeros((len(groups), l_dim))
+        group_matrix[np.arange(len(groups)), groups] = 1.0
+        return group_matrix
+
+    def get_length_groups(self, model, **kwargs):
+        "Get the length-scale groups of the feature dimensions in the model."
+        return model.kernel.get_length_groups()
+
+    def reset_distance_stats(self, **kwargs):
+        """
+        Remove the stored distance statistics of the features.
+
+        Returns:
+            self: The updated object itself.
+        """
+        self.X_stored = None
+        self.groups_stored = None
+        self.dis_max = None
+        self.nn_dis = None
+        return self
+
     def nearest_neighbors(self, dis, **kwargs):
         "Nearest neighbor distance."
         dis_matrix = squareform(dis)
@@ -51,7 +51,11 @@ class RestrictedBoundaries(LengthBoundaries):
         bounds = {}
         for para in parameters_set:
             if para == "length":
-                bounds[para] = self.length_bound(X, parameters.count(para))
+                bounds[para] = self.length_bound(
+                    X,
+                    parameters.count(para),
+                    groups=self.get_length_groups(model),
+                )
             elif para == "noise":
                 if "noise_deriv" in parameters_set:
                     bounds[para] = self.noise_bound(
@@ -79,7 +83,8 @@ class RestrictedBoundaries(LengthBoundaries):
         Get the minimum and maximum ranges of the noise in
         the educated guess regime within a scale.
         """
-        n_max = len(Y.reshape(-1)) * self.scale
+        # The targets not used are given as NaN
+        n_max = np.count_nonzero(np.isfinite(Y)) * self.scale
         if self.log:
             return np.array([[eps_lower, np.log(n_max)]])
         return np.array([[eps_lower, n_max]])
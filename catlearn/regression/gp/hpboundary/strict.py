@@ -53,7 +53,7 @@ class StrictBoundaries(EducatedBoundaries):
             **kwargs,
         )
 
-    def length_bound(self, X, l_dim, **kwargs):
+    def length_bound(self, X, l_dim, groups=None, **kwargs):
         """
         Get the minimum and maximum ranges of the length-scale in
         the educated guess regime within a scale.
@@ -75,10 +75,15 @@ class StrictBoundaries(EducatedBoundaries):
         # Ensure that the features are a matrix
         if not isinstance(X[0], (list, np.ndarray)):
             X = np.array([fp.get_vector() for fp in X])
+        # Get the nearest neighbor distances updated with the new features
+        nn_dis = self.update_distance_stats(X, l_dim, groups=groups)[1]
+        nn_median = np.median(nn_dis, axis=0)
         for d in range(l_dim):
             # Calculate distances
             if l_dim == 1:
                 dis = pdist(X)
+            elif groups is not None:
+                dis = pdist(X[:, groups == d])
             else:
                 dis = pdist(X[:, d : d + 1])
             # Calculate the maximum length-scale
@@ -87,7 +92,7 @@ class StrictBoundaries(EducatedBoundaries):
                 dis_min, dis_max = exp_lower, exp_max
             else:
                 # The minimum length-scale from the nearest neighbor distance
-                dis_min = exp_lower * np.median(self.nearest_neighbors(dis))
+                dis_min = exp_lower * nn_median[d]
                 if dis_min == 0.0:
                     dis_min = exp_lower
             # Transform into log-scale if specified
@@ -13,6 +13,7 @@ class FBPMGP(HyperparameterFitter):
         ngrid=80,
         bounds=None,
         get_prior_mean=False,
+        parallel=False,
         **kwargs,
     ):
         """
@@ -34,6 +35,9 @@ class FBPMGP(HyperparameterFitter):
                 of the hyperparameter.
             get_prior_mean: bool
                 Whether to get the prior arguments in the solution.
+            parallel: bool
+                Whether to distribute the length-scale grid points
+                over the MPI processes.
         """
         # Set the default test points
         self.Q = None
@@ -49,6 +53,7 @@ class FBPMGP(HyperparameterFitter):
             ngrid=ngrid,
             bounds=bounds,
             get_prior_mean=get_prior_mean,
+            parallel=parallel,
             **kwargs,
         )
 
@@ -78,6 +83,7 @@ class FBPMGP(HyperparameterFitter):
         ngrid=None,
         bounds=None,
         get_prior_mean=None,
+        parallel=None,
         **kwargs,
     ):
         """
@@ -98,6 +104,9 @@ class FBPMGP(HyperparameterFitter):
                 of the hyperparameter.
             get_prior_mean: bool
                 Whether to get the prior arguments in the solution.
+            parallel: bool
+                Whether to distribute the length-scale grid points
+                over the MPI processes.
 
         Returns:
             self: The updated object itself.
@@ -112,6 +121,8 @@ class FBPMGP(HyperparameterFitter):
             self.bounds = bounds.copy()
         if get_prior_mean is not None:
             self.get_prior_mean = get_prior_mean
+        if parallel is not None:
+            self.parallel = parallel
         return self
 
     def get_hp(self, theta, parameters, **kwargs):
@@ -161,9 +172,7 @@ class FBPMGP(HyperparameterFitter):
             Y_p,
             get_derivatives=use_derivatives,
         )
-        if use_derivatives:
-            return (Y_p - pmean).T.reshape(-1, 1)
-        return (Y_p - pmean)[:, 0:1]
+        return model.rearrange_targets(Y_p - pmean)
 
     def get_eig(self, model, X, Y, **kwargs):
         "Calculate the eigenvalues."
@@ -184,11 +193,19 @@ class FBPMGP(HyperparameterFitter):
         UTY = (np.matmul(U.T, Y_p)).reshape(-1) ** 2
         return D, U, Y_p, UTY, KXX, n_data
 
-    def get_eig_without_Yp(self, model, X, Y_p, n_data, **kwargs):
-        "Calculate the eigenvalues without using the prior mean."
-        # Calculate the kernel with and without noise
-        KXX, n_data = self.kxx_corr(model, X)
-        # Eigendecomposition
+    def get_eig_without_Yp(self, model, X, Y_p, n_data, lengths, **kwargs):
+        """
+        Calculate the eigenvalues for multiple length-scales
+        without using the prior mean.
+        The kernel matrices are calculated together and decomposed with
+        stacked eigendecompositions.
+        """
+        # Calculate the kernels with and without noise
+        hps = [{"length": np.array([length])} for length in lengths]
+        KXX = model.get_kernel_batch(X, hps)
+        for KXX_b in KXX:
+            self.add_correction(model, KXX_b, n_data)
+        # Stacked eigendecompositions
         try:
             D, U = eigh(KXX)
         except Exception as e:
@@ -196,11 +213,13 @@ class FBPMGP(HyperparameterFitter):
             import scipy.linalg
 
             logging.error("An error occurred: %s", str(e))
-            # More robust but slower eigendecomposition
-            D, U = scipy.linalg.eigh(KXX, driver="ev")
-        UTY = np.matmul(U.T, Y_p)
-        UTY2 = UTY.reshape(-1) ** 2
-        return D, U, UTY, UTY2, Y_p, KXX
+            # More robust but slower eigendecompositions
+            D, U = np.empty(KXX.shape[:2]), np.empty(KXX.shape)
+            for b, KXX_b in enumerate(KXX):
+                D[b], U[b] = scipy.linalg.eigh(KXX_b, driver="ev")
+        UTY = np.matmul(np.transpose(U, (0, 2, 1)), Y_p)[:, :, 0]
+        UTY2 = UTY**2
+        return D, U, UTY, UTY2
 
     def get_grids(
         self,
@@ -337,7 +356,7 @@ class FBPMGP(HyperparameterFitter):
 
     def get_all_eig_matrices(
         self,
-        length,
+        lengths,
         model,
         X,
         Y_p,
@@ -348,27 +367,48 @@ class FBPMGP(HyperparameterFitter):
     ):
         """
         Get all the matrices from eigendecomposition that must be
-        used to posterior distribution and predictions.
+        used to posterior distribution and predictions for
+        multiple length-scales.
         """
-        model.set_hyperparams({"length": [length]})
         # Training part
-        D, U, UTY, UTY2, Y_p, KXX = self.get_eig_without_Yp(
+        D, U, UTY, UTY2 = self.get_eig_without_Yp(
             model,
             X,
             Y_p,
             n_data,
+            lengths,
         )
         # Test part
-        KQQ = model.kernel_diag(
-            Q,
-            len(Q),
-            get_derivatives=get_derivatives,
-            include_noise=False,
-        )
-        KQX = model.get_kernel(Q, X, get_derivatives=get_derivatives)
-        UKQX = np.matmul(KQX, U)
+        KQQ, UKQX = [], []
+        for length, U_b in zip(lengths, U):
+            model.set_hyperparams({"length": [length]})
+            KQQ.append(
+                model.kernel_diag(
+                    Q,
+                    len(Q),
+                    get_derivatives=get_derivatives,
+                    include_noise=False,
+                )
+            )
+            # The hyperparameter fitting is made in float64
+            KQX = model.get_kernel(
+                Q,
+                X,
+                get_derivatives=get_derivatives,
+                dtype=float,
+            )
+            UKQX.append(np.matmul(KQX, U_b))
         return D, UTY, UTY2, KQQ, UKQX
 
+    def get_batch_size(self, n_data, n_test, max_elements=2**24, **kwargs):
+        """
+        Get the number of length-scales that the eigendecompositions
+        are calculated for at once.
+        The batch size is limited by the number of elements in
+        the stacked matrices.
+        """
+        return max(1, int(max_elements // (n_data * (n_data + n_test))))
+
     def posterior_value(
         self,
         like_sum,
@@ -408,15 +448,17 @@ class FBPMGP(HyperparameterFitter):
         return the_grids["length"][l_index] + the_grids["np"]
 
     def pred_unc(self, UKQX, UTY, D_n, KQQ, yp, **kwargs):
-        "Make prediction mean and uncertainty from eigendecomposition."
-        UKQXD = UKQX / D_n[:, None, :]
-        pred = yp + np.einsum("dij,ji->di", UKQXD, UTY, optimize=True)
-        var = KQQ - np.einsum("dij,ji->di", UKQXD, UKQX.T)
+        """
+        Make prediction mean and uncertainty from eigendecomposition
+        for all the noise values.
+        """
+        D_n_inv = (1.0 / D_n).T
+        pred = yp + np.matmul(UKQX * UTY, D_n_inv).T
+        var = KQQ - np.matmul(UKQX**2, D_n_inv).T
         return pred, var
 
-    def update_df_ybar(
+    def update_ybar(
         self,
-        df,
         ybar,
         y2bar_ubar,
         pred,
@@ -424,29 +466,21 @@ class FBPMGP(HyperparameterFitter):
         like,
         ll_scale,
         prefactors,
-        length,
-        noises,
         **kwargs,
     ):
-        "Update the dict and add values to ybar and y2bar_ubar."
-        ybar = (ybar * ll_scale) + np.einsum("nj,pn->j", pred, like)
+        "Add the weighted predictions to the sums in ybar and y2bar_ubar."
+        like_noise = np.sum(like, axis=0)
+        like_var = np.sum(prefactors * like, axis=0)
+        ybar = (ybar * ll_scale) + np.matmul(like_noise, pred)
         y2bar_ubar = (y2bar_ubar * ll_scale) + (
-            np.einsum("nj,pn->j", pred**2, like)
-            + np.einsum("nj,pn->j", var, prefactors * like)
+            np.matmul(like_noise, pred**2) + np.matmul(like_var, var)
         )
-        # Store the hyperparameters and prediction mean and variance
-        df["length"] = np.append(
-            df["length"],
-            np.full(np.shape(noises), length),
-        )
-        df["noise"] = np.append(df["noise"], noises)
-        df["pred"] = np.append(df["pred"], pred, axis=0)
-        df["var"] = np.append(df["var"], var, axis=0)
-        return df, ybar, y2bar_ubar
+        return ybar, y2bar_ubar
 
     def evaluate_for_noise(
         self,
-        df,
+        pred,
+        var,
         ybar,
         y2bar_ubar,
         like_sum,
@@ -464,12 +498,13 @@ class FBPMGP(HyperparameterFitter):
         pr_grid,
         cs,
         l_index,
-        length,
         **kwargs,
     ):
         """
-        Evaluate log-posterior and update the data frame for
+        Evaluate log-posterior and the predictions for
         all noise hyperparameter in grid simulatenously.
+        The prediction mean and variance are stored in
+        the preallocated pred and var arrays.
         """
         D_n = D + np.exp(2 * grids["noise"]).reshape(-1, 1)
         # Calculate log-posterior
@@ -485,11 +520,10 @@ class FBPMGP(HyperparameterFitter):
             cs,
             l_index,
         )
-        # Calculate prediction mean and variance
-        pred, var = self.pred_unc(UKQX, UTY, D_n, KQQ, yp)
-        # Store and update the hyperparameters and prediction mean and variance
-        df, ybar, y2bar_ubar = self.update_df_ybar(
-            df,
+        # Calculate and store the prediction mean and variance
+        pred[:], var[:] = self.pred_unc(UKQX, UTY, D_n, KQQ, yp)
+        # Update the weighted sums of the predictions
+        ybar, y2bar_ubar = self.update_ybar(
             ybar,
             y2bar_ubar,
             pred,
@@ -497,14 +531,51 @@ class FBPMGP(HyperparameterFitter):
             like,
             ll_scale,
             prefactors,
-            length,
-            grids["noise"],
         )
-        return df, ybar, y2bar_ubar, like_sum, lp_max
+        return ybar, y2bar_ubar, like_sum, lp_max
+
+    def gather_parallel(
+        self,
+        preds,
+        variances,
+        ybar,
+        y2bar_ubar,
+        like_sum,
+        lp_max,
+        **kwargs,
+    ):
+        """
+        Gather the predictions and the weighted sums of all
+        the MPI processes.
+        The sums are rescaled to the largest log-posterior value.
+        """
+        from ase.parallel import world, broadcast
+
+        size = world.size
+        n_length = len(preds)
+        # Gather the predictions of the length-scales of each process
+        for r in range(size):
+            preds[r::size] = broadcast(preds[r::size], root=r)
+            variances[r::size] = broadcast(variances[r::size], root=r)
+        # Gather the weighted sums
+        sums = [
+            broadcast((ybar, y2bar_ubar, like_sum, lp_max), root=r)
+            for r in range(min(size, n_length))
+        ]
+        lp_max = max(sums_r[3] for sums_r in sums)
+        ybar, y2bar_ubar, like_sum = 0.0, 0.0, 0.0
+        for ybar_r, y2bar_ubar_r, like_sum_r, lp_max_r in sums:
+            ll_scale = np.exp(lp_max_r - lp_max)
+            ybar = ybar + ybar_r * ll_scale
+            y2bar_ubar = y2bar_ubar + y2bar_ubar_r * ll_scale
+            like_sum = like_sum + like_sum_r * ll_scale
+        return preds, variances, ybar, y2bar_ubar, like_sum, lp_max
 
     def get_solution(
         self,
-        df,
+        preds,
+        variances,
+        grids,
         ybar,
         y2bar_ubar,
         like_sum,
@@ -520,23 +591,29 @@ class FBPMGP(HyperparameterFitter):
         # Normalize the weighted sums
         ybar = ybar / like_sum
         y2bar_ubar = y2bar_ubar / like_sum
+        # Flatten the length-scale and noise grids
+        preds = preds.reshape(-1, preds.shape[-1])
+        variances = variances.reshape(-1, variances.shape[-1])
         # Get the analytic solution to the prefactor
         prefactor = np.mean(
-            (y2bar_ubar + (df["pred"] ** 2) - (2 * df["pred"] * ybar))
-            / df["var"],
+            (y2bar_ubar + (preds**2) - (2 * preds * ybar)) / variances,
             axis=1,
         )
         # Calculate all Kullback-Leibler divergences
         kl = 0.5 * (
             n_test * (1 + np.log(2 * np.pi))
-            + (np.sum(np.log(df["var"]), axis=1) + n_test * np.log(prefactor))
+            + (np.sum(np.log(variances), axis=1) + n_test * np.log(prefactor))
         )
         # Find the best solution
         i_min = np.nanargmin(kl)
         kl_min = kl[i_min] / n_test
+        l_index, n_index = np.unravel_index(
+            i_min,
+            (len(grids["length"]), len(grids["noise"])),
+        )
         hp_best = dict(
-            length=np.array([df["length"][i_min]]),
-            noise=np.array([df["noise"][i_min]]),
+            length=np.array([grids["length"][l_index]]),
+            noise=np.array([grids["noise"][n_index]]),
             prefactor=np.array([0.5 * np.log(prefactor[i_min])]),
         )
         theta = [hp_best[para] for para in hp_best.keys()]
@@ -591,23 +668,26 @@ class FBPMGP(HyperparameterFitter):
         )
         yp = yp.reshape(-1)
         n_data = len(Y_p)
-        # Initialize fb
-        df = {
-            key: np.array([]) for key in ["ll", "length", "noise", "prefactor"]
-        }
-        if model.use_derivatives:
-            df["pred"] = np.empty((0, len(Q) * len(Y[0])))
-            df["var"] = np.empty((0, len(Q) * len(Y[0])))
-        else:
-            df["pred"] = np.empty((0, len(Q)))
-            df["var"] = np.empty((0, len(Q)))
+        n_length = len(grids["length"])
+        n_test = len(yp)
+        # Preallocate the predictions for all the grid points
+        preds = np.zeros((n_length, len(grids["noise"]), n_test))
+        variances = np.ones((n_length, len(grids["noise"]), n_test))
         like_sum, ybar, y2bar_ubar = 0.0, 0.0, 0.0
         lp_max = -np.inf
         prefactors, ln_prefactor = self.get_prefactors(grids, n_data)
         ln2pi = 0.5 * n_data * np.log(2 * np.pi)
-        for l_index, length in enumerate(grids["length"]):
+        # Get the length-scale grid points that are evaluated
+        l_indicies = np.arange(n_length)
+        if self.parallel:
+            from ase.parallel import world
+
+            l_indicies = l_indicies[world.rank :: world.size]
+        batch_size = self.get_batch_size(n_data, n_test)
+        for i in range(0, len(l_indicies), batch_size):
+            l_batch = l_indicies[i : i + batch_size]
             D, UTY, UTY2, KQQ, UKQX = self.get_all_eig_matrices(
-                length,
+                grids["length"][l_batch],
                 model,
                 X,
                 Y_p,
@@ -615,35 +695,54 @@ class FBPMGP(HyperparameterFitter):
                 Q,
                 get_derivatives=use_derivatives,
             )
-            df, ybar, y2bar_ubar, like_sum, lp_max = self.evaluate_for_noise(
-                df,
+            for b, l_index in enumerate(l_batch):
+                ybar, y2bar_ubar, like_sum, lp_max = self.evaluate_for_noise(
+                    preds[l_index],
+                    variances[l_index],
+                    ybar,
+                    y2bar_ubar,
+                    like_sum,
+                    lp_max,
+                    grids,
+                    UTY[b],
+                    UTY2[b],
+                    D[b],
+                    UKQX[b],
+                    KQQ[b],
+                    yp,
+                    prefactors,
+                    ln_prefactor,
+                    ln2pi,
+                    pr_grid,
+                    cs,
+                    l_index,
+                )
+        if self.parallel:
+            (
+                preds,
+                variances,
+                ybar,
+                y2bar_ubar,
+                like_sum,
+                lp_max,
+            ) = self.gather_parallel(
+                preds,
+                variances,
                 ybar,
                 y2bar_ubar,
                 like_sum,
                 lp_max,
-                grids,
-                UTY,
-                UTY2,
-                D,
-                UKQX,
-                KQQ,
-                yp,
-                prefactors,
-                ln_prefactor,
-                ln2pi,
-                pr_grid,
-                cs,
-                l_index,
-                length,
             )
         sol = self.get_solution(
-            df,
+            preds,
+            variances,
+            grids,
             ybar,
             y2bar_ubar,
             like_sum,
-            len(KQQ),
+            n_test,
             model,
-            len(grids["length"]),
+            n_length,
         )
         return OptimizeResult(**sol)
 
@@ -656,6 +755,7 @@ class FBPMGP(HyperparameterFitter):
             ngrid=self.ngrid,
             bounds=self.bounds,
             get_prior_mean=self.get_prior_mean,
+            parallel=self.parallel,
         )
         # Get the constants made within the class
         constant_kwargs = dict()
@@ -1,4 +1,5 @@
 from .kernel import Kernel
 from .se import SE
+from .se_ard import SE_ARD
 
-__all__ = ["Kernel", "SE"]
+__all__ = ["Kernel", "SE", "SE_ARD"]
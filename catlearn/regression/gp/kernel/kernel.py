@@ -8,6 +8,7 @@ class Kernel:
         use_derivatives=False,
         use_fingerprint=False,
         hp={},
+        dtype=float,
         **kwargs,
     ):
         """
@@ -22,6 +23,11 @@ class Kernel:
                 A dictionary of the hyperparameters in the log-space.
                 The hyperparameters should be given as flatten arrays,
                 like hp=dict(length=np.array([-0.7])).
+            dtype: type
+                The data type of the kernel matrix between the test and
+                training features used in the predictions (e.g. np.float32).
+                The symmetric kernel matrix of the training features and
+                its hyperparameter gradients are always in float64.
         """
         # Set the default hyperparameters
         self.hp = dict(length=np.array([-0.7]))
@@ -30,6 +36,7 @@ class Kernel:
             use_derivatives=use_derivatives,
             use_fingerprint=use_fingerprint,
             hp=hp,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -167,6 +174,16 @@ class Kernel:
         """
         return int(1)
 
+    def get_length_groups(self, **kwargs):
+        """
+        Get the length-scale group of each feature dimension.
+
+        Returns:
+            (D) array or None: The index of the length-scale group of
+                each feature dimension or None if the groups are not used.
+        """
+        return None
+
     def get_use_derivatives(self):
         "Get whether the derivatives of the targets are used."
         return self.use_derivatives
@@ -180,6 +197,7 @@ class Kernel:
         use_derivatives=None,
         use_fingerprint=None,
         hp=None,
+        dtype=None,
         **kwargs,
     ):
         """
@@ -195,6 +213,11 @@ class Kernel:
                 A dictionary of the hyperparameters in the log-space.
                 The hyperparameters should be given as flatten arrays,
                 like hp=dict(length=np.array([-0.7])).
+            dtype: type
+                The data type of the kernel matrix between the test and
+                training features used in the predictions (e.g. np.float32).
+                The symmetric kernel matrix of the training features and
+                its hyperparameter gradients are always in float64.
 
         Returns:
             self: The updated object itself.
@@ -205,6 +228,8 @@ class Kernel:
             self.use_fingerprint = use_fingerprint
         if hp is not None:
             self.set_hyperparams(hp)
+        if dtype is not None:
+            self.dtype = dtype
         return self
 
     def get_KXX(self, features, **kwargs):
@@ -225,7 +250,42 @@ class Kernel:
         """
         raise NotImplementedError()
 
-    def get_KQX(self, features, features2, get_derivatives=True, **kwargs):
+    def get_KXX_batch(self, features, hps, **kwargs):
+        """
+        Make the symmetric kernel matrices for multiple sets of
+        hyperparameters.
+        The kernel matrices are calculated one at a time if the kernel
+        does not have a stacked implementation.
+
+        Parameters:
+            features : (N,D) array or (N) list of fingerprint objects
+                Features with N data points.
+            hps : (B) list of dicts
+                The hyperparameters in the log-space.
+                The hyperparameters that are not given are taken from
+                the kernel.
+
+        Returns:
+            (B,N,N) array or (B,N*(D+1),N*(D+1)) array: The stacked
+                symmetric kernel matrices.
+        """
+        hp_kernel = self.get_hyperparams()
+        KXX = []
+        for hp in hps:
+            self.set_hyperparams(hp)
+            KXX.append(self.get_KXX(features, **kwargs))
+        # Reset the hyperparameters of the kernel
+        self.set_hyperparams(hp_kernel)
+        return np.array(KXX)
+
+    def get_KQX(
+        self,
+        features,
+        features2,
+        get_derivatives=True,
+        dtype=None,
+        **kwargs,
+    ):
         """
         Make the kernel matrix.
 
@@ -237,6 +297,9 @@ class Kernel:
                 If it is not given a squared kernel from features is generated.
             get_derivatives: bool
                 Whether to predict derivatives of target.
+            dtype: type or None
+                The data type of the kernel matrix.
+                The data type of the class is used if None.
 
         Returns:
             KQX : array
@@ -248,12 +311,18 @@ class Kernel:
         """
         raise NotImplementedError()
 
-    def get_arrays(self, features, features2=None, **kwargs):
+    def get_arrays(self, features, features2=None, dtype=float, **kwargs):
         "Get the feature matrix from the fingerprint."
-        X = np.array([feature.get_vector() for feature in features])
+        X = np.array(
+            [feature.get_vector() for feature in features],
+            dtype=dtype,
+        )
         if features2 is None:
             return X
-        Q = np.array([feature.get_vector() for feature in features2])
+        Q = np.array(
+            [feature.get_vector() for feature in features2],
+            dtype=dtype,
+        )
         return X, Q
 
     def get_symmetric_absolute_distances(
@@ -284,13 +353,17 @@ class Kernel:
             return len(features[0].get_vector())
         return len(features[0])
 
-    def get_fp_deriv(self, features, dim=None, **kwargs):
+    def get_fp_deriv(self, features, dim=None, dtype=float, **kwargs):
         "Get the derivatives of all the fingerprints."
         if dim is None:
             return np.array(
-                [fp.get_derivatives() for fp in features]
+                [fp.get_derivatives() for fp in features],
+                dtype=dtype,
             ).transpose((2, 0, 1))
-        return np.array([fp.get_derivatives(dim) for fp in features])
+        return np.array(
+            [fp.get_derivatives(dim) for fp in features],
+            dtype=dtype,
+        )
 
     def get_derivative_dimension(self, features, **kwargs):
         "Get the dimension of the features."
@@ -305,6 +378,7 @@ class Kernel:
             use_derivatives=self.use_derivatives,
             use_fingerprint=self.use_fingerprint,
             hp=self.hp,
+            dtype=self.dtype,
         )
         # Get the constants made within the class
         constant_kwargs = dict()
@@ -9,6 +9,8 @@ class SE(Kernel):
         use_derivatives=False,
         use_fingerprint=False,
         hp={},
+        backend="reference",
+        dtype=float,
         **kwargs,
     ):
         """
@@ -24,11 +26,30 @@ class SE(Kernel):
                 A dictionary of the hyperparameters in the log-space.
                 The hyperparameters should be given as flatten arrays,
                 like hp=dict(length=np.array([-0.7])).
+            backend: str
+                The implementation used for the kernel matrices with
+                derivatives.
+                The 'reference' backend fills the hessian blocks
+                one feature dimension at a time.
+                The 'fused' backend calculates all the blocks in single
+                vectorized passes over the pairs of data points.
+                The 'numba' backend uses a compiled loop over the pairs of
+                data points.
+                The 'fused' backend is used if numba is not installed.
+                The 'fused' and 'numba' backends only cover features given
+                as arrays, so the backend is not used with fingerprints.
+            dtype: type
+                The data type of the kernel matrix between the test and
+                training features used in the predictions (e.g. np.float32).
+                The symmetric kernel matrix of the training features and
+                its hyperparameter gradients are always in float64.
         """
         super().__init__(
             use_derivatives=use_derivatives,
             use_fingerprint=use_fingerprint,
             hp=hp,
+            backend=backend,
+            dtype=dtype,
             **kwargs,
         )
 
@@ -47,10 +68,62 @@ class SE(Kernel):
         if self.use_derivatives:
             if self.use_fingerprint:
                 return self.get_KXX_ext_fp(features, X, D, K)
-            return self.get_KXX_ext(features, X, D, K)
+            if self.backend == "reference":
+                return self.get_KXX_ext(features, X, D, K)
+            return self.get_KQX_ext_fused(features, features, X, X, D, K)
         return K
 
-    def get_KQX(self, features, features2, get_derivatives=True, **kwargs):
+    def get_KXX_batch(self, features, hps, **kwargs):
+        # The fingerprint kernels are calculated one at a time
+        if self.use_fingerprint:
+            return super().get_KXX_batch(features, hps, **kwargs)
+        # Get the squared inverse length-scales
+        s2 = np.array(
+            [
+                np.exp(-2.0 * hp.get("length", self.hp["length"])[0])
+                for hp in hps
+            ]
+        ).reshape(-1, 1, 1)
+        # Calculate the unscaled differences and distances once
+        diff = np.transpose(features[:, None, :] - features[None, :, :])
+        D = np.sum(diff**2, axis=0)
+        # Calculate the normal covariance matrices
+        K = np.exp((-0.5 * s2) * D)
+        if not self.use_derivatives:
+            return K
+        # Get dimensions
+        n_batch = len(K)
+        xdim, nd1, _ = diff.shape
+        nd1x = nd1 * xdim
+        Kext = np.empty((n_batch, nd1x + nd1, nd1x + nd1))
+        Kext[:, :nd1, :nd1] = K
+        # Derivative part
+        dK = s2 * K
+        Kext[:, :nd1, nd1:] = (
+            dK[:, :, None, :] * np.transpose(diff, (2, 0, 1))[None]
+        ).reshape(n_batch, nd1, nd1x)
+        Kext[:, nd1:, :nd1] = np.transpose(Kext[:, :nd1, nd1:], (0, 2, 1))
+        # Hessian part
+        ddK = Kext[:, nd1:, nd1:].reshape(n_batch, xdim, nd1, xdim, nd1)
+        np.multiply(
+            (-s2 * dK)[:, None, :, None, :] * diff[None, :, :, None, :],
+            np.transpose(diff, (1, 0, 2))[None, None],
+            out=ddK,
+        )
+        for d in range(xdim):
+            ddK[:, d, :, d, :] += dK
+        return Kext
+
+    def get_KQX(
+        self,
+        features,
+        features2,
+        get_derivatives=True,
+        dtype=None,
+        **kwargs,
+    ):
+        if dtype is None:
+            dtype = self.dtype
         # Scale features or fingerprints with their length-scales
         length_scale = np.exp(-self.hp["length"][0])
         if self.use_fingerprint:
@@ -62,6 +135,11 @@ class SE(Kernel):
             X = features2 * length_scale
         D = self.get_absolute_distances(Q, X, metric="sqeuclidean")
         K = np.exp((-0.5) * D)
+        # The distances are calculated in float64 and
+        # the kernel matrix is made with the data type
+        Q = Q.astype(dtype, copy=False)
+        X = X.astype(dtype, copy=False)
+        K = K.astype(dtype, copy=False)
         if get_derivatives or self.use_derivatives:
             if self.use_fingerprint:
                 return self.get_KQX_ext_fp(
@@ -73,6 +151,16 @@ class SE(Kernel):
                     K,
                     get_derivatives=get_derivatives,
                 )
+            if self.backend != "reference":
+                return self.get_KQX_ext_fused(
+                    features,
+                    features2,
+                    Q,
+                    X,
+                    D,
+                    K,
+                    get_derivatives=get_derivatives,
+                )
             return self.get_KQX_ext(
                 features,
                 features2,
@@ -241,7 +329,7 @@ class SE(Kernel):
         nrows = nd1 * (xdim + 1) if get_derivatives else nd1
         ncol = nd2 * (xdim + 1) if self.use_derivatives else nd2
         # The full kernel matrix
-        Kext = np.zeros((nrows, ncol))
+        Kext = np.zeros((nrows, ncol), dtype=K.dtype)
         Kext[:nd1, :nd2] = K.copy()
         # Get the derivative of the scaled distance matrix
         dDpre, dD = self.get_distance_derivative(Q, X, nd1, nd2, xdim, axis=0)
@@ -262,7 +350,7 @@ class SE(Kernel):
             if self.use_derivatives:
                 ddKpre, ddK = self.get_hessian_K(K)
                 ddKdD = ((-dDpre * dDpre * ddKpre) * ddK) * dD
-                ddDpre = -2.0 * np.exp(-2 * self.hp["length"][0])
+                ddDpre = -2.0 * float(np.exp(-2 * self.hp["length"][0]))
                 dKddD = (ddDpre * dKpre) * dK
                 btensor = ddKdD[:, None, :, :] * dD
                 btensor[range(xdim), range(xdim), :, :] += dKddD
@@ -272,6 +360,131 @@ class SE(Kernel):
                 ).reshape(nd1 * xdim, nd2 * xdim)
         return Kext
 
+    def get_KQX_ext_fused(
+        self,
+        features,
+        features2,
+        Q,
+        X,
+        D,
+        K,
+        get_derivatives=True,
+        **kwargs,
+    ):
+        """
+        Make the extended kernel matrix without fingerprints, where
+        the blocks are written directly into the full kernel matrix.
+        The compiled numba loop is used if the numba backend is chosen.
+
+        Parameters:
+            features: (M,D) array or (M) list of fingerprint objects
+                Features with M data points.
+            features2: (N,D) array or (N) list of fingerprint objects
+                Features with N data points and D dimensions.
+            Q: (M,D) array
+                Features in the scaled feature space.
+            X: (N,D) array
+                Features in the scaled feature space.
+            D: (M,N) array
+                All squared euclidean distances.
+            K: (M,N) array
+                The covariance matrix without derivatives of the features.
+            get_derivatives: bool
+                Whether to predict derivatives of target.
+
+        Returns:
+            (M*D+N,N*D+N) array : The extended kernel matrix.
+        """
+        length_scale = float(np.exp(-self.hp["length"][0]))
+        if self.backend == "numba":
+            from .se_numba import get_KQX_ext_numba
+
+            return get_KQX_ext_numba(
+                np.ascontiguousarray(Q, dtype=float),
+                np.ascontiguousarray(X, dtype=float),
+                np.ascontiguousarray(K, dtype=float),
+                length_scale,
+                get_derivatives,
+                self.use_derivatives,
+            ).astype(K.dtype, copy=False)
+        # Get dimensions
+        nd1 = len(Q)
+        nd2, xdim = np.shape(X)
+        nrows = nd1 * (xdim + 1) if get_derivatives else nd1
+        ncol = nd2 * (xdim + 1) if self.use_derivatives else nd2
+        # The full kernel matrix
+        Kext = np.empty((nrows, ncol), dtype=K.dtype)
+        Kext[:nd1, :nd2] = K
+        # The scaled distance vectors
+        dD = Q.T[:, :, None] - X.T[:, None, :]
+        # The first derivative of the kernel
+        dKdD = length_scale * K
+        if self.use_derivatives:
+            # Derivative part of X
+            Kext_view = Kext[:nd1, nd2:].reshape(nd1, xdim, nd2)
+            np.multiply(dKdD, dD, out=Kext_view.transpose(1, 0, 2))
+        if get_derivatives:
+            # Derivative part of Q
+            Kext_view = Kext[nd1:, :nd2].reshape(xdim, nd1, nd2)
+            np.multiply(-dKdD, dD, out=Kext_view)
+            # Hessian part
+            if self.use_derivatives:
+                ddKdD = (-length_scale * length_scale * K) * dD
+                Kext_view = (
+                    Kext[nd1:]
+                    .reshape(xdim, nd1, ncol)[:, :, nd2:]
+                    .reshape(xdim, nd1, xdim, nd2)
+                )
+                np.einsum("dij,eij->diej", ddKdD, dD, out=Kext_view)
+                dims = np.arange(xdim)
+                Kext_view[dims, :, dims, :] += length_scale * dKdD
+        return Kext
+
+    def check_backend(
+        self,
+        features,
+        features2=None,
+        get_derivatives=True,
+        rtol=1e-8,
+        atol=1e-10,
+        **kwargs,
+    ):
+        """
+        Check that the kernel matrix from the used backend is the same as
+        from the reference implementation.
+
+        Parameters:
+            features : (N,D) array or (N) list of fingerprint objects
+                Features with N data points.
+            features2 : (M,D) array or (M) list of fingerprint objects
+                Features with M data points and D dimensions.
+                If it is not given a squared kernel from features is checked.
+            get_derivatives: bool
+                Whether to predict derivatives of target.
+            rtol: float
+                The relative tolerance of the kernel elements.
+            atol: float
+                The absolute tolerance of the kernel elements.
+
+        Returns:
+            bool: Whether the kernel matrices are the same.
+        """
+        # Calculate the kernel matrix with the used backend
+        K = self(features, features2, get_derivatives=get_derivatives)
+        # Calculate the kernel matrix with the reference implementation
+        backend = self.backend
+        self.backend = "reference"
+        try:
+            K_ref = self(features, features2, get_derivatives=get_derivatives)
+        finally:
+            self.backend = backend
+        return np.shape(K) == np.shape(K_ref) and np.allclose(
+            K,
+            K_ref,
+            rtol=rtol,
+            atol=atol,
+        )
+
     def get_KQX_ext_fp(
         self,
         features,
@@ -311,13 +524,13 @@ class SE(Kernel):
         nrows = nd1 * (xdim + 1) if get_derivatives else nd1
         ncol = nd2 * (xdim + 1) if self.use_derivatives else nd2
         # The full kernel matrix
-        Kext = np.zeros((nrows, ncol))
+        Kext = np.zeros((nrows, ncol), dtype=K.dtype)
         Kext[:nd1, :nd2] = K.copy()
         # The first derivative of the kernel
         dKpre, dK = self.get_derivative_K(K)
         # Get the derivative of the scaled distance matrix for X
         if self.use_derivatives:
-            fp_deriv2 = self.get_fp_deriv(features2)
+            fp_deriv2 = self.get_fp_deriv(features2, dtype=K.dtype)
             dDpre2, dD2 = self.get_distance_derivative_fp(
                 Q,
                 fp_deriv2,
@@ -332,7 +545,7 @@ class SE(Kernel):
             ).reshape(nd1, nd2 * xdim)
         # Get the derivative of the scaled distance matrix for Q
         if get_derivatives:
-            fp_deriv1 = self.get_fp_deriv(features)
+            fp_deriv1 = self.get_fp_deriv(features, dtype=K.dtype)
             dDpre1, dD1 = self.get_distance_derivative_fp(
                 Q,
                 fp_deriv1,
@@ -363,6 +576,88 @@ class SE(Kernel):
                 Kext[nd1:, :nd2] = (dKdD * dD1).reshape(nd1 * xdim, nd2)
         return Kext
 
+    def update_arguments(
+        self,
+        use_derivatives=None,
+        use_fingerprint=None,
+        hp=None,
+        backend=None,
+        dtype=None,
+        **kwargs,
+    ):
+        """
+        Update the class with its arguments.
+        The existing arguments are used if they are not given.
+
+        Parameters:
+            use_derivatives: bool
+                Whether to use the derivatives of the targets.
+            use_fingerprint: bool
+                Whether fingerprint objects is given or arrays.
+            hp: dict
+                A dictionary of the hyperparameters in the log-space.
+                The hyperparameters should be given as flatten arrays,
+                like hp=dict(length=np.array([-0.7])).
+            backend: str
+                The implementation used for the kernel matrices with
+                derivatives ('reference', 'fused', or 'numba').
+            dtype: type
+                The data type of the kernel matrix between the test and
+                training features used in the predictions (e.g. np.float32).
+
+        Returns:
+            self: The updated object itself.
+        """
+        super().update_arguments(
+            use_derivatives=use_derivatives,
+            use_fingerprint=use_fingerprint,
+            hp=hp,
+            dtype=dtype,
+        )
+        if backend is not None:
+            self.set_backend(backend)
+        return self
+
+    def set_backend(self, backend, **kwargs):
+        """
+        Set the implementation used for the kernel matrices with derivatives.
+        The fused backend is used if numba is chosen but not installed.
+        """
+        backend = backend.lower()
+        if backend not in ["reference", "fused", "numba"]:
+            raise Exception(
+                "The backend {} is not implemented!".format(backend)
+            )
+        if backend == "numba":
+            try:
+                from . import se_numba  # noqa: F401
+            except ImportError:
+                import warnings
+
+                warnings.warn(
+                    "Numba is not installed, "
+                    "so the fused backend is used instead!"
+                )
+                backend = "fused"
+        self.backend = backend
+        return self
+
+    def get_arguments(self):
+        "Get the arguments of the class itself."
+        # Get the arguments given to the class in the initialization
+        arg_kwargs = dict(
+            use_derivatives=self.use_derivatives,
+            use_fingerprint=self.use_fingerprint,
+            hp=self.hp,
+            backend=self.backend,
+            dtype=self.dtype,
+        )
+        # Get the constants made within the class
+        constant_kwargs = dict()
+        # Get the objects made within the class
+        object_kwargs = dict()
+        return arg_kwargs, constant_kwargs, object_kwargs
+
     def get_derivative_K(self, K, **kwargs):
         """
         Make the derivative of the kernel matrix wrt.
@@ -508,7 +803,7 @@ class SE(Kernel):
         Get the derivative of the scaled distance matrix wrt.
         the features/fingerprint.
         """
-        dDpre = 2.0 * np.exp(-self.hp["length"][0])
+        dDpre = 2.0 * float(np.exp(-self.hp["length"][0]))
         if axis != 0:
             dDpre = -dDpre
         return dDpre, Q.T.reshape(dim, nd1, 1) - X.T.reshape(dim, 1, nd2)
@@ -525,7 +820,7 @@ class SE(Kernel):
         Get the derivative of the distance matrix wrt.
         the features/fingerprint.
         """
-        dDpre = 2.0 * np.exp(-self.hp["length"][0])
+        dDpre = 2.0 * float(np.exp(-self.hp["length"][0]))
         if axis != 0:
             dDpre = -dDpre
         if X is None:
@@ -547,7 +842,7 @@ class SE(Kernel):
         Get the derivative of the scaled distance matrix wrt.
         the features/fingerprint.
         """
-        dDpre = -2.0 * np.exp(-2 * self.hp["length"][0])
+        dDpre = -2.0 * float(np.exp(-2 * self.hp["length"][0]))
         return dDpre, 1.0
 
     def get_distance_hessian_fp(self, fp_deriv1, fp_deriv2, **kwargs):
@@ -555,7 +850,7 @@ class SE(Kernel):
         Get the derivative of the scaled distance matrix wrt.
         the features/fingerprint.
         """
-        dDpre = -2.0 * np.exp(-2 * self.hp["length"][0])
+        dDpre = -2.0 * float(np.exp(-2 * self.hp["length"][0]))
         hes_fp = np.einsum(
             "dji,eki->dejk",
             fp_deriv1,
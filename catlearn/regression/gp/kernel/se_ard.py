@@ -0,0 +1,367 @@
+import numpy as np
+from scipy.spatial.distance import pdist, squareform
+from .kernel import Kernel
+from .se import SE
+from ..fingerprint.fingerprintobject import FingerprintObject
+
+
+class SE_ARD(SE):
+    def __init__(
+        self,
+        use_derivatives=False,
+        use_fingerprint=False,
+        hp={},
+        groups=None,
+        backend="reference",
+        dtype=float,
+        **kwargs,
+    ):
+        """
+        The Kernel class with hyperparameters.
+        Squared exponential kernel with automatic relevance determination,
+        where the feature dimensions are grouped into a small number of
+        shared length-scales (e.g. one for each combination of elements
+        in the inverse distance fingerprints).
+        The features are scaled with the length-scales of their groups and
+        the kernel matrices of the SE kernel are used in the scaled space.
+
+        Parameters:
+            use_derivatives: bool
+                Whether to use the derivatives of the targets.
+            use_fingerprint: bool
+                Whether fingerprint objects is given or arrays.
+            hp: dict
+                A dictionary of the hyperparameters in the log-space.
+                The hyperparameters should be given as flatten arrays,
+                like hp=dict(length=np.array([-0.7, -0.5])).
+                A single length-scale is used for all the groups.
+            groups: (D) array or None
+                The index of the length-scale group of each feature
+                dimension (e.g. from Fingerprint.get_length_groups).
+                All the feature dimensions share one length-scale if None.
+            backend: str
+                The implementation used for the kernel matrices with
+                derivatives ('reference', 'fused', or 'numba').
+            dtype: type
+                The data type of the kernel matrix between the test and
+                training features used in the predictions (e.g. np.float32).
+        """
+        # All the feature dimensions are in one group as default
+        self.groups = None
+        self.n_groups = 1
+        super().__init__(
+            use_derivatives=use_derivatives,
+            use_fingerprint=use_fingerprint,
+            hp=hp,
+            groups=groups,
+            backend=backend,
+            dtype=dtype,
+            **kwargs,
+        )
+
+    def get_KXX(self, features, **kwargs):
+        # Calculate the kernel in the scaled feature space
+        K = self.call_unit_length(
+            super().get_KXX,
+            self.get_scaled_features(features),
+            **kwargs,
+        )
+        if self.use_derivatives and not self.use_fingerprint:
+            return self.scale_derivatives(K, len(features), len(features))
+        return K
+
+    def get_KXX_batch(self, features, hps, **kwargs):
+        # The kernel matrices are calculated one at a time
+        return Kernel.get_KXX_batch(self, features, hps, **kwargs)
+
+    def get_KQX(
+        self,
+        features,
+        features2,
+        get_derivatives=True,
+        dtype=None,
+        **kwargs,
+    ):
+        # Calculate the kernel in the scaled feature space
+        K = self.call_unit_length(
+            super().get_KQX,
+            self.get_scaled_features(features),
+            self.get_scaled_features(features2),
+            get_derivatives=get_derivatives,
+            dtype=dtype,
+            **kwargs,
+        )
+        if not self.use_fingerprint:
+            return self.scale_derivatives(
+                K,
+                len(features),
+                len(features2),
+                get_derivatives=get_derivatives,
+            )
+        return K
+
+    def diag(self, features, get_derivatives=True, **kwargs):
+        K_diag = self.call_unit_length(
+            super().diag,
+            self.get_scaled_features(features),
+            get_derivatives=get_derivatives,
+        )
+        if get_derivatives and not self.use_fingerprint:
+            nd1, xdim = np.shape(features)
+            scales = np.broadcast_to(self.get_scales(), (xdim,))
+            K_diag[nd1:] *= np.repeat(scales**2, nd1)
+        return K_diag
+
+    def get_gradients(self, features, hp, KXX, correction=True, **kwargs):
+        hp_deriv = {}
+        if "length" not in hp:
+            return hp_deriv
+        # Get the features in the scaled space
+        if self.use_fingerprint:
+            X = self.get_arrays(features) * self.get_scales()
+        else:
+            X = features * self.get_scales()
+        nd1 = len(X)
+        group_indicies = self.get_group_indicies(len(X[0]))
+        # The squared distances within each group
+        D_groups = [
+            squareform(pdist(X[:, indicies], metric="sqeuclidean"))
+            for indicies in group_indicies
+        ]
+        if not self.use_derivatives:
+            hp_deriv["length"] = np.array([KXX * D_g for D_g in D_groups])
+            return hp_deriv
+        # Get the scaled derivatives of the features
+        J = self.get_scaled_derivatives(features)
+        xdim = J.shape[2]
+        nd1x = nd1 * xdim
+        K = KXX[:nd1, :nd1]
+        # The projections of the distances on the derivatives of each group
+        p_groups, q_groups = [], []
+        for indicies in group_indicies:
+            A = np.einsum(
+                "ij,kjb->ikb",
+                X[:, indicies],
+                J[:, indicies],
+                optimize=True,
+            )
+            A_diag = np.einsum("kkb->kb", A)
+            p_groups.append(A_diag[:, None, :] - np.transpose(A, (1, 0, 2)))
+            q_groups.append(A - A_diag[None, :, :])
+        p = np.sum(p_groups, axis=0)
+        q = np.sum(q_groups, axis=0)
+        # The noise correction prefactor
+        K_diag = np.diag(KXX)
+        corr_pre = 2.0 * np.sum(K_diag) / ((1.0 / 2.3e-16) - len(K_diag) ** 2)
+        hp_deriv["length"] = np.empty((len(group_indicies),) + KXX.shape)
+        for g, indicies in enumerate(group_indicies):
+            Kd = hp_deriv["length"][g]
+            # The derivative of the kernel wrt. the distances of the group
+            D_g = np.tile(D_groups[g], (xdim + 1, xdim + 1))
+            np.multiply(KXX, D_g, out=Kd)
+            # The derivative of the scaled derivatives of the group
+            Kd[:nd1, nd1:] -= 2.0 * np.transpose(
+                K[:, :, None] * q_groups[g],
+                (0, 2, 1),
+            ).reshape(nd1, nd1x)
+            Kd[nd1:, :nd1] += 2.0 * np.transpose(
+                K[:, :, None] * p_groups[g],
+                (2, 0, 1),
+            ).reshape(nd1x, nd1)
+            J_g = J[:, indicies]
+            ddK = np.einsum("ija,kjb->aibk", J_g, J_g, optimize=True)
+            ddK -= np.einsum("ika,ikb->aibk", p_groups[g], q, optimize=True)
+            ddK -= np.einsum("ika,ikb->aibk", p, q_groups[g], optimize=True)
+            ddK *= K[None, :, None, :]
+            Kd[nd1:, nd1:] -= 2.0 * ddK.reshape(nd1x, nd1x)
+            if correction:
+                Kd[range(len(Kd)), range(len(Kd))] += corr_pre * np.sum(
+                    np.diag(Kd)[nd1:]
+                )
+        return hp_deriv
+
+    def set_hyperparams(self, new_params, **kwargs):
+        if "length" in new_params:
+            length = np.array(new_params["length"], dtype=float).reshape(-1)
+            # Use the same length-scale for all the groups if one is given
+            if len(length) == 1:
+                length = np.full(self.n_groups, length[0])
+            elif len(length) != self.n_groups:
+                raise Exception(
+                    "The number of length-scales does not match "
+                    "the number of groups!"
+                )
+            self.hp["length"] = length
+        return self
+
+    def get_hp_dimension(self, features=None, **kwargs):
+        return int(self.n_groups)
+
+    def get_length_groups(self, **kwargs):
+        return self.groups
+
+    def get_scales(self, **kwargs):
+        """
+        Get the inverse length-scales of the feature dimensions.
+
+        Returns:
+            (D) array or float: The inverse length-scale of each
+                feature dimension or a float if one group is used.
+        """
+        if self.groups is None:
+            return np.exp(-self.hp["length"][0])
+        return np.exp(-self.hp["length"][self.groups])
+
+    def get_group_indicies(self, dim, **kwargs):
+        "Get the indicies of the feature dimensions in each group."
+        if self.groups is None:
+            return [np.arange(dim)]
+        if len(self.groups) != dim:
+            raise Exception(
+                "The number of groups does not match "
+                "the dimension of the features!"
+            )
+        return [np.where(self.groups == g)[0] for g in range(self.n_groups)]
+
+    def get_scaled_features(self, features, **kwargs):
+        "Scale the features or fingerprints with their length-scales."
+        self.get_group_indicies(self.get_feature_dimension(features))
+        scales = self.get_scales()
+        if not self.use_fingerprint:
+            return features * scales
+        scales_deriv = np.reshape(scales, (-1, 1))
+        features_scaled = []
+        for fp in features:
+            derivative = fp.get_derivatives()
+            if derivative is not None:
+                derivative = derivative * scales_deriv
+            features_scaled.append(
+                FingerprintObject(
+                    vector=fp.get_vector() * scales,
+                    derivative=derivative,
+                )
+            )
+        return features_scaled
+
+    def get_scaled_derivatives(self, features, **kwargs):
+        """
+        Get the derivatives of the scaled features wrt.
+        the coordinates of the derivatives.
+
+        Returns:
+            (N,D,Dx) array: The scaled derivatives.
+        """
+        scales = self.get_scales()
+        if self.use_fingerprint:
+            fp_deriv = np.transpose(self.get_fp_deriv(features), (1, 2, 0))
+            return fp_deriv * np.reshape(scales, (1, -1, 1))
+        nd1, xdim = np.shape(features)
+        scales = np.broadcast_to(scales, (xdim,))
+        return np.broadcast_to(np.diag(scales), (nd1, xdim, xdim))
+
+    def scale_derivatives(
+        self,
+        K,
+        nd1,
+        nd2,
+        get_derivatives=True,
+        **kwargs,
+    ):
+        """
+        Scale the derivative parts of the kernel matrix from
+        the scaled feature space to the features without fingerprints.
+        """
+        scales = self.get_scales()
+        if get_derivatives:
+            xdim = (len(K) - nd1) // nd1
+            scales = np.broadcast_to(scales, (xdim,))
+            K[nd1:] *= np.repeat(scales, nd1).reshape(-1, 1)
+        if self.use_derivatives:
+            xdim = (len(K[0]) - nd2) // nd2
+            scales = np.broadcast_to(scales, (xdim,))
+            K[:, nd2:] *= np.repeat(scales, nd2)
+        return K
+
+    def call_unit_length(self, function, *args, **kwargs):
+        """
+        Call a method of the SE kernel with a unit length-scale,
+        since the features are scaled with their length-scales.
+        """
+        length = self.hp["length"]
+        self.hp["length"] = np.zeros(1)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.hp["length"] = length
+
+    def update_arguments(
+        self,
+        use_derivatives=None,
+        use_fingerprint=None,
+        hp=None,
+        groups=None,
+        backend=None,
+        dtype=None,
+        **kwargs,
+    ):
+        """
+        Update the class with its arguments.
+        The existing arguments are used if they are not given.
+
+        Parameters:
+            use_derivatives: bool
+                Whether to use the derivatives of the targets.
+            use_fingerprint: bool
+                Whether fingerprint objects is given or arrays.
+            hp: dict
+                A dictionary of the hyperparameters in the log-space.
+                The hyperparameters should be given as flatten arrays,
+                like hp=dict(length=np.array([-0.7, -0.5])).
+                A single length-scale is used for all the groups.
+            groups: (D) array or None
+                The index of the length-scale group of each feature
+                dimension (e.g. from Fingerprint.get_length_groups).
+            backend: str
+                The implementation used for the kernel matrices with
+                derivatives ('reference', 'fused', or 'numba').
+            dtype: type
+                The data type of the kernel matrix between the test and
+                training features used in the predictions (e.g. np.float32).
+
+        Returns:
+            self: The updated object itself.
+        """
+        if groups is not None:
+            self.groups = np.array(groups, dtype=int).reshape(-1)
+            self.n_groups = int(np.max(self.groups)) + 1
+            # Use the mean length-scale if the number of groups is changed
+            if len(self.hp["length"]) != self.n_groups:
+                self.hp["length"] = np.full(
+                    self.n_groups,
+                    np.mean(self.hp["length"]),
+                )
+        super().update_arguments(
+            use_derivatives=use_derivatives,
+            use_fingerprint=use_fingerprint,
+            hp=hp,
+            backend=backend,
+            dtype=dtype,
+        )
+        return self
+
+    def get_arguments(self):
+        "Get the arguments of the class itself."
+        # Get the arguments given to the class in the initialization
+        arg_kwargs = dict(
+            use_derivatives=self.use_derivatives,
+            use_fingerprint=self.use_fingerprint,
+            hp=self.hp,
+            groups=self.groups,
+            backend=self.backend,
+            dtype=self.dtype,
+        )
+        # Get the constants made within the class
+        constant_kwargs = dict()
+        # Get the objects made within the class
+        object_kwargs = dict()
+        return arg_kwargs, constant_kwargs, object_kwargs
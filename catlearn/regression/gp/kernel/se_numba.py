@@ -0,0 +1,61 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True)
+def get_KQX_ext_numba(Q, X, K, length_scale, get_derivatives, use_derivatives):
+    """
+    Make the extended squared exponential kernel matrix without fingerprints
+    in a single pass over all pairs of data points.
+
+    Parameters:
+        Q: (M,D) array
+            Features in the scaled feature space.
+        X: (N,D) array
+            Features in the scaled feature space.
+        K: (M,N) array
+            The covariance matrix without derivatives of the features.
+        length_scale: float
+            The inverse length-scale (not in the log-space).
+        get_derivatives: bool
+            Whether to predict derivatives of target.
+        use_derivatives: bool
+            Whether to use the derivatives of the targets.
+
+    Returns:
+        (M*D+M,N*D+N) array : The extended kernel matrix.
+    """
+    # Get dimensions
+    nd1, xdim = Q.shape
+    nd2 = X.shape[0]
+    nrows = nd1 * (xdim + 1) if get_derivatives else nd1
+    ncol = nd2 * (xdim + 1) if use_derivatives else nd2
+    length_scale2 = length_scale * length_scale
+    # The full kernel matrix
+    Kext = np.zeros((nrows, ncol))
+    for i in prange(nd1):
+        dif = np.empty(xdim)
+        for j in range(nd2):
+            k = K[i, j]
+            Kext[i, j] = k
+            for d in range(xdim):
+                dif[d] = Q[i, d] - X[j, d]
+            # Derivative part of X
+            if use_derivatives:
+                for e in range(xdim):
+                    Kext[i, nd2 + e * nd2 + j] = length_scale * k * dif[e]
+            if get_derivatives:
+                for d in range(xdim):
+                    row = nd1 + d * nd1 + i
+                    # Derivative part of Q
+                    Kext[row, j] = -length_scale * k * dif[d]
+                    # Hessian part
+                    if use_derivatives:
+                        for e in range(xdim):
+                            value = -dif[d] * dif[e]
+                            if d == e:
+                                value += 1.0
+                            Kext[row, nd2 + e * nd2 + j] = (
+                                length_scale2 * k * value
+                            )
+    return Kext
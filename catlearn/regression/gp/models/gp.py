@@ -11,6 +11,9 @@ class GaussianProcess(ModelProcess):
         hp={},
         use_derivatives=False,
         use_correction=True,
+        use_frozen=False,
+        dtype=float,
+        precision_tol=1e-3,
         **kwargs
     ):
         """
@@ -33,6 +36,24 @@ class GaussianProcess(ModelProcess):
                 Use derivatives/gradients for training and predictions.
             use_correction : bool
                 Use the noise correction on the covariance matrix.
+            use_frozen : bool
+                Whether to precompute the inverse of the Cholesky factor
+                after training, so the predictions are made with
+                matrix products only (frozen inference).
+                The hyperparameters and training data must not be changed
+                without retraining the model.
+            dtype : type
+                The data type used in the predictions (e.g. np.float32).
+                The kernel matrix between the test and training features
+                and the precomputed arrays of the frozen inference are
+                stored with the data type.
+                The Cholesky factorization and the hyperparameter
+                optimization are always made in float64.
+            precision_tol : float
+                The largest estimated relative rounding error of
+                the predicted mean for using the data type in the predictions.
+                float64 is used in the predictions if the estimated error
+                is larger (e.g. for ill-conditioned kernel matrices).
         """
         # Set default descriptors
         self.trained_model = False
@@ -41,7 +62,14 @@ class GaussianProcess(ModelProcess):
         self.L = np.array([])
         self.low = False
         self.coef = np.array([])
+        self.Linv = np.array([])
         self.prefactor = 1.0
+        self.precision_factor = np.inf
+        # The derivative targets are all used as default
+        self.deriv_indicies = None
+        self.deriv_n_data = 0
+        # The last masked kernel matrix and its full kernel matrix
+        self.full_kernel = None
         # Set default hyperparameters
         self.hp = {"noise": np.array([-8.0]), "prefactor": np.array([0.0])}
         # Set the default prior mean class
@@ -68,6 +96,9 @@ class GaussianProcess(ModelProcess):
             hp=hp,
             use_derivatives=use_derivatives,
             use_correction=use_correction,
+            use_frozen=use_frozen,
+            dtype=dtype,
+            precision_tol=precision_tol,
             **kwargs
         )
 
@@ -113,7 +144,7 @@ class GaussianProcess(ModelProcess):
             )
             K_deriv[:n_data] = 0.0
             hp_deriv["noise_deriv"] = np.array([np.diag(K_deriv)])
-        hp_deriv.update(self.kernel.get_gradients(features, hp, KXX=KXX))
+        hp_deriv.update(self.get_kernel_gradients(features, hp, KXX=KXX))
         return hp_deriv
 
     def calculate_prefactor(self, features=None, targets=None, **kwargs):
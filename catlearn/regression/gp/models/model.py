@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.linalg import cho_factor, cho_solve
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
 
 
 class ModelProcess:
@@ -11,6 +11,9 @@ class ModelProcess:
         hp={},
         use_derivatives=False,
         use_correction=True,
+        use_frozen=False,
+        dtype=float,
+        precision_tol=1e-3,
         **kwargs,
     ):
         """
@@ -34,6 +37,24 @@ class ModelProcess:
                 training and predictions.
             use_correction : bool
                 Use the noise correction on the covariance matrix.
+            use_frozen : bool
+                Whether to precompute the inverse of the Cholesky factor
+                after training, so the predictions are made with
+                matrix products only (frozen inference).
+                The hyperparameters and training data must not be changed
+                without retraining the model.
+            dtype : type
+                The data type used in the predictions (e.g. np.float32).
+                The kernel matrix between the test and training features
+                and the precomputed arrays of the frozen inference are
+                stored with the data type.
+                The Cholesky factorization and the hyperparameter
+                optimization are always made in float64.
+            precision_tol : float
+                The largest estimated relative rounding error of
+                the predicted mean for using the data type in the predictions.
+                float64 is used in the predictions if the estimated error
+                is larger (e.g. for ill-conditioned kernel matrices).
         """
         # Set default descriptors
         self.trained_model = False
@@ -42,7 +63,14 @@ class ModelProcess:
         self.L = np.array([])
         self.low = False
         self.coef = np.array([])
+        self.Linv = np.array([])
         self.prefactor = 1.0
+        self.precision_factor = np.inf
+        # The derivative targets are all used as default
+        self.deriv_indicies = None
+        self.deriv_n_data = 0
+        # The last masked kernel matrix and its full kernel matrix
+        self.full_kernel = None
         # Set default relative-noise hyperparameter
         self.hp = {"noise": np.array([-8.0])}
         # Set the default prior mean class
@@ -69,6 +97,9 @@ class ModelProcess:
             hp=hp,
             use_derivatives=use_derivatives,
             use_correction=use_correction,
+            use_frozen=use_frozen,
+            dtype=dtype,
+            precision_tol=precision_tol,
             **kwargs,
         )
 
@@ -83,12 +114,15 @@ class ModelProcess:
                 Training targets with N data points.
                 If use_derivatives=True, the training targets is in
                 first column and derivatives is in the next columns.
+                The derivatives given as NaN are not used.
 
         Returns:
             self: The trained object itself.
         """
         # Note that the model is trained
         self.trained_model = True
+        # Get the derivative targets that are used
+        self.set_derivative_mask(targets)
         # Store features
         self.features = features.copy()
         # Make the kernel matrix decomposition
@@ -99,6 +133,200 @@ class ModelProcess:
         self.coef = self.calculate_coefficients(features, targets)
         # Calculate the prefactor for variance predictions
         self.prefactor = self.calculate_prefactor(features, targets)
+        # Estimate the rounding error of the predictions
+        self.precision_factor = self.calculate_precision_factor(
+            features,
+            targets,
+        )
+        # Precompute the arrays used in the frozen inference
+        if self.use_frozen:
+            self.freeze()
+        return self
+
+    def freeze(self, **kwargs):
+        """
+        Precompute the inverse of the Cholesky factor, so the predicted
+        mean, variance, and their derivatives are calculated with
+        matrix products only.
+        The model must be trained.
+
+        Returns:
+            self: The frozen object itself.
+        """
+        # Check if the model is trained
+        if not self.trained_model:
+            raise Exception("The model is not trained!")
+        # Calculate the factor W with C^-1 = W W^T
+        eye = np.identity(len(self.L))
+        Linv = solve_triangular(
+            self.L,
+            eye,
+            lower=self.low,
+            check_finite=False,
+        )
+        if self.low:
+            Linv = Linv.T
+        self.Linv = np.asarray(Linv, dtype=self.get_prediction_dtype())
+        return self
+
+    def get_trained_state(self, **kwargs):
+        """
+        Get the trained state of the model as contiguous NumPy arrays.
+        The trained state contains everything needed for predictions,
+        so another instance with the same arguments can predict
+        without being trained.
+        The model must be trained.
+
+        Returns:
+            dict: A dictionary of NumPy arrays with the trained state.
+        """
+        # Check if the model is trained
+        if not self.trained_model:
+            raise Exception("The model is not trained!")
+        state = dict(
+            L=self.L,
+            low=np.array(self.low, dtype=bool),
+            coef=self.coef,
+            Linv=self.Linv,
+            corr=np.array(self.corr, dtype=float),
+            prefactor=np.array(self.prefactor, dtype=float),
+            precision_factor=np.array(self.precision_factor, dtype=float),
+        )
+        # Store the derivative targets that are used
+        if self.deriv_indicies is not None:
+            state["deriv_indicies"] = self.deriv_indicies
+        # Store the training features
+        if self.get_use_fingerprint():
+            state["features"] = np.array(
+                [fp.get_vector() for fp in self.features]
+            )
+            if self.features[0].derivative is not None:
+                state["features_deriv"] = np.array(
+                    [fp.get_derivatives() for fp in self.features]
+                )
+        else:
+            state["features"] = self.features
+        # Store the hyperparameters
+        for key, value in self.get_hyperparams().items():
+            state["hp_" + key] = value
+        # Store the prior mean parameters
+        for key, value in self.get_prior_parameters().items():
+            state["prior_" + key] = np.array(value, dtype=float)
+        return {
+            key: np.ascontiguousarray(value) for key, value in state.items()
+        }
+
+    def set_trained_state(self, state, **kwargs):
+        """
+        Set the trained state of the model from NumPy arrays
+        made by get_trained_state.
+        The model is not trained again.
+
+        Parameters:
+            state : dict
+                A dictionary of NumPy arrays with the trained state.
+
+        Returns:
+            self: The trained object itself.
+        """
+        # Set the hyperparameters and prior mean parameters
+        hp = {
+            key[3:]: value.copy()
+            for key, value in state.items()
+            if key.startswith("hp_")
+        }
+        self.set_hyperparams(hp)
+        prior_parameters = {
+            key[6:]: value.item()
+            for key, value in state.items()
+            if key.startswith("prior_")
+        }
+        self.prior.update_arguments(**prior_parameters)
+        # Set the training features
+        if self.get_use_fingerprint():
+            from ..fingerprint.fingerprintobject import FingerprintObject
+
+            features_deriv = state.get("features_deriv", None)
+            self.features = [
+                FingerprintObject(
+                    vector=vector,
+                    derivative=(
+                        None if features_deriv is None else features_deriv[i]
+                    ),
+                )
+                for i, vector in enumerate(state["features"])
+            ]
+        else:
+            self.features = state["features"].copy()
+        # Set the derivative targets that are used
+        self.deriv_indicies = None
+        self.deriv_n_data = len(self.features)
+        if "deriv_indicies" in state:
+            self.deriv_indicies = state["deriv_indicies"].copy()
+        # Set the trained arrays
+        self.L = state["L"].copy()
+        self.low = bool(state["low"])
+        self.coef = state["coef"].copy()
+        self.corr = state["corr"].item()
+        self.prefactor = state["prefactor"].item()
+        self.precision_factor = np.inf
+        if "precision_factor" in state:
+            self.precision_factor = state["precision_factor"].item()
+        self.trained_model = True
+        # Set or make the arrays used in the frozen inference
+        if self.use_frozen:
+            if len(state["Linv"]):
+                self.Linv = state["Linv"].astype(self.get_prediction_dtype())
+            else:
+                self.freeze()
+        else:
+            self.Linv = np.array([])
+        return self
+
+    def broadcast_trained_state(self, root=0, **kwargs):
+        """
+        Broadcast the trained state of the model from the root rank
+        to all the other MPI ranks.
+        Only the names, shapes, and data types of the arrays are pickled.
+        The arrays are broadcasted as contiguous buffers,
+        so the other ranks can predict without training the model.
+
+        Parameters:
+            root : int
+                The rank of the CPU with the trained model.
+
+        Returns:
+            self: The object itself with the trained state.
+        """
+        from ase.parallel import world, broadcast
+
+        if world.size == 1:
+            return self
+        # Share the layout of the arrays
+        state, layout = None, None
+        if world.rank == root:
+            state = self.get_trained_state()
+            layout = [
+                (key, value.shape, value.dtype.str)
+                for key, value in state.items()
+            ]
+        layout = broadcast(layout, root=root)
+        # Allocate the buffers on the other ranks
+        if world.rank != root:
+            state = {
+                key: np.empty(shape, dtype=dtype)
+                for key, shape, dtype in layout
+            }
+        # Broadcast the buffers
+        comm = getattr(world, "comm", None)
+        for key, _, _ in layout:
+            if comm is not None and hasattr(comm, "Bcast"):
+                comm.Bcast(state[key], root=root)
+            else:
+                world.broadcast(state[key], root)
+        # Set the trained state on the other ranks
+        if world.rank != root:
+            self.set_trained_state(state)
         return self
 
     def optimize(
@@ -120,6 +348,7 @@ class ModelProcess:
             targets : (N,1) array or (N,D+1) array
                 Training targets with or without derivatives
                 with N data points.
+                The derivatives given as NaN are not used.
             retrain : bool
                 Whether to retrain the model after the optimization.
             hp : dict
@@ -142,6 +371,8 @@ class ModelProcess:
         # Ensure the targets are in the right format
         if not self.use_derivatives:
             targets = targets[:, 0:1].copy()
+        # Get the derivative targets that are used
+        self.set_derivative_mask(targets)
         # Optimize the hyperparameters
         sol = self.hpfitter.fit(
             features,
@@ -287,8 +518,12 @@ class ModelProcess:
         else:
             if not get_derivatives:
                 KQX = KQX[:m_data]
-        # Calculate the prediction mean
-        Y_predict = np.matmul(KQX, self.coef)
+        # Calculate the prediction mean with the data type
+        dtype = self.get_prediction_dtype()
+        Y_predict = np.matmul(
+            KQX.astype(dtype, copy=False),
+            self.coef.astype(dtype, copy=False),
+        ).astype(float, copy=False)
         # Rearrange prediction
         Y_predict = Y_predict.reshape(m_data, -1, order="F")
         # Add the prior mean
@@ -354,9 +589,7 @@ class ModelProcess:
             include_noise=include_noise,
         )
         # Calculate predicted variance
-        var = (
-            k - np.einsum("ij,ji->i", KQX, self.calculate_CinvKQX(KQX))
-        ).reshape(-1, 1)
+        var = (k - self.calculate_variance_reduction(KQX)).reshape(-1, 1)
         # Scale prediction variance with the prefactor
         var = var * self.prefactor
         # Rearrange the predicted variance
@@ -393,9 +626,20 @@ class ModelProcess:
         # Calculate derivative of the diagonal wrt. the test features
         k_deriv = self.kernel_deriv_diag(features)
         # Calculate derivative of the predicted variance
-        var_deriv = k_deriv - 2.0 * np.einsum(
-            "ij,ji->i", KQX[m_data:], self.calculate_CinvKQX(KQX[:m_data])
-        ).reshape(-1, 1)
+        if self.use_frozen:
+            KQXW = np.matmul(
+                KQX.astype(self.Linv.dtype, copy=False),
+                self.Linv,
+            )
+            var_red = np.einsum("ij,ji->i", KQXW[m_data:], KQXW[:m_data].T)
+            var_red = var_red.astype(float, copy=False)
+        else:
+            var_red = np.einsum(
+                "ij,ji->i",
+                KQX[m_data:],
+                self.calculate_CinvKQX(KQX[:m_data]),
+            )
+        var_deriv = k_deriv - 2.0 * var_red.reshape(-1, 1)
         # Scale prediction variance with the prefactor
         var_deriv = var_deriv * self.prefactor
         # Rearrange derivative of variance
@@ -414,6 +658,7 @@ class ModelProcess:
             self: The object itself with the new hyperparameters.
         """
         self.kernel.set_hyperparams(new_params)
+        self.full_kernel = None
         if "noise" in new_params:
             self.hp["noise"] = np.array(
                 new_params["noise"],
@@ -443,6 +688,7 @@ class ModelProcess:
         features,
         features2=None,
         get_derivatives=True,
+        dtype=None,
         **kwargs,
     ):
         """
@@ -456,6 +702,10 @@ class ModelProcess:
                 If it is not given a squared kernel from features is generated.
             get_derivatives: bool
                 Whether to predict derivatives of target.
+            dtype: type or None
+                The data type of the kernel matrix if features2 is not None.
+                The data type of the predictions is used if None.
+                The symmetric kernel matrix is always in float64.
 
         Returns:
             KXX : array
@@ -472,12 +722,160 @@ class ModelProcess:
                 The number of columns in the array is M, or M*(D+1)
                 if use_derivatives=True.
         """
-        return self.kernel(
+        if features2 is None:
+            K = self.kernel(
+                features,
+                get_derivatives=get_derivatives,
+                **kwargs,
+            )
+            # Remove the derivative targets that are not used
+            deriv_indicies = self.get_derivative_indicies(len(features))
+            if deriv_indicies is None:
+                return K
+            if not get_derivatives:
+                return K[:, deriv_indicies]
+            # Keep the full kernel matrix for the gradients
+            K_masked = K[np.ix_(deriv_indicies, deriv_indicies)]
+            self.full_kernel = (K_masked, K)
+            return K_masked
+        if dtype is None:
+            dtype = self.get_prediction_dtype()
+        K = self.kernel(
             features,
             features2=features2,
             get_derivatives=get_derivatives,
+            dtype=dtype,
             **kwargs,
         )
+        # Remove the derivative targets of the training data not used
+        deriv_indicies = self.get_derivative_indicies(len(features2))
+        if deriv_indicies is None:
+            return K
+        return K[:, deriv_indicies]
+
+    def get_kernel_batch(self, features, hps, **kwargs):
+        """
+        Make the symmetric kernel matrices for multiple sets of
+        hyperparameters.
+
+        Parameters:
+            features : (N,D) array or (N) list of fingerprint objects
+                Features with N data points.
+            hps : (B) list of dicts
+                The hyperparameters in the log-space.
+                The hyperparameters of the kernel that are not given
+                are taken from the kernel.
+
+        Returns:
+            (B,N,N) array or (B,N*(D+1),N*(D+1)) array: The stacked
+                symmetric kernel matrices.
+        """
+        K = self.kernel.get_KXX_batch(features, hps, **kwargs)
+        # Remove the derivative targets that are not used
+        deriv_indicies = self.get_derivative_indicies(len(features))
+        if deriv_indicies is None:
+            return K
+        return K[:, deriv_indicies[:, None], deriv_indicies]
+
+    def set_derivative_mask(self, targets, **kwargs):
+        """
+        Set the derivative targets that are used from the training targets.
+        The derivatives given as NaN are not used, so only some of
+        the derivatives of each data point can be used.
+
+        Parameters:
+            targets : (N,1) array or (N,1+D) array
+                Training targets with N data points.
+
+        Returns:
+            self: The updated object itself.
+        """
+        self.deriv_indicies = None
+        self.deriv_n_data = len(targets)
+        self.full_kernel = None
+        if not self.use_derivatives:
+            return self
+        is_used = np.isfinite(targets.T.reshape(-1))
+        if not is_used.all():
+            if not is_used[: len(targets)].all():
+                raise Exception("The targets must not be NaN!")
+            self.deriv_indicies = np.where(is_used)[0]
+        return self
+
+    def get_derivative_indicies(self, n_data, **kwargs):
+        """
+        Get the indicies of the used targets in the rearranged targets
+        of the training data.
+
+        Parameters:
+            n_data : int
+                The number of training data points.
+
+        Returns:
+            array or None: The indicies of the used targets or
+                None if all the targets are used.
+        """
+        if self.deriv_indicies is None or n_data != self.deriv_n_data:
+            return None
+        return self.deriv_indicies
+
+    def rearrange_targets(self, targets, **kwargs):
+        """
+        Rearrange the training targets into a column in the same order as
+        the kernel matrix, where the derivative targets not used
+        are removed.
+
+        Parameters:
+            targets : (N,1) array or (N,1+D) array
+                Training targets with N data points.
+
+        Returns:
+            (N,1) array or (M,1) array: The rearranged targets.
+        """
+        if not self.use_derivatives:
+            return targets[:, 0:1].copy()
+        deriv_indicies = self.get_derivative_indicies(len(targets))
+        targets = targets.T.reshape(-1, 1)
+        if deriv_indicies is None:
+            return targets
+        return targets[deriv_indicies]
+
+    def get_kernel_gradients(self, features, hp, KXX, **kwargs):
+        """
+        Get the gradients of the kernel matrix wrt. the hyperparameters
+        of the kernel, where the derivative targets not used are removed.
+
+        Parameters:
+            features : (N,D) array or (N) list of fingerprint objects
+                Training features with N data points.
+            hp : list
+                A list with elements of the hyperparameters that are optimized.
+            KXX : array
+                The kernel matrix of training data.
+
+        Returns:
+            dict: A dictionary with gradients of the kernel matrix
+                wrt. the hyperparameters.
+        """
+        deriv_indicies = self.get_derivative_indicies(len(features))
+        if deriv_indicies is None:
+            return self.kernel.get_gradients(features, hp, KXX=KXX)
+        # The gradients are calculated from the full kernel matrix,
+        # which is only made once for each masked kernel matrix
+        if self.full_kernel is None or self.full_kernel[0] is not KXX:
+            self.full_kernel = (
+                KXX,
+                self.kernel(features, get_derivatives=True),
+            )
+        hp_deriv = self.kernel.get_gradients(
+            features,
+            hp,
+            KXX=self.full_kernel[1],
+        )
+        return {
+            para: K_deriv[:, deriv_indicies[:, None], deriv_indicies]
+            for para, K_deriv in hp_deriv.items()
+        }
 
     def get_prefactor(self):
         """
@@ -572,34 +970,60 @@ class ModelProcess:
         "Get whether a fingerprint is used as the features."
         return self.kernel.get_use_fingerprint()
 
-    def save_model(self, filename="model.pkl", **kwargs):
+    def save_model(self, filename="model.pkl", file_format=None, **kwargs):
         """
         Save the model object to a file.
 
         Parameters:
             filename : str
                 The name of the file where the object is saved.
+            file_format : str or None
+                The file format used ('pickle' or 'npz').
+                The npz format stores the arrays in a binary file with
+                a JSON manifest of the classes and arguments.
+                The format is chosen from the filename extension if None.
 
         Returns:
             self: The object itself.
         """
+        from ..serialization import get_file_format, save_object
+
+        if get_file_format(filename, file_format) == "npz":
+            save_object(self, filename, **kwargs)
+            return self
         import pickle
 
         with open(filename, "wb") as file:
             pickle.dump(self, file)
         return self
 
-    def load_model(self, filename="model.pkl", **kwargs):
+    def load_model(
+        self,
+        filename="model.pkl",
+        file_format=None,
+        mmap_mode=None,
+        **kwargs,
+    ):
         """
         Load the model object from a file.
 
         Parameters:
             filename : str
                 The name of the file where the object is saved.
+            file_format : str or None
+                The file format used ('pickle' or 'npz').
+                The format is chosen from the filename extension if None.
+            mmap_mode : str or None
+                The memory mapping mode (e.g. 'r') used for the arrays
+                in the npz format.
 
         Returns:
             model: The loaded model object.
         """
+        from ..serialization import get_file_format, load_object
+
+        if get_file_format(filename, file_format) == "npz":
+            return load_object(filename, mmap_mode=mmap_mode)
         import pickle
 
         with open(filename, "rb") as file:
@@ -614,6 +1038,9 @@ class ModelProcess:
         hp={},
         use_derivatives=None,
         use_correction=None,
+        use_frozen=None,
+        dtype=None,
+        precision_tol=None,
         **kwargs,
     ):
         """
@@ -634,6 +1061,24 @@ class ModelProcess:
                 Use derivatives/gradients for training and predictions.
             use_correction : bool
                 Use the noise correction on the covariance matrix.
+            use_frozen : bool
+                Whether to precompute the inverse of the Cholesky factor
+                after training, so the predictions are made with
+                matrix products only (frozen inference).
+                The hyperparameters and training data must not be changed
+                without retraining the model.
+            dtype : type
+                The data type used in the predictions (e.g. np.float32).
+                The kernel matrix between the test and training features
+                and the precomputed arrays of the frozen inference are
+                stored with the data type.
+                The Cholesky factorization and the hyperparameter
+                optimization are always made in float64.
+            precision_tol : float
+                The largest estimated relative rounding error of
+                the predicted mean for using the data type in the predictions.
+                float64 is used in the predictions if the estimated error
+                is larger (e.g. for ill-conditioned kernel matrices).
 
         Returns:
             self: The updated instance itself.
@@ -653,6 +1098,12 @@ class ModelProcess:
         # The hyperparameter optimization method
         if hpfitter is not None:
             self.hpfitter = hpfitter.copy()
+        # Set the frozen inference
+        self.update_frozen(
+            use_frozen=use_frozen,
+            dtype=dtype,
+            precision_tol=precision_tol,
+        )
         # Set hyperparameters
         self.set_hyperparams(hp)
         # Check if the attributes agree
@@ -712,6 +1163,8 @@ class ModelProcess:
         # Make kernel matrix with noise
         K = self.get_kernel(features, get_derivatives=self.use_derivatives)
         K = self.add_regularization(K, len(features))
+        # The full kernel matrix is not kept after the training
+        self.full_kernel = None
         # Do Cholesky decomposition
         return cho_factor(K)
 
@@ -726,11 +1179,7 @@ class ModelProcess:
             get_derivatives=self.use_derivatives,
         )
         # Rearrange targets if derivatives are used
-        if self.use_derivatives:
-            targets = targets.T.reshape(-1, 1)
-        else:
-            targets = targets[:, 0:1].copy()
-        return targets
+        return self.rearrange_targets(targets)
 
     def calculate_coefficients(self, features, targets, **kwargs):
         "Calculate the coefficients for the prediction mean."
@@ -742,6 +1191,46 @@ class ModelProcess:
         """
         raise NotImplementedError()
 
+    def calculate_precision_factor(self, features, targets, **kwargs):
+        """
+        Calculate the factor that the machine precision of the data type is
+        multiplied with to estimate the relative rounding error of
+        the predicted mean.
+        The factor is large for ill-conditioned kernel matrices, where
+        the coefficients are large compared to the targets.
+        """
+        # The kernel elements are bounded by the diagonal elements
+        k = np.sqrt(
+            self.kernel_diag(
+                features,
+                len(features),
+                get_derivatives=self.use_derivatives,
+            )
+        )
+        deriv_indicies = self.get_derivative_indicies(len(features))
+        if deriv_indicies is not None:
+            k = k[deriv_indicies]
+        error = k.max() * np.matmul(k, np.abs(self.coef)).max()
+        scale = np.abs(targets).max()
+        if scale == 0.0:
+            return 0.0
+        return error / scale
+
+    def get_prediction_dtype(self, **kwargs):
+        """
+        Get the data type used in the predictions.
+        float64 is used if the estimated relative rounding error of
+        the predicted mean with the data type is larger than
+        the tolerance.
+
+        Returns:
+            type: The data type used in the predictions.
+        """
+        error = np.finfo(self.dtype).eps * self.precision_factor
+        if error > self.precision_tol:
+            return float
+        return self.dtype
+
     def kernel_diag(
         self,
         features,
@@ -776,8 +1265,53 @@ class ModelProcess:
 
     def calculate_CinvKQX(self, KQX, **kwargs):
         "Calculate the CinvKQX matrix."
+        if self.use_frozen:
+            KQXW = np.matmul(
+                KQX.astype(self.Linv.dtype, copy=False),
+                self.Linv,
+            )
+            return np.matmul(self.Linv, KQXW.T).astype(float, copy=False)
         return cho_solve((self.L, self.low), KQX.T, check_finite=False)
 
+    def calculate_variance_reduction(self, KQX, **kwargs):
+        "Calculate the diagonal elements of the KQX C^-1 KQX^T matrix."
+        if self.use_frozen:
+            KQXW = np.matmul(
+                KQX.astype(self.Linv.dtype, copy=False),
+                self.Linv,
+            )
+            return np.einsum("ij,ij->i", KQXW, KQXW).astype(float, copy=False)
+        return np.einsum("ij,ji->i", KQX, self.calculate_CinvKQX(KQX))
+
+    def update_frozen(
+        self,
+        use_frozen=None,
+        dtype=None,
+        precision_tol=None,
+        **kwargs,
+    ):
+        """
+        Update the frozen inference and the data type of the predictions.
+        The arrays of the frozen inference are precomputed if needed.
+        """
+        if use_frozen is not None:
+            self.use_frozen = use_frozen
+        if dtype is not None:
+            self.dtype = dtype
+        if precision_tol is not None:
+            self.precision_tol = float(precision_tol)
+        # Precompute or remove the arrays used in the frozen inference
+        if self.use_frozen and self.trained_model:
+            if (
+                use_frozen is not None
+                or dtype is not None
+                or precision_tol is not None
+            ):
+                self.freeze()
+        elif not self.use_frozen:
+            self.Linv = np.array([])
+        return self
+
     def check_attributes(self):
         "Check if all attributes agree between the class and subclasses."
         if self.use_derivatives != self.kernel.get_use_derivatives():
@@ -797,6 +1331,9 @@ class ModelProcess:
             hp=self.get_hyperparams(),
             use_derivatives=self.use_derivatives,
             use_correction=self.use_correction,
+            use_frozen=self.use_frozen,
+            dtype=self.dtype,
+            precision_tol=self.precision_tol,
         )
         # Get the constants made within the class
         constant_kwargs = dict(
@@ -804,9 +1341,17 @@ class ModelProcess:
             corr=self.corr,
             low=self.low,
             prefactor=self.prefactor,
+            precision_factor=self.precision_factor,
+            deriv_indicies=self.deriv_indicies,
+            deriv_n_data=self.deriv_n_data,
         )
         # Get the objects made within the class
-        object_kwargs = dict(features=self.features, L=self.L, coef=self.coef)
+        object_kwargs = dict(
+            features=self.features,
+            L=self.L,
+            coef=self.coef,
+            Linv=self.Linv,
+        )
         return arg_kwargs, constant_kwargs, object_kwargs
 
     def copy(self):
@@ -11,6 +11,9 @@ class TProcess(ModelProcess):
         hp={},
         use_derivatives=False,
         use_correction=True,
+        use_frozen=False,
+        dtype=float,
+        precision_tol=1e-3,
         a=1e-20,
         b=1e-20,
         **kwargs,
@@ -35,6 +38,24 @@ class TProcess(ModelProcess):
                 Use derivatives/gradients for training and predictions.
             use_correction : bool
                 Use the noise correction on the covariance matrix.
+            use_frozen : bool
+                Whether to precompute the inverse of the Cholesky factor
+                after training, so the predictions are made with
+                matrix products only (frozen inference).
+                The hyperparameters and training data must not be changed
+                without retraining the model.
+            dtype : type
+                The data type used in the predictions (e.g. np.float32).
+                The kernel matrix between the test and training features
+                and the precomputed arrays of the frozen inference are
+                stored with the data type.
+                The Cholesky factorization and the hyperparameter
+                optimization are always made in float64.
+            precision_tol : float
+                The largest estimated relative rounding error of
+                the predicted mean for using the data type in the predictions.
+                float64 is used in the predictions if the estimated error
+                is larger (e.g. for ill-conditioned kernel matrices).
             a: float
                 Hyperprior shape parameter for the inverse-gamma distribution
                 of the prefactor.
@@ -49,7 +70,14 @@ class TProcess(ModelProcess):
         self.L = np.array([])
         self.low = False
         self.coef = np.array([])
+        self.Linv = np.array([])
         self.prefactor = 1.0
+        self.precision_factor = np.inf
+        # The derivative targets are all used as default
+        self.deriv_indicies = None
+        self.deriv_n_data = 0
+        # The last masked kernel matrix and its full kernel matrix
+        self.full_kernel = None
         # Set default relative-noise hyperparameters
         self.hp = {"noise": np.array([-8.0])}
         # Set the default prior mean class
@@ -78,6 +106,9 @@ class TProcess(ModelProcess):
             hp=hp,
             use_derivatives=use_derivatives,
             use_correction=use_correction,
+            use_frozen=use_frozen,
+            dtype=dtype,
+            precision_tol=precision_tol,
             a=a,
             b=b,
             **kwargs,
@@ -104,6 +135,9 @@ class TProcess(ModelProcess):
         hp={},
         use_derivatives=None,
         use_correction=None,
+        use_frozen=None,
+        dtype=None,
+        precision_tol=None,
         a=None,
         b=None,
         **kwargs,
@@ -126,6 +160,24 @@ class TProcess(ModelProcess):
                 Use derivatives/gradients for training and predictions.
             use_correction : bool
                 Use the noise correction on the covariance matrix.
+            use_frozen : bool
+                Whether to precompute the inverse of the Cholesky factor
+                after training, so the predictions are made with
+                matrix products only (frozen inference).
+                The hyperparameters and training data must not be changed
+                without retraining the model.
+            dtype : type
+                The data type used in the predictions (e.g. np.float32).
+                The kernel matrix between the test and training features
+                and the precomputed arrays of the frozen inference are
+                stored with the data type.
+                The Cholesky factorization and the hyperparameter
+                optimization are always made in float64.
+            precision_tol : float
+                The largest estimated relative rounding error of
+                the predicted mean for using the data type in the predictions.
+                float64 is used in the predictions if the estimated error
+                is larger (e.g. for ill-conditioned kernel matrices).
             a: float
                 Hyperprior shape parameter for the inverse-gamma distribution
                 of the prefactor.
@@ -151,6 +203,12 @@ class TProcess(ModelProcess):
         # The hyperparameter optimization method
         if hpfitter is not None:
             self.hpfitter = hpfitter.copy()
+        # Set the frozen inference
+        self.update_frozen(
+            use_frozen=use_frozen,
+            dtype=dtype,
+            precision_tol=precision_tol,
+        )
         # The hyperprior shape parameter
         if a is not None:
             self.a = float(a)
@@ -179,7 +237,7 @@ class TProcess(ModelProcess):
             )
             K_deriv[:n_data] = 0.0
             hp_deriv["noise_deriv"] = np.array([np.diag(K_deriv)])
-        hp_deriv.update(self.kernel.get_gradients(features, hp, KXX=KXX))
+        hp_deriv.update(self.get_kernel_gradients(features, hp, KXX=KXX))
         return hp_deriv
 
     def get_hyperprior_parameters(self, **kwargs):
@@ -201,6 +259,9 @@ class TProcess(ModelProcess):
             hp=self.get_hyperparams(),
             use_derivatives=self.use_derivatives,
             use_correction=self.use_correction,
+            use_frozen=self.use_frozen,
+            dtype=self.dtype,
+            precision_tol=self.precision_tol,
             a=self.a,
             b=self.b,
         )
@@ -210,7 +271,15 @@ class TProcess(ModelProcess):
             corr=self.corr,
             low=self.low,
             prefactor=self.prefactor,
+            precision_factor=self.precision_factor,
+            deriv_indicies=self.deriv_indicies,
+            deriv_n_data=self.deriv_n_data,
         )
         # Get the objects made within the class
-        object_kwargs = dict(features=self.features, L=self.L, coef=self.coef)
+        object_kwargs = dict(
+            features=self.features,
+            L=self.L,
+            coef=self.coef,
+            Linv=self.Linv,
+        )
         return arg_kwargs, constant_kwargs, object_kwargs
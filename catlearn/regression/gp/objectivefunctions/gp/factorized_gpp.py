@@ -1,5 +1,6 @@
 import numpy as np
 from .factorized_likelihood import FactorizedLogLikelihood
+from ..objectivefunction import ObjectiveFuction
 
 
 class FactorizedGPP(FactorizedLogLikelihood):
@@ -118,6 +119,31 @@ class FactorizedGPP(FactorizedLogLikelihood):
         )
         return gpp_v
 
+    def function_stack(
+        self,
+        thetas,
+        hps,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        **kwargs,
+    ):
+        # The values depend on the signs of the eigenvectors,
+        # so the eigendecompositions are made one at a time
+        return ObjectiveFuction.function_stack(
+            self,
+            thetas,
+            hps,
+            parameters,
+            model,
+            X,
+            Y,
+            pdis=pdis,
+            **kwargs,
+        )
+
     def derivative(
         self,
         hp,
@@ -183,6 +183,49 @@ class FactorizedLogLikelihood(ObjectiveFuction):
         )
         return nlp
 
+    def function_stack(
+        self,
+        thetas,
+        hps,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        **kwargs,
+    ):
+        D, U, Y_p, UTY, n_data = self.get_eig_batch(model, X, Y, hps)
+        values = []
+        for b, (theta, hp) in enumerate(zip(thetas, hps)):
+            model = self.update_model(model, hp)
+            # The noise is optimized for each set of hyperparameters
+            noise, nlp = self.maximize_noise(
+                parameters,
+                model,
+                X,
+                Y,
+                pdis,
+                hp,
+                U=U[b],
+                UTY=UTY[b],
+                D=D[b],
+                n_data=n_data,
+            )
+            self.update_solution(
+                nlp,
+                theta,
+                hp,
+                model,
+                jac=False,
+                noise=noise,
+                UTY=UTY[b],
+                U=U[b],
+                D=D[b],
+                n_data=n_data,
+            )
+            values.append(nlp)
+        return np.array(values).reshape(-1)
+
     def derivative(
         self,
         hp,
@@ -59,3 +59,14 @@ class FactorizedLogLikelihoodSVD(FactorizedLogLikelihood):
         Y_p = self.y_prior(X, Y, model, D=D, U=U)
         UTY = np.matmul(Vt, Y_p).reshape(-1) ** 2
         return D, U, Y_p, UTY, KXX, n_data
+
+    def get_eig_batch(self, model, X, Y, hps, **kwargs):
+        "Calculate the eigenvalues with stacked SVDs"
+        # Calculate the kernels with and without noise
+        KXX, n_data = self.kxx_corr_batch(model, X, hps)
+        # Stacked SVDs
+        U, D, Vt = svd(KXX, hermitian=True)
+        # Subtract the prior mean to the training target
+        Y_p = self.y_prior(X, Y, model)
+        UTY = np.matmul(Vt, Y_p)[:, :, 0] ** 2
+        return D, U, Y_p, UTY, n_data
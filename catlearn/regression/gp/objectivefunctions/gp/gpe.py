@@ -64,6 +64,30 @@ class GPE(LOO):
             )
         return gpe_v
 
+    def function_stack(
+        self,
+        thetas,
+        hps,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        **kwargs,
+    ):
+        coef, L, Y_p, n_data = self.coef_cholesky_batch(model, X, Y, hps)
+        K_inv_diag, coef_re, co_Kinv = self.get_co_Kinv_batch(L, coef)
+        co_Kinv2 = np.mean(co_Kinv**2, axis=1)
+        K_inv_diag_rev = np.mean(1.0 / K_inv_diag, axis=1)
+        values = []
+        for b, hp in enumerate(hps):
+            model = self.update_model(model, hp)
+            prefactor2 = self.get_prefactor2(model)
+            gpe_v = co_Kinv2[b] + prefactor2 * K_inv_diag_rev[b]
+            gpe_v = gpe_v - self.logpriors(hp, pdis, jac=False) / n_data
+            values.append(gpe_v)
+        return np.array(values).reshape(-1)
+
     def derivative(
         self,
         hp,
@@ -90,6 +90,43 @@ class GPP(LOO):
         )
         return gpp_v
 
+    def function_stack(
+        self,
+        thetas,
+        hps,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        **kwargs,
+    ):
+        coef, L, Y_p, n_data = self.coef_cholesky_batch(model, X, Y, hps)
+        K_inv_diag, coef_re, co_Kinv = self.get_co_Kinv_batch(L, coef)
+        prefactor2 = np.mean(co_Kinv * coef_re, axis=1)
+        log_K_inv_diag = np.mean(np.log(K_inv_diag), axis=1)
+        values = []
+        for b, (theta, hp) in enumerate(zip(thetas, hps)):
+            prefactor = 0.5 * np.log(prefactor2[b])
+            hp["prefactor"] = np.array([prefactor])
+            gpp_v = (
+                1.0
+                - log_K_inv_diag[b]
+                + 2.0 * prefactor
+                + np.log(2.0 * np.pi)
+            )
+            gpp_v = gpp_v - self.logpriors(hp, pdis, jac=False) / n_data
+            self.update_solution(
+                gpp_v,
+                theta,
+                hp,
+                model,
+                jac=False,
+                prefactor2=prefactor2[b],
+            )
+            values.append(gpp_v)
+        return np.array(values).reshape(-1)
+
     def derivative(
         self,
         hp,
@@ -56,6 +56,33 @@ class LogLikelihood(ObjectiveFuction):
             )
         return nlp
 
+    def function_stack(
+        self,
+        thetas,
+        hps,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        **kwargs,
+    ):
+        coef, L, Y_p, n_data = self.coef_cholesky_batch(model, X, Y, hps)
+        ycoef = np.matmul(Y_p.T, coef)[:, 0, 0]
+        logdet = np.sum(np.log(np.diagonal(L, axis1=1, axis2=2)), axis=1)
+        nlp = []
+        for hp, ycoef_b, logdet_b in zip(hps, ycoef, logdet):
+            model = self.update_model(model, hp)
+            prefactor2 = self.get_prefactor2(model)
+            nlp_b = (
+                0.5 * ycoef_b / prefactor2
+                + 0.5 * n_data * np.log(prefactor2)
+                + logdet_b
+                + 0.5 * n_data * np.log(2.0 * np.pi)
+            )
+            nlp.append(nlp_b - self.logpriors(hp, pdis, jac=False))
+        return np.array(nlp).reshape(-1)
+
     def derivative(
         self,
         hp,
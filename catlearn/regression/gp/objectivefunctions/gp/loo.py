@@ -91,6 +91,36 @@ class LOO(ObjectiveFuction):
         )
         return loo_v
 
+    def function_stack(
+        self,
+        thetas,
+        hps,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        **kwargs,
+    ):
+        coef, L, Y_p, n_data = self.coef_cholesky_batch(model, X, Y, hps)
+        K_inv_diag, coef_re, co_Kinv = self.get_co_Kinv_batch(L, coef)
+        loo_v = np.mean(co_Kinv**2, axis=1)
+        values = []
+        for b, (theta, hp) in enumerate(zip(thetas, hps)):
+            loo_b = loo_v[b] - self.logpriors(hp, pdis, jac=False) / n_data
+            self.update_solution(
+                loo_b,
+                theta,
+                hp,
+                model,
+                jac=False,
+                coef_re=coef_re[b],
+                K_inv_diag=K_inv_diag[b],
+                co_Kinv=co_Kinv[b],
+            )
+            values.append(loo_b)
+        return np.array(values).reshape(-1)
+
     def derivative(
         self,
         hp,
@@ -199,6 +229,17 @@ class LOO(ObjectiveFuction):
         co_Kinv = coef_re / K_inv_diag
         return KXX_inv, K_inv_diag, coef_re, co_Kinv
 
+    def get_co_Kinv_batch(self, L, coef):
+        """
+        Get the diagonal products of the inverse covariance matrices from
+        the stacked lower triangular Cholesky decompositions.
+        """
+        L_inv = np.linalg.inv(L)
+        K_inv_diag = np.sum(L_inv**2, axis=1)
+        coef_re = coef[:, :, 0]
+        co_Kinv = coef_re / K_inv_diag
+        return K_inv_diag, coef_re, co_Kinv
+
     def get_r_s_derivatives(self, K_deriv, KXX_inv, coef):
         """
         Get the r and s vector that are products of the inverse and
@@ -90,6 +90,47 @@ class MaximumLogLikelihood(ObjectiveFuction):
         )
         return nlp
 
+    def function_stack(
+        self,
+        thetas,
+        hps,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        **kwargs,
+    ):
+        coef, L, Y_p, n_data = self.coef_cholesky_batch(model, X, Y, hps)
+        prefactor2 = np.matmul(Y_p.T, coef)[:, 0, 0] / n_data
+        logdet = np.sum(np.log(np.diagonal(L, axis1=1, axis2=2)), axis=1)
+        nlp = []
+        for theta, hp, prefactor2_b, logdet_b in zip(
+            thetas,
+            hps,
+            prefactor2,
+            logdet,
+        ):
+            prefactor = 0.5 * np.log(prefactor2_b)
+            hp["prefactor"] = np.array([prefactor])
+            nlp_b = (
+                0.5 * n_data * (1 + np.log(2.0 * np.pi))
+                + n_data * prefactor
+                + logdet_b
+            )
+            nlp_b = nlp_b - self.logpriors(hp, pdis, jac=False)
+            self.update_solution(
+                nlp_b,
+                theta,
+                hp,
+                model,
+                jac=False,
+                prefactor2=prefactor2_b,
+                n_data=n_data,
+            )
+            nlp.append(nlp_b)
+        return np.array(nlp).reshape(-1)
+
     def derivative(
         self,
         hp,
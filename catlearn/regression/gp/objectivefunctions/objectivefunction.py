@@ -61,6 +61,158 @@ class ObjectiveFuction:
         """
         raise NotImplementedError()
 
+    def function_batch(
+        self,
+        thetas,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        jac=False,
+        **kwargs,
+    ):
+        """
+        The function call that calculate the objective function for
+        multiple sets of hyperparameters.
+        The hyperparameter sets are split into batches that fit in memory.
+        The kernel matrices of a batch are calculated together and
+        decomposed with stacked linear algebra if the objective function
+        supports it.
+
+        Parameters:
+            thetas: (T,H) array of floats
+                An array with the T sets of hyperparameter values used for
+                the objective function.
+            parameters: (H) list of strings
+                A list of names of the hyperparameters.
+            model: Model
+                The Machine Learning Model with kernel and prior that
+                are optimized.
+            X: (N,D) array
+                Training features with N data points and D dimensions.
+            Y: (N,1) array or (N,D+1) array
+                Training targets without or with derivatives with
+                N data points.
+            pdis: dict
+                A dict of prior distributions for each hyperparameter type.
+            jac: bool
+                Whether to get the derivatives of the objective function
+                wrt. the hyperparameters.
+                The hyperparameter sets are then evaluated one at a time.
+
+        Returns:
+            (T) array: The objective function values.
+            or
+            (T) list of tuples: The objective function values and
+                their derivatives wrt. the hyperparameters if jac=True.
+        """
+        # The derivatives are calculated one hyperparameter set at a time
+        if jac:
+            return [
+                self.function(
+                    theta,
+                    parameters,
+                    model,
+                    X,
+                    Y,
+                    pdis=pdis,
+                    jac=True,
+                    **kwargs,
+                )
+                for theta in thetas
+            ]
+        thetas = np.asarray(thetas)
+        hps = self.make_hp_batch(thetas, parameters)
+        batch_size = self.get_batch_size(model, X)
+        values = []
+        for i in range(0, len(thetas), batch_size):
+            try:
+                values.append(
+                    self.function_stack(
+                        thetas[i : i + batch_size],
+                        hps[i : i + batch_size],
+                        parameters,
+                        model,
+                        X,
+                        Y,
+                        pdis=pdis,
+                        **kwargs,
+                    )
+                )
+            except np.linalg.LinAlgError:
+                # Use the robust single decompositions if one failed
+                values.append(
+                    ObjectiveFuction.function_stack(
+                        self,
+                        thetas[i : i + batch_size],
+                        hps[i : i + batch_size],
+                        parameters,
+                        model,
+                        X,
+                        Y,
+                        pdis=pdis,
+                        **kwargs,
+                    )
+                )
+        if len(values):
+            return np.concatenate(values)
+        return np.array([])
+
+    def function_stack(
+        self,
+        thetas,
+        hps,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        **kwargs,
+    ):
+        """
+        Calculate the objective function values for a batch of
+        hyperparameter sets without derivatives.
+        The objective function is called for each hyperparameter set
+        if no stacked implementation is made.
+
+        Parameters:
+            thetas: (B,H) array of floats
+                An array with the B sets of hyperparameter values.
+            hps: (B) list of dicts
+                The hyperparameter dictionaries made from thetas.
+            parameters: (H) list of strings
+                A list of names of the hyperparameters.
+            model: Model
+                The Machine Learning Model with kernel and prior that
+                are optimized.
+            X: (N,D) array
+                Training features with N data points and D dimensions.
+            Y: (N,1) array or (N,D+1) array
+                Training targets without or with derivatives with
+                N data points.
+            pdis: dict
+                A dict of prior distributions for each hyperparameter type.
+
+        Returns:
+            (B) array: The objective function values.
+        """
+        return np.array(
+            [
+                self.function(
+                    theta,
+                    parameters,
+                    model,
+                    X,
+                    Y,
+                    pdis=pdis,
+                    jac=False,
+                    **kwargs,
+                )
+                for theta in thetas
+            ]
+        ).reshape(-1)
+
     def derivative(self, **kwargs):
         """
         The derivative of the objective function wrt. the hyperparameters.
@@ -157,6 +309,22 @@ class ObjectiveFuction:
         }
         return hp, parameters_set
 
+    def make_hp_batch(self, thetas, parameters, **kwargs):
+        "Make a list of hyperparameter dictionaries from lists."
+        return [self.make_hp(theta, parameters)[0] for theta in thetas]
+
+    def get_batch_size(self, model, X, max_elements=2**24, **kwargs):
+        """
+        Get the number of hyperparameter sets that the kernel matrices
+        are calculated for at once.
+        The batch size is limited by the number of elements in
+        the stacked kernel matrices.
+        """
+        n_data = len(X)
+        if model.use_derivatives:
+            n_data *= 1 + model.kernel.get_derivative_dimension(X)
+        return max(1, int(max_elements // (n_data**2)))
+
     def get_hyperparams(self, model, **kwargs):
         "Get the hyperparameters for the model and the kernel."
         return model.get_hyperparams()
@@ -179,6 +347,18 @@ class ObjectiveFuction:
         KXX_n = model.add_regularization(KXX, len(X), overwrite=False)
         return KXX_n, KXX, len(KXX)
 
+    def kxx_reg_batch(self, model, X, hps, **kwargs):
+        """
+        Get the covariance matrices with regularization for
+        multiple sets of hyperparameters.
+        """
+        KXX = model.get_kernel_batch(X, hps)
+        n_data = len(X)
+        for KXX_b, hp in zip(KXX, hps):
+            model = self.update_model(model, hp)
+            model.add_regularization(KXX_b, n_data, overwrite=True)
+        return KXX, KXX.shape[-1]
+
     def kxx_corr(self, model, X, **kwargs):
         "Get covariance matrix with or without noise correction."
         # Calculate the kernel with and without noise
@@ -187,6 +367,17 @@ class ObjectiveFuction:
         KXX = self.add_correction(model, KXX, n_data)
         return KXX, n_data
 
+    def kxx_corr_batch(self, model, X, hps, **kwargs):
+        """
+        Get the covariance matrices with or without noise correction for
+        multiple sets of hyperparameters.
+        """
+        KXX = model.get_kernel_batch(X, hps)
+        n_data = KXX.shape[-1]
+        for KXX_b in KXX:
+            self.add_correction(model, KXX_b, n_data)
+        return KXX, n_data
+
     def add_correction(self, model, KXX, n_data, **kwargs):
         "Add noise correction to covariance matrix."
         corr = model.get_correction(np.diag(KXX))
@@ -204,9 +395,7 @@ class ObjectiveFuction:
             Y_p,
             get_derivatives=get_derivatives,
         )
-        if get_derivatives:
-            return (Y_p - pmean).T.reshape(-1, 1)
-        return (Y_p - pmean)[:, 0:1]
+        return model.rearrange_targets(Y_p - pmean)
 
     def coef_cholesky(self, model, X, Y, **kwargs):
         "Calculate the coefficients by using Cholesky decomposition."
@@ -220,6 +409,24 @@ class ObjectiveFuction:
         coef = cho_solve((L, low), Y_p, check_finite=False)
         return coef, L, low, Y_p, KXX, n_data
 
+    def coef_cholesky_batch(self, model, X, Y, hps, **kwargs):
+        """
+        Calculate the coefficients by using stacked Cholesky decompositions
+        for multiple sets of hyperparameters.
+        """
+        # Calculate the kernels with noise
+        KXX_n, n_data = self.kxx_reg_batch(model, X, hps)
+        # Stacked Cholesky decompositions (lower triangular)
+        L = np.linalg.cholesky(KXX_n)
+        # Subtract the prior mean to the training target
+        # (the prior mean does not depend on the hyperparameters)
+        Y_p = self.y_prior(X, Y, model)
+        # Get the coefficients
+        coef = np.array(
+            [cho_solve((L_b, True), Y_p, check_finite=False) for L_b in L]
+        )
+        return coef, L, Y_p, n_data
+
     def get_eig(self, model, X, Y, **kwargs):
         "Calculate the eigenvalues."
         # Calculate the kernel with and without noise
@@ -239,6 +446,20 @@ class ObjectiveFuction:
         UTY = (np.matmul(U.T, Y_p)).reshape(-1) ** 2
         return D, U, Y_p, UTY, KXX, n_data
 
+    def get_eig_batch(self, model, X, Y, hps, **kwargs):
+        """
+        Calculate the eigenvalues with stacked eigendecompositions for
+        multiple sets of hyperparameters.
+        """
+        # Calculate the kernels with and without noise
+        KXX, n_data = self.kxx_corr_batch(model, X, hps)
+        # Stacked eigendecompositions
+        D, U = eigh(KXX)
+        # Subtract the prior mean to the training target
+        Y_p = self.y_prior(X, Y, model)
+        UTY = np.matmul(np.transpose(U, (0, 2, 1)), Y_p)[:, :, 0] ** 2
+        return D, U, Y_p, UTY, n_data
+
     def get_cinv(self, model, X, Y, **kwargs):
         "Get the inverse covariance matrix."
         coef, L, low, Y_p, KXX, n_data = self.coef_cholesky(model, X, Y)
@@ -59,6 +59,29 @@ class LogLikelihood(ObjectiveFuction):
             )
         return nlp
 
+    def function_stack(
+        self,
+        thetas,
+        hps,
+        parameters,
+        model,
+        X,
+        Y,
+        pdis=None,
+        **kwargs,
+    ):
+        coef, L, Y_p, n_data = self.coef_cholesky_batch(model, X, Y, hps)
+        ycoef = np.matmul(Y_p.T, coef)[:, 0, 0]
+        logdet = np.sum(np.log(np.diagonal(L, axis1=1, axis2=2)), axis=1)
+        nlp = []
+        for hp, ycoef_b, logdet_b in zip(hps, ycoef, logdet):
+            model = self.update_model(model, hp)
+            a, b = self.get_hyperprior_parameters(model)
+            ycoef_b = 1.0 + (ycoef_b / (2.0 * b))
+            nlp_b = logdet_b + 0.5 * (2.0 * a + n_data) * np.log(ycoef_b)
+            nlp.append(nlp_b - self.logpriors(hp, pdis, jac=False))
+        return np.array(nlp).reshape(-1)
+
     def derivative(
         self,
         hp,
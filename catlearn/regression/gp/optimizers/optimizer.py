@@ -164,7 +164,11 @@ class Optimizer:
         return func.reset_solution()
 
     def calculate_values(self, thetas, func, func_args=(), **kwargs):
-        "Calculate a list of values with a function."
+        """
+        Calculate a list of values with a function.
+        All the hyperparameter sets are given to the function at once,
+        so the kernel matrices can be calculated and decomposed together.
+        """
         if self.parallel:
             return self.calculate_values_parallel(
                 thetas,
@@ -172,19 +176,18 @@ class Optimizer:
                 func_args=func_args,
                 **kwargs,
             )
-        return np.array([func.function(theta, *func_args) for theta in thetas])
+        return np.asarray(func.function_batch(thetas, *func_args))
 
     def calculate_values_parallel(self, thetas, func, func_args=(), **kwargs):
         "Calculate a list of values with a function in parallel."
         from ase.parallel import world, broadcast
 
         rank, size = world.rank, world.size
-        f_list = np.array(
-            [
-                func.function(theta, *func_args)
-                for t, theta in enumerate(thetas)
-                if rank == t % size
-            ]
+        f_list = np.asarray(
+            func.function_batch(
+                [theta for t, theta in enumerate(thetas) if rank == t % size],
+                *func_args,
+            )
         )
         return np.array(
             [broadcast(f_list, root=r) for r in range(size)]
@@ -0,0 +1,463 @@
+import json
+import zipfile
+import importlib
+import inspect
+import numpy as np
+
+
+class Serializer:
+    # The version of the file format
+    format_version = 1
+
+    def __init__(self, include_atoms=True, **kwargs):
+        """
+        Serializer that converts objects into a JSON manifest and
+        a dictionary of NumPy arrays.
+        Objects with the get_arguments function are stored from
+        their arguments, constants, and objects, so they are rebuilt
+        in the same way as they are copied.
+        Lists of fingerprint objects, lists of arrays, and ASE Atoms
+        are stored as arrays.
+        Objects that can not be converted are pickled.
+
+        Parameters:
+            include_atoms : bool
+                Whether to store the ASE Atoms objects.
+                The ASE Atoms objects are replaced by None if not.
+        """
+        self.include_atoms = include_atoms
+        self.arrays = {}
+
+    def save(self, obj, filename, **kwargs):
+        """
+        Save the object to a file with the JSON manifest and
+        the uncompressed arrays in the npz (zip) format.
+
+        Parameters:
+            obj : object
+                The object that is saved.
+            filename : str
+                The name of the file where the object is saved.
+        """
+        from ... import __version__
+
+        self.arrays = {}
+        manifest = dict(
+            format="catlearn",
+            format_version=self.format_version,
+            catlearn_version=__version__,
+            object=self.encode(obj),
+        )
+        with zipfile.ZipFile(
+            filename,
+            mode="w",
+            compression=zipfile.ZIP_STORED,
+            allowZip64=True,
+        ) as zfile:
+            zfile.writestr("manifest.json", json.dumps(manifest))
+            for key, array in self.arrays.items():
+                with zfile.open(key + ".npy", "w", force_zip64=True) as fd:
+                    np.lib.format.write_array(fd, array, allow_pickle=False)
+        self.arrays = {}
+        return filename
+
+    def load(self, filename, mmap_mode=None, **kwargs):
+        """
+        Load the object from a file saved by the save function.
+
+        Parameters:
+            filename : str
+                The name of the file where the object is saved.
+            mmap_mode : str or None
+                The memory mapping mode (e.g. 'r') used for the arrays,
+                so the arrays are only read from the file when used.
+                The arrays are read into memory if mmap_mode=None.
+
+        Returns:
+            object: The loaded object.
+        """
+        with zipfile.ZipFile(filename, mode="r") as zfile:
+            manifest = json.loads(zfile.read("manifest.json"))
+            if manifest.get("format", None) != "catlearn":
+                raise Exception("The file is not a saved CatLearn object!")
+            if manifest["format_version"] > self.format_version:
+                raise Exception(
+                    "The file format version {} is newer than "
+                    "the supported version {}!".format(
+                        manifest["format_version"],
+                        self.format_version,
+                    )
+                )
+            self.arrays = {}
+            for info in zfile.infolist():
+                if not info.filename.endswith(".npy"):
+                    continue
+                key = info.filename[:-4]
+                self.arrays[key] = self.read_array(
+                    zfile,
+                    info,
+                    filename,
+                    mmap_mode=mmap_mode,
+                )
+        obj = self.decode(manifest["object"])
+        self.arrays = {}
+        return obj
+
+    def read_array(self, zfile, info, filename, mmap_mode=None, **kwargs):
+        "Read an array from the file or memory map it."
+        with zfile.open(info, "r") as fd:
+            if mmap_mode is None or info.compress_type != zipfile.ZIP_STORED:
+                return np.lib.format.read_array(fd, allow_pickle=False)
+            # Read the header of the array
+            version = np.lib.format.read_magic(fd)
+            if version == (1, 0):
+                header = np.lib.format.read_array_header_1_0(fd)
+            else:
+                header = np.lib.format.read_array_header_2_0(fd)
+            shape, fortran_order, dtype = header
+            header_size = fd.tell()
+        if np.prod(shape) == 0:
+            return np.zeros(shape, dtype=dtype)
+        # Find the start of the data in the zip file
+        with open(filename, "rb") as fd:
+            fd.seek(info.header_offset)
+            local_header = fd.read(30)
+            n_name = int.from_bytes(local_header[26:28], "little")
+            n_extra = int.from_bytes(local_header[28:30], "little")
+        offset = info.header_offset + 30 + n_name + n_extra + header_size
+        return np.memmap(
+            filename,
+            dtype=dtype,
+            mode=mmap_mode,
+            offset=offset,
+            shape=shape,
+            order="F" if fortran_order else "C",
+        )
+
+    def add_array(self, array, **kwargs):
+        "Store the array and get its key."
+        key = "arr_{}".format(len(self.arrays))
+        self.arrays[key] = np.ascontiguousarray(array)
+        return key
+
+    def encode(self, value, **kwargs):
+        "Convert the value into a JSON serializable value."
+        from ase import Atoms
+        from .fingerprint.fingerprintobject import FingerprintObject
+
+        if value is None or isinstance(value, (bool, str)):
+            return value
+        if isinstance(value, (int, float)):
+            return value
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, type) or inspect.isfunction(value):
+            return {"__type__": self.get_class_name(value)}
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            return {"__ndarray__": self.add_array(value)}
+        if isinstance(value, (list, tuple, np.ndarray)):
+            container = "list"
+            if isinstance(value, tuple):
+                container = "tuple"
+            elif isinstance(value, np.ndarray):
+                container = "ndarray"
+            values = list(value)
+            # Store a list of fingerprint objects as arrays
+            if len(values) and all(
+                isinstance(v, FingerprintObject) for v in values
+            ):
+                return self.encode_fingerprints(values, container)
+            # Store a list of ASE Atoms objects as arrays
+            if len(values) and all(isinstance(v, Atoms) for v in values):
+                return self.encode_atoms(values, container)
+            # Store a list of arrays with the same shape as one array
+            if (
+                len(values)
+                and all(isinstance(v, np.ndarray) for v in values)
+                and len({(v.shape, v.dtype.str) for v in values}) == 1
+                and values[0].dtype != object
+            ):
+                return {
+                    "__stacked__": self.add_array(np.array(values)),
+                    "container": container,
+                }
+            return {
+                "__" + container + "__": [self.encode(v) for v in values]
+            }
+        if isinstance(value, dict):
+            return {
+                "__dict__": [
+                    [self.encode(k), self.encode(v)] for k, v in value.items()
+                ]
+            }
+        if isinstance(value, Atoms):
+            return self.encode_atoms(value)
+        if hasattr(value, "get_arguments"):
+            arg_kwargs, constant_kwargs, object_kwargs = value.get_arguments()
+            return {
+                "__object__": self.get_class_name(value.__class__),
+                "arguments": self.encode(arg_kwargs),
+                "constants": self.encode(constant_kwargs),
+                "objects": self.encode(object_kwargs),
+            }
+        # Pickle the objects that can not be converted
+        import pickle
+
+        data = np.frombuffer(pickle.dumps(value), dtype=np.uint8)
+        return {"__pickle__": self.add_array(data)}
+
+    def decode(self, value, **kwargs):
+        "Convert the JSON serializable value back into the value."
+        if not isinstance(value, dict):
+            return value
+        if "__type__" in value:
+            return self.get_class(value["__type__"])
+        if "__ndarray__" in value:
+            return self.arrays[value["__ndarray__"]]
+        if "__stacked__" in value:
+            array = self.arrays[value["__stacked__"]]
+            return self.make_container(list(array), value["container"])
+        if "__fingerprints__" in value:
+            return self.decode_fingerprints(value)
+        for container in ["list", "tuple", "ndarray"]:
+            if "__" + container + "__" in value:
+                values = value["__" + container + "__"]
+                values = [self.decode(v) for v in values]
+                return self.make_container(values, container)
+        if "__dict__" in value:
+            return {
+                self.decode(k): self.decode(v) for k, v in value["__dict__"]
+            }
+        if "__atoms__" in value:
+            return self.decode_atoms(value)
+        if "__object__" in value:
+            cls = self.get_class(value["__object__"])
+            obj = cls(**self.decode(value["arguments"]))
+            # Set the constants and objects made within the class
+            obj.__dict__.update(self.decode(value["constants"]))
+            obj.__dict__.update(self.decode(value["objects"]))
+            return obj
+        if "__pickle__" in value:
+            import pickle
+
+            return pickle.loads(self.arrays[value["__pickle__"]].tobytes())
+        raise Exception("The value {} can not be decoded!".format(value))
+
+    def encode_fingerprints(self, fps, container, **kwargs):
+        "Store a list of fingerprint objects as arrays."
+        value = {
+            "__fingerprints__": self.get_class_name(fps[0].__class__),
+            "vector": self.add_array(np.array([fp.vector for fp in fps])),
+            "derivative": None,
+            "container": container,
+        }
+        if fps[0].derivative is not None:
+            value["derivative"] = self.add_array(
+                np.array([fp.derivative for fp in fps])
+            )
+        return value
+
+    def decode_fingerprints(self, value, **kwargs):
+        "Make the list of fingerprint objects from the arrays."
+        cls = self.get_class(value["__fingerprints__"])
+        vectors = self.arrays[value["vector"]]
+        derivatives = value["derivative"]
+        if derivatives is not None:
+            derivatives = self.arrays[derivatives]
+        fps = [
+            cls(
+                vector=vector,
+                derivative=None if derivatives is None else derivatives[i],
+            )
+            for i, vector in enumerate(vectors)
+        ]
+        return self.make_container(fps, value["container"])
+
+    def encode_atoms(self, atoms_list, container="atoms", **kwargs):
+        """
+        Store a list of ASE Atoms objects with their calculated properties.
+        The properties are stacked into arrays if the ASE Atoms objects
+        have the same number of atoms.
+        """
+        if container == "atoms":
+            atoms_list = [atoms_list]
+        value = {"__atoms__": len(atoms_list), "container": container}
+        if not self.include_atoms:
+            return value
+        # Get the calculated properties
+        results = [
+            {} if atoms.calc is None else atoms.calc.results.copy()
+            for atoms in atoms_list
+        ]
+        value["constraints"] = self.encode(
+            [[c.todict() for c in atoms.constraints] for atoms in atoms_list]
+        )
+        # Store the properties as separate arrays for different sizes
+        if len({len(atoms) for atoms in atoms_list}) != 1:
+            value["atoms"] = [
+                dict(
+                    numbers=self.add_array(atoms.get_atomic_numbers()),
+                    positions=self.add_array(atoms.get_positions()),
+                    cell=self.add_array(atoms.get_cell().array),
+                    pbc=self.add_array(atoms.get_pbc()),
+                )
+                for atoms in atoms_list
+            ]
+            value["results"] = self.encode(results)
+            return value
+        # Stack the structures
+        value["numbers"] = self.add_array(
+            [atoms.get_atomic_numbers() for atoms in atoms_list]
+        )
+        value["positions"] = self.add_array(
+            [atoms.get_positions() for atoms in atoms_list]
+        )
+        value["cell"] = self.add_array(
+            [atoms.get_cell().array for atoms in atoms_list]
+        )
+        value["pbc"] = self.add_array(
+            [atoms.get_pbc() for atoms in atoms_list]
+        )
+        # Stack the properties that all the structures have
+        keys = set(results[0].keys())
+        for result in results[1:]:
+            keys = keys.intersection(result.keys())
+        stacked = {}
+        for key in sorted(keys):
+            values = [np.asarray(result[key]) for result in results]
+            if len({v.shape for v in values}) == 1 and all(
+                v.dtype != object for v in values
+            ):
+                stacked[key] = self.add_array(values)
+                for result in results:
+                    result.pop(key)
+        value["stacked_results"] = stacked
+        value["results"] = self.encode(results)
+        return value
+
+    def decode_atoms(self, value, **kwargs):
+        "Make the ASE Atoms objects with their calculated properties."
+        from ase import Atoms
+        from ase.constraints import dict2constraint
+        from .calculator.copy_atoms import StoredDataCalculator
+
+        n_atoms = value["__atoms__"]
+        container = value["container"]
+        if "constraints" not in value:
+            # The ASE Atoms objects are not stored
+            atoms_list = [None] * n_atoms
+        else:
+            if "atoms" in value:
+                structures = [
+                    {key: self.arrays[v] for key, v in atoms.items()}
+                    for atoms in value["atoms"]
+                ]
+            else:
+                structures = [
+                    {
+                        key: self.arrays[value[key]][i]
+                        for key in ["numbers", "positions", "cell", "pbc"]
+                    }
+                    for i in range(n_atoms)
+                ]
+            results = self.decode(value["results"])
+            for key, array_key in value.get("stacked_results", {}).items():
+                for i, result in enumerate(results):
+                    result[key] = self.arrays[array_key][i]
+                    if np.ndim(result[key]) == 0:
+                        result[key] = result[key].item()
+            constraints = self.decode(value["constraints"])
+            atoms_list = []
+            for structure, result, constraint in zip(
+                structures,
+                results,
+                constraints,
+            ):
+                atoms = Atoms(
+                    **{key: np.array(v) for key, v in structure.items()}
+                )
+                if len(constraint):
+                    atoms.set_constraint(
+                        [dict2constraint(c) for c in constraint]
+                    )
+                atoms.calc = StoredDataCalculator(atoms, **result)
+                atoms_list.append(atoms)
+        if container == "atoms":
+            return atoms_list[0]
+        return self.make_container(atoms_list, container)
+
+    def make_container(self, values, container, **kwargs):
+        "Make the container type of the values."
+        if container == "tuple":
+            return tuple(values)
+        if container == "ndarray":
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+            return array
+        return values
+
+    def get_class_name(self, cls, **kwargs):
+        "Get the full name of the class with its module."
+        return "{}:{}".format(cls.__module__, cls.__qualname__)
+
+    def get_class(self, name, **kwargs):
+        "Import the class from its full name."
+        module_name, qualname = name.split(":")
+        obj = importlib.import_module(module_name)
+        for attr in qualname.split("."):
+            obj = getattr(obj, attr)
+        return obj
+
+
+def save_object(obj, filename, include_atoms=True, **kwargs):
+    """
+    Save the object to a binary file with a JSON manifest of
+    the class names and arguments and uncompressed NumPy arrays.
+
+    Parameters:
+        obj : object
+            The object that is saved.
+            It is e.g. a model, a database, or a ML calculator.
+        filename : str
+            The name of the file where the object is saved.
+        include_atoms : bool
+            Whether to store the ASE Atoms objects (e.g. in the database).
+
+    Returns:
+        str: The name of the file.
+    """
+    return Serializer(include_atoms=include_atoms).save(obj, filename)
+
+
+def load_object(filename, mmap_mode=None, **kwargs):
+    """
+    Load the object from a binary file saved by save_object.
+
+    Parameters:
+        filename : str
+            The name of the file where the object is saved.
+        mmap_mode : str or None
+            The memory mapping mode (e.g. 'r') used for the arrays,
+            so the large arrays are lazily read from the file.
+
+    Returns:
+        object: The loaded object.
+    """
+    return Serializer().load(filename, mmap_mode=mmap_mode)
+
+
+def get_file_format(filename, file_format=None, **kwargs):
+    """
+    Get the file format used for saving and loading objects.
+    The binary format is used for .npz files and
+    pickle is used for other files.
+    """
+    if file_format is not None:
+        if file_format not in ["pickle", "npz"]:
+            raise Exception(
+                "The file format {} is not implemented.".format(file_format)
+            )
+        return file_format
+    if str(filename).endswith(".npz"):
+        return "npz"
+    return "pickle"
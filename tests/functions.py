@@ -1,3 +1,4 @@
+import copy
 import numpy as np
 
 
@@ -183,3 +184,44 @@ def check_image_fmax(images, calc, fmax=0.05):
     energies = [image.get_potential_energy() for image in images]
     i_max = np.argmax(energies)
     return check_fmax(images[i_max], calc, fmax=fmax)
+
+
+class FakeWorld:
+    """
+    A fake MPI world with a given rank, where the objects and buffers
+    broadcasted by the root rank are recorded and replayed in the same
+    order on the other ranks.
+    It replaces ase.parallel.world and ase.parallel.broadcast,
+    so the ranks can be run one after the other in one process.
+    """
+
+    def __init__(self, rank=0, size=2, messages=None):
+        self.rank = rank
+        self.size = size
+        self.messages = [] if messages is None else messages
+
+    def broadcast(self, array, root=0):
+        "Broadcast a NumPy buffer as in the ASE world."
+        if self.rank == root:
+            self.messages.append(np.array(array, copy=True))
+        else:
+            array[...] = self.messages.pop(0)
+
+    def broadcast_object(self, obj, root=0, comm=None):
+        "Broadcast a Python object as in ase.parallel.broadcast."
+        if self.rank == root:
+            self.messages.append(copy.deepcopy(obj))
+            return obj
+        return self.messages.pop(0)
+
+    def patch(self):
+        "Get a context manager that patches the MPI world of ASE."
+        from contextlib import ExitStack
+        from unittest import mock
+
+        stack = ExitStack()
+        stack.enter_context(mock.patch("ase.parallel.world", self))
+        stack.enter_context(
+            mock.patch("ase.parallel.broadcast", self.broadcast_object)
+        )
+        return stack
@@ -0,0 +1,129 @@
+import unittest
+
+
+class TestAcquisition(unittest.TestCase):
+    """
+    Test if the acquisition functions give the same values
+    for a batch and single candidates and the right derivatives.
+    """
+
+    def test_acq_batch(self):
+        "Test if the batch values are the same as for single candidates."
+        import numpy as np
+        from catlearn.optimize.acquisition import (
+            AcqEnergy,
+            AcqUncertainty,
+            AcqUCB,
+            AcqLCB,
+            AcqUME,
+            AcqUUCB,
+            AcqULCB,
+            AcqEI,
+            AcqPI,
+        )
+
+        # Make the predicted energies and uncertainties
+        rng = np.random.default_rng(1)
+        energies = rng.normal(size=8)
+        uncertainties = rng.uniform(0.1, 1.0, size=8)
+        # Make the list of acquisition functions
+        acq_list = [
+            AcqEnergy(objective="min"),
+            AcqUncertainty(objective="max"),
+            AcqUCB(objective="max", kappa=2.0),
+            AcqLCB(objective="min", kappa=2.0),
+            AcqUME(objective="max", unc_convergence=0.05),
+            AcqUUCB(objective="max", kappa=2.0, unc_convergence=0.05),
+            AcqULCB(objective="min", kappa=2.0, unc_convergence=0.05),
+            AcqEI(objective="max", ebest=0.0),
+            AcqPI(objective="max", ebest=0.0),
+        ]
+        for acq in acq_list:
+            with self.subTest(acq=acq):
+                values, derivs = acq.calculate_batch(energies, uncertainties)
+                self.assertTrue(derivs is None)
+                values_single = [
+                    acq.calculate(e, u)
+                    for e, u in zip(energies, uncertainties)
+                ]
+                self.assertTrue(np.allclose(values, values_single))
+                # Check that the best candidates are chosen
+                indicies = acq.choose(values, q=3)
+                self.assertTrue(len(indicies) == 3)
+                self.assertTrue(
+                    np.array_equal(indicies, acq.choose(values)[:3])
+                )
+
+    def test_acq_gradient(self):
+        "Test if the derivatives are the same as the numerical derivatives."
+        import numpy as np
+        from catlearn.optimize.acquisition import (
+            Acquisition,
+            AcqUCB,
+            AcqLCB,
+            AcqUME,
+            AcqEI,
+            AcqPI,
+        )
+
+        # Make the predicted energies, uncertainties and their derivatives
+        rng = np.random.default_rng(1)
+        energies = rng.normal(size=5)
+        uncertainties = rng.uniform(0.1, 1.0, size=5)
+        energy_derivs = rng.normal(size=(5, 4, 3))
+        unc_derivs = rng.normal(size=(5, 4, 3))
+        direction = rng.normal(size=(4, 3))
+        # Make the list of acquisition functions
+        acq_list = [
+            AcqUCB(objective="max", kappa=2.0),
+            AcqLCB(objective="min", kappa=2.0),
+            AcqUME(objective="max", unc_convergence=0.05),
+            AcqEI(objective="max", ebest=0.0),
+            AcqPI(objective="min", ebest=0.0),
+        ]
+        for acq in acq_list:
+            with self.subTest(acq=acq):
+                values, derivs = acq.calculate_batch(
+                    energies,
+                    uncertainties,
+                    energy_derivs=energy_derivs,
+                    unc_derivs=unc_derivs,
+                )
+                self.assertTrue(derivs.shape == energy_derivs.shape)
+                # Calculate the central numerical derivatives
+                h = 1e-6
+                de = np.einsum("nij,ij->n", energy_derivs, direction)
+                du = np.einsum("nij,ij->n", unc_derivs, direction)
+                values_p = acq.calculate_batch(
+                    energies + h * de,
+                    uncertainties + h * du,
+                )[0]
+                values_m = acq.calculate_batch(
+                    energies - h * de,
+                    uncertainties - h * du,
+                )[0]
+                derivs_num = (values_p - values_m) / (2.0 * h)
+                self.assertTrue(
+                    np.allclose(
+                        np.einsum("nij,ij->n", derivs, direction),
+                        derivs_num,
+                        atol=1e-6,
+                    )
+                )
+                # Check that the single candidate uses the same derivatives
+                self.assertTrue(
+                    type(acq).calculate_gradient
+                    is Acquisition.calculate_gradient
+                )
+                value, deriv = acq.calculate_gradient(
+                    energies[0],
+                    uncertainties[0],
+                    energy_derivs[0],
+                    unc_derivs[0],
+                )
+                self.assertTrue(np.isclose(value, values[0]))
+                self.assertTrue(np.allclose(deriv, derivs[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -117,6 +117,116 @@ class TestGPBaseline(unittest.TestCase):
                 error = abs(f_te.item(0) - energy)
                 self.assertTrue(abs(error - error_list[index]) < 1e-4)
 
+    def test_idpp(self):
+        """
+        Test if the IDPP energy is the sum over the unique pairs and
+        if the band evaluation gives the same as each image.
+        """
+        from ase import Atoms
+        from catlearn.regression.gp.baseline import IDPP
+
+        # Make the images with random positions
+        rng = np.random.default_rng(1)
+        images = [
+            Atoms(
+                "CuH5",
+                positions=rng.uniform(0.0, 4.0, size=(6, 3)),
+                cell=[4.0, 4.0, 4.0],
+                pbc=True,
+            )
+            for _ in range(3)
+        ]
+        for mic in [False, True]:
+            with self.subTest(mic=mic):
+                targets = [
+                    image.get_all_distances(mic=mic) + 0.1 for image in images
+                ]
+                idpp = IDPP(target=targets[0], mic=mic)
+                energy = idpp.get_energy_forces(
+                    images[1],
+                    get_derivatives=False,
+                )
+                # Compare the energy with the sum over the unique pairs
+                pair_i, pair_j = np.triu_indices(len(images[1]), k=1)
+                dist = images[1].get_all_distances(mic=mic)[pair_i, pair_j]
+                energy_pairs = np.sum(
+                    ((dist - targets[0][pair_i, pair_j]) ** 2) / (dist**4)
+                )
+                self.assertTrue(np.isclose(energy, energy_pairs))
+                # Compare the band evaluation with the single images
+                energies, forces_band = idpp.get_energies_forces_band(
+                    np.array([image.get_positions() for image in images]),
+                    np.array([target[pair_i, pair_j] for target in targets]),
+                    cell=images[0].cell,
+                    pbc=images[0].pbc,
+                )
+                for image, target, e, f in zip(
+                    images,
+                    targets,
+                    energies,
+                    forces_band,
+                ):
+                    e_image, f_image = IDPP(
+                        target=target,
+                        mic=mic,
+                    ).get_energy_forces(image)
+                    self.assertTrue(np.isclose(e, e_image))
+                    self.assertTrue(np.allclose(f, f_image))
+
+    def test_batch(self):
+        """
+        Test if the batched baseline evaluation gives the same energies
+        and forces as the ASE calculator interface for different atoms.
+        """
+        from ase import Atoms
+        from ase.constraints import FixAtoms
+        from catlearn.regression.gp.baseline import (
+            BaselineCalculator,
+            RepulsionCalculator,
+            MieCalculator,
+        )
+
+        # Make structures with two different compositions
+        rng = np.random.default_rng(1)
+        atoms_list = []
+        for symbols in ["CuH5", "Cu2H4", "CuH5", "Cu2H4", "CuH5"]:
+            atoms = Atoms(
+                symbols,
+                positions=rng.uniform(0.0, 4.0, size=(6, 3)),
+                cell=[4.0, 4.0, 4.0],
+                pbc=True,
+            )
+            atoms.set_constraint(FixAtoms(indices=[0]))
+            atoms_list.append(atoms)
+        # Define the list of baseline objects that are tested
+        baseline_list = [
+            BaselineCalculator(),
+            RepulsionCalculator(r_scale=0.7),
+            RepulsionCalculator(mic=True, periodic_softmax=False),
+            MieCalculator(),
+        ]
+        for baseline in baseline_list:
+            with self.subTest(baseline=baseline):
+                energies, forces = baseline.get_energy_forces_batch(
+                    atoms_list
+                )
+                for atoms, energy, forces_i in zip(
+                    atoms_list,
+                    energies,
+                    forces,
+                ):
+                    atoms_base = atoms.copy()
+                    atoms_base.calc = baseline.copy()
+                    self.assertTrue(
+                        np.isclose(energy, atoms_base.get_potential_energy())
+                    )
+                    self.assertTrue(
+                        np.allclose(
+                            forces_i,
+                            atoms_base.get_forces(apply_constraint=False),
+                        )
+                    )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -220,6 +220,308 @@ class TestGPCalc(unittest.TestCase):
                 error = abs(f_te.item(0) - energy)
                 self.assertTrue(abs(error - error_list[index]) < 1e-4)
 
+    def test_predict_batch(self):
+        """
+        Test if the batch prediction of the ML calculator gives
+        the same results as the single predictions.
+        """
+        from catlearn.regression.gp.calculator import (
+            MLModel,
+            MLCalculator,
+            get_default_model,
+            get_default_database,
+        )
+
+        # Create the data set
+        x, f, g = create_h2_atoms(gridsize=50, seed=1)
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x, f, g, tr=10, te=5, use_derivatives=True
+        )
+        # Make and train the ML calculator
+        mlmodel = MLModel(
+            model=get_default_model(model="gp", global_optimization=False),
+            database=get_default_database(),
+            optimize=False,
+        )
+        mlcalc = MLCalculator(mlmodel=mlmodel)
+        mlcalc.add_training(x_tr)
+        mlcalc.train_model()
+        # Predict the test systems at once
+        properties = ["energy", "forces", "uncertainty"]
+        results_list = mlcalc.calculate_batch(x_te, properties=properties)
+        self.assertTrue(len(results_list) == len(x_te))
+        # Compare with the single predictions
+        for atoms, results in zip(x_te, results_list):
+            atoms = atoms.copy()
+            atoms.calc = mlcalc
+            mlcalc.calculate(atoms, properties=properties)
+            for name in properties:
+                self.assertTrue(
+                    np.allclose(results[name], mlcalc.results[name])
+                )
+
+    def test_derivative_selection(self):
+        """
+        Test if the ML model can be trained with a selection of
+        the forces of the atoms in each training structure.
+        """
+        from catlearn.regression.gp.calculator import (
+            MLModel,
+            get_default_model,
+            get_default_database,
+        )
+
+        # Create the data set
+        x, f, g = create_h2_atoms(gridsize=50, seed=1)
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x, f, g, tr=10, te=5, use_derivatives=True
+        )
+        # Test the number of used targets for the selections
+        for deriv_selection, deriv_budget, n_used in [
+            (None, None, 70),
+            ("magnitude", 1, 40),
+            ("distance", None, 70),
+            ("distance", 1, 40),
+        ]:
+            with self.subTest(
+                deriv_selection=deriv_selection,
+                deriv_budget=deriv_budget,
+            ):
+                mlmodel = MLModel(
+                    model=get_default_model(
+                        model="gp",
+                        global_optimization=False,
+                    ),
+                    database=get_default_database(),
+                    optimize=False,
+                    deriv_selection=deriv_selection,
+                    deriv_budget=deriv_budget,
+                )
+                mlmodel.add_training(x_tr)
+                mlmodel.train_model()
+                self.assertTrue(len(mlmodel.model.L) == n_used)
+                self.assertTrue(mlmodel.copy().deriv_budget == deriv_budget)
+                # Test the energy of a training structure is reproduced
+                results = mlmodel.calculate(x_tr[0], get_uncertainty=False)
+                self.assertTrue(abs(results["energy"] - f_tr[0, 0]) < 1e-2)
+        # Test an unknown selection gives an error
+        with self.assertRaises(Exception):
+            MLModel(deriv_selection="random")
+
+
+class TestDatabaseActiveSubspace(unittest.TestCase):
+    """
+    Test if the database only uses the atoms that are displaced
+    in the features and the derivative targets.
+    """
+
+    def test_active_atoms(self):
+        "Test if the active subspace is found and used in the database."
+        from ase.build import fcc100, add_adsorbate
+        from ase.calculators.emt import EMT
+        from catlearn.regression.gp.calculator import Database
+        from catlearn.regression.gp.fingerprint import (
+            Cartesian,
+            InvDistances,
+        )
+
+        # Make a slab with an adsorbate and move two of the atoms
+        slab = fcc100("Al", size=(2, 2, 3))
+        add_adsorbate(slab, "Au", 1.7, "hollow")
+        slab.center(vacuum=4.0, axis=2)
+        atoms_list = [slab.copy(), slab.copy()]
+        atoms_list[1].positions[-1, 0] += 0.5
+        atoms_list[1].positions[8, 2] += 0.2
+        for atoms in atoms_list:
+            atoms.calc = EMT()
+            atoms.get_forces()
+        active_atoms = [8, len(slab) - 1]
+        # Test the fingerprints
+        for fingerprint in [Cartesian(), InvDistances()]:
+            with self.subTest(fingerprint=fingerprint):
+                database = Database(fingerprint=fingerprint)
+                database.add_set(atoms_list)
+                n_features = len(database.get_features()[0].get_vector())
+                # The atoms displaced less than the threshold are not used
+                is_changed = database.update_active_atoms(
+                    min_displacement=0.1
+                )
+                self.assertTrue(is_changed)
+                self.assertTrue(
+                    np.array_equal(database.get_active_atoms(), active_atoms)
+                )
+                # The features and targets only have the active atoms
+                features = database.get_features()
+                targets = database.get_targets()
+                self.assertTrue(len(features[0].get_vector()) < n_features)
+                self.assertTrue(targets.shape == (2, 1 + 3 * 2))
+                forces = atoms_list[1].get_forces()[active_atoms]
+                self.assertTrue(
+                    np.allclose(targets[1, 1:], -forces.reshape(-1))
+                )
+                # The active subspace is not changed again
+                self.assertFalse(
+                    database.update_active_atoms(
+                        atoms_list=atoms_list,
+                        min_displacement=0.1,
+                    )
+                )
+                # The copy of the database uses the same active subspace
+                database_copy = database.copy().reset_database()
+                database_copy.add_set(atoms_list)
+                self.assertTrue(
+                    np.allclose(database_copy.get_targets(), targets)
+                )
+
+
+class TestDatabaseSaveData(unittest.TestCase):
+    """
+    Test if the database only appends the new ASE Atoms
+    to the trajectory of the training data.
+    """
+
+    def test_save_data(self):
+        "Test if the saved trajectory has all the training data."
+        import os
+        import tempfile
+        from ase.io import read
+        from catlearn.regression.gp.calculator import Database
+
+        # Create the data set
+        x, f, g = create_h2_atoms(gridsize=10, seed=1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            trajectory = os.path.join(tmpdir, "data.traj")
+            database = Database()
+            # Save the data after each addition of training data
+            for i in range(0, len(x), 3):
+                database.add_set(x[i : i + 3])
+                database.save_data(trajectory=trajectory)
+                self.assertTrue(database.n_saved == len(database))
+                atoms_saved = read(trajectory, ":")
+                self.assertTrue(len(atoms_saved) == len(database))
+            energies = [atoms.get_potential_energy() for atoms in atoms_saved]
+            self.assertTrue(np.allclose(energies, f[:, 0]))
+            # The trajectory is written again when the database is reset
+            database.reset_database()
+            database.add_set(x[:2])
+            database.save_data(trajectory=trajectory)
+            self.assertTrue(len(read(trajectory, ":")) == 2)
+
+
+class TestHierarchicalCalc(unittest.TestCase):
+    """
+    Test if the hierarchical ML model can be used as an ASE calculator
+    and if the old models can be collapsed.
+    """
+
+    def test_predict(self):
+        "Test if the hierarchical calculator can predict energy and forces."
+        from catlearn.regression.gp.calculator import (
+            HierarchicalMLModel,
+            MLCalculator,
+            get_default_model,
+            get_default_database,
+        )
+
+        # Create the data set
+        x, f, g = create_h2_atoms(gridsize=50, seed=1)
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x, f, g, tr=12, te=1, use_derivatives=True
+        )
+        # Test with and without collapsing the levels
+        for max_levels, n_levels in [(None, 3), (1, 1)]:
+            with self.subTest(max_levels=max_levels):
+                mlmodel = HierarchicalMLModel(
+                    model=get_default_model(
+                        model="gp",
+                        global_optimization=False,
+                    ),
+                    database=get_default_database(),
+                    optimize=False,
+                    npoints=4,
+                    initial_indicies=[0],
+                    max_levels=max_levels,
+                )
+                mlcalc = MLCalculator(mlmodel=mlmodel)
+                # Add the data one point at the time and train the model
+                for atoms in x_tr:
+                    mlcalc.add_training(atoms)
+                    mlcalc.train_model()
+                # Test the number of levels
+                self.assertTrue(
+                    mlcalc.mlmodel.get_number_of_levels() == n_levels
+                )
+                # Predict the energy and forces of the test system
+                atoms = x_te[0].copy()
+                atoms.calc = mlcalc.copy()
+                energy = atoms.get_potential_energy()
+                forces = atoms.get_forces()
+                self.assertTrue(np.isfinite(energy))
+                self.assertTrue(np.isfinite(forces).all())
+
+    def test_collapse(self):
+        """
+        Test if the collapsed model reproduces the summed predictions of
+        the levels at their training points.
+        """
+        from catlearn.regression.gp.calculator import (
+            HierarchicalMLModel,
+            get_default_model,
+            get_default_database,
+        )
+
+        # Create the data set
+        x, f, g = create_h2_atoms(gridsize=50, seed=1)
+        x_tr = [xi for xi in x if xi.get_distance(0, 1) > 1.0][:12]
+        # Test with all the training points and the default number
+        for collapse_npoints in [12, None]:
+            with self.subTest(collapse_npoints=collapse_npoints):
+                # Make the hierarchical model with three levels
+                mlmodel = HierarchicalMLModel(
+                    model=get_default_model(
+                        model="gp",
+                        global_optimization=False,
+                    ),
+                    database=get_default_database(),
+                    optimize=False,
+                    npoints=4,
+                    initial_indicies=[0],
+                    collapse_npoints=collapse_npoints,
+                )
+                for atoms in x_tr:
+                    mlmodel.add_training(atoms)
+                    mlmodel.train_model()
+                self.assertTrue(mlmodel.get_number_of_levels() == 3)
+                # Predict with the levels at their training points
+                features = np.concatenate(
+                    [level.features for level in mlmodel.levels]
+                )
+                y_levels = mlmodel.predict_levels(
+                    features,
+                    use_derivatives=True,
+                )
+                # Collapse the levels
+                mlmodel.collapse_levels()
+                self.assertTrue(mlmodel.get_number_of_levels() == 1)
+                features_collapsed = mlmodel.levels[0].features
+                if collapse_npoints is None:
+                    # Only npoints features are used in the collapsed level
+                    self.assertTrue(len(features_collapsed) == 4)
+                    # Predict again at the training points of the level
+                    indicies = [
+                        np.argmin(np.linalg.norm(features - fp, axis=1))
+                        for fp in features_collapsed
+                    ]
+                    features = features[indicies]
+                    y_levels = y_levels[indicies]
+                y_collapsed = mlmodel.predict_levels(
+                    features,
+                    use_derivatives=True,
+                )
+                self.assertTrue(
+                    np.allclose(y_levels, y_collapsed, atol=1e-3)
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,11 @@
 import unittest
 import numpy as np
-from .functions import create_func, make_train_test_set, calculate_rmse
+from .functions import (
+    create_func,
+    make_train_test_set,
+    calculate_rmse,
+    FakeWorld,
+)
 
 
 class TestGPEnsemble(unittest.TestCase):
@@ -286,6 +291,63 @@ class TestGPEnsembleDerivatives(unittest.TestCase):
                 error = calculate_rmse(f_te[:, 0], ypred[:, 0])
                 self.assertTrue(abs(error - error_list[index]) < 1e-4)
 
+    def test_broadcast_trained_state(self):
+        """
+        Test if the trained states of the ensemble broadcasted from
+        the root rank give the same predictions on another rank
+        without training.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+        from catlearn.regression.gp.ensemble import EnsembleClustering
+        from catlearn.regression.gp.ensemble.clustering import K_means
+
+        # Create the data set
+        x, f, g = create_func()
+        # Whether to learn from the derivatives
+        use_derivatives = False
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x,
+            f,
+            g,
+            tr=20,
+            te=20,
+            use_derivatives=use_derivatives,
+        )
+        # Construct the Gaussian process
+        gp = GaussianProcess(
+            hp=dict(length=2.0),
+            use_derivatives=use_derivatives,
+        )
+        # Construct the clustering object
+        clustering = K_means(k=4, maxiter=20, tol=1e-3, metric="euclidean")
+        # Construct and train the ensemble model on the root rank
+        enmodel = EnsembleClustering(
+            model=gp,
+            clustering=clustering,
+            use_variance_ensemble=True,
+        )
+        np.random.seed(1)
+        enmodel.train(x_tr, f_tr)
+        # Broadcast the trained states from the root rank
+        world_root = FakeWorld(rank=0)
+        with world_root.patch():
+            enmodel.broadcast_trained_state(root=0)
+        # Receive the trained states on the other rank
+        enmodel_rank = EnsembleClustering(
+            model=gp,
+            clustering=clustering,
+            use_variance_ensemble=True,
+        )
+        with FakeWorld(rank=1, messages=world_root.messages).patch():
+            enmodel_rank.broadcast_trained_state(root=0)
+        self.assertTrue(len(world_root.messages) == 0)
+        self.assertTrue(enmodel_rank.n_models == enmodel.n_models)
+        # Test that the predictions are the same
+        results = enmodel.predict(x_te, get_variance=True)
+        results_rank = enmodel_rank.predict(x_te, get_variance=True)
+        for result, result_rank in zip(results[:2], results_rank[:2]):
+            self.assertTrue(np.allclose(result, result_rank, atol=1e-10))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -241,5 +241,220 @@ class TestGPFPDerivatives(unittest.TestCase):
                 self.assertTrue(abs(error - error_list[index]) < 1e-4)
 
 
+
+class TestFPReference(unittest.TestCase):
+    """
+    Test if the fingerprints with a reference structure of fixed atoms
+    give the same fingerprints as the full calculation.
+    """
+
+    def test_reference(self):
+        """
+        Test if only updating the pairs with moved atoms gives the same
+        fingerprints and derivatives as the full calculation.
+        """
+        from ase import Atoms
+        from ase.build import fcc111, add_adsorbate
+        from ase.constraints import FixAtoms
+        from catlearn.regression.gp.fingerprint import (
+            InvDistances,
+            InvDistances2,
+            SortedDistances,
+            SumDistances,
+            MeanDistancesPower,
+        )
+
+        # Make a slab with an adsorbate and fixed bottom atoms
+        slab = fcc111("Cu", size=(2, 2, 3), vacuum=6.0)
+        n_slab = len(slab)
+        ads = Atoms("CO", positions=[[0.0, 0.0, 0.0], [0.0, 0.0, 1.15]])
+        add_adsorbate(slab, ads, 2.0, "ontop")
+        slab.set_constraint(FixAtoms(indices=[0, 1, 2, 3]))
+        # Define the list of fingerprint objects that are tested
+        fp_list = [
+            InvDistances(periodic_softmax=True),
+            InvDistances(periodic_softmax=False, mic=True),
+            InvDistances2(periodic_softmax=True),
+            SortedDistances(periodic_softmax=True),
+            SumDistances(periodic_softmax=False, mic=False),
+            MeanDistancesPower(periodic_softmax=True),
+        ]
+        rng = np.random.default_rng(1)
+        for fp in fp_list:
+            with self.subTest(fp=fp):
+                fp_full = fp.copy()
+                fp.set_reference(slab, fixed_indicies=np.arange(n_slab))
+                for _ in range(3):
+                    # Only move the adsorbate
+                    atoms = slab.copy()
+                    pos = atoms.get_positions()
+                    pos[n_slab:] += rng.normal(scale=0.2, size=(2, 3))
+                    atoms.set_positions(pos)
+                    self.assertTrue(fp.use_reference(atoms))
+                    fp_atoms = fp(atoms)
+                    fp_atoms_full = fp_full(atoms)
+                    self.assertTrue(
+                        np.allclose(
+                            fp_atoms.get_vector(),
+                            fp_atoms_full.get_vector(),
+                        )
+                    )
+                    self.assertTrue(
+                        np.allclose(
+                            fp_atoms.get_derivatives(),
+                            fp_atoms_full.get_derivatives(),
+                        )
+                    )
+                # The reference is not used if a slab atom is moved
+                pos[n_slab - 1] += 0.1
+                atoms.set_positions(pos)
+                self.assertFalse(fp.use_reference(atoms))
+
+
+
+class TestFPIndexTables(unittest.TestCase):
+    """
+    Test if the index tables of the fingerprints are stored and
+    give the right reductions of the inverse distances.
+    """
+
+    def test_index_tables(self):
+        """
+        Test if the index tables are reused and if the summed, mean,
+        and sorted fingerprints are reductions of the inverse distances.
+        """
+        from ase import Atoms
+        from ase.build import fcc111, add_adsorbate
+        from catlearn.regression.gp.fingerprint import (
+            InvDistances,
+            SortedDistances,
+            SumDistances,
+            MeanDistances,
+        )
+
+        # Make a slab with an adsorbate
+        atoms = fcc111("Cu", size=(2, 2, 2), vacuum=6.0)
+        ads = Atoms("CO", positions=[[0.0, 0.0, 0.0], [0.0, 0.0, 1.15]])
+        add_adsorbate(atoms, ads, 2.0, "ontop")
+        # Get the inverse distances and the tables of the combinations
+        fp = InvDistances(periodic_softmax=True)
+        fij = fp(atoms).get_vector()
+        not_masked = np.arange(len(atoms))
+        masked = np.array([], dtype=int)
+        tables = fp.get_index_tables(atoms, not_masked, masked)
+        # The tables are reused if the atoms types are not changed
+        atoms_rattled = atoms.copy()
+        atoms_rattled.rattle(0.05, seed=1)
+        self.assertTrue(
+            tables is fp.get_index_tables(atoms_rattled, not_masked, masked)
+        )
+        # Each pair belongs to one combination
+        self.assertTrue(sum(tables["comb_lengths"]) == len(fij))
+        self.assertTrue(
+            np.array_equal(
+                np.sort(tables["comb_indicies"]),
+                np.arange(len(fij)),
+            )
+        )
+        # Test the reductions of the combinations
+        f_sum = SumDistances(periodic_softmax=True)(atoms).get_vector()
+        f_mean = MeanDistances(periodic_softmax=True)(atoms).get_vector()
+        f_sort = SortedDistances(periodic_softmax=True)(atoms).get_vector()
+        start = 0
+        for c, length in enumerate(tables["comb_lengths"]):
+            fij_comb = fij[tables["comb_indicies"][start : start + length]]
+            self.assertTrue(np.isclose(f_sum[c], np.sum(fij_comb)))
+            self.assertTrue(np.isclose(f_mean[c], np.mean(fij_comb)))
+            self.assertTrue(
+                np.allclose(
+                    f_sort[start : start + length],
+                    np.sort(fij_comb)[::-1],
+                )
+            )
+            start += length
+
+
+class TestFPMixedPrecision(unittest.TestCase):
+    """
+    Test if the Gaussian Process with float32 fingerprints and predictions
+    predicts the same as with float64 within the float32 precision.
+    """
+
+    def test_predict_float32(self):
+        """
+        Test if the GP with derivatives predicts the same energies and
+        derivatives with float32 fingerprints and predictions, and
+        if float64 is used in the predictions for an ill-conditioned
+        kernel matrix.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+        from catlearn.regression.gp.kernel import SE
+        from catlearn.regression.gp.fingerprint import InvDistances
+
+        # Create the data set
+        x, f, g = create_h2_atoms(gridsize=50, seed=1)
+        # Whether to learn from the derivatives
+        use_derivatives = True
+        # The noise hyperparameters and the data types used in predictions
+        noise_list = [-3.0, -8.0]
+        pred_dtype_list = [np.float32, np.float64]
+        for noise, pred_dtype in zip(noise_list, pred_dtype_list):
+            with self.subTest(noise=noise):
+                results = []
+                for dtype in [np.float64, np.float32]:
+                    # Construct the fingerprints with the data type
+                    fp = InvDistances(
+                        reduce_dimensions=True,
+                        use_derivatives=use_derivatives,
+                        mic=True,
+                        dtype=dtype,
+                    )
+                    fps = [fp(xi) for xi in x]
+                    self.assertTrue(fps[0].get_vector().dtype == dtype)
+                    self.assertTrue(fps[0].get_derivatives().dtype == dtype)
+                    x_tr, f_tr, x_te, f_te = make_train_test_set(
+                        fps,
+                        f,
+                        g,
+                        tr=10,
+                        te=10,
+                        use_derivatives=use_derivatives,
+                    )
+                    # Construct and train the Gaussian process
+                    gp = GaussianProcess(
+                        hp=dict(length=2.0, noise=noise),
+                        use_derivatives=use_derivatives,
+                        kernel=SE(
+                            use_derivatives=use_derivatives,
+                            use_fingerprint=True,
+                        ),
+                        dtype=dtype,
+                    )
+                    gp.train(x_tr, f_tr)
+                    # The training is always made in float64
+                    self.assertTrue(gp.L.dtype == np.float64)
+                    # Predict the energies and derivatives
+                    ypred, var, var_deriv = gp.predict(
+                        x_te,
+                        get_variance=True,
+                        get_derivatives=True,
+                    )
+                    results.append((ypred, var))
+                # Test the data type used in the predictions
+                self.assertTrue(
+                    np.dtype(gp.get_prediction_dtype()) == pred_dtype
+                )
+                # Test that the predictions are the same within the precision
+                for result, result_float32 in zip(results[0], results[1]):
+                    self.assertTrue(
+                        np.allclose(
+                            result,
+                            result_float32,
+                            rtol=1e-3,
+                            atol=1e-3 * np.abs(result).max(),
+                        )
+                    )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -181,6 +181,82 @@ class TestGPHpfitter(unittest.TestCase):
                     )
                     self.assertTrue(is_minima)
 
+    def test_fbpmgp_parallel(self):
+        """
+        Test if the FBPMGP solution is the same when the length-scale
+        grid points are distributed over the processes.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+        from catlearn.regression.gp.hpfitter import FBPMGP
+
+        # Create the data set
+        x, f, g = create_func()
+        # Whether to learn from the derivatives
+        use_derivatives = True
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x,
+            f,
+            g,
+            tr=20,
+            te=20,
+            use_derivatives=use_derivatives,
+        )
+        # Find the solution with and without the distributed grid
+        sols = []
+        for parallel in [False, True]:
+            hpfitter = FBPMGP(n_test=50, ngrid=40, parallel=parallel)
+            gp = GaussianProcess(
+                hp=dict(length=2.0),
+                hpfitter=hpfitter,
+                use_derivatives=use_derivatives,
+            )
+            sols.append(hpfitter.fit(x_tr, f_tr, gp))
+        self.assertTrue(np.isfinite(sols[0]["fun"]))
+        self.assertTrue(np.allclose(sols[0]["x"], sols[1]["x"]))
+        self.assertTrue(np.isclose(sols[0]["fun"], sols[1]["fun"]))
+
+    def test_bounds_update(self):
+        """
+        Test if the length-scale boundary conditions updated with
+        new data are the same as the ones made from scratch.
+        """
+        from catlearn.regression.gp.hpboundary import (
+            LengthBoundaries,
+            EducatedBoundaries,
+            StrictBoundaries,
+        )
+
+        # Create the data set
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(40, 5))
+        # Make a constant dimension and a duplicated data point
+        X[:, 2] = 1.0
+        X[6] = X[5]
+        for bounds_class in [
+            LengthBoundaries,
+            EducatedBoundaries,
+            StrictBoundaries,
+        ]:
+            # Use grouped length-scales in the last case
+            for l_dim, groups in [(1, None), (5, None), (2, [0, 1, 1, 0, 1])]:
+                with self.subTest(bounds_class=bounds_class, l_dim=l_dim):
+                    if groups is not None:
+                        groups = np.array(groups)
+                    bounds = bounds_class()
+                    # Add the data in steps and remove some of the data
+                    for n_data in [2, 10, 10, 11, 30, 20, 40]:
+                        lengths = bounds.length_bound(
+                            X[:n_data],
+                            l_dim,
+                            groups=groups,
+                        )
+                        lengths_new = bounds_class().length_bound(
+                            X[:n_data],
+                            l_dim,
+                            groups=groups,
+                        )
+                        self.assertTrue(np.allclose(lengths, lengths_new))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,159 @@
+import unittest
+import numpy as np
+from .functions import create_func, create_h2_atoms
+
+
+class TestKernelBackend(unittest.TestCase):
+    """
+    Test if the kernel backends give the same kernel matrices as
+    the reference implementation.
+    """
+
+    def test_backend_features(self):
+        "Test the kernel backends without fingerprints."
+        from catlearn.regression.gp.kernel import SE
+
+        # Create the data set
+        x, f, g = create_func()
+        x = np.concatenate([x, x**2 / 100.0], axis=1)
+        # Test the backends with and without derivatives
+        for backend in ["fused", "numba"]:
+            for use_derivatives in [True, False]:
+                with self.subTest(
+                    backend=backend,
+                    use_derivatives=use_derivatives,
+                ):
+                    kernel = SE(
+                        use_derivatives=use_derivatives,
+                        use_fingerprint=False,
+                        hp=dict(length=[1.5]),
+                        backend=backend,
+                    )
+                    # Check the symmetric kernel matrix
+                    self.assertTrue(kernel.check_backend(x[:20]))
+                    # Check the kernel matrix of test and training data
+                    self.assertTrue(kernel.check_backend(x[20:25], x[:20]))
+                    self.assertTrue(
+                        kernel.check_backend(
+                            x[20:25],
+                            x[:20],
+                            get_derivatives=False,
+                        )
+                    )
+
+    def test_backend_fingerprint(self):
+        "Test the kernel backends give the same kernel with fingerprints."
+        from catlearn.regression.gp.kernel import SE
+        from catlearn.regression.gp.fingerprint import InvDistances
+
+        # Create the data set
+        x, f, g = create_h2_atoms(gridsize=20, seed=1)
+        fp = InvDistances(reduce_dimensions=True, use_derivatives=True)
+        fps = [fp(xi) for xi in x]
+        kernel = SE(
+            use_derivatives=True,
+            use_fingerprint=True,
+            hp=dict(length=[0.5]),
+            backend="fused",
+        )
+        # Check the symmetric kernel matrix
+        self.assertTrue(kernel.check_backend(fps[:10]))
+        # Check the kernel matrix of test and training data
+        self.assertTrue(kernel.check_backend(fps[10:], fps[:10]))
+
+
+class TestKernelARD(unittest.TestCase):
+    """
+    Test if the kernel with grouped length-scales gives the same kernel
+    matrices as the SE kernel and the correct gradients.
+    """
+
+    def test_ard_same_length(self):
+        "Test the kernel is the SE kernel when the length-scales are equal."
+        from catlearn.regression.gp.kernel import SE, SE_ARD
+
+        # Create the data set
+        x, f, g = create_func()
+        x = np.concatenate([x, x**2 / 100.0, np.sin(x)], axis=1)
+        groups = [0, 1, 0]
+        for use_derivatives in [True, False]:
+            with self.subTest(use_derivatives=use_derivatives):
+                kernel = SE(
+                    use_derivatives=use_derivatives,
+                    hp=dict(length=[0.5]),
+                )
+                kernel_ard = SE_ARD(
+                    use_derivatives=use_derivatives,
+                    hp=dict(length=[0.5]),
+                    groups=groups,
+                )
+                self.assertTrue(kernel_ard.get_hp_dimension() == 2)
+                self.assertTrue(
+                    np.allclose(kernel(x[:20]), kernel_ard(x[:20]))
+                )
+                self.assertTrue(
+                    np.allclose(
+                        kernel(x[20:25], x[:20]),
+                        kernel_ard(x[20:25], x[:20]),
+                    )
+                )
+                self.assertTrue(
+                    np.allclose(kernel.diag(x[:20]), kernel_ard.diag(x[:20]))
+                )
+
+    def test_ard_gradients(self):
+        """
+        Test the gradients of the kernel matrix wrt. the grouped
+        length-scales with finite differences.
+        """
+        from catlearn.regression.gp.kernel import SE_ARD
+        from catlearn.regression.gp.fingerprint import SumDistancesPower
+
+        # Create the data sets
+        x, f, g = create_func()
+        x = np.concatenate([x, x**2 / 100.0, np.sin(x)], axis=1)
+        atoms_list, f, g = create_h2_atoms(gridsize=6, seed=1)
+        fp = SumDistancesPower(power=3, use_derivatives=True)
+        fps = [fp(atoms) for atoms in atoms_list]
+        groups_fp = [0, 1, 1]
+        self.assertTrue(len(fps[0].get_vector()) == len(groups_fp))
+        for use_fingerprint in [False, True]:
+            for use_derivatives in [True, False]:
+                with self.subTest(
+                    use_fingerprint=use_fingerprint,
+                    use_derivatives=use_derivatives,
+                ):
+                    if use_fingerprint:
+                        features, groups = fps, groups_fp
+                    else:
+                        features, groups = x[:6], [0, 1, 0]
+                    kernel = SE_ARD(
+                        use_derivatives=use_derivatives,
+                        use_fingerprint=use_fingerprint,
+                        hp=dict(length=[0.2, -0.4]),
+                        groups=groups,
+                    )
+                    KXX = kernel(features)
+                    K_deriv = kernel.get_gradients(
+                        features,
+                        ["length"],
+                        KXX,
+                        correction=False,
+                    )["length"]
+                    # Calculate the finite differences
+                    length = kernel.get_hyperparams()["length"]
+                    dh = 1e-6
+                    for i in range(len(length)):
+                        length_p = length.copy()
+                        length_p[i] += dh
+                        kernel.set_hyperparams(dict(length=length_p))
+                        K_fd = kernel(features)
+                        length_p[i] -= 2.0 * dh
+                        kernel.set_hyperparams(dict(length=length_p))
+                        K_fd = (K_fd - kernel(features)) / (2.0 * dh)
+                        kernel.set_hyperparams(dict(length=length))
+                        self.assertTrue(np.allclose(K_deriv[i], K_fd))
+
+
+if __name__ == "__main__":
+    unittest.main()
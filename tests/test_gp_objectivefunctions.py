@@ -242,6 +242,102 @@ class TestGPObjectiveFunctions(unittest.TestCase):
                 )
                 self.assertTrue(is_minima)
 
+    def test_function_batch(self):
+        """
+        Test if the batched objective function values are the same as
+        the values calculated one set of hyperparameters at a time.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+        from catlearn.regression.gp.objectivefunctions.gp import (
+            LogLikelihood,
+            MaximumLogLikelihood,
+            GPP,
+            LOO,
+            GPE,
+            FactorizedLogLikelihood,
+            FactorizedLogLikelihoodSVD,
+            FactorizedGPP,
+        )
+        from catlearn.regression.gp.hpboundary import HPBoundaries
+
+        # Create the data set
+        x, f, g = create_func()
+        # Make fixed boundary conditions for the noise grids
+        bounds = HPBoundaries(
+            bounds_dict=dict(noise=[[-8.0, 0.0]]),
+            log=True,
+        )
+        # Make the hyperparameter sets
+        parameters = ["length", "noise", "prefactor"]
+        thetas = np.array(
+            [
+                [length, -6.0 + 0.5 * length, 0.3 * length]
+                for length in np.linspace(-1.5, 1.5, 7)
+            ]
+        )
+        # Define the list of objective function objects that are tested
+        obj_list = [
+            LogLikelihood(),
+            MaximumLogLikelihood(modification=True),
+            GPP(),
+            LOO(use_analytic_prefactor=True),
+            GPE(),
+            FactorizedLogLikelihood(ngrid=40, bounds=bounds),
+            FactorizedLogLikelihoodSVD(ngrid=40, bounds=bounds),
+            FactorizedGPP(ngrid=40, bounds=bounds),
+        ]
+        # Test with and without derivatives
+        for use_derivatives in [False, True]:
+            x_tr, f_tr, x_te, f_te = make_train_test_set(
+                x,
+                f,
+                g,
+                tr=12,
+                te=1,
+                use_derivatives=use_derivatives,
+            )
+            gp = GaussianProcess(
+                hp=dict(length=2.0),
+                use_derivatives=use_derivatives,
+            )
+            for obj_func in obj_list:
+                with self.subTest(
+                    use_derivatives=use_derivatives,
+                    obj_func=obj_func,
+                ):
+                    # Calculate the values one at a time
+                    obj_func.reset_solution()
+                    values = np.array(
+                        [
+                            obj_func.function(
+                                theta,
+                                parameters,
+                                gp,
+                                x_tr,
+                                f_tr,
+                            )
+                            for theta in thetas
+                        ]
+                    ).reshape(-1)
+                    sol = obj_func.get_stored_solution().copy()
+                    # Calculate the values in batches
+                    obj_func.reset_solution()
+                    values_batch = obj_func.function_batch(
+                        thetas,
+                        parameters,
+                        gp,
+                        x_tr,
+                        f_tr,
+                    )
+                    sol_batch = obj_func.get_stored_solution()
+                    self.assertTrue(values_batch.shape == (len(thetas),))
+                    self.assertTrue(
+                        np.allclose(values_batch, values, rtol=1e-6)
+                    )
+                    self.assertTrue(
+                        np.allclose(sol_batch["x"], sol["x"], rtol=1e-6)
+                    )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,12 @@
 import unittest
 import numpy as np
-from .functions import create_func, make_train_test_set, calculate_rmse
+from .functions import (
+    create_func,
+    make_train_test_set,
+    calculate_rmse,
+    check_minima,
+    FakeWorld,
+)
 
 
 class TestGPTrainPredict(unittest.TestCase):
@@ -426,6 +432,319 @@ class TestGPTrainPredictDerivatives(unittest.TestCase):
         error = calculate_rmse(f_te[:, 0], ypred[:, 0])
         self.assertTrue(abs(error - 0.13723) < 1e-4)
 
+    def test_predict_frozen(self):
+        """
+        Test if the GP with frozen inference predicts the same mean,
+        variance, and derivatives of the variance.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+
+        # Create the data set
+        x, f, g = create_func()
+        # Whether to learn from the derivatives
+        use_derivatives = True
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x,
+            f,
+            g,
+            tr=20,
+            te=20,
+            use_derivatives=use_derivatives,
+        )
+        # Construct the Gaussian processes
+        gp = GaussianProcess(
+            hp=dict(length=2.0),
+            use_derivatives=use_derivatives,
+        )
+        gp_frozen = GaussianProcess(
+            hp=dict(length=2.0),
+            use_derivatives=use_derivatives,
+            use_frozen=True,
+        )
+        # Train the machine learning models
+        gp.train(x_tr, f_tr)
+        gp_frozen.train(x_tr, f_tr)
+        # Predict the energies, derivatives, and uncertainties
+        results = gp.predict(
+            x_te,
+            get_variance=True,
+            get_derivatives=True,
+            get_derivtives_var=True,
+            get_var_derivatives=True,
+        )
+        results_frozen = gp_frozen.copy().predict(
+            x_te,
+            get_variance=True,
+            get_derivatives=True,
+            get_derivtives_var=True,
+            get_var_derivatives=True,
+        )
+        # Test that the predictions are the same
+        for result, result_frozen in zip(results, results_frozen):
+            self.assertTrue(np.allclose(result, result_frozen, atol=1e-8))
+
+    def test_predict_float32(self):
+        """
+        Test if the GP with float32 predictions predicts the same
+        as the GP with float64 predictions within the float32 precision.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+
+        # Create the data set
+        x, f, g = create_func()
+        # Whether to learn from the derivatives
+        use_derivatives = True
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x,
+            f,
+            g,
+            tr=20,
+            te=20,
+            use_derivatives=use_derivatives,
+        )
+        # Construct and train the Gaussian processes
+        gp = GaussianProcess(
+            hp=dict(length=2.0),
+            use_derivatives=use_derivatives,
+        )
+        gp.train(x_tr, f_tr)
+        results = gp.predict(
+            x_te,
+            get_variance=True,
+            get_derivatives=True,
+            get_derivtives_var=True,
+            get_var_derivatives=True,
+        )
+        for use_frozen in [False, True]:
+            with self.subTest(use_frozen=use_frozen):
+                gp_float32 = GaussianProcess(
+                    hp=dict(length=2.0),
+                    use_derivatives=use_derivatives,
+                    use_frozen=use_frozen,
+                    dtype=np.float32,
+                )
+                gp_float32.train(x_tr, f_tr)
+                # Test that the training is made in float64
+                self.assertTrue(gp_float32.L.dtype == np.float64)
+                # Test that the kernel matrix of the predictions is float32
+                KQX = gp_float32.get_kernel(x_te, x_tr, get_derivatives=True)
+                self.assertTrue(KQX.dtype == np.float32)
+                # Predict the energies, derivatives, and uncertainties
+                results_float32 = gp_float32.predict(
+                    x_te,
+                    get_variance=True,
+                    get_derivatives=True,
+                    get_derivtives_var=True,
+                    get_var_derivatives=True,
+                )
+                # Test that the predictions are the same within the precision
+                # (the uncertainties have a larger cancellation error)
+                for result, result_float32, tol in zip(
+                    results,
+                    results_float32,
+                    [1e-4, 1e-2, 1e-2],
+                ):
+                    self.assertTrue(result_float32.dtype == np.float64)
+                    self.assertTrue(
+                        np.allclose(
+                            result,
+                            result_float32,
+                            rtol=tol,
+                            atol=tol * np.abs(result).max(),
+                        )
+                    )
+
+    def test_trained_state(self):
+        """
+        Test if a GP with the trained state of another GP
+        predicts the same without being trained.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+        from catlearn.regression.gp.means import Prior_max
+
+        # Create the data set
+        x, f, g = create_func()
+        # Whether to learn from the derivatives
+        use_derivatives = True
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x,
+            f,
+            g,
+            tr=20,
+            te=20,
+            use_derivatives=use_derivatives,
+        )
+        # Construct and train the Gaussian process
+        gp = GaussianProcess(
+            prior=Prior_max(),
+            hp=dict(length=2.0, prefactor=0.5),
+            use_derivatives=use_derivatives,
+        )
+        gp.train(x_tr, f_tr)
+        # Set the trained state in an untrained Gaussian process
+        state = gp.get_trained_state()
+        gp_state = GaussianProcess(
+            prior=Prior_max(),
+            use_derivatives=use_derivatives,
+        )
+        gp_state.set_trained_state(state)
+        # Predict the energies, derivatives, and uncertainties
+        results = gp.predict(
+            x_te,
+            get_variance=True,
+            get_derivatives=True,
+            get_var_derivatives=True,
+        )
+        results_state = gp_state.predict(
+            x_te,
+            get_variance=True,
+            get_derivatives=True,
+            get_var_derivatives=True,
+        )
+        # Test that the predictions are the same
+        for result, result_state in zip(results, results_state):
+            self.assertTrue(np.allclose(result, result_state, atol=1e-10))
+
+    def test_broadcast_trained_state(self):
+        """
+        Test if the trained state of a GP broadcasted from the root rank
+        gives the same predictions on another rank without training.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+        from catlearn.regression.gp.means import Prior_max
+
+        # Create the data set
+        x, f, g = create_func()
+        # Whether to learn from the derivatives
+        use_derivatives = True
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x,
+            f,
+            g,
+            tr=20,
+            te=20,
+            use_derivatives=use_derivatives,
+        )
+        # Construct and train the Gaussian process on the root rank
+        gp = GaussianProcess(
+            prior=Prior_max(),
+            hp=dict(length=2.0, prefactor=0.5),
+            use_derivatives=use_derivatives,
+        )
+        gp.train(x_tr, f_tr)
+        # Broadcast the trained state from the root rank
+        world_root = FakeWorld(rank=0)
+        with world_root.patch():
+            gp.broadcast_trained_state(root=0)
+        # Receive the trained state on the other rank
+        gp_rank = GaussianProcess(
+            prior=Prior_max(),
+            use_derivatives=use_derivatives,
+        )
+        with FakeWorld(rank=1, messages=world_root.messages).patch():
+            gp_rank.broadcast_trained_state(root=0)
+        self.assertTrue(len(world_root.messages) == 0)
+        self.assertTrue(gp_rank.trained_model)
+        # The scalars of the trained state are floats
+        self.assertTrue(isinstance(gp_rank.corr, float))
+        self.assertTrue(isinstance(gp_rank.prefactor, float))
+        # Test that the predictions are the same
+        results = gp.predict(
+            x_te,
+            get_variance=True,
+            get_derivatives=True,
+            get_var_derivatives=True,
+        )
+        results_rank = gp_rank.predict(
+            x_te,
+            get_variance=True,
+            get_derivatives=True,
+            get_var_derivatives=True,
+        )
+        for result, result_rank in zip(results, results_rank):
+            self.assertTrue(np.allclose(result, result_rank, atol=1e-10))
+
+    def test_derivative_mask(self):
+        """
+        Test if the GP can be trained and optimized when only some of
+        the derivatives of the targets are used.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+        from catlearn.regression.gp.optimizers import ScipyOptimizer
+        from catlearn.regression.gp.objectivefunctions.gp import (
+            LogLikelihood,
+        )
+        from catlearn.regression.gp.hpfitter import HyperparameterFitter
+
+        # Create the data set
+        x, f, g = create_func()
+        # Whether to learn from the derivatives
+        use_derivatives = True
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x,
+            f,
+            g,
+            tr=20,
+            te=1,
+            use_derivatives=use_derivatives,
+        )
+        # Do not use the derivatives of every second training point
+        f_tr[::2, 1:] = np.nan
+        # Construct the hyperparameter fitter
+        hpfitter = HyperparameterFitter(
+            func=LogLikelihood(),
+            optimizer=ScipyOptimizer(
+                maxiter=500,
+                jac=True,
+                method="l-bfgs-b",
+                use_bounds=False,
+                tol=1e-12,
+            ),
+        )
+        # Construct and optimize the Gaussian process
+        gp = GaussianProcess(
+            hp=dict(length=2.0),
+            hpfitter=hpfitter,
+            use_derivatives=use_derivatives,
+        )
+        np.random.seed(1)
+        sol = gp.optimize(x_tr, f_tr, retrain=True)
+        self.assertTrue(
+            check_minima(sol, x_tr, f_tr, gp, pdis=None, is_model_gp=True)
+        )
+        # Test the kernel matrix only has the used targets
+        self.assertTrue(len(gp.L) == 30)
+        # Test the used training targets are predicted
+        ypred = gp.predict(x_tr, get_derivatives=True)[0]
+        is_used = np.isfinite(f_tr)
+        self.assertTrue(np.allclose(ypred[is_used], f_tr[is_used], atol=1e-3))
+        # Test the gradients of the kernel matrix are from the used targets
+        from unittest import mock
+
+        deriv_indicies = gp.get_derivative_indicies(len(x_tr))
+        KXX_full = gp.kernel(x_tr, get_derivatives=True)
+        grad_full = gp.kernel.get_gradients(x_tr, ["length"], KXX=KXX_full)
+        with mock.patch.object(
+            gp.kernel,
+            "get_KXX",
+            wraps=gp.kernel.get_KXX,
+        ) as get_KXX:
+            KXX = gp.get_kernel(x_tr, get_derivatives=True)
+            for _ in range(2):
+                grad = gp.get_kernel_gradients(x_tr, ["length"], KXX=KXX)
+                self.assertTrue(
+                    np.allclose(
+                        grad["length"],
+                        grad_full["length"][
+                            :,
+                            deriv_indicies[:, None],
+                            deriv_indicies,
+                        ],
+                    )
+                )
+            # The full kernel matrix is only made once
+            self.assertTrue(get_KXX.call_count == 1)
+
 
 if __name__ == "__main__":
     unittest.main()
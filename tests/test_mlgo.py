@@ -35,6 +35,23 @@ class TestMLGO(unittest.TestCase):
             min_steps=6,
             full_output=False,
         )
+        # Test that a parallel hyperparameter optimization is not shared
+        from catlearn.regression.gp.calculator import (
+            MLCalculator,
+            get_default_mlmodel,
+        )
+
+        mlcalc = MLCalculator(mlmodel=get_default_mlmodel(parallel=True))
+        with self.assertRaises(Exception):
+            MLGO(
+                slab=slab,
+                ads=ads,
+                ase_calc=EMT(),
+                mlcalc=mlcalc,
+                share_model=True,
+                bounds=bounds,
+                full_output=False,
+            )
 
     def test_mlgo_run(self):
         "Test if the MLGO can run and converge."
@@ -88,6 +105,147 @@ class TestMLGO(unittest.TestCase):
         atoms = mlgo.get_atoms()
         self.assertTrue(check_fmax(atoms, EMT(), fmax=0.05))
 
+    def test_mlgo_gradient(self):
+        """
+        Test if the derivatives of the acquisition function with respect to
+        the positions and angles of the adsorbate are correct.
+        """
+        import numpy as np
+        from catlearn.optimize.mlgo import MLGO
+        from ase import Atoms
+        from ase.calculators.emt import EMT
+
+        # Get the surface and use a diatomic adsorbate
+        slab, _ = get_slab_ads()
+        ads = Atoms("CO", positions=[[0.0, 0.0, 0.0], [0.3, 0.4, 1.1]])
+        # Make the boundary conditions for the global search
+        bounds = np.array(
+            [
+                [0.0, 1.0],
+                [0.0, 1.0],
+                [0.5, 0.95],
+                [0.0, 2 * np.pi],
+                [0.0, 2 * np.pi],
+                [0.0, 2 * np.pi],
+            ]
+        )
+        # Set random seed
+        np.random.seed(1)
+        # Initialize MLGO with the gradient-based search
+        mlgo = MLGO(
+            slab=slab,
+            ads=ads,
+            ase_calc=EMT(),
+            bounds=bounds,
+            initial_points=3,
+            search_method="gradient",
+            full_output=False,
+            tabletxt=None,
+        )
+        mlgo.extra_initial_data(3)
+        mlgo.train_mlmodel()
+        # Calculate the analytic and numerical derivatives
+        x = np.array([0.3, 0.6, 0.7, 0.4, 1.1, 2.0])
+        value, gradient = mlgo.dual_func_gradient(x)
+        self.assertTrue(abs(value - mlgo.dual_func(x)) < 1e-8)
+        step = 1e-5
+        gradient_num = []
+        for i in range(len(x)):
+            x_p = x.copy()
+            x_p[i] += step
+            x_m = x.copy()
+            x_m[i] -= step
+            gradient_num.append(
+                (mlgo.dual_func_gradient(x_p)[0] - mlgo.dual_func(x_m))
+                / (2.0 * step)
+            )
+        self.assertTrue(
+            np.allclose(gradient, gradient_num, rtol=1e-4, atol=1e-4)
+        )
+        # Test if the gradient-based search gives a candidate
+        candidate, energy, unc, x = mlgo.gradient_search(maxiter=200)
+        self.assertTrue(len(candidate) == len(slab) + len(ads))
+        self.assertTrue(np.isfinite(energy) and np.isfinite(unc))
+
+    def test_mlgo_prescreen(self):
+        """
+        Test if the pre-screening rejects overlapping structures and
+        reuses the acquisition values of near-duplicates.
+        """
+        import numpy as np
+        from unittest import mock
+        from catlearn.optimize.mlgo import MLGO
+        from catlearn.optimize.acquisition import AcqUCB, AcqIter
+        from ase.calculators.emt import EMT
+
+        # Get the initial and final states
+        slab, ads = get_slab_ads()
+        # Make the boundary conditions for the global search
+        bounds = np.array(
+            [
+                [0.0, 1.0],
+                [0.0, 1.0],
+                [0.5, 0.95],
+                [0.0, 2 * np.pi],
+                [0.0, 2 * np.pi],
+                [0.0, 2 * np.pi],
+            ]
+        )
+        # Set random seed
+        np.random.seed(1)
+        # Initialize MLGO with the pre-screening
+        mlgo = MLGO(
+            slab=slab,
+            ads=ads,
+            ase_calc=EMT(),
+            bounds=bounds,
+            initial_points=2,
+            prescreen=True,
+            full_output=False,
+            tabletxt=None,
+        )
+        mlgo.extra_initial_data(2)
+        mlgo.train_mlmodel()
+        # Test if the pre-screened value is the same as the ML prediction
+        x = np.array([0.3, 0.6, 0.7, 0.4, 1.1, 2.0])
+        slab_ads = mlgo.place_ads(x)
+        mlgo.prescreen = False
+        value = mlgo.dual_func(x)
+        mlgo.prescreen = True
+        self.assertTrue(abs(value - mlgo.dual_func(x)) < 1e-8)
+        # Test if an overlapping structure is rejected
+        pos = slab_ads.get_positions()
+        pos[-1] = pos[0]
+        slab_ads.set_positions(pos)
+        self.assertTrue(mlgo.get_clash_overlap(slab_ads) > 0.0)
+        self.assertTrue(
+            mlgo.prescreen_func(slab_ads) >= mlgo.clash_penalty
+        )
+        # Test if the predictions of a near-duplicate are reused
+        x = mlgo.best_x.copy()
+        value = mlgo.dual_func(x)
+        self.assertTrue(len(mlgo.duplicate_predictions) == 1)
+        with mock.patch.object(
+            mlgo.mlcalc,
+            "calculate_batch",
+            wraps=mlgo.mlcalc.calculate_batch,
+        ) as calculate_batch:
+            self.assertTrue(abs(value - mlgo.dual_func(x + 1e-9)) < 1e-12)
+            calculate_batch.assert_not_called()
+            # Test if a stochastic acquisition function is not cached
+            mlgo.acq = AcqUCB(objective="min", kappa="random")
+            values = [mlgo.dual_func(x + 1e-9) for _ in range(3)]
+            self.assertTrue(len(np.unique(values)) == 3)
+            # Test if a stateful acquisition function is still called
+            mlgo.acq = AcqIter(objective="min", niter=2)
+            values = [mlgo.dual_func(x + 1e-9) for _ in range(2)]
+            self.assertTrue(mlgo.acq.iter == 2)
+            self.assertTrue(abs(values[0] - values[1]) > 0.0)
+            calculate_batch.assert_not_called()
+        # Test if the predictions are reset when the ML model is trained
+        mlgo.train_mlmodel()
+        self.assertTrue(len(mlgo.duplicate_predictions) == 0)
+
 
 if __name__ == "__main__":
     unittest.main()
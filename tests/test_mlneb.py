@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from .functions import get_endstructures, check_image_fmax
+from .functions import get_endstructures, check_image_fmax, FakeWorld
 
 
 class TestMLNEB(unittest.TestCase):
@@ -252,6 +252,763 @@ class TestMLNEB(unittest.TestCase):
         images = mlneb.get_images()
         self.assertTrue(check_image_fmax(images, EMT(), fmax=0.05))
 
+    def test_mlneb_run_active_subspace(self):
+        """
+        Test if the MLNEB can run and converge when only the atoms
+        displaced along the path are used in the ML model.
+        """
+        from catlearn.optimize.mlneb import MLNEB
+        from ase.calculators.emt import EMT
+
+        # Get the initial and final states
+        initial, final = get_endstructures()
+        # Set random seed
+        np.random.seed(1)
+        # Initialize MLNEB
+        mlneb = MLNEB(
+            start=initial,
+            end=final,
+            ase_calc=EMT(),
+            interpolation="linear",
+            n_images=11,
+            use_restart_path=True,
+            check_path_unc=True,
+            active_subspace=True,
+            full_output=False,
+            local_opt_kwargs=dict(logfile=None),
+            tabletxt=None,
+        )
+        # Test if the MLNEB can be run
+        mlneb.run(
+            fmax=0.05,
+            unc_convergence=0.05,
+            steps=50,
+            ml_steps=250,
+            max_unc=0.05,
+        )
+        # Check that only the adsorbate is in the active subspace
+        active_atoms = mlneb.mlcalc.mlmodel.database.get_active_atoms()
+        self.assertTrue(np.array_equal(active_atoms, [len(initial) - 1]))
+        # Check that MLNEB converged
+        self.assertTrue(mlneb.converged() is True)
+        # Check that MLNEB gives a saddle point
+        images = mlneb.get_images()
+        self.assertTrue(check_image_fmax(images, EMT(), fmax=0.05))
+
+    def test_mlneb_share_model(self):
+        """
+        Test if the ML model trained on the root rank is shared
+        with the other ranks when share_model=True.
+        """
+        from catlearn.optimize.mlneb import MLNEB
+        from ase.calculators.emt import EMT
+
+        # Get the initial and final states
+        initial, final = get_endstructures()
+        # Make a training point between the initial and final states
+        middle = initial.copy()
+        middle.positions = 0.5 * (initial.positions + final.positions)
+        middle.calc = EMT()
+        middle.get_forces()
+        mlnebs = []
+        world_root = FakeWorld(rank=0)
+        world_rank = FakeWorld(rank=1, messages=world_root.messages)
+        for world in [world_root, world_rank]:
+            # Set random seed
+            np.random.seed(1)
+            # Initialize MLNEB on the rank
+            mlneb = MLNEB(
+                start=initial,
+                end=final,
+                ase_calc=EMT(),
+                interpolation="linear",
+                n_images=11,
+                share_model=True,
+                full_output=False,
+                local_opt_kwargs=dict(logfile=None),
+                trainingset=None,
+                trajectory=None,
+                tabletxt=None,
+            )
+            mlneb.rank = world.rank
+            mlneb.add_training([middle])
+            # Train the ML model on the root rank and share it
+            with world.patch():
+                mlneb.train_mlmodel()
+            mlnebs.append(mlneb)
+        self.assertTrue(len(world_root.messages) == 0)
+        # Test that the predictions are the same on both ranks
+        images = [
+            mlneb.make_interpolation(interpolation="linear")
+            for mlneb in mlnebs
+        ]
+        for image, image_rank in zip(images[0][1:-1], images[1][1:-1]):
+            self.assertTrue(
+                np.allclose(image.get_forces(), image_rank.get_forces())
+            )
+            self.assertTrue(
+                np.isclose(
+                    image.get_property("uncertainty"),
+                    image_rank.get_property("uncertainty"),
+                )
+            )
+        # Test that a parallel hyperparameter optimization is not shared
+        from catlearn.regression.gp.calculator import (
+            MLCalculator,
+            get_default_mlmodel,
+        )
+
+        for parallel in [True, False]:
+            with self.subTest(parallel=parallel):
+                mlcalc = MLCalculator(
+                    mlmodel=get_default_mlmodel(parallel=parallel)
+                )
+                self.assertTrue(mlcalc.mlmodel.is_parallel() == parallel)
+                mlneb_kwargs = dict(
+                    start=initial,
+                    end=final,
+                    ase_calc=EMT(),
+                    mlcalc=mlcalc,
+                    interpolation="linear",
+                    n_images=11,
+                    share_model=True,
+                    full_output=False,
+                    trainingset=None,
+                    trajectory=None,
+                    tabletxt=None,
+                )
+                if parallel:
+                    with self.assertRaises(Exception):
+                        MLNEB(**mlneb_kwargs)
+                else:
+                    MLNEB(**mlneb_kwargs)
+
+    def test_mlneb_run_warm_start(self):
+        """
+        Test if the MLNEB can run and converge when the local optimizer
+        is kept between the iterations and if it is only reused
+        for the path where the last NEB stopped.
+        """
+        from catlearn.optimize.mlneb import MLNEB
+        from ase.calculators.emt import EMT
+
+        # Get the initial and final states
+        initial, final = get_endstructures()
+        # Set random seed
+        np.random.seed(1)
+        # Initialize MLNEB
+        mlneb = MLNEB(
+            start=initial,
+            end=final,
+            ase_calc=EMT(),
+            interpolation="linear",
+            n_images=11,
+            use_restart_path=True,
+            check_path_unc=True,
+            warm_start=True,
+            full_output=False,
+            local_opt_kwargs=dict(logfile=None),
+            tabletxt=None,
+        )
+        # Test if the MLNEB can be run
+        mlneb.run(
+            fmax=0.05,
+            unc_convergence=0.05,
+            steps=50,
+            ml_steps=250,
+            max_unc=0.05,
+        )
+        # Check that MLNEB converged
+        self.assertTrue(mlneb.converged() is True)
+        # Check that MLNEB gives a saddle point
+        images = mlneb.get_images()
+        self.assertTrue(check_image_fmax(images, EMT(), fmax=0.05))
+        # Check that the local optimizers are closed after the run
+        self.assertTrue(len(mlneb.neb_sessions) == 0)
+        # Run a few steps of the NEB on the surrogate surface
+        images = mlneb.make_interpolation(interpolation=mlneb.last_images)
+        neb, neb_opt = mlneb.get_neb_session(images, climb=False)
+        for _ in mlneb.irun_neb_opt(neb_opt, fmax=0.01, steps=5):
+            pass
+        # Check that the optimizer is reused for the last positions
+        images_last = [image.copy() for image in images]
+        images_last = mlneb.make_interpolation(interpolation=images_last)
+        neb_last, neb_opt_last = mlneb.get_neb_session(images_last)
+        self.assertTrue(neb_opt_last is neb_opt)
+        self.assertTrue(neb_last.images is images_last)
+        # Check that a new optimizer is made for another path
+        images_new = mlneb.make_interpolation(interpolation="linear")
+        neb_opt_new = mlneb.get_neb_session(images_new)[1]
+        self.assertTrue(neb_opt_new is not neb_opt)
+        # Check that the NEB takes a step before it is stopped
+        # due to the uncertainty
+        mlneb.close_neb_sessions()
+        images = mlneb.make_interpolation(interpolation="linear")
+        mlneb.mlneb_opt_max_unc(images, fmax=0.01, ml_steps=5, max_unc=0.0)
+        self.assertTrue(mlneb.neb_sessions[False][1].nsteps == 1)
+        mlneb.close_neb_sessions()
+        # Check that the versions of ASE are compared as numbers
+        from unittest import mock
+
+        neb_opt = mock.Mock(nsteps=4)
+        for version, steps in [("3.9.1", 9), ("3.100.0", 5)]:
+            with mock.patch("ase.__version__", version):
+                mlneb.irun_neb_opt(neb_opt, fmax=0.01, steps=5)
+            neb_opt.irun.assert_called_with(fmax=0.01, steps=steps)
+
+    def test_mlneb_run_close(self):
+        """
+        Test if the path writers and the local optimizers are closed
+        when the MLNEB fails and if the path writer is made again
+        when the saved properties are changed.
+        """
+        import os
+        import tempfile
+        from unittest import mock
+        from ase.io import read
+        from catlearn.optimize.mlneb import MLNEB
+        from ase.calculators.emt import EMT
+
+        # Get the initial and final states
+        initial, final = get_endstructures()
+        # Set random seed
+        np.random.seed(1)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            last_path = os.path.join(tmpdir, "last_path.traj")
+            # Initialize MLNEB
+            mlneb = MLNEB(
+                start=initial,
+                end=final,
+                ase_calc=EMT(),
+                interpolation="linear",
+                n_images=11,
+                warm_start=True,
+                full_output=False,
+                local_opt_kwargs=dict(logfile=None),
+                trajectory=os.path.join(tmpdir, "MLNEB.traj"),
+                trainingset=os.path.join(tmpdir, "evaluated.traj"),
+                last_path=last_path,
+                final_path=os.path.join(tmpdir, "final_path.traj"),
+                tabletxt=None,
+            )
+            # Test if the path writer follows the saved properties
+            images = [initial.copy(), final.copy()]
+            for image in images:
+                image.calc = EMT()
+                image.get_forces()
+            mlneb.save_last_path(last_path, images, properties=None)
+            path_writer = mlneb.path_writers[last_path]
+            mlneb.save_last_path(last_path, images, properties=["energy"])
+            self.assertTrue(mlneb.path_writers[last_path] is not path_writer)
+            self.assertTrue(
+                mlneb.path_writers[last_path].properties == ["energy"]
+            )
+            mlneb.close_path_writers()
+            self.assertTrue(len(read(last_path, ":")) == 2)
+            # Test if everything is closed when the evaluation fails
+            with mock.patch.object(
+                mlneb,
+                "evaluate",
+                side_effect=RuntimeError("The evaluation failed."),
+            ):
+                with self.assertRaises(RuntimeError):
+                    mlneb.run(fmax=0.05, steps=5, ml_steps=50)
+            self.assertTrue(len(mlneb.path_writers) == 0)
+            self.assertTrue(len(mlneb.neb_sessions) == 0)
+
+
+class TestInterpolation(unittest.TestCase):
+    """
+    Test if the in-memory interpolations give the same paths as
+    the interpolations optimized with the ASE optimizer.
+    """
+
+    def test_interpolation_band(self):
+        "Test the in-memory IDPP and repulsive interpolations."
+        from catlearn.optimize.neb.interpolate_band import (
+            make_interpolation,
+            make_linear_interpolation,
+            make_idpp_interpolation,
+            make_rep_interpolation,
+        )
+        from ase.optimize import FIRE
+
+        # Get the initial and final states
+        initial, final = get_endstructures()
+        for method, make_method in [
+            ("idpp", make_idpp_interpolation),
+            ("rep", make_rep_interpolation),
+        ]:
+            with self.subTest(method=method):
+                images = [initial.copy() for _ in range(10)] + [final.copy()]
+                images = make_linear_interpolation(images, mic=True)
+                # Optimize the band with the ASE optimizer
+                images_ase = make_method(
+                    [image.copy() for image in images],
+                    mic=True,
+                    fmax=0.01,
+                    steps=200,
+                    local_opt=FIRE,
+                    local_kwargs=dict(logfile=None, trajectory=None),
+                )
+                # Optimize the band in memory
+                images_band = make_method(
+                    [image.copy() for image in images],
+                    mic=True,
+                    fmax=0.01,
+                    steps=200,
+                )
+                for image_ase, image_band in zip(images_ase, images_band):
+                    self.assertTrue(
+                        np.allclose(
+                            image_ase.get_positions(),
+                            image_band.get_positions(),
+                        )
+                    )
+                # Check that the cached interpolation is the same
+                cache = {}
+                images1 = make_interpolation(
+                    initial,
+                    final,
+                    n_images=11,
+                    method=method,
+                    cache=cache,
+                )
+                self.assertTrue(len(cache) == 1)
+                images2 = make_interpolation(
+                    initial,
+                    final,
+                    n_images=11,
+                    method=method,
+                    cache=cache,
+                )
+                self.assertTrue(len(cache) == 1)
+                for image1, image2 in zip(images1, images2):
+                    self.assertTrue(
+                        np.allclose(
+                            image1.get_positions(),
+                            image2.get_positions(),
+                        )
+                    )
+
+    def test_interpolation_band_kwargs(self):
+        """
+        Test if the ASE FIRE optimizer is used for the arguments that
+        the in-memory band does not use.
+        """
+        import os
+        import tempfile
+        from ase.optimize import FIRE
+        from catlearn.optimize.neb.interpolate_band import (
+            make_linear_interpolation,
+            make_idpp_interpolation,
+            make_rep_interpolation,
+        )
+
+        # Get the initial and final states
+        initial, final = get_endstructures()
+        images = [initial.copy() for _ in range(10)] + [final.copy()]
+        images = make_linear_interpolation(images, mic=True)
+        for make_method in [make_idpp_interpolation, make_rep_interpolation]:
+            with self.subTest(make_method=make_method):
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    local_kwargs = dict(
+                        trajectory=os.path.join(tmpdir, "band.traj"),
+                        logfile=None,
+                    )
+                    images_band = make_method(
+                        [image.copy() for image in images],
+                        mic=True,
+                        steps=5,
+                        local_kwargs=local_kwargs,
+                    )
+                    self.assertTrue(
+                        os.path.exists(local_kwargs["trajectory"])
+                    )
+                    images_ase = make_method(
+                        [image.copy() for image in images],
+                        mic=True,
+                        steps=5,
+                        local_opt=FIRE,
+                        local_kwargs=local_kwargs,
+                    )
+                for image_band, image_ase in zip(images_band, images_ase):
+                    self.assertTrue(
+                        np.allclose(
+                            image_band.get_positions(),
+                            image_ase.get_positions(),
+                        )
+                    )
+                # The arguments of the FIRE optimizer are used in memory
+                make_method(
+                    [image.copy() for image in images],
+                    mic=True,
+                    steps=2,
+                    local_kwargs=dict(dt=0.05, maxstep=0.1),
+                )
+
+
+class TestTrajectoryWriter(unittest.TestCase):
+    """
+    Test if the buffered trajectory writer writes the groups of
+    the ASE Atoms on a background thread.
+    """
+
+    def test_buffered_writer(self):
+        "Test if the appended and overwritten groups are written."
+        import os
+        import tempfile
+        from ase.io import read
+        from ase.calculators.emt import EMT
+        from catlearn.optimize.trajectorywriter import (
+            BufferedTrajectoryWriter,
+        )
+
+        # Get the initial and final states
+        initial, final = get_endstructures()
+        for atoms in [initial, final]:
+            atoms.calc = EMT()
+            atoms.get_forces()
+        for use_thread in [True, False]:
+            with self.subTest(use_thread=use_thread):
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    trajectory = os.path.join(tmpdir, "path.traj")
+                    with BufferedTrajectoryWriter(
+                        trajectory,
+                        properties=["energy", "forces"],
+                        use_thread=use_thread,
+                        master=True,
+                    ) as writer:
+                        # Append the groups to the trajectory
+                        writer.write([initial, final])
+                        writer.write(final)
+                        writer.flush()
+                        self.assertTrue(len(read(trajectory, ":")) == 3)
+                        # Overwrite the trajectory with a group
+                        writer.write([final], overwrite=True)
+                    atoms_saved = read(trajectory, ":")
+                    self.assertTrue(len(atoms_saved) == 1)
+                    self.assertTrue(
+                        np.isclose(
+                            atoms_saved[0].get_potential_energy(),
+                            final.get_potential_energy(),
+                        )
+                    )
+
+
+class TestNEBForces(unittest.TestCase):
+    """
+    Test if the NEB forces from the band state arrays are the same as
+    the forces from the projection of the images one at a time and
+    if the band state follows changes of the images.
+    """
+
+    def get_band(self, n_images=7, seed=1):
+        "Get a perturbed band of images with EMT calculators."
+        from ase.calculators.emt import EMT
+
+        initial, final = get_endstructures()
+        rng = np.random.default_rng(seed)
+        images = [initial]
+        for i in range(1, n_images - 1):
+            image = initial.copy()
+            frac = i / (n_images - 1)
+            positions = (1.0 - frac) * initial.positions
+            positions += frac * final.positions
+            positions[-1] += rng.normal(scale=0.1, size=3)
+            image.positions = positions
+            image.calc = EMT()
+            images.append(image)
+        images.append(final)
+        return images
+
+    def get_spring_constants(self, neb, energies):
+        "Get the spring constants of the energy weighted NEB methods."
+        from catlearn.optimize.neb import AvgEWNEB, EWNEB, MaxEWNEB
+
+        if not isinstance(neb, (EWNEB, MaxEWNEB)):
+            return neb.k
+        k_l = neb.k * neb.kl_scale
+        emax = np.max(energies)
+        if isinstance(neb, MaxEWNEB):
+            e0 = emax - neb.dE
+        elif neb.use_minimum:
+            e0 = min(energies[0], energies[-1])
+        else:
+            e0 = max(energies[0], energies[-1])
+        if e0 >= emax:
+            return k_l
+        if isinstance(neb, AvgEWNEB):
+            a = np.minimum((emax - energies) / (emax - e0), 1.0)
+            a = 0.5 * (a[1:] + a[:-1])
+            return (1.0 - a) * neb.k + a * k_l
+        a = (emax - energies[:-1]) / (emax - e0)
+        return np.where(a < 1.0, (1.0 - a) * neb.k + a * k_l, k_l)
+
+    def get_reference_forces(self, neb):
+        "Get the NEB forces by projecting the images one at a time."
+        from catlearn.optimize.neb import ImprovedTangentNEB
+        from catlearn.regression.gp.fingerprint.geometry import mic_distance
+
+        images = neb.images
+        n = len(images)
+        energies = np.array(
+            [image.get_potential_energy() for image in images]
+        )
+        forces = [image.get_forces() for image in images]
+        positions = np.array([image.get_positions() for image in images])
+        diff = positions[1:] - positions[:-1]
+        pbc = images[0].get_pbc()
+        if neb.mic and pbc.any():
+            diff = mic_distance(diff, images[0].get_cell(), pbc, True)[1]
+        k = self.get_spring_constants(neb, energies)
+        improved = isinstance(neb, ImprovedTangentNEB)
+        forces_neb, tangents = [], []
+        for i in range(1, n - 1):
+            pos_p, pos_m = diff[i], diff[i - 1]
+            e_p, e, e_m = energies[i + 1], energies[i], energies[i - 1]
+            de_max = max(abs(e_p - e), abs(e_m - e))
+            de_min = min(abs(e_p - e), abs(e_m - e))
+            if not improved:
+                tangent = pos_p / np.linalg.norm(pos_p)
+                tangent = tangent + pos_m / np.linalg.norm(pos_m)
+            elif e_p > e > e_m:
+                tangent = pos_p
+            elif e_p < e < e_m:
+                tangent = pos_m
+            elif e_p > e_m:
+                tangent = pos_p * de_max + pos_m * de_min
+            elif e_p < e_m:
+                tangent = pos_p * de_min + pos_m * de_max
+            else:
+                tangent = pos_p / np.linalg.norm(pos_p)
+                tangent = tangent + pos_m / np.linalg.norm(pos_m)
+            tangent = tangent / np.linalg.norm(tangent)
+            tangents.append(tangent)
+            # The spring force along the tangent
+            if improved:
+                f_spring = k[i] * np.linalg.norm(pos_p)
+                f_spring -= k[i - 1] * np.linalg.norm(pos_m)
+            else:
+                f_spring = np.vdot(k[i] * pos_p - k[i - 1] * pos_m, tangent)
+            f_perp = forces[i] - np.vdot(forces[i], tangent) * tangent
+            forces_neb.append(f_spring * tangent + f_perp)
+        # The climbing image is pushed up along the tangent
+        if neb.climb:
+            i_max = int(np.argmax(energies[1:-1]))
+            f_max, tangent = forces[i_max + 1], tangents[i_max]
+            forces_neb[i_max] = f_max - 2.0 * np.vdot(f_max, tangent) * tangent
+        return np.array(forces_neb).reshape(-1, 3)
+
+    def test_forces(self):
+        """
+        Test if the NEB forces are the same as the projection of
+        the images one at a time for all the NEB methods.
+        """
+        from catlearn.optimize.neb import (
+            OriginalNEB,
+            ImprovedTangentNEB,
+            EWNEB,
+            AvgEWNEB,
+            MaxEWNEB,
+        )
+        from itertools import product
+
+        neb_methods = [
+            OriginalNEB,
+            ImprovedTangentNEB,
+            EWNEB,
+            AvgEWNEB,
+            MaxEWNEB,
+        ]
+        for neb_method, climb in product(neb_methods, [False, True]):
+            with self.subTest(neb_method=neb_method, climb=climb):
+                images = self.get_band()
+                neb = neb_method(images, k=3.0, climb=climb)
+                forces_ref = self.get_reference_forces(neb)
+                self.assertTrue(
+                    np.allclose(neb.get_forces(), forces_ref, atol=1e-10)
+                )
+                # Move the images with the band and check again
+                positions = neb.get_positions()
+                neb.set_positions(positions + 0.01 * neb.get_forces())
+                forces_ref = self.get_reference_forces(neb)
+                self.assertTrue(
+                    np.allclose(neb.get_forces(), forces_ref, atol=1e-10)
+                )
+
+    def test_band_state(self):
+        """
+        Test if the band state follows new calculators and positions
+        changed in the images.
+        """
+        from unittest import mock
+        from catlearn.optimize.neb import ImprovedTangentNEB
+        from ase.calculators.emt import EMT
+        from ase.calculators.lj import LennardJones
+
+        images = self.get_band()
+        neb = ImprovedTangentNEB(images, k=3.0, climb=True)
+        neb.get_forces()
+        # Use another calculator for the moving images
+        neb.set_calculator(LennardJones())
+        forces_ref = self.get_reference_forces(neb)
+        self.assertTrue(np.allclose(neb.get_forces(), forces_ref))
+        neb.set_calculator(EMT())
+        # The images are not read again when the forces are calculated
+        with mock.patch.object(neb, "update_band_state") as update:
+            neb.set_positions(neb.get_positions() + 0.01)
+            neb.get_forces()
+            neb.get_energies()
+            update.assert_not_called()
+        forces_ref = self.get_reference_forces(neb)
+        self.assertTrue(np.allclose(neb.get_forces(), forces_ref))
+        # Change the positions of a moving image in its ASE Atoms
+        neb.images[2].positions[-1] += np.array([0.1, 0.0, 0.0])
+        neb.update_band_state()
+        positions = neb.get_positions().reshape(len(images) - 2, -1, 3)
+        self.assertTrue(np.allclose(positions[1], images[2].positions))
+        forces_ref = self.get_reference_forces(neb)
+        self.assertTrue(np.allclose(neb.get_forces(), forces_ref))
+        # Change the positions of an end image in its ASE Atoms
+        energy_end = neb.get_energies()[-1]
+        neb.images[-1].positions[-1] += np.array([0.0, 0.1, 0.0])
+        neb.update_band_state()
+        forces_ref = self.get_reference_forces(neb)
+        self.assertTrue(np.allclose(neb.get_forces(), forces_ref))
+        self.assertTrue(
+            np.isclose(
+                neb.get_energies()[-1],
+                images[-1].get_potential_energy(),
+            )
+        )
+        self.assertTrue(not np.isclose(neb.get_energies()[-1], energy_end))
+
+
+class TestNEBImage(unittest.TestCase):
+    """
+    Test if the NEB image stores the calculated results and
+    only calculates them again when it is needed.
+    """
+
+    def get_image(self, constraints=[]):
+        "Get an NEB image and its calculator with counted calculations."
+        from catlearn.optimize.neb.nebimage import NEBImage
+        from ase.calculators.emt import EMT
+        from unittest import mock
+
+        atoms = get_endstructures()[0]
+        atoms.set_constraint(atoms.constraints + constraints)
+        calc = EMT()
+        calc.calculate = mock.Mock(wraps=calc.calculate)
+        image = NEBImage(atoms)
+        image.calc = calc
+        return image, calc
+
+    def get_reference(self, image, calc=None, apply_constraint=True):
+        "Calculate the energy and forces of the image without the cache."
+        from ase.calculators.emt import EMT
+
+        atoms = image.copy()
+        atoms.calc = EMT() if calc is None else calc
+        return (
+            atoms.get_potential_energy(apply_constraint=apply_constraint),
+            atoms.get_forces(apply_constraint=apply_constraint),
+        )
+
+    def test_cache_hit(self):
+        "Test if the results are only calculated once for the positions."
+        image, calc = self.get_image()
+        forces = image.get_forces()
+        energy = image.get_potential_energy()
+        forces2 = image.get_forces()
+        energy2 = image.get_potential_energy()
+        self.assertTrue(calc.calculate.call_count == 1)
+        self.assertTrue(np.array_equal(forces, forces2))
+        self.assertTrue(energy == energy2)
+        # Check that a copy of the stored forces is given
+        forces2 += 1.0
+        self.assertTrue(np.array_equal(forces, image.get_forces()))
+        # Check that the results are right
+        energy_ref, forces_ref = self.get_reference(image)
+        self.assertTrue(np.isclose(energy, energy_ref))
+        self.assertTrue(np.allclose(forces, forces_ref))
+
+    def test_cache_miss(self):
+        "Test if the results are calculated again for new positions."
+        image, calc = self.get_image()
+        image.get_forces()
+        # Change the positions with the image
+        positions = image.get_positions()
+        positions[-1, 0] += 0.1
+        image.set_positions(positions)
+        self.assertTrue(image.is_stored("forces") is False)
+        forces = image.get_forces()
+        self.assertTrue(calc.calculate.call_count == 2)
+        self.assertTrue(np.allclose(forces, self.get_reference(image)[1]))
+        # Change the positions directly in the ASE Atoms
+        image.atoms.positions[-1, 1] += 0.1
+        energy = image.get_potential_energy()
+        forces = image.get_forces()
+        self.assertTrue(calc.calculate.call_count == 3)
+        energy_ref, forces_ref = self.get_reference(image)
+        self.assertTrue(np.isclose(energy, energy_ref))
+        self.assertTrue(np.allclose(forces, forces_ref))
+
+    def test_cache_constraints(self):
+        """
+        Test if the constraints are applied to the stored forces and
+        energy as in the ASE Atoms.
+        """
+        from ase.constraints import Hookean
+
+        # Pull the adsorbate with a spring, which adjusts the energy
+        atoms = get_endstructures()[0]
+        point = atoms.positions[-1] + np.array([0.0, 0.0, 1.0])
+        spring = Hookean(a1=len(atoms) - 1, a2=point, k=1.0, rt=0.5)
+        image, calc = self.get_image(constraints=[spring])
+        for apply_constraint in [True, False]:
+            with self.subTest(apply_constraint=apply_constraint):
+                energy_ref, forces_ref = self.get_reference(
+                    image,
+                    apply_constraint=apply_constraint,
+                )
+                # Get the results from the calculation and the cache
+                for _ in range(2):
+                    energy = image.get_potential_energy(
+                        apply_constraint=apply_constraint
+                    )
+                    forces = image.get_forces(
+                        apply_constraint=apply_constraint
+                    )
+                    self.assertTrue(np.isclose(energy, energy_ref))
+                    self.assertTrue(np.allclose(forces, forces_ref))
+        self.assertTrue(calc.calculate.call_count == 1)
+        # Check that the fixed atoms have no forces with the constraints
+        fixed = image.atoms.constraints[0].get_indices()
+        self.assertTrue(np.all(image.get_forces()[fixed] == 0.0))
+        self.assertTrue(
+            np.any(image.get_forces(apply_constraint=False)[fixed] != 0.0)
+        )
+
+    def test_cache_calc(self):
+        "Test if a new calculator resets the stored results."
+        from ase.calculators.lj import LennardJones
+
+        image, calc = self.get_image()
+        image.get_forces()
+        self.assertTrue(image.is_stored("forces"))
+        # Attach a new calculator
+        image.calc = LennardJones()
+        self.assertTrue(image.is_stored("forces") is False)
+        energy_ref, forces_ref = self.get_reference(
+            image,
+            calc=LennardJones(),
+        )
+        self.assertTrue(np.isclose(image.get_potential_energy(), energy_ref))
+        self.assertTrue(np.allclose(image.get_forces(), forces_ref))
+        self.assertTrue(calc.calculate.call_count == 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import numpy as np
 from .functions import create_func, make_train_test_set, calculate_rmse
 
 
@@ -52,6 +53,113 @@ class TestSaveModel(unittest.TestCase):
         error = calculate_rmse(f_te[:, 0], ypred[:, 0])
         self.assertTrue(abs(error - 0.02650) < 1e-4)
 
+    def test_save_model_npz(self):
+        """
+        Test if the Gaussian Process can be saved to and
+        loaded from a binary npz file with memory mapping.
+        """
+        from catlearn.regression.gp.models import GaussianProcess
+        import os
+        import tempfile
+
+        # Create the data set
+        x, f, g = create_func()
+        # Whether to learn from the derivatives
+        use_derivatives = False
+        x_tr, f_tr, x_te, f_te = make_train_test_set(
+            x,
+            f,
+            g,
+            tr=20,
+            te=1,
+            use_derivatives=use_derivatives,
+        )
+        # Construct the Gaussian process
+        gp = GaussianProcess(
+            hp=dict(length=2.0),
+            use_derivatives=use_derivatives,
+        )
+        # Train the machine learning model
+        gp.train(x_tr, f_tr)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "test_model.npz")
+            # Save the model
+            gp.save_model(filename)
+            # Load the model
+            gp2 = gp.load_model(filename, mmap_mode="r")
+            # Predict the energy
+            ypred, var, var_deriv = gp2.predict(
+                x_te,
+                get_variance=False,
+                get_derivatives=False,
+                include_noise=False,
+            )
+        # Test the prediction energy errors
+        error = calculate_rmse(f_te[:, 0], ypred[:, 0])
+        self.assertTrue(abs(error - 0.02650) < 1e-4)
+
+    def test_save_mlcalc_npz(self):
+        """
+        Test if the ML calculator can be saved to and
+        loaded from a binary npz file with and without the ASE Atoms.
+        """
+        from catlearn.regression.gp.calculator import (
+            get_default_mlmodel,
+            MLCalculator,
+        )
+        from catlearn.regression.gp.fingerprint import InvDistances
+        from .functions import create_h2_atoms
+        import os
+        import tempfile
+
+        # Create the data set
+        x, f, g = create_h2_atoms(gridsize=30, seed=1)
+        # Construct and train the ML calculator
+        fp = InvDistances(reduce_dimensions=True, use_derivatives=True)
+        mlmodel = get_default_mlmodel(
+            model="tp",
+            fp=fp,
+            use_derivatives=True,
+            parallel=False,
+        )
+        mlcalc = MLCalculator(mlmodel=mlmodel)
+        mlcalc.add_training(x[:20])
+        mlcalc.train_model()
+        for include_atoms in [True, False]:
+            with self.subTest(include_atoms=include_atoms):
+                with tempfile.TemporaryDirectory() as tmpdir:
+                    filename = os.path.join(tmpdir, "test_mlcalc.npz")
+                    # Save and load the ML calculator
+                    mlcalc.save_mlcalc(filename, include_atoms=include_atoms)
+                    mlcalc2 = mlcalc.load_mlcalc(filename)
+                    self.assertTrue(mlcalc2.get_training_set_size() == 20)
+                    # Predict the energy and forces
+                    atoms = x[25].copy()
+                    atoms.calc = mlcalc
+                    atoms2 = x[25].copy()
+                    atoms2.calc = mlcalc2
+                    self.assertTrue(
+                        abs(
+                            atoms.get_potential_energy()
+                            - atoms2.get_potential_energy()
+                        )
+                        < 1e-8
+                    )
+                    self.assertTrue(
+                        np.allclose(atoms.get_forces(), atoms2.get_forces())
+                    )
+                    # Check the stored ASE Atoms
+                    atoms_list = mlcalc2.mlmodel.get_data_atoms()
+                    if include_atoms:
+                        self.assertTrue(
+                            np.allclose(
+                                atoms_list[3].get_forces(),
+                                x[3].get_forces(),
+                            )
+                        )
+                    else:
+                        self.assertTrue(atoms_list[3] is None)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -218,6 +218,85 @@ class TestTPObjectiveFunctions(unittest.TestCase):
                 )
                 self.assertTrue(is_minima)
 
+    def test_function_batch(self):
+        """
+        Test if the batched objective function values are the same as
+        the values calculated one set of hyperparameters at a time.
+        """
+        from catlearn.regression.gp.models import TProcess
+        from catlearn.regression.gp.objectivefunctions.tp import (
+            LogLikelihood,
+            FactorizedLogLikelihood,
+            FactorizedLogLikelihoodSVD,
+        )
+        from catlearn.regression.gp.hpboundary import HPBoundaries
+
+        # Create the data set
+        x, f, g = create_func()
+        # Make fixed boundary conditions for the noise grids
+        bounds = HPBoundaries(
+            bounds_dict=dict(noise=[[-8.0, 0.0]]),
+            log=True,
+        )
+        # Make the hyperparameter sets
+        parameters = ["length", "noise"]
+        thetas = np.array(
+            [
+                [length, -6.0 + 0.5 * length]
+                for length in np.linspace(-1.5, 1.5, 7)
+            ]
+        )
+        # Define the list of objective function objects that are tested
+        obj_list = [
+            LogLikelihood(),
+            FactorizedLogLikelihood(ngrid=40, bounds=bounds),
+            FactorizedLogLikelihoodSVD(ngrid=40, bounds=bounds),
+        ]
+        # Test with and without derivatives
+        for use_derivatives in [False, True]:
+            x_tr, f_tr, x_te, f_te = make_train_test_set(
+                x,
+                f,
+                g,
+                tr=12,
+                te=1,
+                use_derivatives=use_derivatives,
+            )
+            tp = TProcess(
+                hp=dict(length=2.0),
+                use_derivatives=use_derivatives,
+            )
+            for obj_func in obj_list:
+                with self.subTest(
+                    use_derivatives=use_derivatives,
+                    obj_func=obj_func,
+                ):
+                    # Calculate the values one at a time
+                    values = np.array(
+                        [
+                            obj_func.function(
+                                theta,
+                                parameters,
+                                tp,
+                                x_tr,
+                                f_tr,
+                            )
+                            for theta in thetas
+                        ]
+                    ).reshape(-1)
+                    # Calculate the values in batches
+                    values_batch = obj_func.function_batch(
+                        thetas,
+                        parameters,
+                        tp,
+                        x_tr,
+                        f_tr,
+                    )
+                    self.assertTrue(values_batch.shape == (len(thetas),))
+                    self.assertTrue(
+                        np.allclose(values_batch, values, rtol=1e-6)
+                    )
+
 
 if __name__ == "__main__":
     unittest.main()